@@ -16,8 +16,10 @@ Pipeline::
               -K dot|neato|circo|fdp|sfdp|twopi|osage|patchwork
 """
 import argparse
-import json
+import functools
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 from gvpy.engines import get_engine as _get_engine_impl, list_engines as _list_engines_impl
@@ -106,12 +108,30 @@ def read_graph(source, suffix=".gv"):
         return _gv_reader.read_gv(text)
 
 
+def read_positioned(source):
+    """Read a graph for ``-n``: ``(graph, layout_result)``.
+
+    JSON input goes through :func:`json_io.load_json`, which rebuilds
+    the graph and its layout result in one pass; for other formats the
+    layout result is ``None`` and is built from ``pos`` attributes at
+    render time.
+    """
+    _ensure_imports()
+    if isinstance(source, Path):
+        if source.suffix.lower() == ".json":
+            return _json_io.load_json_file(source)
+    elif source.lstrip().startswith("{"):
+        return _json_io.load_json(source.strip())
+    return read_graph(source), None
+
+
 # ── Layout + Render pipeline ─────────────────────
 
 
 def layout_and_render(graph, fmt, engine_name="dot",
                       no_layout=False, scale=None, invert_y=False,
-                      bundle=False):
+                      bundle=False, sink=None, compact=False,
+                      layout=None):
     """Run layout (if needed) and produce output in the requested format.
 
     Parameters
@@ -128,18 +148,33 @@ def layout_and_render(graph, fmt, engine_name="dot",
         Scale output coordinates.
     invert_y : bool
         Invert Y axis in output.
+    sink : file-like or None
+        For ``svg``, ``dot``, ``json`` and ``json0``, stream the output
+        to this text or binary sink instead of returning it.
+    compact : bool
+        Write ``json`` / ``json0`` without indentation whitespace.
+    layout : dict or None
+        With ``no_layout``, the layout result to render (from
+        :func:`read_positioned`) instead of one rebuilt from ``pos``
+        attributes.
 
     Returns
     -------
     str
-        Rendered output text.
+        Rendered output text (``None`` when streamed to ``sink``).
     """
     _ensure_imports()
 
     # Formats that don't need layout
     if fmt == "json0":
-        return _json_io.write_json0(graph)
+        if sink is not None:
+            _json_io.dump_json0(graph, sink, compact=compact)
+            return None
+        return _json_io.write_json0(graph, compact=compact)
     if fmt == "dot" and no_layout:
+        if sink is not None:
+            _gv_writer.dump_gv(graph, sink)
+            return None
         return _gv_writer.write_gv(graph)
     if fmt == "gxl" and no_layout:
         return _gxl_io.write_gxl(graph)
@@ -155,6 +190,8 @@ def layout_and_render(graph, fmt, engine_name="dot",
             print(f"The '{engine_name}' layout engine is not yet "
                   f"implemented. Use -Kdot for now.", file=sys.stderr)
             sys.exit(1)
+    elif layout is not None:
+        result = layout
     else:
         result = _result_from_attrs(graph)
 
@@ -171,17 +208,28 @@ def layout_and_render(graph, fmt, engine_name="dot",
 
     # Render
     if fmt == "svg":
+        if sink is not None:
+            _svg_renderer.write_svg(result, sink)
+            return None
         return _svg_renderer.render_svg(result)
     elif fmt == "png":
         dpi = float(graph.get_graph_attr("dpi") or
                      graph.get_graph_attr("resolution") or "72")
         return _png_renderer.render_png(result, dpi=dpi)
     elif fmt == "dot":
+        if sink is not None:
+            _gv_writer.dump_gv(graph, sink)
+            return None
         return _gv_writer.write_gv(graph)
     elif fmt == "gxl":
         return _gxl_io.write_gxl(graph)
+    elif sink is not None:
+        from gvpy.render.sink import write_chunks
+        write_chunks(_json_io.encode_document(result, compact=compact),
+                     sink)
+        return None
     else:
-        return json.dumps(result, indent=2)
+        return "".join(_json_io.encode_document(result, compact=compact))
 
 
 # ── Post-processing helpers ──────────────────────
@@ -189,64 +237,7 @@ def layout_and_render(graph, fmt, engine_name="dot",
 
 def _result_from_attrs(graph):
     """Build a layout result dict from existing node ``pos`` attributes."""
-    nodes = []
-    for name, node in graph.nodes.items():
-        pos = node.attributes.get("pos", "")
-        x, y = 0.0, 0.0
-        if pos and "," in pos:
-            parts = pos.split(",")
-            try:
-                x, y = float(parts[0]), float(parts[1])
-            except ValueError:
-                pass
-        try:
-            w = float(node.attributes.get("width", "0.75")) * 72.0
-        except ValueError:
-            w = 54.0
-        try:
-            h = float(node.attributes.get("height", "0.5")) * 72.0
-        except ValueError:
-            h = 36.0
-        entry = {"name": name, "x": x, "y": y, "width": w, "height": h}
-        for attr in ("shape", "label", "color", "fillcolor", "fontcolor",
-                     "fontname", "fontsize", "style", "penwidth"):
-            val = node.attributes.get(attr)
-            if val:
-                entry[attr] = val
-        nodes.append(entry)
-
-    edges = []
-    for key, edge in graph.edges.items():
-        tail, head = edge.tail.name, edge.head.name
-        entry = {"tail": tail, "head": head, "points": []}
-        pos = edge.attributes.get("pos", "")
-        if pos:
-            for part in pos.split():
-                part = part.lstrip("se,")
-                if "," in part:
-                    try:
-                        px, py = part.split(",", 1)
-                        entry["points"].append([float(px), float(py)])
-                    except ValueError:
-                        pass
-        for attr in ("label", "color", "style", "penwidth", "arrowhead",
-                     "arrowtail", "dir"):
-            val = edge.attributes.get(attr)
-            if val:
-                entry[attr] = val
-        edges.append(entry)
-
-    bb_str = graph.get_graph_attr("bb") or "0,0,100,100"
-    try:
-        bb = [float(v) for v in bb_str.split(",")]
-    except ValueError:
-        bb = [0, 0, 100, 100]
-
-    return {
-        "graph": {"name": graph.name, "directed": graph.directed, "bb": bb},
-        "nodes": nodes,
-        "edges": edges,
-    }
+    return _json_io.layout_from_attrs(graph)
 
 
 def _apply_scale(result, scale):
@@ -284,6 +275,29 @@ def _apply_invert_y(result):
         cl["bb"] = [old[0], -old[3], old[2], -old[1]]
 
 
+def _render_to_file(render, out_path: Path):
+    """Stream ``render(sink=...)`` into ``out_path`` through a
+    temporary file beside it, moved into place only once rendering
+    succeeds, so a failed run leaves any previous output untouched."""
+    fd, tmp = tempfile.mkstemp(dir=out_path.parent,
+                               prefix=f".{out_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            output = render(sink=fh)
+        try:
+            mode = os.stat(out_path).st_mode & 0o777
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp, mode)
+        os.replace(tmp, out_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return output
+
+
 # ── Argument parser ──────────────────────────────
 
 
@@ -407,6 +421,10 @@ DOT file examples:
         "--bundle", action="store_true",
         help="Apply mingle edge bundling after layout (reduces clutter)",
     )
+    p.add_argument(
+        "--compact", action="store_true",
+        help="Write json / json0 without indentation whitespace",
+    )
     p.add_argument(
         "-V", "--version", action="store_true",
         help="Print version info and exit",
@@ -481,7 +499,10 @@ def main():
 
     # Process each input
     for source_name, source in sources:
-        graph = read_graph(source)
+        if args.no_layout:
+            graph, layout = read_positioned(source)
+        else:
+            graph, layout = read_graph(source), None
 
         # Honor layout= graph attribute if no -K flag was given
         if not args.engine:
@@ -528,15 +549,38 @@ def main():
             for name in isolated:
                 graph.delete_node(graph.nodes[name])
 
-        # Layout + render
-        output = layout_and_render(
-            graph, fmt,
+        # Overrides change the attributes a loaded layout was read from.
+        if args.G or args.N or args.E or args.A or args.remove_isolated:
+            layout = None
+
+        # Output destination
+        out_path = None
+        if args.output:
+            out_path = Path(args.output)
+        elif args.auto_output and isinstance(source, Path):
+            ext = _FORMAT_EXT.get(fmt, f".{fmt}")
+            out_path = Path(source).with_suffix(ext)
+
+        # Layout + render.  SVG, DOT and JSON are streamed straight to
+        # their destination.
+        render = functools.partial(
+            layout_and_render, graph, fmt,
             engine_name=engine_name,
             no_layout=args.no_layout,
             scale=args.scale,
             invert_y=args.invert_y,
             bundle=args.bundle,
+            compact=args.compact,
+            layout=layout,
         )
+        streamed = fmt in ("svg", "dot", "json", "json0")
+        if streamed and out_path is not None:
+            output = _render_to_file(render, out_path)
+        elif streamed:
+            output = render(sink=sys.stdout)
+            sys.stdout.write("\n")
+        else:
+            output = render()
 
         if args.verbose:
             n = len(graph.nodes)
@@ -546,23 +590,18 @@ def main():
                   f"{n} nodes, {e} edges, {s} subgraphs",
                   file=sys.stderr)
 
-        # Output destination — binary for PNG, text for everything else
+        # Write the output — binary for PNG, text for everything else
         is_binary = isinstance(output, bytes)
-        if args.output:
-            if is_binary:
-                Path(args.output).write_bytes(output)
-            else:
-                Path(args.output).write_text(output, encoding="utf-8")
-        elif args.auto_output and isinstance(source, Path):
-            ext = _FORMAT_EXT.get(fmt, f".{fmt}")
-            out_path = Path(source).with_suffix(ext)
-            if is_binary:
+        if out_path is not None:
+            if output is None:
+                pass
+            elif is_binary:
                 out_path.write_bytes(output)
             else:
                 out_path.write_text(output, encoding="utf-8")
-            if args.verbose:
+            if args.verbose and not args.output:
                 print(f"  → {out_path}", file=sys.stderr)
-        else:
+        elif output is not None:
             if is_binary:
                 sys.stdout.buffer.write(output)
             else:
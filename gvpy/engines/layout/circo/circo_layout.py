@@ -21,9 +21,16 @@ from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
+
 from gvpy.core.graph import Graph
 from gvpy.core.node import Node
 from gvpy.engines.layout.base import LayoutEngine
+from gvpy.engines.layout.common import blocktree
+from gvpy.engines.layout.circo.crossings import (
+    CrossingCounter,
+    count_crossings,
+)
 
 
 # ── Data structures ────────────────────────────────
@@ -184,84 +191,36 @@ class CircoLayout(LayoutEngine):
         """Find biconnected components using Tarjan's bridge-finding DFS.
 
         Returns a list of Block objects, each containing the nodes and
-        edges of one biconnected component.
+        edges of one biconnected component.  The DFS is the iterative
+        :func:`common.blocktree.biconnected_components`; block nodes
+        are listed in order of first appearance in the block's edges.
         """
         if self.oneblock or len(nodes) <= 2:
             block = Block(nodes=list(nodes))
+            node_set = set(nodes)
+            seen: set[tuple[str, str]] = set()
             for n in nodes:
                 for nb in adj.get(n, []):
-                    if nb in nodes and (n, nb) not in block.edges and \
-                       (nb, n) not in block.edges:
+                    if nb in node_set and (n, nb) not in seen and \
+                       (nb, n) not in seen:
+                        seen.add((n, nb))
                         block.edges.append((n, nb))
             return [block]
 
-        disc: dict[str, int] = {}
-        low: dict[str, int] = {}
-        parent: dict[str, str | None] = {}
-        timer = [0]
-        edge_stack: list[tuple[str, str]] = []
-        blocks: list[Block] = []
-
-        root = self.root_name if self.root_name in nodes else nodes[0]
-
-        def _dfs(u):
-            disc[u] = low[u] = timer[0]
-            timer[0] += 1
-            child_count = 0
-
-            for v in adj.get(u, []):
-                if v not in disc:
-                    child_count += 1
-                    parent[v] = u
-                    edge_stack.append((u, v))
-                    _dfs(v)
-                    low[u] = min(low[u], low[v])
-
-                    # u is articulation point: extract block
-                    is_root = (parent.get(u) is None)
-                    if (is_root and child_count > 1) or \
-                       (not is_root and low[v] >= disc[u]):
-                        block_edges = []
-                        block_nodes = set()
-                        while edge_stack and edge_stack[-1] != (u, v):
-                            e = edge_stack.pop()
-                            block_edges.append(e)
-                            block_nodes.add(e[0])
-                            block_nodes.add(e[1])
-                        if edge_stack:
-                            e = edge_stack.pop()
-                            block_edges.append(e)
-                            block_nodes.add(e[0])
-                            block_nodes.add(e[1])
-                        blocks.append(Block(
-                            nodes=list(block_nodes),
-                            edges=block_edges,
-                        ))
-
-                elif v != parent.get(u) and disc[v] < disc[u]:
-                    edge_stack.append((u, v))
-                    low[u] = min(low[u], disc[v])
-
-        parent[root] = None
-        _dfs(root)
-
-        # Remaining edges form the last block
-        if edge_stack:
-            block_nodes = set()
-            block_edges = []
-            while edge_stack:
-                e = edge_stack.pop()
-                block_edges.append(e)
-                block_nodes.add(e[0])
-                block_nodes.add(e[1])
-            blocks.append(Block(nodes=list(block_nodes), edges=block_edges))
+        ids, ptr, nbr = blocktree.csr_adjacency(nodes, adj)
+        root = ids.get(self.root_name, 0)
+        edge_blocks, _ = blocktree.biconnected_components(ptr, nbr, [root])
+        blocks = [Block(nodes=[nodes[x] for x in blocktree.block_nodes(e)],
+                        edges=[(nodes[u], nodes[v]) for u, v in e])
+                  for e in edge_blocks]
 
         # Handle isolated nodes (no edges)
-        covered = set()
-        for b in blocks:
-            covered.update(b.nodes)
-        for n in nodes:
-            if n not in covered:
+        covered = [False] * len(nodes)
+        for e in edge_blocks:
+            for u, v in e:
+                covered[u] = covered[v] = True
+        for i, n in enumerate(nodes):
+            if not covered[i]:
                 blocks.append(Block(nodes=[n]))
 
         return blocks if blocks else [Block(nodes=list(nodes))]
@@ -277,42 +236,25 @@ class CircoLayout(LayoutEngine):
         if len(blocks) <= 1:
             return blocks[0] if blocks else Block()
 
-        # Find which blocks each node belongs to
-        node_to_blocks: dict[str, list[int]] = defaultdict(list)
-        for i, b in enumerate(blocks):
-            for n in b.nodes:
-                node_to_blocks[n].append(i)
-
-        # Articulation points are nodes in 2+ blocks
-        art_points = {n for n, bl in node_to_blocks.items() if len(bl) > 1}
-
-        # Find root block
-        root_name = self.root_name if self.root_name in node_to_blocks else \
-                    blocks[0].nodes[0] if blocks[0].nodes else ""
-        root_idx = node_to_blocks.get(root_name, [0])[0]
-        root_block = blocks[root_idx]
-
-        # BFS to build tree from root block
-        visited_blocks = {root_idx}
-        queue = deque([root_idx])
-        while queue:
-            bi = queue.popleft()
-            parent_block = blocks[bi]
-            # Find articulation points in this block
-            for n in parent_block.nodes:
-                if n not in art_points:
-                    continue
-                for ci in node_to_blocks[n]:
-                    if ci in visited_blocks:
-                        continue
-                    visited_blocks.add(ci)
-                    child_block = blocks[ci]
-                    child_block.parent = parent_block
-                    child_block.cut_node = n
-                    parent_block.children.append(child_block)
-                    queue.append(ci)
+        ids: dict[str, int] = {}
+        members = [[ids.setdefault(n, len(ids)) for n in b.nodes]
+                   for b in blocks]
+        names = list(ids)
+
+        # Root block: the first one containing the root node.
+        root = ids.get(self.root_name, -1)
+        root_idx = next((i for i, m in enumerate(members) if root in m), 0)
 
-        return root_block
+        order, parent, cut = blocktree.block_cut_tree(
+            members, len(names), root_idx)
+        for ci in order[1:]:
+            child_block = blocks[ci]
+            parent_block = blocks[parent[ci]]
+            child_block.parent = parent_block
+            child_block.cut_node = names[cut[ci]]
+            parent_block.children.append(child_block)
+
+        return blocks[root_idx]
 
     # ── Single block layout ────────────────────────
 
@@ -352,8 +294,10 @@ class CircoLayout(LayoutEngine):
         block_set = set(nodes)
         local_adj: dict[str, list[str]] = defaultdict(list)
         for n in nodes:
+            seen = set()
             for nb in adj.get(n, []):
-                if nb in block_set and nb not in local_adj[n]:
+                if nb in block_set and nb not in seen:
+                    seen.add(nb)
                     local_adj[n].append(nb)
 
         # 0. Remove pair edges to create skeleton
@@ -426,9 +370,10 @@ class CircoLayout(LayoutEngine):
         order = list(path)
         remaining = [n for n in nodes if n not in on_path]
 
+        placed = set(order)
         for n in remaining:
             nbrs_in_order = [nb for nb in local_adj.get(n, [])
-                             if nb in set(order)]
+                             if nb in placed]
             if len(nbrs_in_order) >= 2:
                 # Insert between the two closest neighbors
                 i0 = order.index(nbrs_in_order[0])
@@ -440,6 +385,7 @@ class CircoLayout(LayoutEngine):
                 order.insert(pos, n)
             else:
                 order.append(n)
+            placed.add(n)
 
         # 4. Edge crossing reduction (neighbor-targeted insertion)
         order = self._reduce_crossings(order, local_adj, max_iter=10)
@@ -492,8 +438,10 @@ class CircoLayout(LayoutEngine):
         # excessive multi-edges (degree > neighbors)
         skeleton: dict[str, list[str]] = defaultdict(list)
         for u in nodes:
+            seen = set()
             for v in adj.get(u, []):
-                if v not in skeleton[u]:
+                if v not in seen:
+                    seen.add(v)
                     skeleton[u].append(v)
 
         # For nodes with high degree relative to unique neighbors,
@@ -516,39 +464,36 @@ class CircoLayout(LayoutEngine):
         """Reduce edge crossings using neighbor-targeted insertion.
 
         Port of reduce() from Graphviz blockpath.c.  For each node,
-        tries moving it next to each of its neighbors.
+        tries moving it next to each of its neighbors.  Each trial is
+        scored by :meth:`CrossingCounter.move_delta`, which only
+        looks at the chords a move toggles against the moved node's.
         """
-        best_order = list(order)
-        best_crossings = self._count_crossings(order, adj)
-
-        if best_crossings == 0:
-            return best_order
+        counter = CrossingCounter(order, self._block_edges(order, adj))
+        if counter.total == 0:
+            return list(order)
 
+        in_order = set(order)
         for _ in range(max_iter):
             improved = False
+            best_order = counter.order
             for i in range(len(best_order)):
                 node = best_order[i]
-                nbrs = adj.get(node, [])
-                for nb in nbrs:
-                    if nb not in set(best_order):
+                for nb in adj.get(node, []):
+                    if nb not in in_order:
                         continue
-                    nb_idx = best_order.index(nb)
+                    nb_idx = counter.index[nb]
                     # Try inserting node right after its neighbor
                     for target in (nb_idx, nb_idx + 1):
                         if target == i:
                             continue
-                        trial = list(best_order)
-                        trial.pop(i)
                         ins = target if target <= i else target - 1
-                        ins = max(0, min(ins, len(trial)))
-                        trial.insert(ins, node)
-                        c = self._count_crossings(trial, adj)
-                        if c < best_crossings:
-                            best_order = trial
-                            best_crossings = c
+                        ins = max(0, min(ins, len(best_order) - 1))
+                        delta = counter.move_delta(node, ins)
+                        if delta < 0:
+                            counter.apply_move(node, ins, delta)
                             improved = True
-                            if c == 0:
-                                return best_order
+                            if counter.total <= 0:
+                                return list(counter.order)
                             break
                     if improved:
                         break
@@ -557,7 +502,20 @@ class CircoLayout(LayoutEngine):
             if not improved:
                 break
 
-        return best_order
+        return list(counter.order)
+
+    def _block_edges(self, order: list[str], adj: dict[str, list[str]]
+                     ) -> list[tuple[str, str, float]]:
+        """Deduplicated ``(u, v, weight)`` edges among ``order``."""
+        edges = []
+        seen = set()
+        for u in order:
+            for v in adj.get(u, []):
+                key = (min(u, v), max(u, v))
+                if key not in seen:
+                    seen.add(key)
+                    edges.append((u, v, self._edge_weights.get(key, 1.0)))
+        return edges
 
     def _count_crossings(self, order: list[str],
                          adj: dict[str, list[str]]) -> float:
@@ -569,33 +527,11 @@ class CircoLayout(LayoutEngine):
         if N < 4:
             return 0
         pos = {name: i for i, name in enumerate(order)}
-        edges = []
-        edge_weights = []
-        seen = set()
-        for u in order:
-            for v in adj.get(u, []):
-                key = (min(u, v), max(u, v))
-                if key not in seen:
-                    seen.add(key)
-                    edges.append((pos[u], pos[v]))
-                    edge_weights.append(
-                        self._edge_weights.get(key, 1.0))
-
-        crossings = 0.0
-        for i in range(len(edges)):
-            a, b = edges[i]
-            if a > b:
-                a, b = b, a
-            for j in range(i + 1, len(edges)):
-                c, d = edges[j]
-                if c > d:
-                    c, d = d, c
-                # Two chords (a,b) and (c,d) cross if one endpoint
-                # of each is between the other's endpoints
-                if a < c < b < d or c < a < d < b:
-                    # Weight crossing by product of edge weights
-                    crossings += edge_weights[i] * edge_weights[j]
-        return crossings
+        edges = self._block_edges(order, adj)
+        return count_crossings(
+            np.array([pos[u] for u, _, _ in edges], dtype=np.int64),
+            np.array([pos[v] for _, v, _ in edges], dtype=np.int64),
+            np.array([w for _, _, w in edges], dtype=float))
 
     # ── Component layout ───────────────────────────
 
@@ -606,11 +542,11 @@ class CircoLayout(LayoutEngine):
         root_block = self._build_block_tree(blocks)
 
         # Layout each block (bottom-up)
-        def _layout_tree(block):
-            for child in block.children:
-                _layout_tree(child)
+        order = [root_block]
+        for block in order:
+            order.extend(block.children)
+        for block in reversed(order):
             self._layout_block(block, adj)
-        _layout_tree(root_block)
 
         # Position blocks recursively (top-down)
         self._position_block_tree(root_block)
@@ -637,11 +573,21 @@ class CircoLayout(LayoutEngine):
 
         Port of position()/positionChildren() from Graphviz circpos.c.
         Supports coalescing (single-child blocks merge into parent)
-        and scale-based spacing to prevent overlap.
+        and scale-based spacing to prevent overlap.  Descendants are
+        placed from an explicit stack: a block's placement reads only
+        its parent block and the cut node, so the visiting order does
+        not matter.
         """
-        if not parent_block.children:
-            return
-
+        stack = [parent_block]
+        while stack:
+            parent_block = stack.pop()
+            if parent_block.children:
+                self._position_block_children(parent_block)
+                stack.extend(reversed(parent_block.children))
+
+    def _position_block_children(self, parent_block: Block):
+        """Place the children of ``parent_block`` around their
+        articulation points."""
         # Group children by their cut_node (articulation point)
         cut_children: dict[str, list[Block]] = defaultdict(list)
         for child in parent_block.children:
@@ -710,9 +656,6 @@ class CircoLayout(LayoutEngine):
                         ln.x = child.center_x + rx
                         ln.y = child.center_y + ry
 
-                # Recurse
-                self._position_children(child)
-
     # Shared methods inherited from LayoutEngine base class:
     # _compute_node_size, _init_common_attrs,
     # _apply_normalize, _apply_rotation, _apply_center,
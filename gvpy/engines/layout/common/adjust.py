@@ -13,6 +13,10 @@ duck-typed: any object with ``lnodes`` (dict of objects with
 ``x``, ``y``, ``width``, ``height``, ``pinned`` attributes),
 ``sep`` (float), and ``overlap`` (string) works.
 
+Every mode enumerates node pairs through the shared sweep-and-prune
+index in ``common.overlap_index``, so only pairs whose boxes can
+intersect are ever examined.
+
 Mode mapping (mirrors ``adjust.c::adjustMode[]`` /
 ``getAdjustMode``):
 
@@ -27,10 +31,10 @@ scalexy            AM_SCALEXY         Marriott separate-axis
 prism / prismN     AM_PRISM           Voronoi-based
 voronoi / Voronoi  AM_VOR             Voronoi-based
 compress           AM_COMPRESS        Marriott shrink
-ortho / portho     AM_ORTHO* /        iterative slide-apart
+ortho / portho     AM_ORTHO* /        VPSC per axis
                    AM_PORTHO*
-ipsep              AM_IPSEP           falls back to scale
-vpsc               AM_VPSC            falls back to scale
+ipsep              AM_IPSEP           VPSC (post-pass)
+vpsc               AM_VPSC            VPSC
 ================  =================  ============
 
 Trace tag: ``[TRACE neato_adjust]`` (kept for back-compat — the
@@ -43,11 +47,28 @@ import os
 import sys
 from typing import Any
 
+import numpy as np
+
+from gvpy.engines.layout.common.overlap_index import (
+    any_overlap,
+    overlapping_pairs,
+)
+from gvpy.engines.layout.common.vpsc import (
+    EXTRA_GAP,
+    generate_x_constraints,
+    generate_y_constraints,
+    remove_rectangle_overlap,
+    solve_vpsc,
+)
+
 
 # Mirrors ``incr`` (adjust.c:46): each scaling iteration multiplies
 # coordinates by 1.05.
 _SCALE_INCR = 0.05
 _DFLT_SCALE_MAXITER = 200
+# VPSC weight for pinned nodes — large enough that the solver moves
+# everything else around them.
+_PIN_WEIGHT = 1e6
 
 # Adjustment modes (mirrors enum ``adjust_mode`` in adjust.h).
 AM_NONE = "none"
@@ -129,6 +150,26 @@ def _bbox_of(layout: Any) -> tuple[float, float, float, float]:
     return min(xs), min(ys), max(xs), max(ys)
 
 
+def _node_boxes(layout: Any
+                ) -> tuple[list[Any], np.ndarray, np.ndarray,
+                           np.ndarray, np.ndarray]:
+    """Return ``(nodes, x, y, hw, hh)`` for the layout's nodes.
+
+    Half extents are inflated by ``layout.sep / 2`` so two boxes
+    overlap when ``|dx| < hw_a + hw_b`` (the pairwise ``+ sep``
+    margin every mode uses).
+    """
+    nodes = list(layout.lnodes.values())
+    half_sep = layout.sep / 2
+    x = np.array([ln.x for ln in nodes], dtype=np.float64)
+    y = np.array([ln.y for ln in nodes], dtype=np.float64)
+    hw = np.array([ln.width / 2 for ln in nodes],
+                  dtype=np.float64) + half_sep
+    hh = np.array([ln.height / 2 for ln in nodes],
+                  dtype=np.float64) + half_sep
+    return nodes, x, y, hw, hh
+
+
 def _has_overlap(layout: Any, sx: float = 1.0,
                  sy: float = 1.0) -> bool:
     """Return True if any pair of nodes has overlapping bounding
@@ -136,82 +177,77 @@ def _has_overlap(layout: Any, sx: float = 1.0,
 
     The optional ``sx`` / ``sy`` factors let callers test whether a
     *hypothetical* uniform scale would clear the overlaps without
-    mutating the layout.
+    mutating the layout.  Candidate pairs come from the shared
+    sweep-and-prune index, so the test is near-linear for spread
+    layouts.
     """
-    nodes = list(layout.lnodes.values())
-    sep = layout.sep
-    for i in range(len(nodes)):
-        a = nodes[i]
-        ax, ay, ah_w, ah_h = a.x * sx, a.y * sy, a.width / 2, a.height / 2
-        for j in range(i + 1, len(nodes)):
-            b = nodes[j]
-            bx, by = b.x * sx, b.y * sy
-            bh_w, bh_h = b.width / 2, b.height / 2
-            if (abs(ax - bx) < ah_w + bh_w + sep
-                    and abs(ay - by) < ah_h + bh_h + sep):
-                return True
-    return False
-
-
-def _pair_min_scales(layout: Any
-                     ) -> tuple[list[tuple[float, float]], bool]:
+    _nodes, x, y, hw, hh = _node_boxes(layout)
+    return any_overlap(x * sx, y * sy, hw, hh)
+
+
+def _pair_scales(x: np.ndarray, y: np.ndarray, hw: np.ndarray,
+                 hh: np.ndarray, ia: np.ndarray, ib: np.ndarray
+                 ) -> np.ndarray:
+    """``(m, 2)`` array of the ``(sx, sy)`` factors that would
+    just-separate each pair along that axis (``inf`` for a zero
+    offset)."""
+    dx = np.abs(x[ia] - x[ib])
+    dy = np.abs(y[ia] - y[ib])
+    wx = hw[ia] + hw[ib]
+    wy = hh[ia] + hh[ib]
+    with np.errstate(divide="ignore"):
+        sx = np.where(dx == 0, np.inf, wx / np.where(dx == 0, 1.0, dx))
+        sy = np.where(dy == 0, np.inf, wy / np.where(dy == 0, 1.0, dy))
+    return np.column_stack([sx, sy])
+
+
+def _pair_min_scales(layout: Any) -> tuple[np.ndarray, bool]:
     """Build the per-pair minimum-scale set used by ``scAdjust``.
 
     Mirrors ``constraint.c::mkOverlapSet`` (line 665) for overlap
     pairs and ``compress`` (line 629) for the no-overlap case.
-    Returns ``(pairs, any_overlap)`` where each pair is the
-    ``(min_sx, min_sy)`` factor that would just-separate the two
-    nodes along that axis.
-
-    For overlap pairs (``any_overlap=True``) the values are
-    clamped to ``>= 1.0``: scaling up by less than 1.0 wouldn't
-    help.  For the no-overlap case (compress) the values can be
-    ``< 1.0``: each pair tells us how far we could shrink before
-    that pair would touch.
+    Returns ``(pairs, any_overlap)`` where ``pairs`` is an
+    ``(m, 2)`` array whose rows are the ``(min_sx, min_sy)`` factor
+    that would just-separate the two nodes along that axis.
+
+    For overlap pairs (``any_overlap=True``) only the overlapping
+    pairs are returned, clamped to ``>= 1.0``: scaling up by less
+    than 1.0 wouldn't help.  Like ``mkOverlapSet``, a pair that does
+    not overlap is left out even when one of its factors exceeds 1.0
+    (earlier versions kept it, which let ``scalexy`` shrink an axis).  For the no-overlap case (compress) the
+    values can be ``< 1.0``: each pair tells us how far we could
+    shrink before that pair would touch.  Only the pairs that can
+    decide the compress scale are returned — a pair's
+    ``min(sx, sy) >= t`` exactly when the boxes scaled by ``1 / t``
+    touch, so the index is queried with ``t`` halving from 1/2
+    until some pair qualifies.
     """
-    nodes = list(layout.lnodes.values())
-    sep = layout.sep
-    pairs: list[tuple[float, float]] = []
-    any_overlap = False
-    for i in range(len(nodes)):
-        a = nodes[i]
-        ah_w = a.width / 2 + sep / 2
-        ah_h = a.height / 2 + sep / 2
-        for j in range(i + 1, len(nodes)):
-            b = nodes[j]
-            bh_w = b.width / 2 + sep / 2
-            bh_h = b.height / 2 + sep / 2
-            dx = abs(a.x - b.x)
-            dy = abs(a.y - b.y)
-            overlap = dx < ah_w + bh_w and dy < ah_h + bh_h
-            if overlap:
-                any_overlap = True
-            sx = float("inf") if dx == 0 else (ah_w + bh_w) / dx
-            sy = float("inf") if dy == 0 else (ah_h + bh_h) / dy
-            if overlap:
-                pairs.append((max(sx, 1.0), max(sy, 1.0)))
-            else:
-                # Used by compress: how much we could shrink before
-                # this pair just touches.
-                pairs.append((sx, sy))
-    return pairs, any_overlap
-
-
-def _compute_scale(pairs: list[tuple[float, float]]) -> float:
+    _nodes, x, y, hw, hh = _node_boxes(layout)
+    ia, ib = overlapping_pairs(x, y, hw, hh)
+    if len(ia):
+        return np.maximum(_pair_scales(x, y, hw, hh, ia, ib), 1.0), True
+
+    t = 0.5
+    while t > 1e-12:
+        ia, ib = overlapping_pairs(x, y, hw / t, hh / t, strict=False)
+        if len(ia):
+            return _pair_scales(x, y, hw, hh, ia, ib), False
+        t /= 2
+    return np.empty((0, 2), dtype=np.float64), False
+
+
+def _compute_scale(pairs: np.ndarray) -> float:
     """Optimal uniform scale: ``max_pair min(sx, sy)``.
 
     Mirrors ``constraint.c::computeScale`` (line 743).
     """
-    sc = 0.0
-    for sx, sy in pairs:
-        v = min(sx, sy)
-        if v > sc:
-            sc = v
-    return sc
+    pairs = np.asarray(pairs, dtype=np.float64).reshape(-1, 2)
+    if len(pairs) == 0:
+        return 0.0
+    return max(0.0, float(pairs.min(axis=1).max()))
 
 
-def _compute_scale_xy(pairs: list[tuple[float, float]]
-                      ) -> tuple[float, float]:
+def _compute_scale_xy(pairs: np.ndarray) -> tuple[float, float]:
     """Optimal separate-axis scale minimising area = sx * sy.
 
     Mirrors ``constraint.c::computeScaleXY`` (line 704).  The C
@@ -224,34 +260,21 @@ def _compute_scale_xy(pairs: list[tuple[float, float]]
     y-scale must be ``max(sy_i for i >= k)``.  Total area
     ``sx * sy`` is minimised over k.
     """
-    if not pairs:
+    pairs = np.asarray(pairs, dtype=np.float64).reshape(-1, 2)
+    if len(pairs) == 0:
         return 1.0, 1.0
     # Sort by sx ascending; prepend the sentinel after sorting so
     # it stays at index 0.
-    sorted_pairs = sorted(pairs, key=lambda p: (p[0], p[1]))
-    s = [(1.0, float("inf"))] + sorted_pairs
-    n = len(s)
+    srt = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    s = np.vstack([[1.0, np.inf], srt])
     # max_sy_right[k] = max(sy_i for i > k) with base 1 (mirrors C
     # ``barr[m-1].y = 1`` initialisation).
-    max_sy_right = [1.0] * n
-    cur = 1.0
-    for k in range(n - 1, -1, -1):
-        if k + 1 < n:
-            cur = max(cur, s[k + 1][1])
-        max_sy_right[k] = cur
-
-    best_cost = float("inf")
-    best_x = 1.0
-    best_y = 1.0
-    for k in range(n):
-        sx = s[k][0]
-        sy = max_sy_right[k]
-        cost = sx * sy
-        if cost < best_cost:
-            best_cost = cost
-            best_x = sx
-            best_y = sy
-    return best_x, best_y
+    right = np.append(s[1:, 1], 1.0)
+    max_sy_right = np.maximum(
+        np.maximum.accumulate(right[::-1])[::-1], 1.0)
+    cost = s[:, 0] * max_sy_right
+    k = int(np.argmin(cost))
+    return float(s[k, 0]), float(max_sy_right[k])
 
 
 def scale_adjust(layout: Any) -> int:
@@ -259,21 +282,19 @@ def scale_adjust(layout: Any) -> int:
 
     Mirrors ``constraint.c::scAdjust(g, 1)`` (line 767) — the
     algorithm that backs ``overlap=scale``.  Computes the optimal
-    single scale factor in O(N²) time and applies it once, so
-    "iterations" is 1 if a scale was applied, 0 otherwise.
+    single scale factor from the overlapping pairs reported by the
+    spatial index and applies it once, so "iterations" is 1 if a
+    scale was applied, 0 otherwise.
 
     Reference: Marriott, Stuckey, Tam, He, "Removing Node
     Overlapping in Graph Layout Using Constrained Optimization"
     (2003).
     """
-    if not _has_overlap(layout):
-        _trace("scale: no overlap, skip")
-        return 0
     pairs, any_overlap = _pair_min_scales(layout)
     if not any_overlap:
+        _trace("scale: no overlap, skip")
         return 0
-    overlap_pairs = [p for p in pairs if p[0] >= 1.0 or p[1] >= 1.0]
-    s = _compute_scale(overlap_pairs)
+    s = _compute_scale(pairs)
     if s <= 1.0:
         _trace(f"scale: computed scale {s:.4f} ≤ 1; no-op")
         return 0
@@ -294,14 +315,11 @@ def scalexy_adjust(layout: Any) -> int:
     constraint via the sort-based DP in
     ``computeScaleXY`` (line 704).
     """
-    if not _has_overlap(layout):
-        _trace("scalexy: no overlap, skip")
-        return 0
     pairs, any_overlap = _pair_min_scales(layout)
     if not any_overlap:
+        _trace("scalexy: no overlap, skip")
         return 0
-    overlap_pairs = [p for p in pairs if p[0] >= 1.0 or p[1] >= 1.0]
-    sx, sy = _compute_scale_xy(overlap_pairs)
+    sx, sy = _compute_scale_xy(pairs)
     if sx <= 1.0 and sy <= 1.0:
         _trace(f"scalexy: ({sx:.4f}, {sy:.4f}) ≤ 1; no-op")
         return 0
@@ -328,14 +346,10 @@ def compress_adjust(layout: Any) -> int:
     if any_overlap:
         _trace("compress: overlap present; skip (matches C behaviour)")
         return 0
-    if not pairs:
+    if len(pairs) == 0:
         return 0
     # max-min: take the most restrictive shrink-to-touch scale.
-    s = 0.0
-    for sx, sy in pairs:
-        v = min(sx, sy)
-        if v > s:
-            s = v
+    s = _compute_scale(pairs)
     if s <= 0 or s >= 1.0:
         _trace(f"compress: scale {s:.4f}; no-op")
         return 0
@@ -348,64 +362,82 @@ def compress_adjust(layout: Any) -> int:
     return 1
 
 
-def ortho_adjust(layout: Any,
-                 axes: str = "both",
-                 max_iter: int = 100) -> int:
-    """Orthogonal-constraint overlap removal.
+def _solve_axis(nodes: list[Any], axis: str,
+                desired: np.ndarray,
+                constraints: list[tuple[int, int, float]]) -> bool:
+    """Solve one VPSC axis and write the unpinned coordinates back.
+    Returns True if any constraint was generated."""
+    if not constraints:
+        return False
+    weights = np.array([_PIN_WEIGHT if ln.pinned else 1.0
+                        for ln in nodes], dtype=np.float64)
+    pos = solve_vpsc(desired, weights, constraints)
+    for ln, v in zip(nodes, pos.tolist()):
+        if not ln.pinned:
+            setattr(ln, axis, v)
+    return True
 
-    Approximates ``constraint.c::cAdjust`` for the AM_ORTHO* /
-    AM_PORTHO* family.  C's implementation solves a per-axis
-    constraint optimisation with network simplex; this Py port
-    uses a simpler iterative projection — for each overlapping
-    pair, slide the pair apart along the chosen axis by the
-    minimum amount needed.
 
-    Less optimal than the C QP-style solve (more layout drift),
-    but produces non-overlapping output and respects the
-    "preserve relative order" property of orthogonal modes.
+def ortho_adjust(layout: Any, axes: str = "both") -> int:
+    """Orthogonal-constraint overlap removal.
+
+    Mirrors ``constraint.c::cAdjust`` for the AM_ORTHO* /
+    AM_PORTHO* family, with the per-axis quadratic solve done by
+    the VPSC solver (``common.vpsc``) rather than network simplex:
+    each pass moves nodes the least along one axis subject to
+    separation constraints generated by a sweep line, so relative
+    order along that axis is preserved.
 
     ``axes``:
-    - ``"x"`` — slide overlap pairs along the X axis only.
-    - ``"y"`` — slide along Y only.
-    - ``"both"`` (AM_ORTHO/PORTHO default) — alternates.
+    - ``"x"`` — one X pass; every pair whose Y extents overlap
+      keeps its X order and is separated in X.
+    - ``"y"`` — the same along Y.
+    - ``"both"`` (AM_ORTHO/PORTHO default) — an X pass that only
+      separates pairs cheaper to separate in X (VPSC neighbour
+      lists), then a Y pass for whatever still overlaps.
+
+    Returns the number of passes that had constraints to solve.
+    """
+    nodes, x, y, hw, hh = _node_boxes(layout)
+    if not any_overlap(x, y, hw, hh):
+        _trace(f"ortho({axes}): no overlap, skip")
+        return 0
+    passes = 0
+    if axes in ("x", "both"):
+        cs = generate_x_constraints(x, y, hw + EXTRA_GAP, hh,
+                                    use_neighbour_lists=axes == "both")
+        passes += _solve_axis(nodes, "x", x, cs)
+        x = np.array([ln.x for ln in nodes], dtype=np.float64)
+    if axes in ("y", "both"):
+        cs = generate_y_constraints(x, y, hw, hh + EXTRA_GAP)
+        passes += _solve_axis(nodes, "y", y, cs)
+    _trace(f"ortho({axes}): passes={passes}")
+    return passes
+
+
+def vpsc_adjust(layout: Any) -> int:
+    """Least-displacement overlap removal.
+
+    Mirrors ``neatogen/constraint.c`` routing ``overlap=vpsc`` to
+    ``removeRectangleOverlap`` (``lib/vpsc``): an X pass, a Y pass
+    and a final X re-solve, each minimising squared displacement
+    subject to separation constraints.  Unlike the scale modes the
+    drawing only grows where nodes actually collide.  Returns 1 if
+    nodes were moved, 0 if there was no overlap.
     """
-    iters = 0
-    while iters < max_iter:
-        nodes = list(layout.lnodes.values())
-        moved = False
-        sep = layout.sep
-        for i in range(len(nodes)):
-            a = nodes[i]
-            for j in range(i + 1, len(nodes)):
-                b = nodes[j]
-                dx = b.x - a.x
-                dy = b.y - a.y
-                ovx = (a.width + b.width) / 2 + sep - abs(dx)
-                ovy = (a.height + b.height) / 2 + sep - abs(dy)
-                if ovx <= 0 or ovy <= 0:
-                    continue
-                # Choose axis per mode.
-                push_x = axes == "x" or (axes == "both" and ovx <= ovy)
-                push_y = axes == "y" or (axes == "both" and not push_x)
-                shift = (ovx if push_x else ovy) / 2 + 0.5
-                if push_x:
-                    sgn = 1.0 if dx >= 0 else -1.0
-                    if not a.pinned:
-                        a.x -= sgn * shift
-                    if not b.pinned:
-                        b.x += sgn * shift
-                else:
-                    sgn = 1.0 if dy >= 0 else -1.0
-                    if not a.pinned:
-                        a.y -= sgn * shift
-                    if not b.pinned:
-                        b.y += sgn * shift
-                moved = True
-        iters += 1
-        if not moved:
-            break
-    _trace(f"ortho({axes}): iters={iters}")
-    return iters
+    nodes, x, y, hw, hh = _node_boxes(layout)
+    if not any_overlap(x, y, hw, hh):
+        _trace("vpsc: no overlap, skip")
+        return 0
+    weights = np.array([_PIN_WEIGHT if ln.pinned else 1.0
+                        for ln in nodes], dtype=np.float64)
+    nx, ny = remove_rectangle_overlap(x, y, hw, hh, weights)
+    for ln, vx, vy in zip(nodes, nx.tolist(), ny.tolist()):
+        if not ln.pinned:
+            ln.x = vx
+            ln.y = vy
+    _trace(f"vpsc: solved n={len(nodes)}")
+    return 1
 
 
 def remove_overlap(layout: Any) -> int:
@@ -473,8 +505,7 @@ def remove_overlap(layout: Any) -> int:
         # one — keep this distinct from AM_PRISM above.
         from gvpy.engines.layout.common.voronoi import voronoi_adjust
         return voronoi_adjust(layout)
-    # §4.N.3.4 — orthogonal modes.  C uses constraint solvers; this
-    # port uses an iterative slide-apart pass.
+    # §4.N.3.4 — orthogonal modes, solved per axis with VPSC.
     if mode in (AM_ORTHO, AM_PORTHO):
         return ortho_adjust(layout, axes="both")
     if mode in (AM_ORTHOXY, AM_PORTHOXY):
@@ -491,15 +522,10 @@ def remove_overlap(layout: Any) -> int:
         ortho_adjust(layout, axes="y")
         return ortho_adjust(layout, axes="x")
     if mode in (AM_VPSC, AM_IPSEP):
-        # IPSEP / VPSC need a quadratic-programming solver
-        # (constrained_majorization).  Not implemented; fall back
-        # to scale and warn so users see something reasonable.
-        print(
-            f"warning: overlap={raw!r} requested {mode}; QP solver "
-            f"not yet implemented in gvpy; falling back to scale.",
-            file=sys.stderr,
-        )
-        return scale_adjust(layout)
+        # C runs IPSEP as constrained stress majorization inside
+        # neato; as a post-pass both reduce to the same
+        # least-displacement separation problem.
+        return vpsc_adjust(layout)
     # Unknown mode beyond what we map.
     print(
         f"warning: overlap={raw!r} not supported, "
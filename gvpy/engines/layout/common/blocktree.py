@@ -0,0 +1,153 @@
+"""Biconnected components and the block-cutpoint tree.
+
+Mirrors Graphviz ``lib/circogen/blocktree.c`` (``dfs`` /
+``find_blocks`` / ``createBlocktree``); the ``bcomps`` filter
+(``cmd/tools/bcomps.c``) runs the same decomposition.
+
+The functions work on integer node ids and a CSR adjacency
+(:func:`csr_adjacency`) so circo and :mod:`gvpy.filters.bcomps` can
+share them.  Tarjan's DFS is iterative — an explicit stack of nodes
+and per-node neighbour cursors — so long cycles and paths do not hit
+Python's recursion limit.  It visits neighbours in adjacency order
+and emits blocks in the order the recursive formulation did: a block
+is cut off when its articulation point's child returns, except that
+the DFS root's first child's block stays on the edge stack until the
+root finishes.
+"""
+from __future__ import annotations
+
+from collections import deque
+
+
+def csr_adjacency(names: list[str], adj: dict[str, list[str]]
+                  ) -> tuple[dict[str, int], list[int], list[int]]:
+    """Integer ids and CSR adjacency ``(ids, ptr, nbr)`` for ``names``.
+
+    The neighbours of ``names[i]`` are ``nbr[ptr[i]:ptr[i + 1]]``, in
+    ``adj`` order; neighbours outside ``names`` are dropped.
+    """
+    ids = {name: i for i, name in enumerate(names)}
+    ptr = [0] * (len(names) + 1)
+    nbr: list[int] = []
+    for i, name in enumerate(names):
+        for v in adj.get(name, ()):
+            j = ids.get(v)
+            if j is not None:
+                nbr.append(j)
+        ptr[i + 1] = len(nbr)
+    return ids, ptr, nbr
+
+
+def biconnected_components(ptr: list[int], nbr: list[int],
+                           roots) -> tuple[list[list[tuple[int, int]]],
+                                           list[bool]]:
+    """Tarjan's biconnected components, DFS started from each of
+    ``roots`` not yet visited.
+
+    The adjacency must be free of duplicate neighbours.  Returns
+    ``(blocks, art)``: the edges of each block in edge-stack pop
+    order, and per-node articulation-point flags.  Nodes without
+    edges belong to no block.
+    """
+    n = len(ptr) - 1
+    disc = [-1] * n
+    low = [0] * n
+    parent = [-1] * n
+    cursor = ptr[:-1]
+    child_count = [0] * n
+    # Edge-stack height before each node's tree edge was pushed.
+    mark = [0] * n
+    art = [False] * n
+    edge_stack: list[tuple[int, int]] = []
+    blocks: list[list[tuple[int, int]]] = []
+    timer = 0
+
+    def cut(height: int) -> None:
+        block = edge_stack[height:]
+        del edge_stack[height:]
+        block.reverse()
+        blocks.append(block)
+
+    for root in roots:
+        if disc[root] >= 0:
+            continue
+        disc[root] = low[root] = timer
+        timer += 1
+        stack = [root]
+        while stack:
+            u = stack[-1]
+            k = cursor[u]
+            if k < ptr[u + 1]:
+                cursor[u] = k + 1
+                v = nbr[k]
+                if disc[v] < 0:
+                    child_count[u] += 1
+                    parent[v] = u
+                    mark[v] = len(edge_stack)
+                    edge_stack.append((u, v))
+                    disc[v] = low[v] = timer
+                    timer += 1
+                    stack.append(v)
+                elif v != parent[u] and disc[v] < disc[u]:
+                    edge_stack.append((u, v))
+                    if disc[v] < low[u]:
+                        low[u] = disc[v]
+                continue
+            stack.pop()
+            if not stack:
+                break
+            p = stack[-1]
+            if low[u] < low[p]:
+                low[p] = low[u]
+            if parent[p] < 0:
+                if child_count[p] > 1:
+                    art[p] = True
+                    cut(mark[u])
+            elif low[u] >= disc[p]:
+                art[p] = True
+                cut(mark[u])
+        if edge_stack:
+            cut(0)
+    return blocks, art
+
+
+def block_nodes(edges: list[tuple[int, int]]) -> list[int]:
+    """Nodes of a block in order of first appearance in ``edges``."""
+    return list(dict.fromkeys(x for e in edges for x in e))
+
+
+def block_cut_tree(blocks: list[list[int]], n: int, root_block: int
+                   ) -> tuple[list[int], list[int], list[int]]:
+    """Block-cutpoint tree of ``blocks`` (node lists over ``n``
+    nodes), rooted at ``root_block``.
+
+    Returns ``(order, parent, cut)``: the blocks reached, breadth
+    first from the root, and per block the parent block index and
+    the articulation point shared with it (both ``-1`` for the root
+    and for blocks not reached).  A block's children are found
+    through its nodes in order, and through each node's blocks in
+    index order.
+    """
+    node_blocks: list[list[int]] = [[] for _ in range(n)]
+    for bi, nodes in enumerate(blocks):
+        for x in nodes:
+            node_blocks[x].append(bi)
+    parent = [-1] * len(blocks)
+    cut = [-1] * len(blocks)
+    seen = [False] * len(blocks)
+    seen[root_block] = True
+    order = [root_block]
+    queue = deque(order)
+    while queue:
+        bi = queue.popleft()
+        for x in blocks[bi]:
+            if len(node_blocks[x]) < 2:
+                continue
+            for ci in node_blocks[x]:
+                if not seen[ci]:
+                    seen[ci] = True
+                    parent[ci] = bi
+                    cut[ci] = x
+                    order.append(ci)
+                    queue.append(ci)
+    return order, parent, cut
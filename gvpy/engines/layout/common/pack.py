@@ -0,0 +1,515 @@
+"""Component packing — the ``pack`` / ``packmode`` attributes.
+
+See: /lib/pack/pack.c
+
+Places separately laid-out connected components so they do not
+overlap, as Graphviz's ``pack`` library does:
+
+- ``packmode=node`` (the default), ``clust`` and ``graph`` use
+  polyomino packing.  Each component is covered by grid cells — the
+  cells under its nodes and edges, under its nodes and top-level
+  clusters, or under its bounding box — and components are placed in
+  decreasing perimeter order at the first free spot of an outward
+  spiral over a sparse occupancy grid (a set of cells).
+- ``packmode=array[_flags][N]`` lays components out in a grid of
+  ``N`` columns (rows with the ``c`` flag), sorted by size, input
+  order (``i``) or node ``sortv`` values (``u``), and aligned in
+  their grid cells per ``t`` / ``b`` / ``l`` / ``r``.
+
+``pack=N`` sets the margin around each component to ``N`` points.
+
+Python deviations:
+
+- Cell coverage uses floor division throughout; C mixes ``GRID``
+  (ceil) and ``CELL`` (truncation) and so covers a few cells more or
+  less at component borders.
+- Clusters in ``clust`` mode are covered by their member nodes'
+  bounding box plus the margin — engines other than dot do not store
+  cluster boxes.
+- The spiral is walked by each component's anchor cell — the lower
+  left cell of its first node — rather than by its lower left corner,
+  and the first component is not centred specially.  Every component
+  covers a node-sized box at its anchor, so a spiral position where
+  the smallest such box is occupied is skipped for all later
+  components.  Positions that fail only the full fit are offered
+  again once the perimeter drops, not to the other components of the
+  same perimeter.  The spiral is walked once overall instead of once
+  per component, and the work grows linearly with the component
+  count.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+# ``CL_OFFSET`` in lib/common/const.h — the default margin.
+CL_OFFSET = 8.0
+# ``C`` in pack.c — the target number of cells per component.
+_CELLS_PER_COMPONENT = 100
+
+PK_COL_MAJOR = 1 << 0
+PK_USER_VALS = 1 << 1
+PK_TOP_ALIGN = 1 << 2
+PK_BOT_ALIGN = 1 << 3
+PK_LEFT_ALIGN = 1 << 4
+PK_RIGHT_ALIGN = 1 << 5
+PK_INPUT_ORDER = 1 << 6
+
+_FLAG_CHARS = {
+    "c": PK_COL_MAJOR, "u": PK_USER_VALS, "t": PK_TOP_ALIGN,
+    "b": PK_BOT_ALIGN, "l": PK_LEFT_ALIGN, "r": PK_RIGHT_ALIGN,
+    "i": PK_INPUT_ORDER,
+}
+
+
+@dataclass
+class PackInfo:
+    """Mirror of ``pack_info`` in ``pack.h``."""
+    mode: str = "node"
+    margin: float = CL_OFFSET
+    flags: int = 0
+    sz: int = 0
+
+
+def parse_pack_mode(s: Optional[str], info: PackInfo) -> PackInfo:
+    """``parsePackModeInfo`` — fill ``info`` from a ``packmode`` value.
+
+    Unknown values leave ``info.mode`` unchanged.
+    """
+    s = (s or "").strip().lower()
+    if s.startswith("array"):
+        info.mode = "array"
+        rest = s[5:]
+        if rest.startswith("_"):
+            rest = rest[1:]
+            while rest and rest[0] in _FLAG_CHARS:
+                info.flags |= _FLAG_CHARS[rest[0]]
+                rest = rest[1:]
+        digits = ""
+        while rest and rest[0].isdigit():
+            digits += rest[0]
+            rest = rest[1:]
+        if digits:
+            info.sz = int(digits)
+    elif s in ("node", "clust", "graph"):
+        info.mode = s
+    elif s == "aspect":
+        # Deprecated in Graphviz; packs as ``node``.
+        info.mode = "node"
+    return info
+
+
+def get_pack_info(graph, default_margin: float = CL_OFFSET) -> PackInfo:
+    """``getPackInfo`` — read ``pack`` and ``packmode`` from ``graph``."""
+    info = PackInfo(margin=default_margin)
+    pack = graph.get_graph_attr("pack")
+    if pack:
+        try:
+            margin = int(pack)
+        except ValueError:
+            margin = -1
+        if margin >= 0:
+            info.margin = float(margin)
+    return parse_pack_mode(graph.get_graph_attr("packmode"), info)
+
+
+def compute_step(bbs: list[tuple], margin: float) -> int:
+    """``computeStep`` — grid cell size giving about
+    ``_CELLS_PER_COMPONENT`` cells per component."""
+    if not bbs:
+        return 1
+    a = _CELLS_PER_COMPONENT * len(bbs) - 1
+    b = 0.0
+    c = 0.0
+    for x0, y0, x1, y1 in bbs:
+        w = x1 - x0 + 2 * margin
+        h = y1 - y0 + 2 * margin
+        b -= w + h
+        c -= w * h
+    r = math.sqrt(b * b - 4.0 * a * c)
+    return max(1, int((-b + r) / (2 * a)))
+
+
+# ── Polyominoes ──────────────────────────────
+
+
+def _cell_range(lo: float, hi: float, step: int) -> range:
+    return range(math.floor(lo / step), math.floor(hi / step) + 1)
+
+
+def _fill_box(cells: set, x0: float, y0: float, x1: float, y1: float,
+              step: int) -> None:
+    ys = _cell_range(y0, y1, step)
+    for x in _cell_range(x0, x1, step):
+        for y in ys:
+            cells.add((x, y))
+
+
+def _fill_line(cells: set, x0: int, y0: int, x1: int, y1: int) -> None:
+    """``fillLine`` — Bresenham line between two cells."""
+    dx, dy = abs(x1 - x0), abs(y1 - y0)
+    sx = 1 if x1 > x0 else -1
+    sy = 1 if y1 > y0 else -1
+    err = dx - dy
+    while True:
+        cells.add((x0, y0))
+        if x0 == x1 and y0 == y1:
+            return
+        e2 = 2 * err
+        if e2 > -dy:
+            err -= dy
+            x0 += sx
+        if e2 < dx:
+            err += dx
+            y0 += sy
+
+
+def _top_clusters(graph) -> list:
+    """Top-level clusters: ``cluster*`` subgraphs not nested in another
+    cluster."""
+    out = []
+    stack = list(graph.subgraphs.values())
+    while stack:
+        sub = stack.pop(0)
+        if sub.name.startswith("cluster"):
+            out.append(sub)
+        else:
+            stack.extend(sub.subgraphs.values())
+    return out
+
+
+def _polyomino(layout, comp: list[str], edges: list[tuple[str, str]],
+               clusters: list[list[str]], bb: tuple, info: PackInfo,
+               step: int, origin: tuple[float, float]) -> tuple:
+    """``genPoly`` / ``genBox`` — cells covering a component, relative
+    to ``origin``.
+
+    Returns ``(cells, anchor, size)``: ``anchor`` is the first cell of
+    the first node's box and ``size`` that box's extent in cells.
+    """
+    m = info.margin
+    ox, oy = origin
+    cells: set = set()
+    lnodes = layout.lnodes
+    ln = lnodes[comp[0]]
+    xs = _cell_range(ln.x - ln.width / 2 - ox - m,
+                     ln.x + ln.width / 2 - ox + m, step)
+    ys = _cell_range(ln.y - ln.height / 2 - oy - m,
+                     ln.y + ln.height / 2 - oy + m, step)
+    anchor = (xs.start, ys.start)
+    size = (len(xs), len(ys))
+    if info.mode == "graph":
+        _fill_box(cells, bb[0] - ox - m, bb[1] - oy - m,
+                  bb[2] - ox + m, bb[3] - oy + m, step)
+        return frozenset(cells), anchor, size
+    for name in comp:
+        ln = lnodes[name]
+        _fill_box(cells, ln.x - ln.width / 2 - ox - m,
+                  ln.y - ln.height / 2 - oy - m,
+                  ln.x + ln.width / 2 - ox + m,
+                  ln.y + ln.height / 2 - oy + m, step)
+    if info.mode == "clust":
+        for members in clusters:
+            lns = [lnodes[n] for n in members]
+            _fill_box(cells,
+                      min(ln.x - ln.width / 2 for ln in lns) - ox - m,
+                      min(ln.y - ln.height / 2 for ln in lns) - oy - m,
+                      max(ln.x + ln.width / 2 for ln in lns) - ox + m,
+                      max(ln.y + ln.height / 2 for ln in lns) - oy + m,
+                      step)
+    else:
+        for t, h in edges:
+            a, b = lnodes[t], lnodes[h]
+            _fill_line(cells, math.floor((a.x - ox) / step),
+                       math.floor((a.y - oy) / step),
+                       math.floor((b.x - ox) / step),
+                       math.floor((b.y - oy) / step))
+    return frozenset(cells), anchor, size
+
+
+def _ring_cell(b: int, k: int, wide: bool) -> tuple[int, int]:
+    """Position ``k`` (``0 <= k < 8 b``) of ring ``b`` in
+    ``placeGraph``'s walk: a wide component's ring starts below the
+    origin, a tall one's to its left."""
+    if wide:
+        if k < b:
+            return k, -b
+        k -= b
+        if k < 2 * b:
+            return b, -b + k
+        k -= 2 * b
+        if k < 2 * b:
+            return b - k, b
+        k -= 2 * b
+        if k < 2 * b:
+            return -b, b - k
+        return -b + k - 2 * b, -b
+    if k < b:
+        return -b, -k
+    k -= b
+    if k < 2 * b:
+        return -b + k, -b
+    k -= 2 * b
+    if k < 2 * b:
+        return b, -b + k
+    k -= 2 * b
+    if k < 2 * b:
+        return b - k, b
+    return -b, b - k + 2 * b
+
+
+class _Candidates:
+    """Spiral positions not yet known to be blocked, in spiral order.
+
+    Positions are generated ring by ring on demand; positions handed
+    out and returned with :meth:`keep` come back from a heap keyed on
+    their spiral rank.
+    """
+
+    def __init__(self, wide: bool):
+        self.wide = wide
+        self.heap: list[tuple[int, int, int]] = []
+        self.ring = 0
+        self.k = 0
+        self.rank = 0
+
+    def pop(self) -> tuple[int, int, int]:
+        if self.heap and self.heap[0][0] < self.rank:
+            return heapq.heappop(self.heap)
+        rank = self.rank
+        if self.ring == 0:
+            x, y = 0, 0
+            self.ring = 1
+        else:
+            x, y = _ring_cell(self.ring, self.k, self.wide)
+            self.k += 1
+            if self.k == 8 * self.ring:
+                self.ring += 1
+                self.k = 0
+        self.rank += 1
+        return rank, x, y
+
+    def keep(self, items: list[tuple[int, int, int]]) -> None:
+        for item in items:
+            heapq.heappush(self.heap, item)
+
+
+# Occupied cells are kept as ints ``x * _KEY + y``.
+_KEY = 1 << 32
+
+
+def poly_places(polys: list[frozenset], anchors: list[tuple[int, int]],
+                probe: tuple[int, int], bbs: list[tuple],
+                fixed: list[bool], margin: float,
+                step: int) -> list[tuple[int, int]]:
+    """``polyRects`` — grid offset of each polyomino.
+
+    Fixed polyominoes keep offset ``(0, 0)``; the rest are placed in
+    decreasing perimeter order at the first spiral position, for the
+    cell ``anchors[i]`` of polyomino ``i``, where it fits.  Every
+    polyomino covers a ``probe``-sized box of cells at its anchor, so
+    a position where that box is occupied is blocked for all later
+    polyominoes too and is never examined again.  A position where
+    only the full polyomino does not fit is examined again for the
+    next smaller perimeter.
+    """
+    occupied: set[int] = set()
+    places: list[tuple[int, int]] = [(0, 0)] * len(polys)
+    for i, cells in enumerate(polys):
+        if fixed[i]:
+            occupied.update(x * _KEY + y for x, y in cells)
+    pw, ph = probe
+    box = [(dx, dy, dx * _KEY + dy) for dx in range(pw) for dy in range(ph)]
+    # Occupied cell that blocked the last probed box: consecutive
+    # spiral positions overlap, so it usually blocks the next one too.
+    bx, by = 0, 0
+    blocked = False
+
+    def perim(i: int) -> int:
+        x0, y0, x1, y1 = bbs[i]
+        return (math.ceil((x1 - x0 + 2 * margin) / step)
+                + math.ceil((y1 - y0 + 2 * margin) / step))
+
+    order = sorted((i for i in range(len(polys)) if not fixed[i]),
+                   key=lambda i: -perim(i))
+    searches = {True: _Candidates(True), False: _Candidates(False)}
+    # Positions that failed a polyomino are set aside until the
+    # perimeter drops: each is retried once per perimeter, not once
+    # per polyomino.
+    parked: list[tuple[_Candidates, list]] = []
+    current = None
+    for i in order:
+        if perim(i) != current:
+            current = perim(i)
+            for search, items in parked:
+                search.keep(items)
+            parked = []
+        ax, ay = anchors[i]
+        keys = [(x - ax) * _KEY + (y - ay) for x, y in polys[i]]
+        x0, y0, x1, y1 = bbs[i]
+        cand = searches[math.ceil(x1 - x0) >= math.ceil(y1 - y0)]
+        passed = []
+        while True:
+            item = cand.pop()
+            _, qx, qy = item
+            if blocked and 0 <= bx - qx < pw and 0 <= by - qy < ph:
+                continue
+            q = qx * _KEY + qy
+            for dx, dy, k in box:
+                if q + k in occupied:
+                    bx, by = qx + dx, qy + dy
+                    blocked = True
+                    break
+            else:
+                blocked = False
+            if blocked:
+                continue
+            for k in keys:
+                if q + k in occupied:
+                    break
+            else:
+                break
+            passed.append(item)
+        if passed:
+            parked.append((cand, passed))
+        places[i] = (qx - ax, qy - ay)
+        occupied.update(q + k for k in keys)
+    return places
+
+
+def array_places(bbs: list[tuple], info: PackInfo,
+                 vals: Optional[list[float]] = None) -> list[tuple]:
+    """``arrayRects`` — translation of each box in a grid layout."""
+    ng = len(bbs)
+    m = info.margin
+    if info.flags & PK_COL_MAJOR:
+        nr = info.sz if info.sz > 0 else math.ceil(math.sqrt(ng))
+        nc = -(-ng // nr)
+    else:
+        nc = info.sz if info.sz > 0 else math.ceil(math.sqrt(ng))
+        nr = -(-ng // nc)
+    sizes = [(x1 - x0 + 2 * m, y1 - y0 + 2 * m) for x0, y0, x1, y1 in bbs]
+    order = list(range(ng))
+    if info.flags & PK_USER_VALS and vals is not None:
+        order.sort(key=lambda i: vals[i])
+    elif not info.flags & PK_INPUT_ORDER:
+        order.sort(key=lambda i: -(sizes[i][0] + sizes[i][1]))
+
+    def cells() -> Iterator[tuple[int, int]]:
+        for k in range(ng):
+            if info.flags & PK_COL_MAJOR:
+                yield k % nr, k // nr
+            else:
+                yield k // nc, k % nc
+
+    widths = [0.0] * (nc + 1)
+    heights = [0.0] * (nr + 1)
+    for i, (r, c) in zip(order, cells()):
+        widths[c] = max(widths[c], sizes[i][0])
+        heights[r] = max(heights[r], sizes[i][1])
+    # Column left edges, and row top edges counted down from the top.
+    xs = [0.0]
+    for wd in widths[:nc]:
+        xs.append(xs[-1] + wd)
+    ys = [sum(heights[:nr])]
+    for ht in heights[:nr]:
+        ys.append(ys[-1] - ht)
+
+    places: list[tuple] = [(0.0, 0.0)] * ng
+    for i, (r, c) in zip(order, cells()):
+        x0, y0, x1, y1 = bbs[i]
+        if info.flags & PK_LEFT_ALIGN:
+            dx = xs[c] + m - x0
+        elif info.flags & PK_RIGHT_ALIGN:
+            dx = xs[c + 1] - m - x1
+        else:
+            dx = (xs[c] + xs[c + 1] - x0 - x1) / 2
+        if info.flags & PK_TOP_ALIGN:
+            dy = ys[r] - m - y1
+        elif info.flags & PK_BOT_ALIGN:
+            dy = ys[r + 1] + m - y0
+        else:
+            dy = (ys[r] + ys[r + 1] - y0 - y1) / 2
+        places[i] = (dx, dy)
+    return places
+
+
+# ── Entry point ──────────────────────────────
+
+
+def pack_components(layout, components: list[set[str]],
+                    info: PackInfo) -> None:
+    """``packGraphs`` — translate each component's nodes in
+    ``layout.lnodes`` to its packed position.
+
+    Components containing a pinned node stay where they are and the
+    others are packed around them.
+    """
+    lnodes = layout.lnodes
+    comps = [[n for n in comp if n in lnodes] for comp in components]
+    comps = [c for c in comps if c]
+    if len(comps) < 2:
+        return
+    bbs = []
+    for comp in comps:
+        lns = [lnodes[n] for n in comp]
+        bbs.append((min(ln.x - ln.width / 2 for ln in lns),
+                    min(ln.y - ln.height / 2 for ln in lns),
+                    max(ln.x + ln.width / 2 for ln in lns),
+                    max(ln.y + ln.height / 2 for ln in lns)))
+
+    if info.mode == "array":
+        vals = None
+        if info.flags & PK_USER_VALS:
+            vals = [min((_sortv(layout, n) for n in comp), default=0.0)
+                    for comp in comps]
+        moves = array_places(bbs, info, vals)
+    else:
+        owner = {n: i for i, comp in enumerate(comps) for n in comp}
+        edges: list[list[tuple[str, str]]] = [[] for _ in comps]
+        clusters: list[list[list[str]]] = [[] for _ in comps]
+        graph = getattr(layout, "graph", None)
+        if info.mode == "node" and graph is not None:
+            for e in graph.edges.values():
+                i = owner.get(e.tail.name)
+                if i is not None and owner.get(e.head.name) == i:
+                    edges[i].append((e.tail.name, e.head.name))
+        elif info.mode == "clust" and graph is not None:
+            for cl in _top_clusters(graph):
+                parts: dict[int, list[str]] = {}
+                for n in cl.nodes:
+                    if n in owner:
+                        parts.setdefault(owner[n], []).append(n)
+                for i, members in parts.items():
+                    clusters[i].append(members)
+        fixed = [any(getattr(lnodes[n], "pinned", False) for n in comp)
+                 for comp in comps]
+        step = compute_step(bbs, info.margin)
+        polys = [_polyomino(layout, comp, edges[i], clusters[i], bbs[i],
+                            info, step,
+                            (0.0, 0.0) if fixed[i] else bbs[i][:2])
+                 for i, comp in enumerate(comps)]
+        free = [size for (_, _, size), f in zip(polys, fixed) if not f]
+        probe = (min((w for w, _ in free), default=1),
+                 min((h for _, h in free), default=1))
+        places = poly_places([p[0] for p in polys], [p[1] for p in polys],
+                             probe, bbs, fixed, info.margin, step)
+        moves = [(0.0, 0.0) if fixed[i]
+                 else (step * x - bbs[i][0], step * y - bbs[i][1])
+                 for i, (x, y) in enumerate(places)]
+
+    for comp, (dx, dy) in zip(comps, moves):
+        for n in comp:
+            ln = lnodes[n]
+            ln.x += dx
+            ln.y += dy
+
+
+def _sortv(layout, name: str) -> float:
+    node = getattr(layout.lnodes[name], "node", None)
+    try:
+        return float(node.attributes.get("sortv", "0")) if node else 0.0
+    except ValueError:
+        return 0.0
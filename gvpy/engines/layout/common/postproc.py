@@ -3,7 +3,7 @@
 See: /lib/common/postproc.c
 
 Normalize / rotate / center of final coordinates; connected-component
-detection + left-to-right packing.  These are engine-agnostic: any
+detection + packing (:mod:`common.pack`).  These are engine-agnostic: any
 `LayoutEngine` subclass can call into them once per-node ``(x, y,
 width, height, pinned)`` fields are populated.
 
@@ -91,15 +91,18 @@ def find_components(adj: dict[str, list[str]]) -> list[set[str]]:
 
 def pack_components_lr(layout, components: list[set[str]],
                        gap: float = 36.0) -> None:
-    """Pack multiple laid-out components left-to-right."""
-    x_offset = 0.0
-    for comp in components:
-        comp_lns = [layout.lnodes[n] for n in comp if n in layout.lnodes]
-        if not comp_lns:
-            continue
-        min_x = min(ln.x - ln.width / 2 for ln in comp_lns)
-        max_x = max(ln.x + ln.width / 2 for ln in comp_lns)
-        dx = x_offset - min_x
-        for ln in comp_lns:
-            ln.x += dx
-        x_offset += (max_x - min_x) + gap
+    """Pack multiple laid-out components.
+
+    Follows the graph's ``pack`` / ``packmode`` attributes through
+    :func:`common.pack.pack_components`; ``gap`` is the default
+    separation between components (a margin of ``gap / 2`` around
+    each) when ``pack`` gives no margin.
+    """
+    from gvpy.engines.layout.common import pack
+
+    graph = getattr(layout, "graph", None)
+    if graph is not None:
+        info = pack.get_pack_info(graph, default_margin=gap / 2)
+    else:
+        info = pack.PackInfo(margin=gap / 2)
+    pack.pack_components(layout, components, info)
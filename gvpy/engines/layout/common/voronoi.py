@@ -41,6 +41,10 @@ from typing import Any
 
 import numpy as np
 
+from gvpy.engines.layout.common.overlap_index import (
+    any_overlap,
+    overlapping_pairs,
+)
 
 
 # Mirrors ``incr`` (adjust.c:46) — used to pad the bounding box
@@ -161,23 +165,30 @@ def _rm_equality(layout: Any, names: list[str]) -> int:
     return nudged
 
 
+def _boxes_at(layout: Any, names: list[str],
+              positions: dict[str, tuple[float, float]] | None = None
+              ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Box arrays ``(x, y, hw, hh)`` for ``names``, half extents
+    inflated by ``layout.sep / 2``.  ``positions`` overrides the
+    node centres when given."""
+    lns = [layout.lnodes[n] for n in names]
+    if positions is None:
+        x = np.array([ln.x for ln in lns], dtype=np.float64)
+        y = np.array([ln.y for ln in lns], dtype=np.float64)
+    else:
+        x = np.array([positions[n][0] for n in names], dtype=np.float64)
+        y = np.array([positions[n][1] for n in names], dtype=np.float64)
+    half_sep = layout.sep / 2
+    hw = np.array([ln.width / 2 for ln in lns], dtype=np.float64) + half_sep
+    hh = np.array([ln.height / 2 for ln in lns], dtype=np.float64) + half_sep
+    return x, y, hw, hh
+
+
 def _has_overlap_at(layout: Any, positions: dict[str, tuple[float, float]]) -> bool:
     """Pairwise overlap test using a position override map (used to
     test moves before committing them)."""
     names = list(positions.keys())
-    sep = layout.sep
-    for i in range(len(names)):
-        a = layout.lnodes[names[i]]
-        ax, ay = positions[names[i]]
-        ah_w, ah_h = a.width / 2, a.height / 2
-        for j in range(i + 1, len(names)):
-            b = layout.lnodes[names[j]]
-            bx, by = positions[names[j]]
-            bh_w, bh_h = b.width / 2, b.height / 2
-            if (abs(ax - bx) < ah_w + bh_w + sep
-                    and abs(ay - by) < ah_h + bh_h + sep):
-                return True
-    return False
+    return any_overlap(*_boxes_at(layout, names, positions))
 
 
 def voronoi_adjust(layout: Any,
@@ -217,20 +228,9 @@ def voronoi_adjust(layout: Any,
 
     def _overlap_pair_count() -> tuple[int, set[str]]:
         """Return (pair count, set of overlapping node names)."""
-        cnt = 0
-        offenders: set[str] = set()
-        sep = layout.sep
-        for i in range(len(names)):
-            a = layout.lnodes[names[i]]
-            for j in range(i + 1, len(names)):
-                b = layout.lnodes[names[j]]
-                if (abs(a.x - b.x) < a.width / 2 + b.width / 2 + sep
-                        and abs(a.y - b.y)
-                        < a.height / 2 + b.height / 2 + sep):
-                    cnt += 1
-                    offenders.add(names[i])
-                    offenders.add(names[j])
-        return cnt, offenders
+        ia, ib = overlapping_pairs(*_boxes_at(layout, names))
+        offenders = {names[k] for k in np.union1d(ia, ib).tolist()}
+        return len(ia), offenders
 
     iters = 0
     pad_factor = 1.1
@@ -0,0 +1,625 @@
+"""Variable Placement with Separation Constraints (VPSC).
+
+Mirrors Graphviz ``lib/vpsc/`` (``solve_VPSC.cpp``, ``block.cpp``,
+``blocks.cpp``, ``generate-constraints.cpp``,
+``remove_rectangle_overlap.cpp``), the solver behind
+``overlap=vpsc`` and the orthogonal ``overlap=ortho*`` modes.
+
+Problem
+-------
+Given variables ``v_i`` with desired positions ``d_i`` and weights
+``w_i`` and separation constraints ``v_l + gap <= v_r``, minimise
+
+    sum_i w_i (v_i - d_i)^2
+
+The solver is the block-merging active-set method of Dwyer,
+Marriott & Stuckey, "Fast Node Overlap Removal" (GD 2005):
+
+- **satisfy** — visit variables in a total order of the constraint
+  DAG; merge each block with the block on the far side of its most
+  violated incoming constraint until none is violated.  A block is
+  a set of variables joined by active (tight) constraints; it sits
+  at the weighted mean of its members' desired positions.
+- **refine** — compute Lagrange multipliers over each block's tree
+  of active constraints and split on any negative multiplier, then
+  re-merge left / right.  Stops when every multiplier is
+  non-negative, which (with feasibility) is the KKT optimum.
+
+Block constraint heaps are persistent and lazily re-keyed: a popped
+entry whose key no longer matches the current block positions is
+pushed back with its fresh key, and constraints that became
+internal to a block are dropped.
+
+Constraint generation (:func:`generate_x_constraints`,
+:func:`generate_y_constraints`) is the O(n log n) sweep of
+``generate-constraints.cpp``: open / close events along one axis,
+with a scanline of open rectangles ordered by centre on the other.
+
+Trace tag: ``[TRACE vpsc]``.
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import sys
+from bisect import bisect_left, insort
+from collections import deque
+from itertools import count
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+# Mirrors ``EXTRA_GAP`` (remove_rectangle_overlap.cpp:26) — keeps
+# boxes from ending up exactly touching after rounding.
+EXTRA_GAP = 0.0001
+# Mirrors the ``-0.0000001`` feasibility tolerance in solve_VPSC.cpp.
+_SLACK_EPS = 1e-7
+# Mirrors ``maxtries`` in ``VPSC::refine``.
+_MAX_REFINE = 100
+# Rounds of ``Solver._repair`` (one normally suffices).
+_MAX_REPAIR = 4
+
+_tiebreak = count()
+
+
+def _trace(msg: str) -> None:
+    """Emit a ``[TRACE vpsc]`` line on stderr if tracing is enabled
+    (``GVPY_TRACE_NEATO=1``)."""
+    if os.environ.get("GVPY_TRACE_NEATO", "") == "1":
+        print(f"[TRACE vpsc] {msg}", file=sys.stderr)
+
+
+class Variable:
+    """One solver variable.  Mirrors ``vpsc::Variable``."""
+
+    __slots__ = ("id", "desired", "weight", "offset", "block",
+                 "in_cs", "out_cs")
+
+    def __init__(self, vid: int, desired: float, weight: float = 1.0):
+        self.id = vid
+        self.desired = desired
+        self.weight = weight
+        self.offset = 0.0
+        self.block: Optional[Block] = None
+        self.in_cs: list[Constraint] = []
+        self.out_cs: list[Constraint] = []
+
+    @property
+    def position(self) -> float:
+        return self.block.posn + self.offset
+
+
+class Constraint:
+    """``left + gap <= right``.  Mirrors ``vpsc::Constraint``."""
+
+    __slots__ = ("left", "right", "gap", "lm", "active")
+
+    def __init__(self, left: Variable, right: Variable, gap: float):
+        self.left = left
+        self.right = right
+        self.gap = gap
+        self.lm = 0.0
+        self.active = False
+        left.out_cs.append(self)
+        right.in_cs.append(self)
+
+    def slack(self) -> float:
+        return self.right.position - self.gap - self.left.position
+
+
+class Block:
+    """Variables joined by active constraints.  Mirrors
+    ``vpsc::Block``."""
+
+    __slots__ = ("vars", "posn", "weight", "wposn", "deleted",
+                 "in_heap", "out_heap")
+
+    def __init__(self, v: Optional[Variable] = None):
+        self.vars: list[Variable] = []
+        self.posn = 0.0
+        self.weight = 0.0
+        self.wposn = 0.0
+        self.deleted = False
+        self.in_heap: Optional[list] = None
+        self.out_heap: Optional[list] = None
+        if v is not None:
+            v.offset = 0.0
+            self.add_variable(v)
+
+    def add_variable(self, v: Variable) -> None:
+        v.block = self
+        self.vars.append(v)
+        self.weight += v.weight
+        self.wposn += v.weight * (v.desired - v.offset)
+        self.posn = self.wposn / self.weight
+
+    def merge(self, b: "Block", c: Constraint, dist: float) -> None:
+        """Absorb ``b`` with its variables shifted by ``dist``."""
+        c.active = True
+        self.wposn += b.wposn - dist * b.weight
+        self.weight += b.weight
+        self.posn = self.wposn / self.weight
+        for v in b.vars:
+            v.block = self
+            v.offset += dist
+            self.vars.append(v)
+        b.deleted = True
+
+    # ── Constraint heaps ─────────────────────────
+    #
+    # In-heap entries are keyed by ``-k`` with
+    # ``k = left.position + gap - right.offset``; the slack of the
+    # entry is ``self.posn - k`` so the heap top is the most
+    # violated incoming constraint.  Out-heap entries are keyed by
+    # ``right.position - gap - left.offset`` (slack ``key - posn``).
+
+    @staticmethod
+    def _in_key(c: Constraint) -> float:
+        return -(c.left.position + c.gap - c.right.offset)
+
+    @staticmethod
+    def _out_key(c: Constraint) -> float:
+        return c.right.position - c.gap - c.left.offset
+
+    def setup_in(self) -> None:
+        heap = [(self._in_key(c), next(_tiebreak), c)
+                for v in self.vars for c in v.in_cs
+                if c.left.block is not self]
+        heapq.heapify(heap)
+        self.in_heap = heap
+
+    def setup_out(self) -> None:
+        heap = [(self._out_key(c), next(_tiebreak), c)
+                for v in self.vars for c in v.out_cs
+                if c.right.block is not self]
+        heapq.heapify(heap)
+        self.out_heap = heap
+
+    def _find_min(self, heap: list, key_fn, internal) -> Optional[Constraint]:
+        while heap:
+            key, _t, c = heap[0]
+            if internal(c):
+                heapq.heappop(heap)
+                continue
+            fresh = key_fn(c)
+            if fresh != key:
+                heapq.heapreplace(heap, (fresh, next(_tiebreak), c))
+                continue
+            return c
+        return None
+
+    def find_min_in(self) -> Optional[Constraint]:
+        return self._find_min(self.in_heap, self._in_key,
+                              lambda c: c.left.block is self)
+
+    def find_min_out(self) -> Optional[Constraint]:
+        return self._find_min(self.out_heap, self._out_key,
+                              lambda c: c.right.block is self)
+
+    def merge_heap(self, mine: list, other: Optional[list],
+                   key_fn) -> None:
+        """Fold ``other``'s entries into ``mine`` with fresh keys."""
+        if not other:
+            return
+        for _key, _t, c in other:
+            heapq.heappush(mine, (key_fn(c), next(_tiebreak), c))
+
+    # ── Lagrange multipliers / splitting ─────────
+
+    def find_min_lm(self) -> Optional[Constraint]:
+        """Compute multipliers on the active-constraint tree and
+        return the constraint with the smallest one.  Mirrors
+        ``Block::findMinLM`` / ``compute_dfdv`` (iterative)."""
+        root = self.vars[0]
+        # (var, parent var, via constraint, via is out-constraint)
+        order: list[tuple[Variable, Optional[Variable],
+                          Optional[Constraint], bool]] = []
+        stack = [(root, None, None, False)]
+        while stack:
+            v, u, via, is_out = stack.pop()
+            order.append((v, u, via, is_out))
+            for c in v.out_cs:
+                if c.active and c.right.block is self and c.right is not u:
+                    stack.append((c.right, v, c, True))
+            for c in v.in_cs:
+                if c.active and c.left.block is self and c.left is not u:
+                    stack.append((c.left, v, c, False))
+        dfdv: dict[int, float] = {}
+        min_lm: Optional[Constraint] = None
+        for v, _u, _via, _o in order:
+            dfdv[id(v)] = v.weight * (v.position - v.desired)
+        for v, u, via, is_out in reversed(order):
+            if via is None:
+                continue
+            d = dfdv[id(v)]
+            if is_out:
+                via.lm = d
+                dfdv[id(u)] += d
+            else:
+                via.lm = -d
+                dfdv[id(u)] -= via.lm
+            if min_lm is None or via.lm < min_lm.lm:
+                min_lm = via
+        return min_lm
+
+    def _populate_split(self, v: Variable, u: Variable,
+                        old: "Block") -> None:
+        queue = deque([(v, u)])
+        while queue:
+            v, u = queue.popleft()
+            self.add_variable(v)
+            for c in v.in_cs:
+                if c.active and c.left.block is old and c.left is not u:
+                    queue.append((c.left, v))
+            for c in v.out_cs:
+                if c.active and c.right.block is old and c.right is not u:
+                    queue.append((c.right, v))
+
+    def split(self, c: Constraint) -> tuple["Block", "Block"]:
+        """Split on active constraint ``c``.  Mirrors
+        ``Block::split``."""
+        c.active = False
+        left = Block()
+        left._populate_split(c.left, c.right, self)
+        right = Block()
+        right._populate_split(c.right, c.left, self)
+        self.deleted = True
+        return left, right
+
+
+class Solver:
+    """VPSC solver.  Mirrors ``vpsc::VPSC`` (``solve_VPSC.cpp``)."""
+
+    def __init__(self, variables: Sequence[Variable],
+                 constraints: Sequence[Constraint]):
+        self.vs = list(variables)
+        self.cs = list(constraints)
+        self.blocks: list[Block] = [Block(v) for v in self.vs]
+        self._rank: Optional[dict[int, int]] = None
+
+    # ── Blocks helpers (blocks.cpp) ──────────────
+
+    def _total_order(self) -> list[Variable]:
+        """Kahn topological order of the constraint DAG."""
+        indeg = {id(v): len(v.in_cs) for v in self.vs}
+        queue = deque(v for v in self.vs if indeg[id(v)] == 0)
+        order: list[Variable] = []
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for c in v.out_cs:
+                r = c.right
+                indeg[id(r)] -= 1
+                if indeg[id(r)] == 0:
+                    queue.append(r)
+        if len(order) != len(self.vs):
+            raise ValueError("vpsc: constraint graph has a cycle")
+        return order
+
+    @staticmethod
+    def _merge_across(c: Constraint) -> tuple[Block, Block]:
+        """Merge the blocks on either side of ``c`` with ``c`` tight,
+        folding the smaller block into the larger.  Returns
+        ``(survivor, absorbed)``."""
+        lb = c.left.block
+        rb = c.right.block
+        if len(lb.vars) >= len(rb.vars):
+            lb.merge(rb, c, c.left.offset + c.gap - c.right.offset)
+            return lb, rb
+        rb.merge(lb, c, c.right.offset - c.gap - c.left.offset)
+        return rb, lb
+
+    def merge_left(self, r: Block) -> Block:
+        """Mirrors ``Blocks::mergeLeft``: merge ``r`` with the blocks
+        across its violated incoming constraints, most violated
+        first.  Returns the surviving block."""
+        if r.in_heap is None:
+            r.setup_in()
+        c = r.find_min_in()
+        while c is not None and c.slack() < 0:
+            heapq.heappop(r.in_heap)
+            other = c.left.block
+            if other.in_heap is None:
+                other.setup_in()
+            survivor, absorbed = self._merge_across(c)
+            if survivor is not r:
+                survivor.merge_heap(survivor.in_heap, r.in_heap,
+                                    Block._in_key)
+            else:
+                survivor.merge_heap(survivor.in_heap, absorbed.in_heap,
+                                    Block._in_key)
+            survivor.out_heap = None
+            r = survivor
+            c = r.find_min_in()
+        return r
+
+    def merge_right(self, lft: Block) -> Block:
+        """Mirrors ``Blocks::mergeRight``: the mirror image of
+        :meth:`merge_left` over outgoing constraints."""
+        if lft.out_heap is None:
+            lft.setup_out()
+        c = lft.find_min_out()
+        while c is not None and c.slack() < 0:
+            heapq.heappop(lft.out_heap)
+            other = c.right.block
+            if other.out_heap is None:
+                other.setup_out()
+            survivor, absorbed = self._merge_across(c)
+            if survivor is not lft:
+                survivor.merge_heap(survivor.out_heap, lft.out_heap,
+                                    Block._out_key)
+            else:
+                survivor.merge_heap(survivor.out_heap, absorbed.out_heap,
+                                    Block._out_key)
+            survivor.in_heap = None
+            lft = survivor
+            c = lft.find_min_out()
+        return lft
+
+    def _cleanup(self) -> None:
+        self.blocks = [b for b in self.blocks if not b.deleted]
+
+    # ── Solve ────────────────────────────────────
+
+    def satisfy(self) -> None:
+        """Mirrors ``VPSC::satisfy``."""
+        order = self._total_order()
+        self._rank = {id(v): i for i, v in enumerate(order)}
+        for v in order:
+            if not v.block.deleted:
+                self.merge_left(v.block)
+        self._cleanup()
+        self._repair()
+
+    def _repair(self) -> int:
+        """Merge across any constraint still violated after lazy
+        heap ordering let it slip through; return the number of
+        rounds that found one.
+
+        Deviation: ``VPSC::satisfy`` throws on an unsatisfied
+        constraint instead.  A round scans the constraints once and,
+        like :meth:`satisfy`, merges the right block of each violated
+        one leftwards with a fresh heap, in total order, so one round
+        normally clears them.  At most ``_MAX_REPAIR`` rounds run,
+        keeping the pass O(|C|) plus its merges; anything left is
+        traced.
+        """
+        if self._rank is None:
+            self._rank = {id(v): i
+                          for i, v in enumerate(self._total_order())}
+        for rounds in range(_MAX_REPAIR):
+            bad = [c for c in self.cs if c.slack() < -_SLACK_EPS]
+            if not bad:
+                return rounds
+            bad.sort(key=lambda c: self._rank[id(c.right)])
+            for c in bad:
+                if c.slack() < -_SLACK_EPS:
+                    b = c.right.block
+                    b.in_heap = None
+                    self.merge_left(b)
+            self._cleanup()
+        bad = sum(c.slack() < -_SLACK_EPS for c in self.cs)
+        if bad:
+            _trace(f"repair: {bad} constraints still violated "
+                   f"after {_MAX_REPAIR} rounds")
+        return _MAX_REPAIR
+
+    def refine(self) -> None:
+        """Mirrors ``VPSC::refine``: split blocks on negative
+        Lagrange multipliers until none remain.  Blocks created by a
+        split are appended and checked later in the same pass."""
+        for _ in range(_MAX_REFINE):
+            split_done = False
+            k = 0
+            while k < len(self.blocks):
+                b = self.blocks[k]
+                k += 1
+                if b.deleted or len(b.vars) < 2:
+                    continue
+                c = b.find_min_lm()
+                if c is not None and c.lm < -_SLACK_EPS:
+                    self._split(b, c)
+                    split_done = True
+            self._cleanup()
+            if not split_done:
+                break
+        self._repair()
+
+    def _split(self, b: Block, c: Constraint) -> None:
+        """Mirrors ``Blocks::split``."""
+        left, right = b.split(c)
+        right.posn = b.posn
+        right.wposn = right.posn * right.weight
+        self.blocks.extend((left, right))
+        self.merge_left(left)
+        right = c.right.block
+        right.wposn = sum(v.weight * (v.desired - v.offset)
+                          for v in right.vars)
+        right.posn = right.wposn / right.weight
+        self.merge_right(right)
+
+    def solve(self) -> list[float]:
+        """Solve and return the variable positions."""
+        self.satisfy()
+        self.refine()
+        return [v.position for v in self.vs]
+
+
+def solve_vpsc(desired: Sequence[float], weights: Sequence[float],
+               constraints: Sequence[tuple[int, int, float]]
+               ) -> np.ndarray:
+    """Solve one VPSC instance.
+
+    ``constraints`` holds ``(left, right, gap)`` index triples
+    meaning ``x[left] + gap <= x[right]``.  Returns the optimal
+    positions as a float array.
+    """
+    vs = [Variable(i, float(d), float(w))
+          for i, (d, w) in enumerate(zip(desired, weights))]
+    cs = [Constraint(vs[lft], vs[rgt], float(gap))
+          for lft, rgt, gap in constraints]
+    if not cs:
+        return np.asarray(desired, dtype=np.float64).copy()
+    return np.array(Solver(vs, cs).solve(), dtype=np.float64)
+
+
+# ── Constraint generation (generate-constraints.cpp) ─────────────
+
+
+def _overlap_1d(ca: float, ha: float, cb: float, hb: float) -> float:
+    """Mirrors ``Rectangle::overlapX`` along one axis."""
+    if ca <= cb and cb - hb < ca + ha:
+        return ca + ha - (cb - hb)
+    if cb <= ca and ca - ha < cb + hb:
+        return cb + hb - (ca - ha)
+    return 0.0
+
+
+def _events(lo: np.ndarray, hi: np.ndarray) -> list[tuple[float, int, int]]:
+    """Open / close events sorted by position.  At equal positions
+    closes come first (touching boxes need no constraint), except a
+    zero-extent box's own close, which stays after its open."""
+    ev: list[tuple[float, int, int]] = []
+    for i in range(len(lo)):
+        ev.append((float(lo[i]), 1, i))
+        ev.append((float(hi[i]), 0 if hi[i] > lo[i] else 2, i))
+    ev.sort()
+    return ev
+
+
+def _scan_adjacent(c: np.ndarray, h: np.ndarray, pc: np.ndarray,
+                   ph: np.ndarray) -> list[tuple[int, int, float]]:
+    """Constraints between scanline neighbours along axis ``c``.
+
+    Sweeps the perpendicular axis (centres ``pc``, half extents
+    ``ph``); every pair that is ever adjacent in the scanline
+    ordered by ``c`` gets ``c[l] + h[l] + h[r] <= c[r]``.  Mirrors
+    ``generateYConstraints`` (and ``generateXConstraints`` with
+    ``useNeighbourLists=false``).
+    """
+    n = len(c)
+    above: list[int] = [-1] * n
+    below: list[int] = [-1] * n
+    scan: list[tuple[float, int]] = []
+    out: list[tuple[int, int, float]] = []
+    for _pos, kind, v in _events(pc - ph, pc + ph):
+        key = (float(c[v]), v)
+        if kind == 1:
+            insort(scan, key)
+            k = bisect_left(scan, key)
+            if k > 0:
+                u = scan[k - 1][1]
+                above[v] = u
+                below[u] = v
+            if k + 1 < len(scan):
+                u = scan[k + 1][1]
+                below[v] = u
+                above[u] = v
+        else:
+            lft, rgt = above[v], below[v]
+            if lft >= 0:
+                out.append((lft, v, float(h[lft] + h[v])))
+                below[lft] = rgt
+            if rgt >= 0:
+                out.append((v, rgt, float(h[v] + h[rgt])))
+                above[rgt] = lft
+            del scan[bisect_left(scan, key)]
+    return out
+
+
+def _scan_neighbours(c: np.ndarray, h: np.ndarray, pc: np.ndarray,
+                     ph: np.ndarray) -> list[tuple[int, int, float]]:
+    """``generateXConstraints`` with ``useNeighbourLists=true``.
+
+    On open, each new box collects left / right neighbours in the
+    scanline: boxes it overlaps more cheaply along ``c`` than along
+    the perpendicular axis, plus the first box it does not overlap
+    along ``c`` (which ends the walk).  Constraints are emitted on
+    close.
+    """
+    n = len(c)
+    left_nb: list[set[int]] = [set() for _ in range(n)]
+    right_nb: list[set[int]] = [set() for _ in range(n)]
+    scan: list[tuple[float, int]] = []
+    out: list[tuple[int, int, float]] = []
+    for _pos, kind, v in _events(pc - ph, pc + ph):
+        key = (float(c[v]), v)
+        if kind == 1:
+            insort(scan, key)
+            k = bisect_left(scan, key)
+            for rng in (range(k - 1, -1, -1), range(k + 1, len(scan))):
+                for j in rng:
+                    u = scan[j][1]
+                    ox = _overlap_1d(c[u], h[u], c[v], h[v])
+                    if ox <= 0:
+                        (left_nb if j < k else right_nb)[v].add(u)
+                        break
+                    if ox <= _overlap_1d(pc[u], ph[u], pc[v], ph[v]):
+                        (left_nb if j < k else right_nb)[v].add(u)
+            for u in left_nb[v]:
+                right_nb[u].add(v)
+            for u in right_nb[v]:
+                left_nb[u].add(v)
+        else:
+            for u in left_nb[v]:
+                out.append((u, v, float(h[u] + h[v])))
+                right_nb[u].discard(v)
+            for u in right_nb[v]:
+                out.append((v, u, float(h[v] + h[u])))
+                left_nb[u].discard(v)
+            del scan[bisect_left(scan, key)]
+    return out
+
+
+def generate_x_constraints(x: np.ndarray, y: np.ndarray,
+                           hw: np.ndarray, hh: np.ndarray,
+                           use_neighbour_lists: bool = True
+                           ) -> list[tuple[int, int, float]]:
+    """Horizontal separation constraints for boxes centred at
+    ``(x, y)`` with half extents ``(hw, hh)``."""
+    if use_neighbour_lists:
+        return _scan_neighbours(x, hw, y, hh)
+    return _scan_adjacent(x, hw, y, hh)
+
+
+def generate_y_constraints(x: np.ndarray, y: np.ndarray,
+                           hw: np.ndarray, hh: np.ndarray
+                           ) -> list[tuple[int, int, float]]:
+    """Vertical separation constraints (``generateYConstraints``)."""
+    return _scan_adjacent(y, hh, x, hw)
+
+
+def remove_rectangle_overlap(x: np.ndarray, y: np.ndarray,
+                             hw: np.ndarray, hh: np.ndarray,
+                             weights: Optional[np.ndarray] = None
+                             ) -> tuple[np.ndarray, np.ndarray]:
+    """Move box centres the least (weighted squared distance) so no
+    two boxes overlap.
+
+    Mirrors ``removeRectangleOverlap``: an x pass with neighbour
+    lists, a y pass on the moved boxes, then a final x pass from the
+    original x positions with only the constraints the y pass left
+    necessary.  ``hw`` / ``hh`` should already include any
+    separation margin.
+    """
+    n = len(x)
+    if weights is None:
+        weights = np.ones(n)
+    x0 = np.asarray(x, dtype=np.float64)
+    y0 = np.asarray(y, dtype=np.float64)
+    hw = np.asarray(hw, dtype=np.float64)
+    hh = np.asarray(hh, dtype=np.float64)
+
+    cs = generate_x_constraints(x0, y0, hw + EXTRA_GAP, hh + EXTRA_GAP)
+    x1 = solve_vpsc(x0, weights, cs)
+    cs = generate_y_constraints(x1, y0, hw, hh + EXTRA_GAP)
+    y1 = solve_vpsc(y0, weights, cs)
+    # Unlike the C code the final pass keeps ``EXTRA_GAP`` on x, so
+    # float rounding cannot leave two boxes overlapping by an ulp
+    # under the strict ``<`` overlap test.
+    cs = generate_x_constraints(x0, y1, hw + EXTRA_GAP, hh,
+                                use_neighbour_lists=False)
+    x2 = solve_vpsc(x0, weights, cs)
+    _trace(f"remove_rectangle_overlap n={n}")
+    return x2, y1
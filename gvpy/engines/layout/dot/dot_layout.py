@@ -489,6 +489,10 @@ class DotGraphInfo(LayoutEngine):
         # every spline router helper.  None outside that pass.
         from gvpy.engines.layout.dot.path import SplineInfo
         self._spline_info: "SplineInfo | None" = None
+        # Per-node in/out edge index for phase 4 — built after phase 3
+        # by ``_rebuild_edge_index``; rebuilt on demand if the edge
+        # lists change.  See :class:`dotsplines.EdgeIndex`.
+        self._edge_index_cache: "dotsplines.EdgeIndex | None" = None
         # Mincross caches — populated lazily by mincross.cluster_medians
         # and mincross.mark_low_clusters.  Pre-declared so PyCharm /
         # mypy see them as proper instance attributes.
@@ -557,6 +561,7 @@ class DotGraphInfo(LayoutEngine):
         # later only transform positions, not structure).  Cache the
         # non-virtual views so downstream helpers reuse them.
         self._rebuild_output_views()
+        self._rebuild_edge_index()
         self._apply_fixed_positions()
         self._apply_size()
         self._compute_cluster_boxes()
@@ -1651,6 +1656,17 @@ class DotGraphInfo(LayoutEngine):
             le for le in self.ledges if not le.virtual
         ] + self._chain_edges
 
+    def _rebuild_edge_index(self):
+        """Rebuild the per-node in/out edge index used by phase 4.
+
+        See: ``ND_in`` / ``ND_out`` in ``lib/common/types.h``.  Call
+        once after phase 3; phase-4 neighbour lookups
+        (``make_regular_edge``, ``neighbor``, ``pathscross``,
+        ``maximal_bbox``, ``edgecmp``) then read per-node lists
+        instead of filtering ``ledges`` + ``_chain_edges`` per call.
+        """
+        self._edge_index_cache = dotsplines.EdgeIndex(self)
+
     def _apply_size(self):
         """Compute the viewport zoom factor for ``size="W,H"`` if set.
 
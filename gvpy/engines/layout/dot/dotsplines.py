@@ -277,6 +277,59 @@ def phase4_routing(layout):
         _phase4_from_tb(layout, _rankdir_state)
 
 
+def spline_workers() -> int:
+    """Worker-process count for phase-4 routing, from
+    ``GVPY_SPLINE_WORKERS`` (default 1 — serial)."""
+    try:
+        return max(1, int(os.environ.get("GVPY_SPLINE_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def route_edge(layout, le: LayoutEdge, is_chain: bool, P, et: int,
+               ortho_routes: dict) -> None:
+    """Route one edge and place its label — the per-edge body of the
+    :func:`phase4_routing` dispatch loop.
+
+    ``is_chain`` selects the chain-edge dispatch (``layout._chain_edges``
+    members are routed through their virtual nodes and are never
+    self or flat edges).  Writes only ``le.route`` and, through
+    ``recover_slack``, the geometry of the edge's own virtual chain.
+    """
+    from gvpy.engines.layout.dot.regular_edge import make_regular_edge
+    from gvpy.engines.layout.dot.flat_edge import make_flat_edge
+    from gvpy.engines.layout.dot.self_edge import make_self_edge
+    from gvpy.engines.layout.dot.straight_edge import make_straight_edges
+    from gvpy.engines.layout.dot.path import EDGETYPE_LINE, EDGETYPE_CURVED
+
+    tail = layout.lnodes.get(le.tail_name)
+    head = layout.lnodes.get(le.head_name)
+    if tail is None or head is None:
+        return
+    if is_chain:
+        if et in (EDGETYPE_LINE, EDGETYPE_CURVED):
+            make_straight_edges(layout, [le], et)
+        elif layout.splines == "ortho":
+            pts = ortho_routes.get(id(le))
+            le.points = (pts if pts is not None
+                         else layout._ortho_route(le, tail, head))
+        else:
+            make_regular_edge(layout, layout._spline_info, P, [le], et)
+    elif le.tail_name == le.head_name:
+        make_self_edge(layout, le, tail)
+    elif tail.rank == head.rank and not le.virtual:
+        make_flat_edge(layout, layout._spline_info, P, [le], et)
+    elif layout.splines == "ortho":
+        pts = ortho_routes.get(id(le))
+        le.points = (pts if pts is not None
+                     else layout._ortho_route(le, tail, head))
+    elif et in (EDGETYPE_LINE, EDGETYPE_CURVED):
+        make_straight_edges(layout, [le], et)
+    else:
+        make_regular_edge(layout, layout._spline_info, P, [le], et)
+    layout._compute_label_pos(le)
+
+
 def _phase4_routing_body(layout):
     """Phase-4 body — always runs in TB frame (see :func:`phase4_routing`)."""
     # Pre-compute rank bounding info for obstacle-aware routing.
@@ -355,7 +408,6 @@ def _phase4_routing_body(layout):
     # with no hint (matching C's setflags calls at dotsplines.c:298,
     # 303, 316).
     import functools as _ft
-    layout._edge_seq_cache = None
     real_edges = [le for le in layout.ledges if not le.virtual]
     for le in real_edges:
         setflags(layout, le, 0, 0, 64)  # MAINGRAPH=64, auto-detect type/dir
@@ -411,11 +463,8 @@ def _phase4_routing_body(layout):
 
     # Route real edges in edgecmp-sorted order (Phase A step 6).
     # See: /lib/dotgen/dotsplines.c @ 344
-    from gvpy.engines.layout.dot.regular_edge import make_regular_edge
     from gvpy.engines.layout.dot.flat_edge import make_flat_edge
-    from gvpy.engines.layout.dot.self_edge import make_self_edge
-    from gvpy.engines.layout.dot.straight_edge import make_straight_edges
-    from gvpy.engines.layout.dot.path import Path, EDGETYPE_SPLINE, EDGETYPE_LINE, EDGETYPE_CURVED
+    from gvpy.engines.layout.dot.path import Path
 
     et = edge_type_from_splines(layout.splines)
     P = Path()
@@ -466,43 +515,18 @@ def _phase4_routing_body(layout):
         from gvpy.engines.layout.ortho import ortho_edges as _ortho_v2_edges
         ortho_routes = _ortho_v2_edges(layout, use_lbls=False)
 
-    for le in sorted_real_edges:
-        if id(le) in flat_ids:
-            continue
-        tail = layout.lnodes.get(le.tail_name)
-        head = layout.lnodes.get(le.head_name)
-        if tail is None or head is None:
-            continue
-        if le.tail_name == le.head_name:
-            make_self_edge(layout, le, tail)
-        elif tail.rank == head.rank and not le.virtual:
-            make_flat_edge(layout, layout._spline_info, P, [le], et)
-        elif layout.splines == "ortho":
-            pts = ortho_routes.get(id(le))
-            le.points = (pts if pts is not None
-                         else layout._ortho_route(le, tail, head))
-        elif et in (EDGETYPE_LINE, EDGETYPE_CURVED):
-            make_straight_edges(layout, [le], et)
-        else:
-            make_regular_edge(layout, layout._spline_info, P, [le], et)
-        layout._compute_label_pos(le)
-
-    # Route chain edges through virtual nodes.
-    # See: /lib/dotgen/dotsplines.c @ 1736
-    for le in layout._chain_edges:
-        tail = layout.lnodes.get(le.tail_name)
-        head = layout.lnodes.get(le.head_name)
-        if tail is None or head is None:
-            continue
-        if et in (EDGETYPE_LINE, EDGETYPE_CURVED):
-            make_straight_edges(layout, [le], et)
-        elif layout.splines == "ortho":
-            pts = ortho_routes.get(id(le))
-            le.points = (pts if pts is not None
-                         else layout._ortho_route(le, tail, head))
-        else:
-            make_regular_edge(layout, layout._spline_info, P, [le], et)
-        layout._compute_label_pos(le)
+    # Real edges in edgecmp order, then chain edges through virtual
+    # nodes.  See: /lib/dotgen/dotsplines.c @ 1736
+    tasks = [(le, False) for le in sorted_real_edges
+             if id(le) not in flat_ids]
+    tasks.extend((le, True) for le in layout._chain_edges)
+    workers = spline_workers()
+    if workers > 1 and layout.splines != "ortho":
+        from gvpy.engines.layout.dot.parallel_splines import route_parallel
+        route_parallel(layout, tasks, et, workers)
+    else:
+        for le, is_chain in tasks:
+            route_edge(layout, le, is_chain, P, et, ortho_routes)
 
     # Apply samehead/sametail: merge endpoints for grouped edges
     layout._apply_sameport()
@@ -1256,20 +1280,94 @@ from gvpy.engines.layout.common.shapes import self_loop_points  # noqa: F401
 # directly from tests and from filters/diff_phases.py with GV_TRACE=spline_path.
 
 
+class EdgeIndex:
+    """Per-node in/out edge lists over ``layout.ledges`` +
+    ``layout._chain_edges``.
+
+    See: ``ND_out`` / ``ND_in`` in /lib/common/types.h @ 501
+
+    C keeps fast-edge lists on every node; Python's edges live in two
+    flat lists, so phase 4 used to filter both lists on every
+    neighbour lookup.  The index is built once after phase 3 (edge
+    structure is final by then) by
+    :meth:`DotGraphInfo._rebuild_edge_index` and carries:
+
+    - ``out`` / ``inn`` — ``name -> [LayoutEdge]`` in list order
+      (``ledges`` first, then ``_chain_edges``), exactly what the
+      old filters produced;
+    - ``seq`` — ``id(le) -> int``, the AGSEQ stand-in used by
+      :func:`edgecmp`;
+    - ``main`` — ``(tail, head) -> first real edge`` for
+      :func:`getmainedge`;
+    - ``pairs`` — unordered ``(a, b) -> [real edges in ledges]`` for
+      the flat-edge multi-edge counters;
+    - ``self_loops`` — names of nodes with a self-loop in ``ledges``.
+
+    ``key`` records the identity and length of both edge lists;
+    :func:`_edge_index` rebuilds the index whenever they change, so a
+    pass that rewrites chains invalidates it automatically.  Lists
+    handed out by the index are shared — callers must not mutate them.
+    """
+
+    __slots__ = ("key", "out", "inn", "seq", "main", "pairs", "self_loops")
+
+    def __init__(self, layout):
+        self.key = _edge_index_key(layout)
+        self.out: dict[str, list["LayoutEdge"]] = {}
+        self.inn: dict[str, list["LayoutEdge"]] = {}
+        self.seq: dict[int, int] = {}
+        self.main: dict[tuple[str, str], "LayoutEdge"] = {}
+        self.pairs: dict[tuple[str, str], list["LayoutEdge"]] = {}
+        self.self_loops: set[str] = set()
+        n = 0
+        for le in layout.ledges:
+            self._add(le, n)
+            n += 1
+            t, h = le.tail_name, le.head_name
+            if t == h:
+                self.self_loops.add(t)
+            if le.virtual:
+                continue
+            self.main.setdefault((t, h), le)
+            self.pairs.setdefault((min(t, h), max(t, h)), []).append(le)
+        for le in layout._chain_edges:
+            self._add(le, n)
+            n += 1
+
+    def _add(self, le: "LayoutEdge", n: int) -> None:
+        self.seq[id(le)] = n
+        self.out.setdefault(le.tail_name, []).append(le)
+        self.inn.setdefault(le.head_name, []).append(le)
+
+
+def _edge_index_key(layout) -> tuple:
+    return (id(layout.ledges), len(layout.ledges),
+            id(layout._chain_edges), len(layout._chain_edges))
+
+
+def _edge_index(layout) -> EdgeIndex:
+    """Return ``layout``'s :class:`EdgeIndex`, rebuilding it if the
+    edge lists changed since it was built (or it was never built)."""
+    idx = getattr(layout, "_edge_index_cache", None)
+    if idx is None or idx.key != _edge_index_key(layout):
+        idx = EdgeIndex(layout)
+        layout._edge_index_cache = idx
+    return idx
+
+
+_NO_EDGES: list = []
+
+
 def _node_out_edges(layout, ln: "LayoutNode") -> list["LayoutEdge"]:
     """Outgoing LayoutEdges of ``ln``.
 
     See: /lib/common/types.h @ 515
 
-    Walks ``layout.ledges`` +
-    ``layout._chain_edges`` and filters by ``le.tail_name == ln.name``.
-    Preserves Python iteration order, which is insertion order and
-    therefore stable across calls.
+    Edges from ``layout.ledges`` then ``layout._chain_edges`` whose
+    ``tail_name`` is ``ln.name``, in insertion order (stable across
+    calls).  Served from the :class:`EdgeIndex`; do not mutate.
     """
-    name = ln.name
-    out = [le for le in layout.ledges if le.tail_name == name]
-    out.extend(le for le in layout._chain_edges if le.tail_name == name)
-    return out
+    return _edge_index(layout).out.get(ln.name, _NO_EDGES)
 
 
 def _node_in_edges(layout, ln: "LayoutNode") -> list["LayoutEdge"]:
@@ -1277,10 +1375,7 @@ def _node_in_edges(layout, ln: "LayoutNode") -> list["LayoutEdge"]:
 
     See: /lib/common/types.h @ 501
     """
-    name = ln.name
-    out = [le for le in layout.ledges if le.head_name == name]
-    out.extend(le for le in layout._chain_edges if le.head_name == name)
-    return out
+    return _edge_index(layout).inn.get(ln.name, _NO_EDGES)
 
 
 def _clust(layout, ln: "LayoutNode"):
@@ -1627,11 +1722,9 @@ def getmainedge(layout, le: "LayoutEdge") -> "LayoutEdge":
     cluster skeleton edges) have no ``orig_tail`` so return self.
     """
     if le.orig_tail and le.orig_head:
-        for real in layout.ledges:
-            if (not real.virtual
-                    and real.tail_name == le.orig_tail
-                    and real.head_name == le.orig_head):
-                return real
+        real = _edge_index(layout).main.get((le.orig_tail, le.orig_head))
+        if real is not None:
+            return real
     return le
 
 
@@ -1769,25 +1862,11 @@ def _edge_seq_map(layout) -> dict:
     See: /lib/cgraph/cgraph.h @ 223
 
     The cgraph sequence number assigned at edge creation time.
-    Python doesn't have a built-in edge sequence,
-    so we cache the index of each edge in ``layout.ledges`` +
-    ``layout._chain_edges`` on first access within a phase 4 pass.
-    The cache is cleared by :func:`phase4_routing` at the start of
-    every pass via ``layout._edge_seq_cache = None``.
+    Python doesn't have a built-in edge sequence, so each edge's
+    index in ``layout.ledges`` + ``layout._chain_edges`` is kept on
+    the :class:`EdgeIndex`.
     """
-    seq = getattr(layout, "_edge_seq_cache", None)
-    if seq is not None:
-        return seq
-    seq = {}
-    n = 0
-    for le in layout.ledges:
-        seq[id(le)] = n
-        n += 1
-    for le in layout._chain_edges:
-        seq[id(le)] = n
-        n += 1
-    layout._edge_seq_cache = seq
-    return seq
+    return _edge_index(layout).seq
 
 
 def edgecmp(layout, e0: "LayoutEdge", e1: "LayoutEdge") -> int:
@@ -1993,14 +2072,11 @@ def resetRW(layout) -> None:
     changes — the body is a literal port of C, the math just happens
     to swap two equal values today.
     """
+    self_loops = _edge_index(layout).self_loops
     for ln in layout.lnodes.values():
         # C: ``if (ND_other(n).list)`` — has at least one self-loop.
         # Python equivalent: any edge with tail == head == this node.
-        has_selfloop = any(
-            le.tail_name == ln.name and le.head_name == ln.name
-            for le in layout.ledges
-        )
-        if not has_selfloop:
+        if ln.name not in self_loops:
             continue
         # C: SWAP(&ND_rw(n), &ND_mval(n)).  C relies on position.c
         # having stashed the pre-inflation rw in mval; swapping is
@@ -2203,21 +2279,21 @@ def count_flat_edge_index(layout, le: LayoutEdge) -> int:
     edges from the same tail, used to compute a vertical offset so
     multiple flat edges from one node don't overlap.
     """
-    idx = 0
-    for other in layout.ledges:
-        if other is le:
-            return idx
-        if other.virtual:
-            continue
-        t = layout.lnodes.get(other.tail_name)
-        h = layout.lnodes.get(other.head_name)
-        if t and h and t.rank == h.rank:
-            if ((other.tail_name == le.tail_name and
-                 other.head_name == le.head_name) or
-                (other.tail_name == le.head_name and
-                 other.head_name == le.tail_name)):
-                idx += 1
-    return idx
+    t = layout.lnodes.get(le.tail_name)
+    h = layout.lnodes.get(le.head_name)
+    if not (t and h and t.rank == h.rank):
+        return 0
+    seq = _edge_index(layout).seq
+    pos = seq.get(id(le), len(seq))
+    return sum(1 for other in _pair_edges(layout, le)
+               if seq[id(other)] < pos)
+
+
+def _pair_edges(layout, le: LayoutEdge) -> list[LayoutEdge]:
+    """Real edges in ``layout.ledges`` joining ``le``'s endpoints in
+    either direction, in list order."""
+    a, b = le.tail_name, le.head_name
+    return _edge_index(layout).pairs.get((min(a, b), max(a, b)), _NO_EDGES)
 
 
 def flat_edge_route(layout, le: LayoutEdge, tail: LayoutNode,
@@ -2338,17 +2414,11 @@ def flat_arc(layout, le: LayoutEdge, p1, p2,
     idx = layout._count_flat_edge_index(le)
     # Count total parallel flat edges for this pair
     total = idx + 1
-    for other in layout.ledges:
-        if other is le or other.virtual:
-            continue
-        if ((other.tail_name == le.tail_name and
-             other.head_name == le.head_name) or
-            (other.tail_name == le.head_name and
-             other.head_name == le.tail_name)):
-            ot = layout.lnodes.get(other.tail_name)
-            oh = layout.lnodes.get(other.head_name)
-            if ot and oh and ot.rank == oh.rank:
-                total += 1
+    ot = layout.lnodes.get(le.tail_name)
+    oh = layout.lnodes.get(le.head_name)
+    if ot and oh and ot.rank == oh.rank:
+        total += sum(1 for other in _pair_edges(layout, le)
+                     if other is not le)
 
     multisep = layout.nodesep
     stepx = multisep / (total + 1)
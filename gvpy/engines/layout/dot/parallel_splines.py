@@ -0,0 +1,164 @@
+"""Parallel phase-4 routing of independent edge batches.
+
+Opt-in companion to :func:`dotsplines.phase4_routing`, enabled with
+``GVPY_SPLINE_WORKERS=N`` (``N > 1``).  Graphviz routes edges one at
+a time in ``_dot_splines_`` (``lib/dotgen/dotsplines.c @ 1736``);
+every route reads the frozen phase-3 geometry (node coordinates,
+rank boxes, bounds) and writes only
+
+- the edge's own ``EdgeRoute`` (points, label position, arrow flags)
+- through ``recover_slack`` (``dotsplines.c @ 2131``), the
+  ``x`` / ``width`` / ``_lw`` / ``_rw`` of the virtual nodes on the
+  edge's own chain.
+
+Tasks are therefore grouped by their virtual-chain write sets (a
+union-find over the chain node names, so edges sharing a chain stay
+in one group in serial order), groups are cut into contiguous chunks
+and the chunks are routed in forked worker processes.
+
+Each group is routed against the *snapshot* taken before routing:
+a worker restores the chain geometry it changed after finishing the
+group, and the parent applies routes and chain geometry in task
+order.  The result is independent of the worker count and of
+scheduling.  It can differ slightly from serial routing, where the
+chain slack recovered by an earlier edge is visible to later edges'
+rank boxes — which is why this mode stays opt-in.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+
+from gvpy.engines.layout.dot.path import BWDEDGE, EDGETYPE_SPLINE
+
+
+# Chunks per worker — small enough to balance uneven groups.
+_CHUNKS_PER_WORKER = 4
+# Below this many tasks, forking costs more than it saves.
+_MIN_PARALLEL_TASKS = 64
+
+# (layout, tasks, et) for forked workers; set only around a pool.
+_STATE = None
+
+_GEOMETRY = ("x", "width", "_lw", "_rw")
+
+
+def _write_set(layout, le, is_chain: bool, et: int) -> list[str]:
+    """Virtual nodes whose geometry routing ``le`` may rewrite —
+    the chain ``make_regular_edge`` looks up, with the same key."""
+    if et != EDGETYPE_SPLINE and is_chain:
+        return []
+    tail = le.orig_tail if le.orig_tail else le.tail_name
+    head = le.orig_head if le.orig_head else le.head_name
+    if le.tree_index & BWDEDGE:
+        tail, head = head, tail
+    return list(layout._vnode_chains.get((tail, head), ()))
+
+
+def group_tasks(layout, tasks: list, et: int) -> list[list[int]]:
+    """Partition task indices into groups with disjoint write sets,
+    ordered by first member; members keep task order."""
+    parent = list(range(len(tasks)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: dict[str, int] = {}
+    for i, (le, is_chain) in enumerate(tasks):
+        for name in _write_set(layout, le, is_chain, et):
+            j = owner.setdefault(name, i)
+            if j != i:
+                ri, rj = find(i), find(j)
+                if ri != rj:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+    groups: dict[int, list[int]] = {}
+    for i in range(len(tasks)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _chunk(groups: list[list[int]], n: int) -> list[list[list[int]]]:
+    """Split ``groups`` into at most ``n`` contiguous chunks of
+    roughly equal task count."""
+    total = sum(len(g) for g in groups)
+    target = max(1, -(-total // max(1, n)))
+    chunks: list[list[list[int]]] = []
+    cur: list[list[int]] = []
+    size = 0
+    for g in groups:
+        cur.append(g)
+        size += len(g)
+        if size >= target:
+            chunks.append(cur)
+            cur, size = [], 0
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+
+def _route_chunk(chunk: list[list[int]]) -> list[tuple]:
+    """Route every group of ``chunk`` against the snapshot geometry.
+
+    Returns ``(task_index, route, {vnode: geometry})`` per task, the
+    geometry being the chain state after the task's group finished.
+    """
+    from gvpy.engines.layout.dot.dotsplines import route_edge
+    from gvpy.engines.layout.dot.path import Path
+
+    layout, tasks, et = _STATE
+    out = []
+    for group in chunk:
+        names: list[str] = []
+        for i in group:
+            names.extend(_write_set(layout, tasks[i][0], tasks[i][1], et))
+        vnodes = [vn for vn in (layout.lnodes.get(n) for n in
+                                dict.fromkeys(names)) if vn is not None]
+        saved = [{a: vn.__dict__[a] for a in _GEOMETRY if a in vn.__dict__}
+                 for vn in vnodes]
+        P = Path()
+        for i in group:
+            le, is_chain = tasks[i]
+            route_edge(layout, le, is_chain, P, et, {})
+        geometry = {vn.name: {a: vn.__dict__[a] for a in _GEOMETRY
+                              if a in vn.__dict__} for vn in vnodes}
+        for vn, snap in zip(vnodes, saved):
+            for a in _GEOMETRY:
+                if a in snap:
+                    setattr(vn, a, snap[a])
+                else:
+                    vn.__dict__.pop(a, None)
+        for k, i in enumerate(group):
+            out.append((i, tasks[i][0].route,
+                        geometry if k == len(group) - 1 else None))
+    return out
+
+
+def route_parallel(layout, tasks: list, et: int, workers: int) -> None:
+    """Route ``tasks`` (``(LayoutEdge, is_chain)`` pairs) in up to
+    ``workers`` processes and merge the results into ``layout``."""
+    global _STATE
+    groups = group_tasks(layout, tasks, et)
+    chunks = _chunk(groups, workers * _CHUNKS_PER_WORKER)
+    procs = min(workers, os.cpu_count() or 1, len(chunks))
+    _STATE = (layout, tasks, et)
+    try:
+        if (procs > 1 and len(tasks) >= _MIN_PARALLEL_TASKS
+                and "fork" in multiprocessing.get_all_start_methods()):
+            with multiprocessing.get_context("fork").Pool(procs) as pool:
+                results = pool.map(_route_chunk, chunks)
+        else:
+            results = [_route_chunk(c) for c in chunks]
+    finally:
+        _STATE = None
+
+    for chunk_result in results:
+        for i, route, geometry in chunk_result:
+            tasks[i][0].route = route
+            for name, attrs in (geometry or {}).items():
+                vn = layout.lnodes[name]
+                for a, v in attrs.items():
+                    setattr(vn, a, v)
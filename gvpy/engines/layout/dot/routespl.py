@@ -31,8 +31,11 @@ from __future__ import annotations
 import math
 import sys
 
+import numpy as np
+
 from gvpy.engines.layout.dot.path import Box, Path
 from gvpy.engines.layout.pathplan import Pedge, Ppoint, Ppoly
+from gvpy.engines.layout.pathplan.arrays import as_array, casteljau
 from gvpy.engines.layout.pathplan.route import Proutespline
 from gvpy.engines.layout.pathplan import Pshortestpath
 from gvpy.engines.layout.pathplan import make_polyline
@@ -227,44 +230,28 @@ def limit_boxes(boxes: list[Box], pps: list[Ppoint], delta: float) -> None:
 
     Uses de Casteljau subdivision to sample the spline and shrink
     each box's ``ll_x`` / ``ur_x`` to the minimum enclosing range.
+    The samples are evaluated in one batch
+    (:func:`...pathplan.arrays.casteljau`) and each box takes the
+    min / max over the samples inside its y-band.
     """
     boxn = len(boxes)
     pn = len(pps)
     num_div = delta * boxn
-
-    splinepi = 0
-    while splinepi + 3 < pn:
-        si = 0.0
-        while si <= num_div:
-            t = si / num_div
-            sp = [
-                Ppoint(pps[splinepi].x, pps[splinepi].y),
-                Ppoint(pps[splinepi + 1].x, pps[splinepi + 1].y),
-                Ppoint(pps[splinepi + 2].x, pps[splinepi + 2].y),
-                Ppoint(pps[splinepi + 3].x, pps[splinepi + 3].y),
-            ]
-            # Three rounds of de Casteljau linear interpolation.
-            sp[0].x += t * (sp[1].x - sp[0].x)
-            sp[0].y += t * (sp[1].y - sp[0].y)
-            sp[1].x += t * (sp[2].x - sp[1].x)
-            sp[1].y += t * (sp[2].y - sp[1].y)
-            sp[2].x += t * (sp[3].x - sp[2].x)
-            sp[2].y += t * (sp[3].y - sp[2].y)
-            sp[0].x += t * (sp[1].x - sp[0].x)
-            sp[0].y += t * (sp[1].y - sp[0].y)
-            sp[1].x += t * (sp[2].x - sp[1].x)
-            sp[1].y += t * (sp[2].y - sp[1].y)
-            sp[0].x += t * (sp[1].x - sp[0].x)
-            sp[0].y += t * (sp[1].y - sp[0].y)
-
-            for bi in range(boxn):
-                if (sp[0].y <= boxes[bi].ur_y + FUDGE
-                        and sp[0].y >= boxes[bi].ll_y - FUDGE):
-                    boxes[bi].ll_x = min(boxes[bi].ll_x, sp[0].x)
-                    boxes[bi].ur_x = max(boxes[bi].ur_x, sp[0].x)
-
-            si += 1.0
-        splinepi += 3
+    if boxn == 0 or pn < 4:
+        return
+
+    # All samples of every segment at once; ``si`` runs over the
+    # integers ``0 .. num_div`` exactly as C's float counter does.
+    t = np.arange(0.0, math.floor(num_div) + 1.0) / num_div
+    cps = as_array(pps)
+    pts = np.concatenate([casteljau(cps[k:k + 4], t)
+                          for k in range(0, pn - 3, 3)])
+    xs, ys = pts[:, 0], pts[:, 1]
+    for box in boxes:
+        hit = (ys <= box.ur_y + FUDGE) & (ys >= box.ll_y - FUDGE)
+        if hit.any():
+            box.ll_x = min(box.ll_x, float(xs[hit].min()))
+            box.ur_x = max(box.ur_x, float(xs[hit].max()))
 
 
 # ── routesplines_ ─────────────────────────────────────────────────
@@ -5,15 +5,26 @@ size ``cell_size = grid_cells × K``; repulsive forces are computed
 between nodes in the same cell and between adjacent cells only,
 giving an O(N) average vs the O(N²) all-pairs approach.
 
-Engine-agnostic: any object with ``x`` / ``y`` attributes can be
-binned.
+Two forms are provided:
+
+- :func:`build_grid` — dict-of-lists keyed by ``(cell_i, cell_j)``.
+  Engine-agnostic: any object with ``x`` / ``y`` attributes can be
+  binned.
+- :func:`build_cell_hash` — sorted-cell spatial hash over an
+  ``(N, 2)`` position array, used by the array-backed force loop in
+  :mod:`tlayout`.  :func:`cell_pairs` enumerates the node pairs of
+  one neighbour offset as flat index arrays so the force kernel can
+  process each offset in a single vectorised block.
 """
 from __future__ import annotations
 
 import math
 from collections import defaultdict
+from dataclasses import dataclass
 from typing import Iterable
 
+import numpy as np
+
 
 def build_grid(node_names: Iterable[str], lnodes: dict,
                cell_size: float
@@ -37,3 +48,92 @@ def neighbour_offsets() -> list[tuple[int, int]]:
     excluding (0, 0) which is the cell itself)."""
     return [(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)
             if not (di == 0 and dj == 0)]
+
+
+def half_neighbour_offsets() -> list[tuple[int, int]]:
+    """Return 4 of the 8 Moore offsets such that every unordered
+    pair of adjacent cells is visited exactly once when each cell
+    looks at ``cell + offset``."""
+    return [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+@dataclass
+class CellHash:
+    """Sorted-cell spatial hash over an ``(N, 2)`` position array.
+
+    ``order`` lists node indices sorted by cell key; the occupied
+    cells are ``keys`` (ascending) with their node runs at
+    ``order[start[c]:start[c] + count[c]]``.  Cell coordinates are
+    shifted so that ``cx + di`` / ``cy + dj`` for ``|d| <= 1`` map to
+    distinct keys via ``cx * stride + cy``.
+    """
+    order: np.ndarray
+    keys: np.ndarray
+    start: np.ndarray
+    count: np.ndarray
+    cx: np.ndarray
+    cy: np.ndarray
+    stride: int
+
+
+def build_cell_hash(pos: np.ndarray, cell_size: float) -> CellHash:
+    """Bin the rows of ``pos`` into cells of side ``cell_size``.
+
+    Array counterpart of :func:`build_grid`: one ``argsort`` over
+    the integer cell keys replaces the per-node dict insertion.
+    """
+    cells = np.floor(pos / cell_size).astype(np.int64)
+    ci = cells[:, 0] - cells[:, 0].min() + 1
+    cj = cells[:, 1] - cells[:, 1].min() + 1
+    stride = int(cj.max()) + 2
+    node_keys = ci * stride + cj
+    order = np.argsort(node_keys, kind="stable")
+    sorted_keys = node_keys[order]
+    keys, start, count = np.unique(sorted_keys, return_index=True,
+                                   return_counts=True)
+    return CellHash(order=order, keys=keys, start=start, count=count,
+                    cx=keys // stride, cy=keys % stride, stride=stride)
+
+
+def cell_pairs(ch: CellHash, di: int, dj: int
+               ) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(ia, ib)`` node-index arrays for every pair formed by
+    a node in an occupied cell and a node in the cell at offset
+    ``(di, dj)``.
+
+    For ``(0, 0)`` only pairs with ``a < b`` inside the cell run are
+    emitted, so each unordered pair appears once.
+    """
+    if di == 0 and dj == 0:
+        a_cell = np.arange(len(ch.keys))
+        b_cell = a_cell
+    else:
+        nb_keys = (ch.cx + di) * ch.stride + (ch.cy + dj)
+        idx = np.searchsorted(ch.keys, nb_keys)
+        idx_c = np.minimum(idx, len(ch.keys) - 1)
+        hit = ch.keys[idx_c] == nb_keys
+        a_cell = np.nonzero(hit)[0]
+        b_cell = idx_c[hit]
+
+    a_cnt = ch.count[a_cell]
+    b_cnt = ch.count[b_cell]
+    n_per = a_cnt * b_cnt
+    total = int(n_per.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    pair_cell = np.repeat(np.arange(len(a_cell)), n_per)
+    first = np.cumsum(n_per) - n_per
+    local = np.arange(total) - first[pair_cell]
+    bc = b_cnt[pair_cell]
+    a_local = local // bc
+    b_local = local % bc
+    if di == 0 and dj == 0:
+        keep = a_local < b_local
+        pair_cell = pair_cell[keep]
+        a_local = a_local[keep]
+        b_local = b_local[keep]
+    ia = ch.order[ch.start[a_cell][pair_cell] + a_local]
+    ib = ch.order[ch.start[b_cell][pair_cell] + b_local]
+    return ia, ib
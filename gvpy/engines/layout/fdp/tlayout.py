@@ -15,6 +15,14 @@ Per iteration:
 Temperature anneals linearly from ``T0`` to 0 over ``maxiter``
 steps.
 
+The loop runs on NumPy arrays: positions and displacements are
+``(N, 2)`` float arrays indexed by the node's position in
+``node_list``, edges are parallel index/length/weight arrays, and
+repulsion is evaluated per neighbour-cell offset in vectorised
+blocks over a sorted-cell spatial hash (:func:`grid.build_cell_hash`).
+Positions are copied back onto the ``LayoutNode`` objects once the
+loop finishes.
+
 Trace tag: ``[TRACE fdp_tlayout]``.
 """
 from __future__ import annotations
@@ -25,7 +33,13 @@ import random
 import sys
 from typing import Any
 
-from gvpy.engines.layout.fdp.grid import build_grid, neighbour_offsets
+import numpy as np
+
+from gvpy.engines.layout.fdp.grid import (
+    build_cell_hash,
+    cell_pairs,
+    half_neighbour_offsets,
+)
 
 
 # Mirrors ``EXPFACTOR`` from tlayout.c:96 — span multiplier for
@@ -60,128 +74,99 @@ def init_positions(layout: Any, node_list: list[str],
         ln.y = (random.random() - 0.5) * span
 
 
-def _repel_pair(pa: Any, pb: Any, K2: float) -> None:
-    """Apply repulsive force ``F = K² / dist²`` between two nodes.
+def _repel_pairs(pos: np.ndarray, disp: np.ndarray, ia: np.ndarray,
+                 ib: np.ndarray, K2: float) -> None:
+    """Apply repulsive force ``F = K² / dist²`` between each node pair
+    ``(ia[k], ib[k])``.
 
-    Equal and opposite — both displacement accumulators are
-    updated.
+    Equal and opposite — both displacement rows are updated.
+    Coincident or near-coincident pairs get a small random offset so
+    the next iteration produces a meaningful force.
     """
-    dx = pb.x - pa.x
-    dy = pb.y - pa.y
-    dist2 = dx * dx + dy * dy
-    if dist2 < 0.01:
-        # Coincident or near-coincident: jitter one slightly so the
-        # next iteration produces a meaningful force.
-        dx = random.random() * 0.1
-        dy = random.random() * 0.1
-        dist2 = dx * dx + dy * dy
-    dist = math.sqrt(dist2)
-    force = K2 / (dist * dist2)
-    fx = dx * force
-    fy = dy * force
-    pb.disp_x += fx
-    pb.disp_y += fy
-    pa.disp_x -= fx
-    pa.disp_y -= fy
-
-
-def all_pairs_repulsion(layout: Any, node_list: list[str],
+    if len(ia) == 0:
+        return
+    d = pos[ib] - pos[ia]
+    dist2 = np.einsum("ij,ij->i", d, d)
+    close = dist2 < 0.01
+    if close.any():
+        k = int(close.sum())
+        d[close] = np.array([[random.random() * 0.1,
+                              random.random() * 0.1]
+                             for _ in range(k)])
+        dist2[close] = np.einsum("ij,ij->i", d[close], d[close])
+    force = K2 / (np.sqrt(dist2) * dist2)
+    f = d * force[:, None]
+    n = len(disp)
+    for axis in (0, 1):
+        disp[:, axis] += np.bincount(ib, weights=f[:, axis], minlength=n)
+        disp[:, axis] -= np.bincount(ia, weights=f[:, axis], minlength=n)
+
+
+def all_pairs_repulsion(pos: np.ndarray, disp: np.ndarray,
                         K2: float) -> None:
     """O(N²) repulsive-force pass.  Used for small graphs or when
-    ``use_grid`` is False."""
-    n = len(node_list)
-    for i in range(n):
-        pi = layout.lnodes[node_list[i]]
-        for j in range(i + 1, n):
-            pj = layout.lnodes[node_list[j]]
-            _repel_pair(pi, pj, K2)
+    ``use_grid`` is False.  Pairs are processed one row block at a
+    time so memory stays O(N)."""
+    n = len(pos)
+    for i in range(n - 1):
+        ib = np.arange(i + 1, n)
+        _repel_pairs(pos, disp, np.full(len(ib), i), ib, K2)
 
 
-def grid_repulsion(layout: Any, node_list: list[str], K2: float,
+def grid_repulsion(pos: np.ndarray, disp: np.ndarray, K2: float,
                    cell_size: float) -> None:
     """Grid-accelerated repulsive forces.
 
     Mirrors ``tlayout.c::doRep`` with the grid path.  Forces are
     only computed between nodes in the same cell or adjacent cells;
     nodes farther than ~one cell width contribute negligibly to the
-    ``1/r²`` repulsion in practice.
+    ``1/r²`` repulsion in practice.  Each unordered cell pair is
+    visited once (same cell plus four half-neighbourhood offsets),
+    and all node pairs for one offset are handled as a single block.
     """
-    grid = build_grid(node_list, layout.lnodes, cell_size)
-
-    # Within-cell forces.
-    for cell_nodes in grid.values():
-        m = len(cell_nodes)
-        for a in range(m):
-            pa = layout.lnodes[cell_nodes[a]]
-            for b in range(a + 1, m):
-                pb = layout.lnodes[cell_nodes[b]]
-                _repel_pair(pa, pb, K2)
-
-    # Adjacent-cell forces (process each unordered pair once).
-    processed: set[tuple[tuple[int, int], tuple[int, int]]] = set()
-    offsets = neighbour_offsets()
-    for (ci, cj), cell_nodes in grid.items():
-        for di, dj in offsets:
-            nb_key = (ci + di, cj + dj)
-            if nb_key not in grid:
-                continue
-            pair_key = (min((ci, cj), nb_key), max((ci, cj), nb_key))
-            if pair_key in processed:
-                continue
-            processed.add(pair_key)
-            for na in cell_nodes:
-                pa = layout.lnodes[na]
-                for nb in grid[nb_key]:
-                    pb = layout.lnodes[nb]
-                    _repel_pair(pa, pb, K2)
-
-
-def apply_attraction(layout: Any, t_name: str, h_name: str,
-                     edge_len: float, weight: float) -> None:
-    """Apply the F-R attractive force along an edge.
+    ch = build_cell_hash(pos, cell_size)
+    for di, dj in [(0, 0)] + half_neighbour_offsets():
+        ia, ib = cell_pairs(ch, di, dj)
+        _repel_pairs(pos, disp, ia, ib, K2)
+
+
+def apply_attraction(pos: np.ndarray, disp: np.ndarray,
+                     tail: np.ndarray, head: np.ndarray,
+                     edge_len: np.ndarray, weight: np.ndarray) -> None:
+    """Apply the F-R attractive force along every edge.
 
     ``F_attr = weight × (dist - edge_len) / dist`` along the edge
     direction.  Pulls endpoints together when they're farther than
-    ``edge_len``, pushes apart when closer.
+    ``edge_len``, pushes apart when closer.  Edges whose endpoints
+    are closer than 0.01 are skipped.
     """
-    pt = layout.lnodes[t_name]
-    ph = layout.lnodes[h_name]
-    dx = ph.x - pt.x
-    dy = ph.y - pt.y
-    dist = math.sqrt(dx * dx + dy * dy)
-    if dist < 0.01:
+    if len(tail) == 0:
         return
-    force = weight * (dist - edge_len) / dist
-    fx = dx * force
-    fy = dy * force
-    pt.disp_x += fx
-    pt.disp_y += fy
-    ph.disp_x -= fx
-    ph.disp_y -= fy
-
-
-def update_positions(layout: Any, node_list: list[str],
-                     temp: float) -> None:
+    d = pos[head] - pos[tail]
+    dist = np.hypot(d[:, 0], d[:, 1])
+    live = dist >= 0.01
+    safe = np.where(live, dist, 1.0)
+    force = np.where(live, weight * (dist - edge_len) / safe, 0.0)
+    f = d * force[:, None]
+    n = len(disp)
+    for axis in (0, 1):
+        disp[:, axis] += np.bincount(tail, weights=f[:, axis], minlength=n)
+        disp[:, axis] -= np.bincount(head, weights=f[:, axis], minlength=n)
+
+
+def update_positions(pos: np.ndarray, disp: np.ndarray,
+                     pinned: np.ndarray, temp: float) -> None:
     """Apply each node's accumulated displacement, capped by temp.
 
     Pinned nodes are skipped.  Mirrors the position-update tail of
     the F-R inner loop in ``tlayout.c``.
     """
-    for name in node_list:
-        ln = layout.lnodes[name]
-        if ln.pinned:
-            continue
-        dx = ln.disp_x
-        dy = ln.disp_y
-        disp_len = math.sqrt(dx * dx + dy * dy)
-        if disp_len <= 0:
-            continue
-        if disp_len > temp:
-            scale = temp / disp_len
-            dx *= scale
-            dy *= scale
-        ln.x += dx
-        ln.y += dy
+    disp_len = np.hypot(disp[:, 0], disp[:, 1])
+    move = (disp_len > 0) & ~pinned
+    scale = np.ones_like(disp_len)
+    over = move & (disp_len > temp)
+    scale[over] = temp / disp_len[over]
+    pos[move] += disp[move] * scale[move, None]
 
 
 def tlayout(layout: Any, node_list: list[str],
@@ -201,27 +186,42 @@ def tlayout(layout: Any, node_list: list[str],
     _trace(f"start N={len(node_list)} K={K:.2f} T0={T0:.2f} "
            f"maxiter={maxiter} use_grid={use_grid}")
 
+    index = {name: i for i, name in enumerate(node_list)}
+    lnodes = [layout.lnodes[name] for name in node_list]
+    pos = np.array([[ln.x, ln.y] for ln in lnodes], dtype=np.float64)
+    pinned = np.array([bool(ln.pinned) for ln in lnodes], dtype=bool)
+    disp = np.zeros_like(pos)
+
+    tail = np.array([index[t] for t, _, _, _ in comp_edges],
+                    dtype=np.int64)
+    head = np.array([index[h] for _, h, _, _ in comp_edges],
+                    dtype=np.int64)
+    elen = np.array([e[2] for e in comp_edges], dtype=np.float64)
+    wt = np.array([e[3] for e in comp_edges], dtype=np.float64)
+
+    iteration = 0
     for iteration in range(maxiter):
         temp = T0 * (maxiter - iteration) / maxiter
         if temp <= 0:
             break
 
-        # Reset displacements.
-        for name in node_list:
-            ln = layout.lnodes[name]
-            ln.disp_x = 0.0
-            ln.disp_y = 0.0
+        disp.fill(0.0)
 
         # Repulsion.
         if use_grid and len(node_list) > 20:
-            grid_repulsion(layout, node_list, K2, cell_size)
+            grid_repulsion(pos, disp, K2, cell_size)
         else:
-            all_pairs_repulsion(layout, node_list, K2)
+            all_pairs_repulsion(pos, disp, K2)
 
         # Attraction along edges.
-        for t, h, elen, wt in comp_edges:
-            apply_attraction(layout, t, h, elen, wt)
+        apply_attraction(pos, disp, tail, head, elen, wt)
+
+        update_positions(pos, disp, pinned, temp)
 
-        update_positions(layout, node_list, temp)
+    for ln, (x, y), (dx, dy) in zip(lnodes, pos.tolist(), disp.tolist()):
+        ln.x = x
+        ln.y = y
+        ln.disp_x = dx
+        ln.disp_y = dy
 
     _trace(f"finish iters={iteration + 1}")
@@ -16,6 +16,18 @@ shared ``common.adjust.remove_overlap`` so fdp users can pick
 ``scale`` / ``voronoi`` / ``ortho`` / etc. like neato and twopi
 users.
 
+Overlap detection goes through the shared sweep-and-prune index
+(``common.overlap_index``): overlapping pairs get the strong
+``X_ov`` repulsion.
+
+Deviation: xlayout.c applies the weak ``X_nonov`` repulsion to every
+pair.  Here it reaches only pairs whose boxes come within ``K`` of
+each other (each box grown by ``K / 2``, the same near-field cut-off
+``tlayout``'s grid uses), so an iteration costs O(N + pairs in range)
+rather than O(N²).  Nodes farther apart no longer push each other
+away, so positions differ from the all-pairs pass; a node with no
+edges and nothing in range stays where it is.
+
 Trace tag: ``[TRACE fdp_xlayout]``.
 """
 from __future__ import annotations
@@ -26,6 +38,14 @@ import random
 import sys
 from typing import Any
 
+import numpy as np
+
+from gvpy.engines.layout.common.overlap_index import (
+    candidate_blocks,
+    count_overlaps,
+)
+from gvpy.engines.layout.fdp.tlayout import update_positions
+
 
 _DFLT_MAX_ATTEMPTS = 9
 _REPEL_C = 1.5                  # X_C in xlayout.c:39 (xpms->C)
@@ -38,16 +58,22 @@ def _trace(msg: str) -> None:
         print(f"[TRACE fdp_xlayout] {msg}", file=sys.stderr)
 
 
-def _is_overlap(a: Any, b: Any, dx: float, dy: float,
-                sep_x: float, sep_y: float) -> bool:
-    """Bounding-box overlap test with separation margin."""
-    return (abs(dx) <= (a.width + b.width) / 2 + sep_x
-            and abs(dy) <= (a.height + b.height) / 2 + sep_y)
+def _overlap_mask(x: np.ndarray, y: np.ndarray, hw: np.ndarray,
+                  hh: np.ndarray, ia: np.ndarray, ib: np.ndarray
+                  ) -> np.ndarray:
+    """Bounding-box overlap test with separation margin (``hw`` /
+    ``hh`` already include ``sep / 2``)."""
+    return ((np.abs(x[ib] - x[ia]) <= hw[ia] + hw[ib])
+            & (np.abs(y[ib] - y[ia]) <= hh[ia] + hh[ib]))
 
 
-def _node_radius(ln: Any) -> float:
-    """Approximate radius of the node's bounding box."""
-    return math.hypot(ln.width / 2, ln.height / 2)
+def _accumulate(disp: np.ndarray, ia: np.ndarray, ib: np.ndarray,
+                f: np.ndarray) -> None:
+    """Add ``f`` to ``disp[ib]`` and subtract it from ``disp[ia]``."""
+    n = len(disp)
+    for axis in (0, 1):
+        disp[:, axis] += np.bincount(ib, weights=f[:, axis], minlength=n)
+        disp[:, axis] -= np.bincount(ia, weights=f[:, axis], minlength=n)
 
 
 def xlayout(layout: Any, K: float, sep: float, max_iter: int,
@@ -68,14 +94,40 @@ def xlayout(layout: Any, K: float, sep: float, max_iter: int,
         return 0
 
     n_edges = len(layout.graph.edges)
-    sep_x = sep
-    sep_y = sep
     inner_iters = min(max_iter, 100)
 
+    pos = np.array([[ln.x, ln.y] for ln in nodes], dtype=np.float64)
+    hw = np.array([ln.width / 2 for ln in nodes],
+                  dtype=np.float64) + sep / 2
+    hh = np.array([ln.height / 2 for ln in nodes],
+                  dtype=np.float64) + sep / 2
+    radius = np.hypot(hw - sep / 2, hh - sep / 2)
+    pinned = np.array([bool(ln.pinned) for ln in nodes], dtype=bool)
+    disp = np.zeros_like(pos)
+
+    index = {id(ln): i for i, ln in enumerate(nodes)}
+    tails: list[int] = []
+    heads: list[int] = []
+    for _key, edge in layout.graph.edges.items():
+        t_ln = layout.lnodes.get(edge.tail.name)
+        h_ln = layout.lnodes.get(edge.head.name)
+        if t_ln is None or h_ln is None:
+            continue
+        tails.append(index[id(t_ln)])
+        heads.append(index[id(h_ln)])
+    et = np.array(tails, dtype=np.int64)
+    eh = np.array(heads, dtype=np.int64)
+    rad_sum = radius[et] + radius[eh]
+
     # Initial overlap count — mirrors x_layout.c:273.
-    if not _count_overlaps(nodes, sep_x, sep_y):
+    if not count_overlaps(pos[:, 0], pos[:, 1], hw, hh, strict=False):
         return 0
 
+    def _write_back() -> None:
+        for ln, (x, y) in zip(nodes, pos.tolist()):
+            ln.x = x
+            ln.y = y
+
     K_eff = K
     overlaps = 0
     for attempt in range(tries):
@@ -87,99 +139,61 @@ def xlayout(layout: Any, K: float, sep: float, max_iter: int,
         else:
             x_nonov = 0.0
         T0 = K_eff * math.sqrt(N) / 5.0
+        reach = K_eff / 2
 
         for it in range(inner_iters):
             temp = T0 * (inner_iters - it) / inner_iters
             if temp <= 0:
                 break
 
-            for ln in nodes:
-                ln.disp_x = 0.0
-                ln.disp_y = 0.0
+            disp.fill(0.0)
+            x = pos[:, 0]
+            y = pos[:, 1]
 
             overlaps = 0
-            for i in range(N):
-                a = nodes[i]
-                for j in range(i + 1, N):
-                    b = nodes[j]
-                    dx = b.x - a.x
-                    dy = b.y - a.y
-                    dist2 = dx * dx + dy * dy
-                    if dist2 < 0.01:
-                        dx = random.random() * 0.1
-                        dy = random.random() * 0.1
-                        dist2 = dx * dx + dy * dy
-
-                    if _is_overlap(a, b, dx, dy, sep_x, sep_y):
-                        overlaps += 1
-                        force = x_ov / dist2
-                    else:
-                        force = x_nonov / dist2
-
-                    fx = dx * force
-                    fy = dy * force
-                    b.disp_x += fx
-                    b.disp_y += fy
-                    a.disp_x -= fx
-                    a.disp_y -= fy
-
-            for key, edge in layout.graph.edges.items():
-                t_ln = layout.lnodes.get(edge.tail.name)
-                h_ln = layout.lnodes.get(edge.head.name)
-                if t_ln is None or h_ln is None:
-                    continue
-                dx = h_ln.x - t_ln.x
-                dy = h_ln.y - t_ln.y
-                dist = math.sqrt(dx * dx + dy * dy)
-                if dist < 0.01:
-                    continue
-                if _is_overlap(t_ln, h_ln, dx, dy, sep_x, sep_y):
-                    continue
-                rad_sum = _node_radius(t_ln) + _node_radius(h_ln)
-                dout = max(dist - rad_sum, 0.01)
-                force = dout * dout / ((K_eff + rad_sum) * dist)
-                fx = dx * force
-                fy = dy * force
-                t_ln.disp_x += fx
-                t_ln.disp_y += fy
-                h_ln.disp_x -= fx
-                h_ln.disp_y -= fy
-
-            for ln in nodes:
-                if ln.pinned:
-                    continue
-                dx = ln.disp_x
-                dy = ln.disp_y
-                disp_len = math.sqrt(dx * dx + dy * dy)
-                if disp_len <= 0:
-                    continue
-                if disp_len > temp:
-                    scale = temp / disp_len
-                    dx *= scale
-                    dy *= scale
-                ln.x += dx
-                ln.y += dy
+            for ia, ib in candidate_blocks(x, y, hw + reach, hh + reach):
+                d = pos[ib] - pos[ia]
+                dist2 = np.einsum("ij,ij->i", d, d)
+                close = dist2 < 0.01
+                if close.any():
+                    k = int(close.sum())
+                    d[close] = np.array([[random.random() * 0.1,
+                                          random.random() * 0.1]
+                                         for _ in range(k)])
+                    dist2[close] = np.einsum("ij,ij->i",
+                                             d[close], d[close])
+                ov = _overlap_mask(x, y, hw, hh, ia, ib)
+                overlaps += int(ov.sum())
+                force = np.where(ov, x_ov, x_nonov) / dist2
+                _accumulate(disp, ia, ib, d * force[:, None])
+
+            if len(et):
+                d = pos[eh] - pos[et]
+                dist = np.hypot(d[:, 0], d[:, 1])
+                live = (dist >= 0.01) & ~_overlap_mask(x, y, hw, hh, et, eh)
+                if live.any():
+                    dl = d[live]
+                    dst = dist[live]
+                    rs = rad_sum[live]
+                    dout = np.maximum(dst - rs, 0.01)
+                    force = dout * dout / ((K_eff + rs) * dst)
+                    # Edge attraction pulls the tail towards the head.
+                    _accumulate(disp, eh[live], et[live],
+                                dl * force[:, None])
+
+            update_positions(pos, disp, pinned, temp)
 
             if overlaps == 0:
+                _write_back()
                 _trace(f"cleared in attempt={attempt} iter={it}")
                 return 0
 
         if overlaps == 0:
+            _write_back()
             return 0
         K_eff += K          # additive growth, mirrors xlayout.c:300
 
+    _write_back()
     _trace(f"bail tries={tries} remaining_overlaps={overlaps}")
     return overlaps
 
-
-def _count_overlaps(nodes: list, sep_x: float, sep_y: float) -> int:
-    """Count pairs of overlapping bounding boxes."""
-    cnt = 0
-    N = len(nodes)
-    for i in range(N):
-        a = nodes[i]
-        for j in range(i + 1, N):
-            b = nodes[j]
-            if _is_overlap(a, b, b.x - a.x, b.y - a.y, sep_x, sep_y):
-                cnt += 1
-    return cnt
@@ -15,6 +15,13 @@ Semantics track C verbatim:
 
 C declares the heap size statically via ``PQgen(sz)``; this port keeps
 the bound purely for parity with the ``Heap overflow`` error path.
+
+Python addition: :class:`IntPq` and the ``ipq_*`` functions are the
+same heap over integer node ids, keyed by a caller-owned list of
+values and tracking positions in a parallel list.  They perform the
+same comparisons and moves as the :class:`Snode` versions — so pop
+order, ties included, is identical — without the per-object attribute
+traffic; :func:`sgraph.short_path` runs on them.
 """
 
 from __future__ import annotations
@@ -145,6 +152,94 @@ def _pq_downheap(pq: Pq, k: int) -> None:
     x.n_idx = k
 
 
+@dataclass
+class IntPq:
+    """Heap of node ids; ``heap[0]`` holds ``guard``, an id whose key
+    stays 0, and ``pos[i]`` is the slot of node ``i``."""
+    heap: list = field(default_factory=list)
+    pos: list = field(default_factory=list)
+    cnt: int = 0
+    size: int = 0
+    guard: int = 0
+
+
+def ipq_gen(sz: int, nnodes: int) -> IntPq:
+    """Heap of capacity ``sz`` over ids ``0 .. nnodes - 1``; the guard
+    id is ``nnodes``, so keys need ``nnodes + 1`` slots."""
+    return IntPq(heap=[nnodes] + [0] * sz, pos=[0] * (nnodes + 1),
+                 cnt=0, size=sz, guard=nnodes)
+
+
+def ipq_insert(pq: IntPq, i: int, key: list) -> int:
+    """:func:`pq_insert` for node id ``i``; return 1 on overflow."""
+    if pq.cnt == pq.size:
+        print("[ERROR ortho-fpq] Heap overflow", flush=True)
+        return 1
+    pq.cnt += 1
+    pq.heap[pq.cnt] = i
+    _ipq_upheap(pq, pq.cnt, key)
+    return 0
+
+
+def ipq_remove(pq: IntPq, key: list) -> int:
+    """:func:`pq_remove` — pop the max-key id, or -1 when empty."""
+    if pq.cnt:
+        heap = pq.heap
+        n = heap[1]
+        heap[1] = heap[pq.cnt]
+        pq.cnt -= 1
+        if pq.cnt:
+            _ipq_downheap(pq, 1, key)
+        return n
+    return -1
+
+
+def ipq_update(pq: IntPq, i: int, key: list, d: int) -> None:
+    """:func:`pq_update` — set ``key[i] = d`` and re-heapify."""
+    key[i] = d
+    _ipq_upheap(pq, pq.pos[i], key)
+
+
+def _ipq_upheap(pq: IntPq, k: int, key: list) -> None:
+    heap = pq.heap
+    pos = pq.pos
+    x = heap[k]
+    v = key[x]
+    next_k = k // 2
+    while key[heap[next_k]] < v:
+        n = heap[next_k]
+        heap[k] = n
+        pos[n] = k
+        k = next_k
+        next_k //= 2
+    heap[k] = x
+    pos[x] = k
+
+
+def _ipq_downheap(pq: IntPq, k: int, key: list) -> None:
+    heap = pq.heap
+    pos = pq.pos
+    cnt = pq.cnt
+    x = heap[k]
+    v = key[x]
+    lim = cnt // 2
+    while k <= lim:
+        j = k + k
+        n = heap[j]
+        if j < cnt:
+            m = heap[j + 1]
+            if key[n] < key[m]:
+                j += 1
+                n = m
+        if v >= key[n]:
+            break
+        heap[k] = n
+        pos[n] = k
+        k = j
+    heap[k] = x
+    pos[x] = k
+
+
 def _pq_check(pq: Pq) -> None:
     """Mirror C's ``PQcheck`` invariant: ``pq.pq[i].n_idx == i``.
 
@@ -130,7 +130,8 @@ def update_wts(g: Sgraph, cp: Cell, ep) -> None:
 
     Bend edges are always bumped; straight edges are bumped only if
     the passing route ``ep`` itself bends, or if ``ep`` is the very
-    edge being updated.
+    edge being updated.  The new weights are mirrored into ``g.wt``,
+    the array :func:`sgraph.short_path` reads.
     """
     # BEND(g, e) — the two endpoints have different isVert.
     def _bend(e) -> bool:
@@ -139,6 +140,8 @@ def update_wts(g: Sgraph, cp: Cell, ep) -> None:
     def _horz(e) -> bool:
         return g.nodes[e.v1].is_vert
 
+    wt = g.wt
+
     is_bend_ep = _bend(ep)
     hsz = _chansz(cp.bb.UR.y - cp.bb.LL.y)
     vsz = _chansz(cp.bb.UR.x - cp.bb.LL.x)
@@ -151,11 +154,13 @@ def update_wts(g: Sgraph, cp: Cell, ep) -> None:
         if not _bend(e):
             break
         update_wt(e, minsz)
+        wt[e.index] = e.weight
         i += 1
     while i < cp.nedges:
         e = cp.edges[i]
         if is_bend_ep or e is ep:
             update_wt(e, hsz if _horz(e) else vsz)
+            wt[e.index] = e.weight
         i += 1
 
 
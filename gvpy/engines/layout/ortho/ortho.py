@@ -22,6 +22,16 @@ divergences where faithful reproduction would fight Python idiom:
 - The ``OPTIONAL(size_t)`` fields in ``Segment`` (``ind_no``,
   ``track_no``) are plain ``Optional[int]`` — C stores them in a
   tagged-union-like struct.
+- ``GVPY_ORTHO_ASTAR=1`` routes each edge with
+  :func:`sgraph.short_path_astar` under a Manhattan-distance bound
+  (:func:`_astar_bound`) instead of Dijkstra.  Route costs are the
+  same up to the integer truncation of distances, but ties between
+  equal-cost routes can break differently from ``dot.exe``, so it is
+  opt-in.
+- ``GVPY_ORTHO_PARTITION=sweep`` builds the maze cells with
+  :func:`partition.sweep_partition` (see :mod:`partition`) — the same
+  cells, in a different order, for graphs too large for Seidel's
+  trapezoidation.
 
 :func:`ortho_edges` is the single public entry, invoked from
 :mod:`gvpy.engines.layout.dot.dotsplines` under ``GVPY_ORTHO_V2=1``.
@@ -29,10 +39,13 @@ divergences where faithful reproduction would fight Python idiom:
 
 from __future__ import annotations
 
+import os
 import sys
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
+
 from gvpy.engines.layout.common.geom import Ppoint
 from gvpy.engines.layout.ortho import fpq, rawgraph, sgraph as sgraph_mod
 from gvpy.engines.layout.ortho.maze import (
@@ -56,7 +69,9 @@ from gvpy.engines.layout.ortho.sgraph import (
     create_sedge,
     gsave,
     reset,
+    set_weight,
     short_path,
+    short_path_astar,
 )
 from gvpy.engines.layout.ortho.structures import Bend, Paird, Route, Segment
 
@@ -1070,21 +1085,83 @@ def _edge_member_cluster_idxs(inp: "OrthoEdgeInput",
     return members
 
 
-def _apply_cluster_penalty(mp: Maze, avoid_cell_idxs: set[int]) -> None:
-    """Bump every sedge in the named cells by :data:`_CLUSTER_PENALTY`.
+class _ClusterWeights:
+    """Per-edge weight vectors for :attr:`Sgraph.weights`, one per
+    distinct set of avoided clusters.
+
+    Every maze sedge weighs its ``base_weight``, plus
+    :data:`_CLUSTER_PENALTY` when its cell overlaps an avoided
+    cluster.  Edges with the same endpoint memberships avoid the same
+    clusters, so each vector is built once (with NumPy) and reused;
+    the sedges themselves are never rewritten.
+    """
+
+    def __init__(self, mp: Maze, info: _ClusterInfo) -> None:
+        sg = mp.sg
+        edge_idx = {id(e): i for i, e in enumerate(sg.edges[:sg.nedges])}
+        self._base = np.array([e.base_weight
+                               for e in sg.edges[:sg.nedges]], dtype=float)
+        self._cluster_edges = [
+            np.array(sorted({edge_idx[id(e)] for ci in cells
+                             for e in mp.cells[ci].edges}), dtype=np.int64)
+            for cells in info.cell_idxs
+        ]
+        self._cache: dict[frozenset[int], list[float]] = {}
+
+    def vector(self, avoid: frozenset[int]) -> list[float]:
+        """Weights with the clusters ``avoid`` penalised."""
+        w = self._cache.get(avoid)
+        if w is None:
+            wts = self._base.copy()
+            if avoid:
+                idx = np.concatenate([self._cluster_edges[ci]
+                                      for ci in sorted(avoid)])
+                wts[idx] = self._base[idx] + _CLUSTER_PENALTY
+            w = self._cache[avoid] = wts.tolist()
+        return w
+
+
+def _snode_positions(sg: Sgraph, nnodes: int) -> tuple[np.ndarray, np.ndarray]:
+    """Midpoints of the cell sides the first ``nnodes`` snodes stand for.
+
+    A side snode is shared by the two cells on either side of it; the
+    ordinary (non-node) cell's side is the snode's full extent.
+    """
+    xs = np.zeros(nnodes)
+    ys = np.zeros(nnodes)
+    for i in range(nnodes):
+        n = sg.nodes[i]
+        c0, c1 = n.cells
+        if c0 is None or (c1 is not None and is_node(c0)):
+            bb = c1.bb
+            x, y = bb.LL.x, bb.LL.y      # its left / bottom side
+        else:
+            bb = c0.bb
+            x, y = bb.UR.x, bb.UR.y      # its right / top side
+        if n.is_vert:
+            xs[i], ys[i] = x, (bb.LL.y + bb.UR.y) / 2
+        else:
+            xs[i], ys[i] = (bb.LL.x + bb.UR.x) / 2, y
+    return xs, ys
+
 
-    Starts from ``base_weight`` each time so per-edge penalties don't
-    accumulate across routing iterations.
+def _astar_bound(xs: np.ndarray, ys: np.ndarray, target: Cell,
+                 size: int) -> list[float]:
+    """Manhattan distance from every snode to ``target``'s bbox.
+
+    A lower bound on the remaining route cost for
+    :func:`short_path_astar`: crossing a cell straight costs its
+    extent (``DELTA * w``) and turning in it costs ``(w + h) / 2 +
+    MU`` for a ``w/2 + h/2`` displacement, so no route gains more
+    than one unit of distance per unit of cost (up to the integer
+    truncation of distances).  Terminal slots past ``len(xs)`` get 0.
     """
-    # Reset all edges to base first (clears prior iteration's bumps).
-    for cp in mp.cells:
-        for e in cp.edges:
-            e.weight = e.base_weight
-    # Apply the current edge's penalties.
-    for idx in avoid_cell_idxs:
-        cp = mp.cells[idx]
-        for e in cp.edges:
-            e.weight = e.base_weight + _CLUSTER_PENALTY
+    bb = target.bb
+    d = (np.maximum(bb.LL.x - xs, 0.0) + np.maximum(xs - bb.UR.x, 0.0)
+         + np.maximum(bb.LL.y - ys, 0.0) + np.maximum(ys - bb.UR.y, 0.0))
+    h = d.tolist()
+    h.extend([0.0] * (size - len(h)))
+    return h
 
 
 def ortho_edges(layout, *, use_lbls: bool) -> dict[int, list]:
@@ -1150,8 +1227,13 @@ def ortho_edges(layout, *, use_lbls: bool) -> dict[int, list]:
     dn = sg.nodes[gstart + 1]
 
     pq = fpq.pq_gen(sg.nnodes + 2)
+    use_astar = os.environ.get("GVPY_ORTHO_ASTAR") == "1"
+    if use_astar:
+        pos_x, pos_y = _snode_positions(sg, gstart)
 
-    all_cluster_idxs = set(range(len(cluster_info.bboxes)))
+    all_cluster_idxs = frozenset(range(len(cluster_info.bboxes)))
+    cluster_weights = (_ClusterWeights(mp, cluster_info)
+                       if cluster_info.bboxes else None)
     routes: list[Route] = []
     routed_inputs: list[OrthoEdgeInput] = []
     for inp in sorted_inputs:
@@ -1164,12 +1246,10 @@ def ortho_edges(layout, *, use_lbls: bool) -> dict[int, list]:
 
         # Per-edge cluster avoidance: weight up every cell whose bbox
         # sits inside a cluster that contains neither endpoint.
-        if cluster_info.bboxes:
+        if cluster_weights is not None:
             member_idxs = _edge_member_cluster_idxs(inp, cluster_info)
-            avoid_cells: set[int] = set()
-            for ci in all_cluster_idxs - member_idxs:
-                avoid_cells |= cluster_info.cell_idxs[ci]
-            _apply_cluster_penalty(mp, avoid_cells)
+            sg.weights = cluster_weights.vector(
+                all_cluster_idxs - member_idxs)
 
         if start_cell is dest_cell:
             _add_loop(sg, start_cell, dn, sn)
@@ -1177,7 +1257,12 @@ def ortho_edges(layout, *, use_lbls: bool) -> dict[int, list]:
             _add_node_edges(sg, dest_cell, dn)
             _add_node_edges(sg, start_cell, sn)
 
-        rc = short_path(pq, sg, dn, sn)
+        if use_astar:
+            rc = short_path_astar(
+                sg, dn, sn,
+                _astar_bound(pos_x, pos_y, start_cell, len(sg.nodes)))
+        else:
+            rc = short_path(pq, sg, dn, sn)
         if rc != 0:
             if _ortho_trace:
                 trace("ortho_route", "shortPath overflow — abort")
@@ -1189,11 +1274,13 @@ def ortho_edges(layout, *, use_lbls: bool) -> dict[int, list]:
         reset(sg)
 
     # Restore base weights so downstream channel/track assignment sees
-    # the original per-cell cost structure, not the last edge's penalty.
-    if cluster_info.bboxes:
+    # the original per-cell cost structure, not the last edge's
+    # penalty or congestion bumps.
+    if cluster_weights is not None:
+        sg.weights = None
         for cp in mp.cells:
             for e in cp.edges:
-                e.weight = e.base_weight
+                set_weight(sg, e, e.base_weight)
 
     mp.hchans = _extract_h_chans(mp)
     mp.vchans = _extract_v_chans(mp)
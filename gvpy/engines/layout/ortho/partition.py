@@ -22,14 +22,26 @@ permutation for segment insertion order.  The Python port uses the
 Callers that need byte-identical trapezoidation can pass explicit
 ``hor_permute`` / ``ver_permute`` arguments.  The RNG path is not
 reproduced.
+
+Python addition: ``GVPY_ORTHO_PARTITION=sweep`` (or
+``partition(..., method="sweep")``) computes the same rectangle set
+with :func:`sweep_partition` — a sweep-line pass per direction over
+the cell boxes plus an array intersection — instead of two Seidel
+trapezoidations.  Its output order differs from the trapezoid path
+(rectangles come out sorted), so the ortho routes built on it may
+differ where equal-cost choices exist.
 """
 
 from __future__ import annotations
 
+import os
 import sys
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
+
 from gvpy.engines.layout.common.geom import Ppoint
 from gvpy.engines.layout.ortho import trapezoid
 from gvpy.engines.layout.ortho.trapezoid import (
@@ -682,12 +694,126 @@ def _rect_intersect(r0: Boxf, r1: Boxf) -> Optional[Boxf]:
     return Boxf(LL=Ppoint(ll_x, ll_y), UR=Ppoint(ur_x, ur_y))
 
 
+# ---------- sweep-line partition (Python addition) ----------
+
+# Vertical rectangles intersected per vectorised step.
+_SWEEP_BAND = 64
+
+
+def _sweep_decomp(boxes: np.ndarray, lo: float, hi: float,
+                  start: float, stop: float) -> list[tuple]:
+    """Horizontal-thread decomposition of ``[lo, hi] x [start, stop]``
+    minus ``boxes`` (``(n, 4)`` rows ``a0, b0, a1, b1``; the sweep runs
+    along ``b``).
+
+    Equivalent to the trapezoids :func:`_traverse_polygon` emits: a free
+    interval between two active boxes (or the outer box) stays one
+    rectangle until a box corner lands on its closure, which is where
+    Seidel's algorithm threads a horizontal through it.  Slivers
+    thinner than ``C_EPS`` are dropped, as there.  Boxes must not
+    overlap.  Returns ``(a0, b0, a1, b1)`` tuples.
+    """
+    events: dict[float, list[int]] = {}
+    for i, (b0, b1) in enumerate(zip(boxes[:, 1].tolist(),
+                                     boxes[:, 3].tolist())):
+        events.setdefault(b0, []).append(i)
+        events.setdefault(b1, []).append(i)
+    a0s = boxes[:, 0].tolist()
+    a1s = boxes[:, 2].tolist()
+    b0s = boxes[:, 1].tolist()
+
+    act_lo: list[float] = []        # active boxes, sorted by a0
+    act_hi: list[float] = []        # their a1, in the same order
+    opened: dict[float, float] = {lo: start}    # gap's left end -> b0
+    out: list[tuple] = []
+
+    def gaps(a: float, b: float) -> range:
+        # Gaps whose closure meets [a, b]; gap i lies between active
+        # boxes i - 1 and i.
+        return range(bisect_left(act_lo, a), bisect_right(act_hi, b) + 1)
+
+    def gap(i: int) -> tuple[float, float]:
+        return (act_hi[i - 1] if i else lo,
+                act_lo[i] if i < len(act_lo) else hi)
+
+    for y in sorted(events):
+        if y >= stop:
+            break
+        cells = events[y]
+        for c in cells:
+            for i in gaps(a0s[c], a1s[c]):
+                l, r = gap(i)
+                y0 = opened.pop(l, None)
+                if y0 is not None and y > y0 + C_EPS:
+                    out.append((l, y0, r, y))
+        for c in cells:
+            if b0s[c] == y:
+                k = bisect_left(act_lo, a0s[c])
+                act_lo.insert(k, a0s[c])
+                act_hi.insert(k, a1s[c])
+            else:
+                k = bisect_left(act_lo, a0s[c])
+                del act_lo[k]
+                del act_hi[k]
+        for c in cells:
+            for i in gaps(a0s[c], a1s[c]):
+                l, r = gap(i)
+                if r > l + C_EPS:
+                    opened.setdefault(l, y)
+    for l, y0 in opened.items():
+        k = bisect_right(act_hi, l)
+        r = act_lo[k] if k < len(act_lo) else hi
+        if stop > y0 + C_EPS:
+            out.append((l, y0, r, stop))
+    return out
+
+
+def sweep_partition(cells: list[Cell], ncells: int, bb: Boxf) -> list[Boxf]:
+    """Rectangle decomposition of ``bb`` around ``cells`` by sweep lines.
+
+    Python addition; same rectangle set as the trapezoid path of
+    :func:`partition`, sorted by ``(LL.x, LL.y, UR.x, UR.y)``.  Each
+    direction is one sweep over the cell boxes in ``O(n log n)`` plus
+    the output, and the pairwise intersection of the two
+    decompositions is vectorised over bands of neighbouring
+    rectangles.
+    """
+    boxes = np.array([(c.bb.LL.x, c.bb.LL.y, c.bb.UR.x, c.bb.UR.y)
+                      for c in cells[:ncells]], dtype=float).reshape(-1, 4)
+    hor = np.array(_sweep_decomp(boxes, bb.LL.x, bb.UR.x,
+                                 bb.LL.y, bb.UR.y), dtype=float)
+    ver = np.array(_sweep_decomp(boxes[:, [1, 0, 3, 2]], bb.LL.y, bb.UR.y,
+                                 bb.LL.x, bb.UR.x), dtype=float)
+    ver = ver.reshape(-1, 4)[:, [1, 0, 3, 2]]
+    hor = hor.reshape(-1, 4)
+
+    # Intersect bands of x-sorted vertical rectangles with the
+    # horizontal ones overlapping the band's x-extent.
+    ver = ver[np.argsort(ver[:, 0], kind="stable")]
+    parts = []
+    for k in range(0, len(ver), _SWEEP_BAND):
+        v = ver[k:k + _SWEEP_BAND]
+        h = hor[(hor[:, 0] < v[:, 2].max()) & (hor[:, 2] > v[0, 0])]
+        ll = np.maximum(v[:, None, :2], h[None, :, :2])
+        ur = np.minimum(v[:, None, 2:], h[None, :, 2:])
+        keep = (ll < ur).all(axis=2)
+        parts.append(np.concatenate([ll[keep], ur[keep]], axis=1))
+    rects = np.concatenate(parts) if parts else np.empty((0, 4))
+    rects = rects[np.lexsort(rects.T[::-1])]
+    return [Boxf(LL=Ppoint(x0, y0), UR=Ppoint(x1, y1))
+            for x0, y0, x1, y1 in rects.tolist()]
+
+
 # ---------- public entry point ----------
 
+# Values of ``partition(method=...)`` / ``GVPY_ORTHO_PARTITION``.
+_METHODS = ("seidel", "sweep")
+
 
 def partition(cells: list[Cell], ncells: int, bb: Boxf,
               hor_permute: Optional[list[int]] = None,
-              ver_permute: Optional[list[int]] = None) -> list[Boxf]:
+              ver_permute: Optional[list[int]] = None,
+              method: Optional[str] = None) -> list[Boxf]:
     """Decompose ``bb`` around ``cells`` into axis-aligned rectangles.
 
     Port of ``partition.c::partition``.
@@ -704,6 +830,11 @@ def partition(cells: list[Cell], ncells: int, bb: Boxf,
         (``None``) uses identity ``[1, 2, ..., nsegs]`` — deterministic
         and correct, though different from C's RNG-based ordering.
         See the module docstring for why this is safe.
+    method
+        ``"seidel"`` (the C algorithm) or ``"sweep"``
+        (:func:`sweep_partition`).  Default: ``GVPY_ORTHO_PARTITION``,
+        else ``"seidel"``; an unknown environment value is ignored.
+        The permutations only apply to ``"seidel"``.
 
     Returns
     -------
@@ -712,8 +843,20 @@ def partition(cells: list[Cell], ncells: int, bb: Boxf,
         Order is not guaranteed; callers that need a canonical form
         should sort by ``(LL.x, LL.y, UR.x, UR.y)``.
     """
-    nsegs = 4 * (ncells + 1)
+    if method is None:
+        method = os.environ.get("GVPY_ORTHO_PARTITION", "seidel")
+        if method not in _METHODS:
+            method = "seidel"
+    elif method not in _METHODS:
+        raise ValueError(f"unknown partition method {method!r}; "
+                         f"expected one of {', '.join(_METHODS)}")
     _emit_entry_trace(ncells, bb)
+    if method == "sweep":
+        rects = sweep_partition(cells, ncells, bb)
+        _emit_exit_trace(rects)
+        return rects
+
+    nsegs = 4 * (ncells + 1)
 
     # Segment array is 1-indexed: seg[0] placeholder, seg[1..nsegs] populated.
     seg_h = _new_seg_array(nsegs)
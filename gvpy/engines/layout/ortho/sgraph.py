@@ -21,16 +21,40 @@ Semantics track C verbatim (``lib/ortho/sgraph.c``):
   assigns ``d = -(int + double)`` back to ``int n_val``, implicitly
   truncating toward zero.  :func:`short_path` mirrors that truncation
   with an explicit :class:`int` cast.
+
+Python additions for routing many edges over one maze:
+
+- Search state is invalidated with a generation counter
+  (``Sgraph.stamp`` / ``Sgraph.gen``) instead of C's
+  ``N_VAL(n) = UNSEEN`` sweep over every node at the start of each
+  search; :func:`reset` only restores the nodes that gained edges
+  since :func:`gsave` (``Sgraph.touched``).
+- ``Sgraph.weights``, when set, overrides ``Sedge.weight`` for the
+  first ``len(weights)`` edges, so a caller can swap a whole weight
+  vector (ortho's cluster penalties) without rewriting the edges.
+- :func:`short_path_astar` — goal-directed variant of
+  :func:`short_path` for callers that can bound the remaining cost.
+- The searches run on flat arrays rather than :class:`Snode` /
+  :class:`Sedge` objects: a CSR adjacency of the checkpointed graph
+  (``ptr`` / ``nbr`` / ``eid``, rebuilt by :func:`gsave`) plus the
+  edges added since, the edge weight array ``Sgraph.wt``, per-node
+  value / parent lists, and :class:`fpq.IntPq`.  Only the nodes on
+  the found path get ``n_val`` / ``n_dad`` / ``n_edge`` written
+  back.  The arrays are Python lists: the search indexes them one
+  element at a time, which lists do faster than NumPy arrays.
+  Edge weights must therefore be changed with :func:`set_weight`.
 """
 
 from __future__ import annotations
 
+import heapq
 import sys
 from dataclasses import dataclass, field
+from itertools import chain
 from typing import Optional
 
 from gvpy.engines.layout.ortho import fpq
-from gvpy.engines.layout.ortho.fpq import Pq
+from gvpy.engines.layout.ortho.fpq import IntPq, Pq
 
 UNSEEN: int = -(2 ** 31)  # matches INT_MIN in the C port
 
@@ -65,6 +89,7 @@ class Sedge:
     v1: int = 0
     v2: int = 0
     base_weight: float = 0.0
+    index: int = 0
 
 
 @dataclass
@@ -76,6 +101,17 @@ class Sgraph:
     save_nedges: int = 0
     nodes: list[Snode] = field(default_factory=list)
     edges: list[Sedge] = field(default_factory=list)
+    # Python additions — see the module docstring.
+    stamp: list[int] = field(default_factory=list)
+    gen: int = 0
+    weights: Optional[list[float]] = None
+    touched: list[int] = field(default_factory=list)
+    wt: list[float] = field(default_factory=list)
+    val: list[int] = field(default_factory=list)
+    dad: list[int] = field(default_factory=list)
+    dad_edge: list[int] = field(default_factory=list)
+    csr: Optional[tuple] = None
+    ipq: Optional[IntPq] = None
 
 
 def create_sgraph(nnodes: int) -> Sgraph:
@@ -112,17 +148,29 @@ def create_sedge(g: Sgraph, v1: Snode, v2: Snode, wt: float) -> Sedge:
     """``createSEdge`` — append a new edge, hook into both endpoints."""
     idx = g.nedges
     g.nedges += 1
-    e = Sedge(v1=v1.index, v2=v2.index, weight=wt, cnt=0, base_weight=wt)
+    e = Sedge(v1=v1.index, v2=v2.index, weight=wt, cnt=0, base_weight=wt,
+              index=idx)
     # C pre-allocates the edges array; Python grows on demand.
     if idx < len(g.edges):
         g.edges[idx] = e
+        g.wt[idx] = wt
     else:
         g.edges.append(e)
+        g.wt.append(wt)
     _add_edge_to_node(v1, idx)
     _add_edge_to_node(v2, idx)
+    g.touched.append(v1.index)
+    g.touched.append(v2.index)
     return e
 
 
+def set_weight(g: Sgraph, e: Sedge, wt: float) -> None:
+    """Set ``e``'s weight in the edge object and in ``g.wt``, the
+    array the searches read."""
+    e.weight = wt
+    g.wt[e.index] = wt
+
+
 def init_sedges(g: Sgraph, maxdeg: int) -> None:
     """``initSEdges`` — reserve edges/adj capacity.
 
@@ -140,6 +188,8 @@ def gsave(g: Sgraph) -> None:
     g.save_nedges = g.nedges
     for i in range(g.nnodes):
         g.nodes[i].save_n_adj = g.nodes[i].n_adj
+    g.touched.clear()
+    g.csr = None
 
 
 def reset(g: Sgraph) -> None:
@@ -147,16 +197,21 @@ def reset(g: Sgraph) -> None:
 
     Truncates every per-node ``adj_edge_list`` back to its saved
     length, then zeroes adj on the +2 terminal slots that ortho's
-    per-edge routing populates after ``gsave``.
+    per-edge routing populates after ``gsave``.  Only nodes that
+    gained an edge since the checkpoint can differ from it, so only
+    those (``g.touched``) are visited.
     """
     g.nnodes = g.save_nnodes
     g.nedges = g.save_nedges
-    for i in range(g.nnodes):
+    for i in set(g.touched):
+        if i >= g.nnodes:
+            continue
         node = g.nodes[i]
         node.n_adj = node.save_n_adj
         # Truncate in place so subsequent _add_edge_to_node appends
         # cleanly without leaving stale mid-list entries.
         del node.adj_edge_list[node.save_n_adj:]
+    g.touched.clear()
     # C resets n_adj=0 on nodes[nnodes], nodes[nnodes+1] (the two
     # terminals allocated for the routing-pair).  In Python those
     # slots may or may not exist depending on whether create_snode
@@ -166,62 +221,237 @@ def reset(g: Sgraph) -> None:
         g.nodes[i].adj_edge_list = []
 
 
+def _adjacency(g: Sgraph) -> tuple[list[int], list[int], list[int], dict]:
+    """CSR adjacency of the checkpointed graph plus the later edges.
+
+    Returns ``(ptr, nbr, eid, extra)``: node ``i``'s checkpointed
+    edges are ``eid[ptr[i]:ptr[i + 1]]`` leading to ``nbr[...]``, in
+    ``adj_edge_list`` order; ``extra[i]`` lists ``(nbr, eid)`` for the
+    edges added since :func:`gsave` (the per-route terminals), which
+    follow them in that order too.
+    """
+    n = len(g.nodes)
+    if g.csr is None or len(g.csr[0]) != n + 1:
+        edges = g.edges
+        ptr = [0]
+        nbr: list[int] = []
+        eid: list[int] = []
+        for i, node in enumerate(g.nodes):
+            if i < g.save_nnodes:
+                for ei in node.adj_edge_list[:node.save_n_adj]:
+                    e = edges[ei]
+                    nbr.append(e.v2 if e.v1 == i else e.v1)
+                    eid.append(ei)
+            ptr.append(len(nbr))
+        g.csr = (ptr, nbr, eid)
+    extra: dict[int, list[tuple[int, int]]] = {}
+    for ei in range(g.save_nedges, g.nedges):
+        e = g.edges[ei]
+        extra.setdefault(e.v1, []).append((e.v2, ei))
+        extra.setdefault(e.v2, []).append((e.v1, ei))
+    return (*g.csr, extra)
+
+
+def _new_search(g: Sgraph) -> tuple[int, list[int]]:
+    """Start a search generation; nodes stamped with an older one
+    count as ``UNSEEN``.  Also sizes the per-node arrays (one spare
+    slot: the :class:`IntPq` guard, whose value stays 0)."""
+    n = len(g.nodes) + 1
+    if len(g.stamp) < n:
+        grow = n - len(g.stamp)
+        g.stamp.extend([0] * grow)
+        g.val.extend([0] * grow)
+        g.dad.extend([-1] * grow)
+        g.dad_edge.extend([-1] * grow)
+    g.gen += 1
+    return g.gen, g.stamp
+
+
+def _write_path(g: Sgraph, to: Snode, reached: bool) -> None:
+    """Copy the search result for the path ending at ``to`` onto the
+    :class:`Snode` objects."""
+    if not reached:
+        to.n_val = UNSEEN
+        return
+    nodes = g.nodes
+    i = to.index
+    while i >= 0:
+        node = nodes[i]
+        node.n_val = g.val[i]
+        j = g.dad[i]
+        node.n_dad = nodes[j] if j >= 0 else None
+        if j >= 0:
+            node.n_edge = g.edges[g.dad_edge[i]]
+        i = j
+
+
 def short_path(pq: Pq, g: Sgraph, from_: Snode, to: Snode) -> int:
     """``shortPath`` — Dijkstra from ``from_`` to ``to``.
 
-    Writes results into each node: ``n_val`` holds the final distance
-    (positive) or remains ``UNSEEN`` if unreachable; ``n_dad`` gives the
-    predecessor for path reconstruction; ``n_edge`` gives the edge
-    taken into the node.
+    On return ``to.n_val`` holds the final distance (positive) or
+    ``UNSEEN`` if unreachable, and the ``n_dad`` chain from ``to``
+    leads back to ``from_`` with ``n_edge`` the edge taken into each
+    node.  The search itself runs on the arrays described in the
+    module docstring; ``pq`` only supplies the heap capacity (C's
+    ``Heap overflow`` bound).  Relaxation and heap order follow C, so
+    the same path comes back.
 
     Returns 0 on success, 1 on heap overflow.
     """
     _emit_entry_trace(g, from_, to)
 
-    for x in range(g.nnodes):
-        g.nodes[x].n_val = UNSEEN
-
-    fpq.pq_init(pq)
-    if fpq.pq_insert(pq, from_):
+    ptr, nbr, eid, extra = _adjacency(g)
+    gen, stamp = _new_search(g)
+    val, dad, dad_edge = g.val, g.dad, g.dad_edge
+    wt = g.wt
+    wts = g.weights or ()
+    nw = len(wts)
+    ipq = g.ipq
+    if ipq is None or ipq.size != pq.size or ipq.guard != len(g.nodes):
+        ipq = g.ipq = fpq.ipq_gen(pq.size, len(g.nodes))
+    ipq.cnt = 0
+    val[ipq.guard] = 0
+    heap, pos, size = ipq.heap, ipq.pos, ipq.size
+
+    f = from_.index
+    t = to.index
+    val[f] = UNSEEN
+    if fpq.ipq_insert(ipq, f, val):
         _emit_overflow_trace()
         return 1
-    from_.n_dad = None
-    from_.n_val = 0
-
-    while True:
-        n = fpq.pq_remove(pq)
-        if n is None:
-            break
-        n.n_val *= -1
-        if n is to:
+    stamp[f] = gen
+    dad[f] = -1
+    val[f] = 0
+
+    # The pops and inserts below are fpq.ipq_remove / ipq_insert
+    # inlined: they run once per settled / discovered node.
+    cnt = 1
+    while cnt:
+        n = heap[1]
+        x = heap[cnt]
+        cnt -= 1
+        if cnt:
+            v = val[x]
+            k = 1
+            lim = cnt // 2
+            while k <= lim:
+                j = k + k
+                m = heap[j]
+                if j < cnt:
+                    m2 = heap[j + 1]
+                    if val[m] < val[m2]:
+                        j += 1
+                        m = m2
+                if v >= val[m]:
+                    break
+                heap[k] = m
+                pos[m] = k
+                k = j
+            heap[k] = x
+            pos[x] = k
+        vn = val[n] = -val[n]
+        if n == t:
             break
-        for y in range(n.n_adj):
-            e = g.edges[n.adj_edge_list[y]]
-            adjn = _adjacent_node(g, e, n)
-            if adjn.n_val < 0:
-                d = int(-(n.n_val + e.weight))
-                if adjn.n_val == UNSEEN:
-                    adjn.n_val = d
-                    if fpq.pq_insert(pq, adjn):
-                        _emit_overflow_trace()
-                        return 1
-                    adjn.n_dad = n
-                    adjn.n_edge = e
-                else:
-                    if adjn.n_val < d:
-                        fpq.pq_update(pq, adjn, d)
-                        adjn.n_dad = n
-                        adjn.n_edge = e
-
+        lo, hi = ptr[n], ptr[n + 1]
+        adj = zip(nbr[lo:hi], eid[lo:hi])
+        if n in extra:
+            adj = chain(adj, extra[n])
+        for a, ei in adj:
+            if stamp[a] != gen:
+                stamp[a] = gen
+                v = val[a] = int(-(vn + (wts[ei] if ei < nw else wt[ei])))
+                if cnt == size:
+                    ipq.cnt = cnt
+                    fpq.ipq_insert(ipq, a, val)
+                    _emit_overflow_trace()
+                    return 1
+                cnt += 1
+                k = cnt
+                up = k >> 1
+                while val[heap[up]] < v:
+                    m = heap[up]
+                    heap[k] = m
+                    pos[m] = k
+                    k = up
+                    up >>= 1
+                heap[k] = a
+                pos[a] = k
+                dad[a] = n
+                dad_edge[a] = ei
+            elif val[a] < 0:
+                d = int(-(vn + (wts[ei] if ei < nw else wt[ei])))
+                if val[a] < d:
+                    ipq.cnt = cnt
+                    fpq.ipq_update(ipq, a, val, d)
+                    dad[a] = n
+                    dad_edge[a] = ei
+    ipq.cnt = cnt
+
+    _write_path(g, to, stamp[t] == gen)
     _emit_exit_trace(to)
     return 0
 
 
-def _adjacent_node(g: Sgraph, e: Sedge, n: Snode) -> Snode:
-    """Return the endpoint of ``e`` that is not ``n``."""
-    if e.v1 == n.index:
-        return g.nodes[e.v2]
-    return g.nodes[e.v1]
+def short_path_astar(g: Sgraph, from_: Snode, to: Snode,
+                     h: list[float]) -> int:
+    """A* from ``from_`` to ``to`` — Python addition.
+
+    ``h[i]`` is a lower bound on the remaining cost from node ``i`` to
+    ``to`` (``h[to.index] == 0``).  Nodes are expanded in order of
+    tentative distance plus ``h`` from a :mod:`heapq` with lazy
+    deletion, so far fewer of them are settled than by
+    :func:`short_path`.  Distances, the ``int`` truncation and the
+    ``n_val`` / ``n_dad`` / ``n_edge`` results follow
+    :func:`short_path`; among equal-cost paths a different one may
+    be returned.
+
+    Returns 0 (never overflows).
+    """
+    _emit_entry_trace(g, from_, to)
+
+    ptr, nbr, eid, extra = _adjacency(g)
+    gen, stamp = _new_search(g)
+    closed, _ = _new_search(g)
+    val, dad, dad_edge = g.val, g.dad, g.dad_edge
+    wt = g.wt
+    wts = g.weights or ()
+    nw = len(wts)
+
+    f = from_.index
+    t = to.index
+    stamp[f] = gen
+    dad[f] = -1
+    val[f] = 0
+    heap = [(h[f], 0, f)]
+    seq = 1
+    while heap:
+        _, _, n = heapq.heappop(heap)
+        if stamp[n] == closed:
+            continue
+        stamp[n] = closed
+        vn = val[n] = -val[n]
+        if n == t:
+            break
+        lo, hi = ptr[n], ptr[n + 1]
+        adj = zip(nbr[lo:hi], eid[lo:hi])
+        if n in extra:
+            adj = chain(adj, extra[n])
+        for a, ei in adj:
+            s = stamp[a]
+            if s == closed:
+                continue
+            d = int(-(vn + (wts[ei] if ei < nw else wt[ei])))
+            if s != gen or val[a] < d:
+                stamp[a] = gen
+                val[a] = d
+                dad[a] = n
+                dad_edge[a] = ei
+                heapq.heappush(heap, (h[a] - d, seq, a))
+                seq += 1
+
+    _write_path(g, to, stamp[t] == closed)
+    _emit_exit_trace(to)
+    return 0
 
 
 def _add_edge_to_node(np: Snode, idx: int) -> None:
@@ -34,6 +34,7 @@ from gvpy.engines.layout.pathplan.pathgeom import (
 from gvpy.engines.layout.pathplan.solvers import solve1, solve2, solve3
 from gvpy.engines.layout.pathplan.visibility import (
     allocArray,
+    boxes_disjoint,
     area2,
     clear,
     compVis,
@@ -47,6 +48,7 @@ from gvpy.engines.layout.pathplan.visibility import (
     polyhit,
     ptVis,
     visibility,
+    visible_from,
     wind,
 )
 from gvpy.engines.layout.pathplan.inpoly import in_poly
@@ -69,7 +71,11 @@ from gvpy.engines.layout.pathplan.triang import (
     isdiagonal,
 )
 from gvpy.engines.layout.pathplan.shortest import Pshortestpath
-from gvpy.engines.layout.pathplan.shortestpth import makePath, shortestPath
+from gvpy.engines.layout.pathplan.shortestpth import (
+    makePath,
+    shortestPath,
+    sparsePath,
+)
 from gvpy.engines.layout.pathplan.cvt import Pobsopen, Pobsclose, Pobspath
 
 __all__ = [
@@ -85,6 +91,7 @@ __all__ = [
     "solve3",
     # visibility
     "allocArray",
+    "boxes_disjoint",
     "area2",
     "clear",
     "compVis",
@@ -98,6 +105,7 @@ __all__ = [
     "polyhit",
     "ptVis",
     "visibility",
+    "visible_from",
     "wind",
     # vispath
     "POLYID_NONE",
@@ -121,6 +129,7 @@ __all__ = [
     # shortestpth
     "makePath",
     "shortestPath",
+    "sparsePath",
     # cvt (obstacle avoidance glue)
     "Pobsopen",
     "Pobsclose",
@@ -0,0 +1,239 @@
+"""Array kernels for the spline fitter in :mod:`route`.
+
+The C sources (``lib/pathplan/route.c``, ``lib/common/routespl.c``)
+work one ``Ppoint`` at a time; the Python port keeps those scalar
+functions as the reference and uses the kernels below where a loop
+runs over many points or barriers:
+
+- :func:`bernstein` / :func:`bezier_eval` — batched cubic evaluation
+  in the Bernstein form ``reallyroutespline`` uses.
+- :func:`casteljau` — batched evaluation in the de Casteljau form
+  ``limit_boxes`` uses.
+- :class:`Barriers` — a barrier edge list that carries its segments
+  as one ``(k, 4)`` array.
+- :func:`solve3` — ``solvers.solve3`` over a batch of cubics.
+- :func:`spline_crosses` — ``splineisinside``'s intrusion test
+  against every barrier at once, with a bounding-box prefilter.
+
+Each kernel performs the same floating-point operations, in the same
+order, as the scalar code it replaces.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from gvpy.engines.layout.pathplan.solvers import _EPS
+
+# Relative slack for the bounding-box prefilter — far above rounding
+# error in the cubic solve, far below any real clearance.
+_SLACK = 1e-7
+
+
+def as_array(points) -> np.ndarray:
+    """``(n, 2)`` float array of ``Ppoint``-like objects."""
+    return np.array([(p.x, p.y) for p in points], dtype=float).reshape(-1, 2)
+
+
+def bernstein(t: np.ndarray) -> np.ndarray:
+    """``(m, 4)`` cubic Bernstein weights ``B0 .. B3`` at ``t``,
+    computed as :func:`route.B0` .. :func:`route.B3` do."""
+    tmp = 1.0 - t
+    out = np.empty((len(t), 4))
+    out[:, 0] = tmp * tmp * tmp
+    out[:, 1] = 3 * t * tmp * tmp
+    out[:, 2] = 3 * t * t * tmp
+    out[:, 3] = t * t * t
+    return out
+
+
+def bezier_eval(cps: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Points of the cubic with control points ``cps`` (``(4, 2)``)
+    at every ``t``: ``B0 P0 + B1 P1 + B2 P2 + B3 P3``."""
+    b = bernstein(t)
+    return (b[:, 0, None] * cps[0] + b[:, 1, None] * cps[1]
+            + b[:, 2, None] * cps[2] + b[:, 3, None] * cps[3])
+
+
+def casteljau(cps: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Points of the cubic ``cps`` at every ``t`` by three rounds of
+    de Casteljau interpolation."""
+    t = t[:, None]
+    p0, p1, p2, p3 = (np.broadcast_to(c, (len(t), 2)) for c in cps)
+    p0 = p0 + t * (p1 - p0)
+    p1 = p1 + t * (p2 - p1)
+    p2 = p2 + t * (p3 - p2)
+    p0 = p0 + t * (p1 - p0)
+    p1 = p1 + t * (p2 - p1)
+    return p0 + t * (p1 - p0)
+
+
+class Barriers(list):
+    """List of ``Pedge`` barriers with cached segment arrays.
+
+    ``seg`` is the ``(k, 4)`` array ``ax, ay, bx, by``; the per-segment
+    bounding boxes, directions and slack used by
+    :func:`crossing_candidates` are derived from it once.
+    """
+
+    def __init__(self, edges=()):
+        super().__init__(edges)
+        self._seg = None
+        self._geom = None
+
+    @property
+    def seg(self) -> np.ndarray:
+        if self._seg is None or len(self._seg) != len(self):
+            self._seg = np.array([(e.a.x, e.a.y, e.b.x, e.b.y)
+                                  for e in self], dtype=float).reshape(-1, 4)
+            self._geom = None
+        return self._seg
+
+    def bounds(self) -> tuple[np.ndarray, np.ndarray, float]:
+        """Per-segment bounding boxes ``lo``, ``hi`` (``(k, 2)``) and
+        the largest absolute coordinate."""
+        seg = self.seg
+        if self._geom is None:
+            a = seg[:, 0:2]
+            b = seg[:, 2:4]
+            self._geom = (np.minimum(a, b), np.maximum(a, b),
+                          float(np.abs(seg).max()) if len(seg) else 0.0)
+        return self._geom
+
+
+def _aeq0(x: np.ndarray) -> np.ndarray:
+    return (-_EPS < x) & (x < _EPS)
+
+
+def solve3(coeff: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Real roots of the cubics ``coeff`` (``(k, 4)``, constant term
+    first), following ``solvers.solve3`` (and its ``solve2`` /
+    ``solve1`` fallbacks) branch for branch.
+
+    Returns ``(roots, degenerate)``: ``roots`` is ``(k, 3)`` with
+    ``nan`` in unused slots, and ``degenerate`` flags the rows
+    ``solve3`` reports as ``4`` (``0 == 0``).  Every branch is
+    evaluated for every row and selected afterwards, which is cheaper
+    than masking for the small batches the router produces.
+    """
+    d, c, b, a = coeff.T
+    roots = np.empty((len(coeff), 3))
+    with np.errstate(all="ignore"):
+        # solve3 — depressed cubic.
+        b_over_3a = b / (3 * a)
+        c_over_a = c / a
+        d_over_a = d / a
+        p = b_over_3a * b_over_3a
+        q = 2 * b_over_3a * p - b_over_3a * c_over_a + d_over_a
+        p = c_over_a / 3 - p
+        disc = q * q + 4 * p * p * p
+        neg = disc < 0
+        r = 0.5 * np.sqrt(-disc + q * q)
+        theta = np.arctan2(np.sqrt(-disc), -q)
+        temp = 2 * np.cbrt(r)
+        alpha = 0.5 * (np.sqrt(disc) - q)
+        beta = -q - alpha
+        one = np.cbrt(alpha) + np.cbrt(beta)
+        half = np.where(disc == 0, -0.5 * one, np.nan)
+        roots[:, 0] = np.where(neg, temp * np.cos(theta / 3), one)
+        roots[:, 1] = np.where(
+            neg, temp * np.cos((theta + np.pi + np.pi) / 3), half)
+        roots[:, 2] = np.where(
+            neg, temp * np.cos((theta - np.pi - np.pi) / 3), half)
+        roots -= b_over_3a[:, None]
+
+        # solve2 / solve1 where the leading coefficient vanishes.
+        lead3 = _aeq0(a)
+        if lead3.any():
+            b_over_2a = c / (2 * b)
+            disc2 = b_over_2a * b_over_2a - d / b
+            r0 = -b_over_2a + np.sqrt(disc2)
+            q0 = np.where(disc2 > 0, r0,
+                          np.where(disc2 == 0, -b_over_2a, np.nan))
+            q1 = np.where(disc2 > 0, -2 * b_over_2a - r0, np.nan)
+            lin = _aeq0(b)
+            l0 = np.where(_aeq0(c), np.nan, -d / c)
+            roots[lead3, 0] = np.where(lin, l0, q0)[lead3]
+            roots[lead3, 1] = np.where(lin, np.nan, q1)[lead3]
+            roots[lead3, 2] = np.nan
+    degenerate = lead3 & _aeq0(b) & _aeq0(c) & _aeq0(d)
+    return roots, degenerate
+
+
+def _horner(c: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """Evaluate power-form cubics ``c`` (``(n, 4)``) at ``t``
+    (``(n, 3)``) by Horner's rule."""
+    c = c[:, None, :]
+    return c[..., 0] + t * (c[..., 1] + t * (c[..., 2] + t * c[..., 3]))
+
+
+def _coeff(v: np.ndarray) -> np.ndarray:
+    """``route.points2coeff`` over the last axis of ``v``."""
+    v0, v1, v2, v3 = v[..., 0], v[..., 1], v[..., 2], v[..., 3]
+    return np.stack([v0, 3 * (v1 - v0), 3 * v0 + 3 * v2 - 6 * v1,
+                     v3 + 3 * v1 - (v0 + 3 * v2)], axis=-1)
+
+
+def spline_crosses(barriers: Barriers, cps: np.ndarray,
+                   eps1: float, eps2: float) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised intrusion test of ``route.splineisinside`` for a
+    batch of cubics ``cps`` (``(m, 4, 2)``) against every barrier.
+
+    Returns ``(crosses, point_rows)``: per cubic, whether it crosses a
+    barrier away from the curve ends and the barrier ends, and the
+    indices of zero-length barriers — which the caller tests with the
+    scalar code.  Only (cubic, barrier) pairs whose bounding boxes
+    overlap are solved: by the convex-hull property the cubic cannot
+    reach the others.
+    """
+    m = len(cps)
+    crosses = np.zeros(m, dtype=bool)
+    if len(barriers) == 0:
+        return crosses, np.empty(0, dtype=np.int64)
+    lo, hi, scale = barriers.bounds()
+    seg = barriers.seg
+    d = seg[:, 2:4] - seg[:, 0:2]
+    point = (d[:, 0] == 0) & (d[:, 1] == 0)
+    pad = _SLACK * (float(np.abs(cps).max()) + scale + 1.0)
+    box = ((lo[None] <= cps.max(axis=1)[:, None] + pad).all(axis=2)
+           & (hi[None] >= cps.min(axis=1)[:, None] - pad).all(axis=2)
+           & ~point)
+    ti, bi = np.nonzero(box)
+    if len(ti) == 0:
+        return crosses, np.nonzero(point)[0]
+    ax, ay, bx, by = seg[bi].T
+    dx, dy = d[bi].T
+    xs = cps[ti, :, 0]                              # (n, 4)
+    ys = cps[ti, :, 1]
+    gen = dx != 0
+
+    with np.errstate(all="ignore"):
+        rat = dy / np.where(gen, dx, 1.0)
+        # Case 3 rotates so the barrier is horizontal; case 2 (vertical
+        # barrier) solves x(t) = ax directly.
+        coeff = _coeff(np.where(gen[:, None], ys - rat[:, None] * xs, xs))
+        coeff[:, 0] = np.where(gen, coeff[:, 0] + (rat * ax - ay),
+                               coeff[:, 0] - ax)
+        tv, degenerate = solve3(coeff)
+        # Segment parameter of each root.
+        sv = np.where(gen[:, None],
+                      (_horner(_coeff(xs), tv) - ax[:, None]) / dx[:, None],
+                      (_horner(_coeff(ys), tv) - ay[:, None]) / dy[:, None])
+        ok = ((tv >= 0) & (tv <= 1) & (sv >= 0) & (sv <= 1)
+              & (tv >= eps2) & (tv <= 1 - eps2) & ~degenerate[:, None])
+        t = tv
+        td = t * t * t
+        tc = 3 * t * t * (1 - t)
+        tb = 3 * t * (1 - t) * (1 - t)
+        ta = (1 - t) * (1 - t) * (1 - t)
+        x = xs[:, None, :]
+        y = ys[:, None, :]
+        ipx = ta * x[..., 0] + tb * x[..., 1] + tc * x[..., 2] + td * x[..., 3]
+        ipy = ta * y[..., 0] + tb * y[..., 1] + tc * y[..., 2] + td * y[..., 3]
+        dx0 = ipx - ax[:, None]
+        dy0 = ipy - ay[:, None]
+        dx1 = ipx - bx[:, None]
+        dy1 = ipy - by[:, None]
+        ok &= dx0 * dx0 + dy0 * dy0 >= eps1
+        ok &= dx1 * dx1 + dy1 * dy1 >= eps1
+    crosses[ti[ok.any(axis=1)]] = True
+    return crosses, np.nonzero(point)[0]
@@ -27,6 +27,10 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from gvpy.engines.layout.pathplan.arrays import (
+    Barriers, as_array, bezier_eval, spline_crosses)
 from gvpy.engines.layout.pathplan.pathgeom import Pedge, Ppoint, Ppolyline, Pvector
 from gvpy.engines.layout.pathplan.solvers import solve3
 
@@ -36,6 +40,11 @@ from gvpy.engines.layout.pathplan.solvers import solve3
 EPSILON1 = 1e-3
 EPSILON2 = 1e-6
 
+# Python addition: barrier count from which :func:`splineisinside`
+# tests all barriers at once with :func:`...arrays.spline_crosses`;
+# below it the array overhead exceeds the scalar loop.
+_VECTOR_MIN = 64
+
 
 # ── Tna type ───────────────────────────────────────────────────────
 # See: /lib/pathplan/route.c @ 24
@@ -479,7 +488,21 @@ def splineisinside(edges: list[Pedge], sps: list[Ppoint]) -> bool:
     lies exactly on the barrier line) is skipped — C does
     ``continue`` on it, treating a fully-degenerate case as "no
     crossing to worry about".
+
+    Python addition: from ``_VECTOR_MIN`` barriers on, the same test
+    runs over every barrier at once (:func:`...arrays.spline_crosses`);
+    only zero-length barriers still take the scalar path.  ``edges``
+    may be a :class:`...arrays.Barriers` so the segment array is built
+    once per :func:`Proutespline` call.
     """
+    if len(edges) >= _VECTOR_MIN:
+        if not isinstance(edges, Barriers):
+            edges = Barriers(edges)
+        cps = np.array([[(p.x, p.y) for p in sps[:4]]], dtype=float)
+        crosses, point_rows = spline_crosses(edges, cps, EPSILON1, EPSILON2)
+        if crosses[0]:
+            return False
+        edges = [edges[ei] for ei in point_rows.tolist()]
     for edge in edges:
         lps = [edge.a, edge.b]
         rootn, roots = splineintersectsline(sps, lps)
@@ -550,6 +573,8 @@ def splinefits(edges: list[Pedge], pa: Ppoint, va: Pvector,
       line is by construction at least as good.
     """
     forceflag = 1 if inpn == 2 else 0
+    if len(edges) >= _VECTOR_MIN:
+        return _splinefits_batch(edges, pa, va, pb, vb, inps, inpn, forceflag)
     first = True
     a = 4.0
     while True:
@@ -583,6 +608,53 @@ def splinefits(edges: list[Pedge], pa: Ppoint, va: Pvector,
     return 0
 
 
+def _scale_schedule() -> list[float]:
+    """The tangent scales :func:`splinefits` tries, in order."""
+    sched = []
+    a = 4.0
+    while True:
+        sched.append(a)
+        if a < 0.005:
+            return sched
+        a = a / 2.0 if a > 0.01 else 0.0
+
+
+_SCHEDULE = _scale_schedule()
+
+
+def _splinefits_batch(edges: list[Pedge], pa: Ppoint, va: Pvector,
+                      pb: Ppoint, vb: Pvector, inps: list[Ppoint],
+                      inpn: int, forceflag: int) -> int:
+    """:func:`splinefits` for large barrier sets.
+
+    Python addition: builds the trial cubic for every scale of the
+    schedule at once and tests them all against every barrier in one
+    :func:`...arrays.spline_crosses` call, then accepts the first
+    trial that fits — the same choice as the sequential loop.
+    """
+    trials = [[Ppoint(pa.x, pa.y),
+               Ppoint(pa.x + a * va.x / 3.0, pa.y + a * va.y / 3.0),
+               Ppoint(pb.x - a * vb.x / 3.0, pb.y - a * vb.y / 3.0),
+               Ppoint(pb.x, pb.y)] for a in _SCHEDULE]
+    if dist_n(trials[0], 4) < dist_n(inps, inpn) - EPSILON1:
+        return 0
+    if not isinstance(edges, Barriers):
+        edges = Barriers(edges)
+    cps = np.array([[(p.x, p.y) for p in sps] for sps in trials])
+    crosses, point_rows = spline_crosses(edges, cps, EPSILON1, EPSILON2)
+    points = [edges[ei] for ei in point_rows.tolist()]
+    for k, sps in enumerate(trials):
+        if not crosses[k] and splineisinside(points, sps):
+            break
+    else:
+        if not forceflag:
+            return 0
+        sps = trials[-1]
+    for pi in range(1, 4):
+        _ops.append(Ppoint(sps[pi].x, sps[pi].y))
+    return 1
+
+
 # ── reallyroutespline (B5d) ────────────────────────────────────────
 
 def reallyroutespline(edges: list[Pedge], inps: list[Ppoint], inpn: int,
@@ -632,22 +704,15 @@ def reallyroutespline(edges: list[Pedge], inps: list[Ppoint], inpn: int,
     # the divergence measurement — ``cp1 = p1 + v1/3`` and
     # ``cp2 = p2 - v2/3`` matches the ``a == 1`` case of the
     # splinefits loop.
+    # The divergence scan evaluates every interior sample at once
+    # (:func:`...arrays.bezier_eval`); ``argmax`` keeps C's first
+    # maximum.
     cp1 = add(p1, scale(v1, 1.0 / 3.0))
     cp2 = sub(p2, scale(v2, 1.0 / 3.0))
-    maxi = -1
-    maxd = -1.0
-    for i in range(1, inpn - 1):
-        t = tnas[i].t
-        px = (B0(t) * p1.x + B1(t) * cp1.x
-              + B2(t) * cp2.x + B3(t) * p2.x)
-        py = (B0(t) * p1.y + B1(t) * cp1.y
-              + B2(t) * cp2.y + B3(t) * p2.y)
-        d = dist(Ppoint(px, py), inps[i])
-        if d > maxd:
-            maxd = d
-            maxi = i
-
-    spliti = maxi
+    ts = np.array([tnas[i].t for i in range(1, inpn - 1)])
+    curve = bezier_eval(as_array((p1, cp1, cp2, p2)), ts)
+    d = curve - as_array(inps[1:inpn - 1])
+    spliti = 1 + int(np.argmax(np.hypot(d[:, 0], d[:, 1])))
     splitv1 = normv(sub(inps[spliti], inps[spliti - 1]))
     splitv2 = normv(sub(inps[spliti + 1], inps[spliti]))
     splitv = normv(add(splitv1, splitv2))
@@ -692,6 +757,7 @@ def Proutespline(barriers: list[Pedge], input_route: Ppolyline,
     endpoint_slopes[0] = normv(endpoint_slopes[0])
     endpoint_slopes[1] = normv(endpoint_slopes[1])
 
+    barriers = Barriers(barriers)
     _ops.clear()
     _ops.append(Ppoint(inps[0].x, inps[0].y))
     if reallyroutespline(barriers, inps, inpn,
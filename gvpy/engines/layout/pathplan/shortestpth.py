@@ -2,17 +2,22 @@
 
 See: /lib/pathplan/shortestpth.c @ 30
 
-Two functions:
+Three functions:
 
 - :func:`shortestPath` — Dijkstra on a ``V × V`` weighted adjacency
   matrix, returning a ``dad`` back-pointer array.
+- :func:`sparsePath` — the same search with a binary heap over the
+  sparse ``{neighbour: distance}`` rows :func:`...visibility.visibility`
+  builds.
 - :func:`makePath` — glue layer that either returns a direct link
-  if ``directVis`` succeeds, or falls back to :func:`shortestPath`
+  if ``directVis`` succeeds, or falls back to a shortest-path search
   on the visibility graph with the two query points' visibility
   vectors spliced into rows ``V`` and ``V + 1`` of ``conf.vis``.
 """
 from __future__ import annotations
 
+import heapq
+
 from gvpy.engines.layout.pathplan.pathgeom import Ppoint
 from gvpy.engines.layout.pathplan.vispath import Vconfig
 from gvpy.engines.layout.pathplan.visibility import directVis
@@ -90,6 +95,51 @@ def shortestPath(root: int, target: int, V: int, wadj: list) -> list[int]:
     return dad
 
 
+def sparsePath(root: int, target: int, V: int, wadj: list) -> list[int]:
+    """Dijkstra from ``root`` to ``target`` over sparse rows.
+
+    Python addition.  ``wadj[k]`` is either a ``{t: weight}`` dict or
+    a dense list (the query-point rows :func:`makePath` splices in);
+    zero weights mean "no edge", as in :func:`shortestPath`.  Edges are
+    read from both endpoints' rows, which are symmetric except for the
+    dense query rows — those are only stored on the query side, so
+    their reverse direction is added here.  Settling order and ties
+    (lowest index first, ``dad`` rewritten only on a strictly shorter
+    distance) match :func:`shortestPath`, so the same ``dad`` comes
+    back in ``O(E log V)`` instead of ``O(V^2)``.
+    """
+    dense: dict[int, list] = {k: row for k, row in enumerate(wadj)
+                              if isinstance(row, list)}
+    dad = [-1] * V
+    best = [_UNSEEN] * V
+    done = [False] * V
+    best[root] = 0.0
+    heap = [(0.0, root)]
+    while heap:
+        d, k = heapq.heappop(heap)
+        if done[k] or d > best[k]:
+            continue
+        done[k] = True
+        if k == target:
+            break
+        row = wadj[k]
+        if isinstance(row, dict):
+            items = list(row.items())
+            items.extend((r, vec[k]) for r, vec in dense.items()
+                         if k < len(vec) and vec[k] != 0)
+        else:
+            items = [(t, w) for t, w in enumerate(row) if w != 0]
+        for t, w in items:
+            if w == 0 or done[t]:
+                continue
+            nd = d + w
+            if nd < best[t]:
+                best[t] = nd
+                dad[t] = k
+                heapq.heappush(heap, (nd, t))
+    return dad
+
+
 def makePath(p: Ppoint, pp: int, pvis: list,
              q: Ppoint, qp: int, qvis: list,
              conf: Vconfig) -> list[int]:
@@ -104,8 +154,10 @@ def makePath(p: Ppoint, pp: int, pvis: list,
 
     Python mutates ``conf.vis[V]`` and ``conf.vis[V + 1]`` just
     like C assigns to the row pointers.  The two slots were
-    allocated as ``None`` placeholders by :func:`...visibility.allocArray`
-    during :func:`...visibility.visibility`.
+    allocated as ``None`` placeholders by :func:`...visibility.visibility`.
+    When the graph rows are sparse dicts the search is
+    :func:`sparsePath`; dense matrices still go through
+    :func:`shortestPath`.
     """
     V = conf.N
 
@@ -121,4 +173,6 @@ def makePath(p: Ppoint, pp: int, pvis: list,
     assert conf.vis is not None, "makePath requires visibility() to have run"
     conf.vis[V] = qvis
     conf.vis[V + 1] = pvis
+    if V and isinstance(conf.vis[0], dict):
+        return sparsePath(V + 1, V, V + 2, conf.vis)
     return shortestPath(V + 1, V, V + 2, conf.vis)
@@ -9,19 +9,28 @@ builder.  It contains:
   step B1), :func:`inBetween`, :func:`intersect`, :func:`in_cone`,
   :func:`dist2`, :func:`dist`, :func:`inCone`, :func:`clear`.
 - 2D-array allocator: :func:`allocArray`.
-- Internal compute pass: :func:`compVis` (builds visibility matrix
-  from pairwise vertex checks).
+- Internal compute pass: :func:`compVis` (builds the visibility graph
+  with a rotational sweep per vertex, :func:`visible_from`).
 - Public entry points: :func:`visibility` (top-level driver),
   :func:`polyhit` (which-polygon lookup), :func:`ptVis` (visibility
   vector from an external point), :func:`directVis` (two-point
   direct-visibility test).
 
-Every function is a literal transliteration of the C source — same
-variable names, same control flow, same predicate semantics.
+The predicates are literal transliterations of the C source — same
+variable names, same control flow, same predicate semantics.  The
+graph construction is not: C tests every vertex pair against every
+polygon edge (``O(V^3)``) into a dense ``V × V`` matrix, which is
+unusable past a few hundred obstacles.  :func:`compVis` and
+:func:`ptVis` instead run Lee's rotational sweep (``O(V log V)`` per
+viewpoint, ``O(V^2 log V)`` for the graph) and ``conf.vis`` holds one
+sparse ``{neighbour: distance}`` row per vertex.
 """
 from __future__ import annotations
 
 import math
+from bisect import insort
+
+import numpy as np
 
 from gvpy.engines.layout.pathplan.pathgeom import Ppoint, Ppoly
 from gvpy.engines.layout.pathplan.vispath import POLYID_NONE, POLYID_UNKNOWN, Vconfig
@@ -168,56 +177,224 @@ def allocArray(V: int, extra: int) -> list:
     return arr
 
 
-# ── Private: build the visibility matrix ────────────────────────────
+# ── Rotational sweep ────────────────────────────────────────────────
+
+# Events whose angles around the viewpoint differ by less than this
+# are treated as one direction and ordered by distance, so collinear
+# vertices stay adjacent despite ``atan2`` rounding.
+_ANGLE_EPS = 1e-9
+
+
+def boxes_disjoint(conf: Vconfig) -> bool:
+    """Whether the obstacles' bounding boxes are pairwise disjoint.
+
+    Python addition: decides whether :func:`visible_from` may trust
+    its distance order (touching boxes count as overlapping).
+    """
+    if conf.Npoly < 2:
+        return True
+    xs = np.fromiter((q.x for q in conf.P), dtype=float, count=conf.N)
+    ys = np.fromiter((q.y for q in conf.P), dtype=float, count=conf.N)
+    starts = np.asarray(conf.start[:conf.Npoly], dtype=np.int64)
+    xlo = np.minimum.reduceat(xs, starts)
+    xhi = np.maximum.reduceat(xs, starts)
+    ylo = np.minimum.reduceat(ys, starts)
+    yhi = np.maximum.reduceat(ys, starts)
+    order = np.argsort(xlo, kind="stable")
+    xlo, xhi, ylo, yhi = xlo[order], xhi[order], ylo[order], yhi[order]
+    # Boxes after ``i`` in ``xlo`` order that start before it ends.
+    ends = np.searchsorted(xlo, xhi, side="right")
+    for i in np.nonzero(ends > np.arange(1, conf.Npoly + 1))[0].tolist():
+        j = slice(i + 1, int(ends[i]))
+        if np.any((ylo[j] <= yhi[i]) & (yhi[j] >= ylo[i])):
+            return False
+    return True
+
+
+def visible_from(p: Ppoint, conf: Vconfig, skip_start: int, skip_end: int,
+                 own: int = -1, limit: int | None = None,
+                 ordered: bool = True) -> list[int]:
+    """Vertices visible from ``p`` — Lee's rotational sweep.
+
+    Python addition (replaces the per-pair :func:`clear` scans of
+    ``visibility.c``).  A vertex ``w`` is visible when no polygon edge
+    blocks the segment ``p w`` in the sense of :func:`intersect`; edges
+    of polygon ``[skip_start, skip_end)`` and edges incident to vertex
+    ``own`` (the viewpoint itself, when it is a vertex) are ignored,
+    exactly as :func:`clear` skips them.  The cone tests are left to
+    the caller.
+
+    The other vertices are visited in angular order around ``p``
+    (nearest first along a direction) while a list of the edges the
+    current ray crosses is kept sorted by distance along the ray;
+    only the nearest of them can hide ``w``.  A vertex lying on
+    ``p w`` hides ``w`` too — :func:`intersect` counts such touches.
+
+    ``limit`` restricts the answer to vertices ``< limit`` (the sweep
+    still visits all of them to maintain the edge list).  The distance
+    order is only meaningful when obstacle boundaries do not cross —
+    Lee's precondition; with ``ordered=False`` every edge the ray
+    currently crosses is tested instead of stopping beyond ``w``.
+    """
+    V = conf.N
+    pts = conf.P
+    nextPt = conf.next
+    prevPt = conf.prev
+    if limit is None:
+        limit = V
+    px, py = p.x, p.y
+    xs = np.fromiter((q.x for q in pts), dtype=float, count=V)
+    ys = np.fromiter((q.y for q in pts), dtype=float, count=V)
+    rx = xs - px
+    ry = ys - py
+    d2 = rx * rx + ry * ry
+    keep = d2 > 0
+    keep[skip_start:skip_end] = False
+    if 0 <= own < V:
+        keep[own] = False
+    cand = np.nonzero(keep)[0]
+    if len(cand) == 0:
+        return []
+    ang = np.arctan2(ry[cand], rx[cand]) % (2 * math.pi)
+    order = np.argsort(ang, kind="stable")
+    ang_s = ang[order]
+    group = np.concatenate(([0], np.cumsum(np.diff(ang_s) > _ANGLE_EPS)))
+    sub = np.lexsort((d2[cand][order], group))
+    events = cand[order[sub]]
+    ev_group = group[sub]
+    ev_d2 = d2[events].tolist()
+    pos = np.full(V, -1, dtype=np.int64)
+    pos[events] = np.arange(len(events))
+    direction = np.full(V, -1, dtype=np.int64)
+    direction[events] = ev_group
+    ev_group = ev_group.tolist()
+
+    # Edge ``k`` runs ``k -> next[k]``.  ``o > 0``: the sweep meets
+    # ``k`` first; ``o < 0``: ``next[k]`` first.  An edge whose ends
+    # share a direction points at ``p`` and never straddles a ray;
+    # only its end vertices can block.
+    nxt = np.asarray(nextPt, dtype=np.int64)
+    o = rx * ry[nxt] - ry * rx[nxt]
+    use = keep & keep[nxt] & (direction != direction[nxt])
+    use[skip_start:skip_end] = False
+    if 0 <= own < V:
+        use[own] = False
+        use[prevPt[own]] = False
+    first = np.where(o > 0, np.arange(V), nxt)
+    last = np.where(o > 0, nxt, np.arange(V))
+    first_l = first.tolist()
+    use_l = use.tolist()
+    x_l = xs.tolist()
+    y_l = ys.tolist()
+
+    def ray_key(e: int, wx: float, wy: float, w: int):
+        """Distance order of edge ``e`` along the ray ``p -> w``."""
+        a, b = e, nextPt[e]
+        if a == w or b == w:
+            # Incident at ``w``: break the tie by how fast the edge
+            # recedes from ``p`` once the ray turns past ``w``.
+            x = b if a == w else a
+            ux = x_l[x] - wx
+            uy = y_l[x] - wy
+            dx = wx - px
+            dy = wy - py
+            cr = dx * uy - dy * ux
+            return (1.0, (dx * ux + dy * uy) / cr if cr else math.inf)
+        ex = x_l[b] - x_l[a]
+        ey = y_l[b] - y_l[a]
+        den = (wx - px) * ey - (wy - py) * ex
+        if den == 0:
+            return (math.inf, 0.0)
+        return (((x_l[a] - px) * ey - (y_l[a] - py) * ex) / den, 0.0)
+
+    w0 = int(events[0])
+    active = [int(e) for e in
+              np.nonzero(use & (pos[first] > pos[last]))[0].tolist()]
+    if ordered:
+        active.sort(key=lambda e: ray_key(e, x_l[w0], y_l[w0], w0))
+
+    visible: list[int] = []
+    # ``u``: the last vertex in the current direction strictly nearer
+    # to ``p`` — the one that could lie on ``p w``.
+    u = -1
+    prev_w = -1
+    for n, w in enumerate(events.tolist()):
+        wx, wy = x_l[w], y_l[w]
+        pw = pts[w]
+        if n == 0 or ev_group[n] != ev_group[n - 1]:
+            u = -1
+        elif ev_d2[n] != ev_d2[n - 1]:
+            u = prev_w
+        prev_w = w
+        if w < limit:
+            blocked = (u >= 0 and wind(p, pts[u], pw) == 0
+                       and inBetween(p, pw, pts[u]))
+            if not blocked:
+                for e in active:
+                    if ordered and ray_key(e, wx, wy, w)[0] > 1.0:
+                        break
+                    if intersect(p, pw, pts[e], pts[nextPt[e]]):
+                        blocked = True
+                        break
+            if not blocked:
+                visible.append(w)
+        for e in (prevPt[w], w):
+            if not use_l[e]:
+                continue
+            if first_l[e] != w:
+                active.remove(e)
+            elif ordered:
+                insort(active, e, key=lambda f: ray_key(f, wx, wy, w))
+            else:
+                active.append(e)
+    return visible
+
+
+# ── Private: build the visibility graph ─────────────────────────────
 
 def compVis(conf: Vconfig) -> None:
     """Populate ``conf.vis`` with pairwise vertex-visibility distances.
 
     See: /lib/pathplan/visibility.c @ 171
 
-    For each vertex ``i``, add an edge of length
-    ``dist(pts[i], pts[prev[i]])`` to the polygon-edge neighbour, then
-    scan all earlier vertices ``j < i`` and add an edge if:
+    Every polygon edge ``(i, prev[i])`` is an edge of the graph.  Any
+    other pair ``j < i`` is joined when
 
     1. ``j`` is in ``i``'s cone (``inCone(i, j, ...)``)
     2. ``i`` is in ``j``'s cone (``inCone(j, i, ...)``)
     3. The segment ``pts[i]-pts[j]`` is clear of every other polygon
-       edge (``clear(..., V, V, V, ...)``)
+       edge.
 
-    All three conditions must hold for the pair to be visible.
+    Python deviation: condition 3 comes from one
+    :func:`visible_from` sweep per vertex instead of a :func:`clear`
+    call per pair, and ``conf.vis`` rows are ``{j: distance}`` dicts
+    (absent means not visible).
     """
     V = conf.N
     pts = conf.P
     nextPt = conf.next
     prevPt = conf.prev
     wadj = conf.vis
-    assert wadj is not None, "compVis called before allocArray"
+    assert wadj is not None, "compVis called before visibility"
+    if conf.disjoint is None:
+        conf.disjoint = boxes_disjoint(conf)
 
     for i in range(V):
         # Add the polygon edge between ``i`` and ``previ``.
-        # Works for polygons of 1 or 2 vertices at the cost of some
-        # redundant work (C note preserved).
         previ = prevPt[i]
         d = dist(pts[i], pts[previ])
         wadj[i][previ] = d
         wadj[previ][i] = d
 
-        # Scan earlier vertices.  If ``previ`` is ``i - 1`` (the usual
-        # case — polygon is walked in order), skip ``i - 1`` because
-        # it's already been handled; otherwise include it.
-        if previ == i - 1:
-            j_start = i - 2
-        else:
-            j_start = i - 1
-        j = j_start
-        while j >= 0:
+        for j in visible_from(pts[i], conf, V, V, own=i, limit=i,
+                              ordered=conf.disjoint):
+            if j == previ or j in wadj[i]:
+                continue
             if (inCone(i, j, pts, nextPt, prevPt) and
-                    inCone(j, i, pts, nextPt, prevPt) and
-                    clear(pts[i], pts[j], V, V, V, pts, nextPt)):
+                    inCone(j, i, pts, nextPt, prevPt)):
                 d = dist(pts[i], pts[j])
                 wadj[i][j] = d
                 wadj[j][i] = d
-            j -= 1
 
 
 # ── Public entry points ─────────────────────────────────────────────
@@ -230,9 +407,13 @@ def visibility(conf: Vconfig) -> None:
     Allocates ``conf.vis`` with ``N + 2`` rows (the 2 extras are
     placeholders for the two query points ``Pobspath`` will add
     dynamically), then calls :func:`compVis` to populate the first
-    ``N`` rows.
+    ``N`` rows.  Python deviation: the first ``N`` rows are sparse
+    ``{neighbour: distance}`` dicts rather than :func:`allocArray`'s
+    dense lists.
     """
-    conf.vis = allocArray(conf.N, 2)
+    conf.vis = [{} for _ in range(conf.N)]
+    conf.vis.extend([None, None])
+    conf.disjoint = boxes_disjoint(conf)
     compVis(conf)
 
 
@@ -289,24 +470,14 @@ def ptVis(conf: Vconfig, pp: int, p: Ppoint) -> list:
         start = V
         end = V
 
-    for k in range(0, start):
-        pk = pts[k]
-        if (in_cone(pts[prevPt[k]], pk, pts[nextPt[k]], p) and
-                clear(p, pk, start, end, V, pts, nextPt)):
-            vadj[k] = dist(p, pk)
-        else:
-            vadj[k] = 0.0
-
-    for k in range(start, end):
-        vadj[k] = 0.0
-
-    for k in range(end, V):
+    # Python deviation: one :func:`visible_from` sweep replaces the
+    # per-vertex :func:`clear` scans; own-polygon entries stay 0.
+    if conf.disjoint is None:
+        conf.disjoint = boxes_disjoint(conf)
+    for k in visible_from(p, conf, start, end, ordered=conf.disjoint):
         pk = pts[k]
-        if (in_cone(pts[prevPt[k]], pk, pts[nextPt[k]], p) and
-                clear(p, pk, start, end, V, pts, nextPt)):
+        if in_cone(pts[prevPt[k]], pk, pts[nextPt[k]], p):
             vadj[k] = dist(p, pk)
-        else:
-            vadj[k] = 0.0
 
     # C: vadj[V] = 0; vadj[V + 1] = 0;  (already zero from init)
     vadj[V] = 0.0
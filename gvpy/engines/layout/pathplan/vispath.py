@@ -45,11 +45,16 @@ class Vconfig:
       each point (within the same polygon, wrapping at the polygon's
       last vertex back to its first).
     - ``prev`` — list of length ``N``, the reverse of ``next``.
-    - ``vis`` — visibility matrix, lazily populated by :func:`visibility`.
+    - ``vis`` — visibility graph, lazily populated by :func:`visibility`.
       Shape: ``N + 2`` rows (the extra 2 are placeholders for the two
-      query points added dynamically by ``Pobspath``).  The first ``N``
-      rows each have length ``N``; the extra rows are ``None`` until
-      ``Pobspath`` fills them.
+      query points added dynamically by ``Pobspath``).  Python
+      deviation: the first ``N`` rows are sparse ``{j: distance}``
+      dicts instead of length-``N`` lists; the extra rows are ``None``
+      until ``Pobspath`` fills them.
+    - ``disjoint`` — Python addition: whether the obstacles' bounding
+      boxes are pairwise disjoint, set by :func:`visibility`.  The
+      rotational sweep can stop at the nearest blocking edge only when
+      obstacle boundaries cannot cross.
 
     ``next`` shadows Python's builtin ``next()`` — that's fine because
     it's an attribute, not a module-level name.  Kept verbatim from C
@@ -62,4 +67,5 @@ class Vconfig:
     start: list = field(default_factory=list)  # list[int]
     next: list = field(default_factory=list)   # list[int] — shadows builtin
     prev: list = field(default_factory=list)   # list[int]
-    vis: list | None = None                    # list[list[float] | None] | None
+    vis: list | None = None                    # list[dict | list | None] | None
+    disjoint: bool | None = None
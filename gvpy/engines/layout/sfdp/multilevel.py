@@ -0,0 +1,191 @@
+"""Sfdp multilevel coarsening hierarchy over CSR matrices.
+
+Mirrors ``lib/sfdpgen/Multilevel.c``: each level is coarsened by a
+heavy-edge matching (a maximal independent edge set, heaviest edges
+first), matched pairs collapse into one super-node, and the map from
+fine to coarse nodes is kept as a sparse prolongation matrix ``P``
+(``n_fine × n_coarse``, one unit entry per row) so interpolating a
+coarse layout back is ``P @ pos``.
+
+A level stores its graph as parallel edge arrays ``(eu, ev)`` with
+``eu < ev`` plus per-edge attributes:
+
+- ``heavy``  — summed fine-edge weight, the matching key
+- ``weight`` — mean fine-edge weight, used by the attractive force
+- ``length`` — mean fine-edge ideal length
+- ``count``  — number of fine edges merged into the coarse edge
+
+and ``mass`` — the number of original nodes each super-node stands
+for (Barnes-Hut uses it as the charge).
+
+The matching is computed in vectorised rounds: every node whose
+row still has an unmatched neighbour proposes to its heaviest one
+and mutual proposals are matched.  Edges are ordered by
+``(heavy, hash(edge))`` — a strict total order — so a round always
+matches at least the globally heaviest remaining edge, and a run to
+completion equals the greedy heaviest-first matching.  With weights
+in no particular order that takes an expected ``O(log N)`` rounds.
+
+Deviation: the rounds are capped at ``_MATCH_ROUNDS``, and nodes
+still unmatched then stay singletons.  Weights that rise steadily
+along a chain settle one pair per round, so on such inputs the
+matching stops early, the level coarsens little and
+:func:`build_hierarchy` ends at its ``ratio`` test.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+
+# Upper bound on proposal rounds per matching; nodes still unmatched
+# afterwards stay singletons at the next level, even where greedy
+# matching would have paired them.
+_MATCH_ROUNDS = 64
+# Mirrors ``Multilevel_control.min_coarsen_size`` — stop at this size.
+_MIN_NODES = 4
+
+
+@dataclass
+class Level:
+    """One level of the multilevel hierarchy."""
+    n: int
+    eu: np.ndarray
+    ev: np.ndarray
+    heavy: np.ndarray
+    weight: np.ndarray
+    length: np.ndarray
+    count: np.ndarray
+    mass: np.ndarray
+    P: Optional[sp.csr_matrix] = None   # prolongation from the next level
+
+    def adjacency(self) -> sp.csr_matrix:
+        """Symmetric CSR matrix of ``heavy`` edge weights."""
+        rows = np.concatenate([self.eu, self.ev])
+        cols = np.concatenate([self.ev, self.eu])
+        data = np.concatenate([self.heavy, self.heavy])
+        return sp.csr_matrix((data, (rows, cols)), shape=(self.n, self.n))
+
+
+def _edge_priority(lo: np.ndarray, hi: np.ndarray, n: int) -> np.ndarray:
+    """Deterministic pseudo-random tie-break key per undirected edge
+    (splitmix64 of ``lo * n + hi``)."""
+    z = lo.astype(np.uint64) * np.uint64(n) + hi.astype(np.uint64)
+    z = z + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def heavy_edge_matching(A: sp.csr_matrix,
+                        max_rounds: int = _MATCH_ROUNDS) -> np.ndarray:
+    """Heavy-edge matching of the symmetric weight matrix ``A``.
+
+    Returns ``match`` with ``match[i]`` the partner of node ``i``, or
+    ``-1`` when ``i`` is unmatched.
+    """
+    A = sp.csr_matrix(A)
+    n = A.shape[0]
+    match = np.full(n, -1, dtype=np.int64)
+    rows = np.repeat(np.arange(n), np.diff(A.indptr))
+    cols = A.indices.astype(np.int64)
+    w = A.data
+    off = rows != cols
+    rows, cols, w = rows[off], cols[off], w[off]
+    if len(rows) == 0:
+        return match
+    prio = _edge_priority(np.minimum(rows, cols), np.maximum(rows, cols), n)
+    # Ascending by (row, weight, priority): the last entry of each row
+    # run is that row's heaviest neighbour.
+    order = np.lexsort((prio, w, rows))
+    rows, cols = rows[order], cols[order]
+
+    for _ in range(max_rounds):
+        live = (match[rows] < 0) & (match[cols] < 0)
+        rows, cols = rows[live], cols[live]
+        if len(rows) == 0:
+            break
+        last = np.ones(len(rows), dtype=bool)
+        last[:-1] = rows[1:] != rows[:-1]
+        best = np.full(n, -1, dtype=np.int64)
+        best[rows[last]] = cols[last]
+        prop = np.nonzero(best >= 0)[0]
+        mutual = prop[best[best[prop]] == prop]
+        if len(mutual) == 0:
+            break
+        match[mutual] = best[mutual]
+    return match
+
+
+def coarsen(level: Level) -> tuple[Level, sp.csr_matrix]:
+    """Collapse a heavy-edge matching of ``level``.
+
+    Returns the coarse level and the prolongation matrix
+    ``P`` (``level.n × coarse.n``).  Each matched pair is represented
+    by its lower-indexed node, and coarse nodes keep the relative
+    order of their representatives.
+    """
+    n = level.n
+    match = heavy_edge_matching(level.adjacency())
+    ids = np.arange(n)
+    rep = np.where(match >= 0, np.minimum(ids, match), ids)
+    is_rep = rep == ids
+    cid = np.cumsum(is_rep) - 1
+    group = cid[rep]
+    nc = int(is_rep.sum())
+    P = sp.csr_matrix((np.ones(n), (ids, group)), shape=(n, nc))
+
+    gu, gv = group[level.eu], group[level.ev]
+    keep = gu != gv
+    lo = np.minimum(gu[keep], gv[keep])
+    hi = np.maximum(gu[keep], gv[keep])
+    key, inv = np.unique(lo * nc + hi, return_inverse=True)
+    m = len(key)
+    count = np.bincount(inv, weights=level.count[keep], minlength=m)
+    heavy = np.bincount(inv, weights=level.heavy[keep], minlength=m)
+    wsum = np.bincount(inv, weights=(level.weight * level.count)[keep],
+                       minlength=m)
+    lsum = np.bincount(inv, weights=(level.length * level.count)[keep],
+                       minlength=m)
+    coarse = Level(
+        n=nc,
+        eu=key // nc,
+        ev=key % nc,
+        heavy=heavy,
+        weight=wsum / count if m else wsum,
+        length=lsum / count if m else lsum,
+        count=count,
+        mass=P.T @ level.mass,
+    )
+    return coarse, P
+
+
+def build_hierarchy(n: int, eu: np.ndarray, ev: np.ndarray,
+                    weight: np.ndarray, length: np.ndarray,
+                    max_levels: int, ratio: float) -> list[Level]:
+    """Build the coarsening hierarchy, finest level first.
+
+    Coarsening stops after ``max_levels`` coarse levels, once a level
+    has at most ``_MIN_NODES`` nodes, or when a matching would keep
+    more than ``ratio`` of the nodes.  Every level but the last has
+    its prolongation matrix ``P`` set.
+    """
+    eu = np.asarray(eu, dtype=np.int64)
+    ev = np.asarray(ev, dtype=np.int64)
+    weight = np.asarray(weight, dtype=float)
+    levels = [Level(n=n, eu=eu, ev=ev, heavy=weight.copy(),
+                    weight=weight, length=np.asarray(length, dtype=float),
+                    count=np.ones(len(eu)), mass=np.ones(n))]
+    for _ in range(max_levels):
+        fine = levels[-1]
+        if fine.n <= _MIN_NODES:
+            break
+        coarse, P = coarsen(fine)
+        if coarse.n / fine.n > ratio:
+            break
+        fine.P = P
+        levels.append(coarse)
+    return levels
@@ -0,0 +1,179 @@
+"""Barnes-Hut repulsion for sfdp on a linear (Morton-ordered) quadtree.
+
+Mirrors ``lib/sparse/QuadTree.c`` (``QuadTree_get_repulsive_force``).
+Instead of a pointer tree built by repeated insertion, every point
+gets a ``2 * _DEPTH``-bit Morton code inside the square bounding box;
+the quadtree cells at depth ``l`` are the distinct code prefixes of
+length ``2 l``, so a single sort gives every level, and per-cell mass
+and centre of mass come from ``bincount``.
+
+The traversal is breadth-first over ``(point, cell)`` pairs, one
+depth at a time:
+
+- a cell holding a single point is a leaf and contributes its exact
+  force (nothing for the point itself);
+- a cell that passes the opening test ``size / dist < theta`` is
+  treated as one mass at its centre of mass;
+- any other cell is opened and the pair is replaced by its children.
+
+At the maximum depth unopened cells are summed as aggregates with the
+querying point's own mass removed.  Points are processed in blocks so
+the frontier stays bounded.
+"""
+from __future__ import annotations
+
+import random
+
+import numpy as np
+
+
+# Morton depth: cells at the deepest level are size / 2**_DEPTH wide.
+_DEPTH = 20
+# Points per traversal block.
+_BLOCK = 4096
+
+
+def _interleave(v: np.ndarray) -> np.ndarray:
+    """Spread the low 32 bits of ``v`` to the even bit positions."""
+    v = v.astype(np.uint64) & np.uint64(0xFFFFFFFF)
+    for shift, mask in ((16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF),
+                        (4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333),
+                        (1, 0x5555555555555555)):
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+
+class _Tree:
+    """Per-depth cell tables of a linear quadtree."""
+
+    def __init__(self, pos: np.ndarray, mass: np.ndarray,
+                 depth: int = _DEPTH):
+        n = len(pos)
+        lo = pos.min(axis=0)
+        self.size = max(float((pos.max(axis=0) - lo).max()), 1.0)
+        self.depth = depth
+        side = 1 << depth
+        cell = np.floor((pos - lo) * (side / self.size)).astype(np.int64)
+        np.clip(cell, 0, side - 1, out=cell)
+        code = (_interleave(cell[:, 0]) | (_interleave(cell[:, 1])
+                                            << np.uint64(1))).astype(np.int64)
+        order = np.argsort(code, kind="stable")
+        code_s = code[order]
+        m_s = mass[order]
+        p_s = pos[order]
+
+        self.keys: list[np.ndarray] = []
+        self.point_cell: list[np.ndarray] = []
+        self.count: list[np.ndarray] = []
+        self.mass: list[np.ndarray] = []
+        self.com: list[np.ndarray] = []
+        self.member: list[np.ndarray] = []
+        for level in range(depth + 1):
+            key = code_s >> (2 * (depth - level))
+            new = np.ones(n, dtype=bool)
+            new[1:] = key[1:] != key[:-1]
+            cid = np.cumsum(new) - 1
+            nc = int(cid[-1]) + 1
+            m = np.bincount(cid, weights=m_s, minlength=nc)
+            com = np.empty((nc, 2))
+            for axis in (0, 1):
+                com[:, axis] = np.bincount(cid, weights=p_s[:, axis] * m_s,
+                                           minlength=nc)
+            com /= np.where(m > 0, m, 1.0)[:, None]
+            pc = np.empty(n, dtype=np.int64)
+            pc[order] = cid
+            self.keys.append(key[new])
+            self.point_cell.append(pc)
+            self.count.append(np.bincount(cid, minlength=nc))
+            self.mass.append(m)
+            self.com.append(com)
+            self.member.append(order[new])
+
+    def children(self, level: int, cells: np.ndarray
+                 ) -> tuple[np.ndarray, np.ndarray]:
+        """Index range ``[start, end)`` of each cell's children at
+        ``level + 1``."""
+        child_keys = self.keys[level + 1]
+        base = self.keys[level][cells] << 2
+        return (np.searchsorted(child_keys, base),
+                np.searchsorted(child_keys, base + 4))
+
+
+def _jitter_close(d: np.ndarray, dist2: np.ndarray) -> None:
+    """Give coincident pairs a small random offset."""
+    close = dist2 < 0.01
+    if close.any():
+        d[close] += np.array([[random.random() * 0.1,
+                               random.random() * 0.1]
+                              for _ in range(int(close.sum()))])
+        dist2[close] = np.einsum("ij,ij->i", d[close], d[close])
+
+
+def repulsive_force(pos: np.ndarray, mass: np.ndarray, K: float,
+                    p: float, theta: float) -> np.ndarray:
+    """Barnes-Hut approximation of ``F_rep = K^(1+p) m / dist^(1+p)``
+    on every point.  Returns the ``(N, 2)`` force array."""
+    n = len(pos)
+    disp = np.zeros((n, 2))
+    if n < 2:
+        return disp
+    tree = _Tree(pos, mass)
+    Kp = K ** (1 + p)
+    for b0 in range(0, n, _BLOCK):
+        pts = np.arange(b0, min(b0 + _BLOCK, n))
+        cells = np.zeros(len(pts), dtype=np.int64)
+        for level in range(tree.depth + 1):
+            if len(pts) == 0:
+                break
+            d = tree.com[level][cells] - pos[pts]
+            dist2 = np.einsum("ij,ij->i", d, d)
+            m = tree.mass[level][cells]
+            leaf = tree.count[level][cells] == 1
+            if level == tree.depth:
+                # Unopened cells at the bottom: aggregate minus self.
+                own = (~leaf) & (tree.point_cell[level][pts] == cells)
+                if own.any():
+                    mi = mass[pts[own]]
+                    rest = m[own] - mi
+                    c = (tree.com[level][cells[own]] * m[own][:, None]
+                         - pos[pts[own]] * mi[:, None])
+                    d[own] = c / np.where(rest > 0, rest, 1.0)[:, None] \
+                        - pos[pts[own]]
+                    m[own] = rest
+                    dist2[own] = np.einsum("ij,ij->i", d[own], d[own])
+                done = np.ones(len(pts), dtype=bool)
+                near = done
+            else:
+                size = tree.size / (1 << level)
+                far = size / np.sqrt(np.maximum(dist2, 0.01)) < theta
+                done = leaf | far
+                near = leaf
+            self_leaf = leaf & (tree.member[level][cells] == pts)
+            use = done & ~self_leaf & (m > 0)
+            if use.any():
+                du = d[use]
+                d2 = dist2[use]
+                jit = near[use]
+                if jit.any():
+                    dj = du[jit]
+                    d2j = d2[jit]
+                    _jitter_close(dj, d2j)
+                    du[jit] = dj
+                    d2[jit] = d2j
+                dist = np.sqrt(np.where(jit, d2, np.maximum(d2, 0.01)))
+                f = -du * (Kp * m[use] / dist ** (2 + p))[:, None]
+                tgt = pts[use]
+                for axis in (0, 1):
+                    disp[:, axis] += np.bincount(tgt, weights=f[:, axis],
+                                                 minlength=n)
+            if level == tree.depth:
+                break
+            open_ = ~done
+            pts, cells = pts[open_], cells[open_]
+            start, end = tree.children(level, cells)
+            cnt = end - start
+            first = np.cumsum(cnt) - cnt
+            pts = np.repeat(pts, cnt)
+            cells = np.repeat(start, cnt) + (np.arange(int(cnt.sum()))
+                                             - np.repeat(first, cnt))
+    return disp
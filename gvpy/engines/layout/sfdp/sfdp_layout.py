@@ -8,6 +8,10 @@ Port of Graphviz ``lib/sfdpgen/``.  Extends fdp with:
 - **Barnes-Hut quadtree**: O(n log n) repulsive force approximation
 - **Post-processing smoothing**: Optional stress majorization refinement
 
+The hierarchy is built over CSR matrices (``multilevel.py``) and the
+whole multilevel cycle — prolongation, repulsion, attraction and
+position updates — runs on NumPy arrays.
+
 Command-line::
 
     python gvcli.py -Ksfdp input.gv -Tsvg -o output.svg
@@ -30,12 +34,17 @@ from __future__ import annotations
 import math
 import random
 from collections import defaultdict, deque
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from typing import Optional
 
+import numpy as np
+
 from gvpy.core.graph import Graph
 from gvpy.core.node import Node
 from gvpy.engines.layout.base import LayoutEngine
+from gvpy.engines.layout.common.adjust import remove_overlap
+from gvpy.engines.layout.sfdp.multilevel import Level, build_hierarchy
+from gvpy.engines.layout.sfdp.quadtree import repulsive_force
 
 
 _DFLT_K = 0.3 * 72.0
@@ -61,20 +70,6 @@ class LayoutNode:
     mass: float = 1.0      # for coarsened super-nodes
 
 
-@dataclass
-class _QTNode:
-    """Quadtree node for Barnes-Hut approximation."""
-    cx: float = 0.0        # center of mass x
-    cy: float = 0.0        # center of mass y
-    mass: float = 0.0      # total mass
-    x0: float = 0.0        # bounding box
-    y0: float = 0.0
-    size: float = 0.0      # side length
-    children: list = field(default_factory=list)  # 4 children or empty
-    is_leaf: bool = True
-    node_idx: int = -1      # leaf: index of single node
-
-
 class SfdpLayout(LayoutEngine):
     """Scalable force-directed placement layout engine."""
 
@@ -249,7 +244,12 @@ class SfdpLayout(LayoutEngine):
     # ── Multilevel layout ────────────────────────
 
     def _layout_component(self, nodes: set[str], adj: dict[str, list[str]]):
-        """Multilevel spring-electrical layout for a component."""
+        """Multilevel spring-electrical layout for a component.
+
+        The hierarchy, positions and forces live on NumPy arrays
+        indexed by the node's position in ``node_list``; positions are
+        copied back onto the ``LayoutNode`` objects at the end.
+        """
         node_list = [n for n in self.lnodes if n in nodes]
         N = len(node_list)
         if N == 0:
@@ -260,355 +260,199 @@ class SfdpLayout(LayoutEngine):
                 ln.x, ln.y = 0.0, 0.0
             return
 
+        rng = np.random.default_rng(random.getrandbits(32))
+        lns = [self.lnodes[n] for n in node_list]
+        seed_pos = np.array([(ln.x, ln.y) for ln in lns], dtype=float)
+        pos_set = np.array([ln.pos_set for ln in lns], dtype=bool)
+        pinned = np.array([ln.pinned for ln in lns], dtype=bool)
+
         # Build coarsening hierarchy
         levels = self._build_hierarchy(node_list, adj)
 
+        # Restrict pos-set / pinned flags (and the pos-set positions)
+        # to every coarse level: a super-node inherits them from any
+        # of its members.
+        fixed = [(pos_set, pinned, seed_pos)]
+        for level in levels[:-1]:
+            f_set, f_pin, f_pos = fixed[-1]
+            PT = level.P.T
+            n_set = PT @ f_set.astype(float)
+            c_pos = PT @ (f_pos * f_set[:, None])
+            c_pos /= np.maximum(n_set, 1.0)[:, None]
+            fixed.append((n_set > 0, (PT @ f_pin.astype(float)) > 0, c_pos))
+
         # Solve at coarsest level
         coarsest = levels[-1]
         K_level = self.K
         for _ in range(len(levels) - 1):
             K_level *= 0.75
 
-        self._init_positions(coarsest["nodes"], len(coarsest["nodes"]))
-        self._spring_electrical(coarsest["nodes"], coarsest["adj"],
-                                K_level, self.maxiter)
+        c_set, c_pin, c_pos = fixed[-1]
+        pos = self._init_positions(c_pos, c_set, rng)
+        self._spring_electrical(pos, coarsest, c_pin, K_level, self.maxiter)
 
         # Uncoarsen: interpolate and refine
         for level_idx in range(len(levels) - 2, -1, -1):
             level = levels[level_idx]
-            parent = levels[level_idx + 1]
-            mapping = level.get("mapping", {})
+            f_set, f_pin, f_pos = fixed[level_idx]
 
             # Prolongate: interpolate positions from parent
-            for name in level["nodes"]:
-                ln = self.lnodes[name]
-                parent_name = mapping.get(name, name)
-                if parent_name in self.lnodes:
-                    parent_ln = self.lnodes[parent_name]
-                    if not ln.pos_set:
-                        ln.x = parent_ln.x + (random.random() - 0.5) * K_level * 0.1
-                        ln.y = parent_ln.y + (random.random() - 0.5) * K_level * 0.1
+            pos = level.P @ pos
+            pos += (rng.random(pos.shape) - 0.5) * K_level * 0.1
+            pos[f_set] = f_pos[f_set]
 
             K_level = self.K
             iters = min(self.maxiter, max(50, self.maxiter // (level_idx + 2)))
-            self._spring_electrical(level["nodes"], level["adj"],
-                                    K_level, iters)
+            self._spring_electrical(pos, level, f_pin, K_level, iters)
 
         # Smoothing post-process
         if self.smoothing == "spring":
-            self._spring_electrical(node_list, adj, self.K, 50)
+            self._spring_electrical(pos, levels[0], pinned, self.K, 50)
+
+        for ln, (x, y) in zip(lns, pos.tolist()):
+            ln.x, ln.y = x, y
 
         # Beautify: arrange leaf nodes in circle
         if self.beautify:
             self._beautify_leaves(node_list, adj)
 
     def _build_hierarchy(self, node_list: list[str],
-                         adj: dict[str, list[str]]) -> list[dict]:
-        """Build multilevel hierarchy via maximal independent edge set."""
-        levels = [{"nodes": node_list, "adj": adj}]
-
-        current_nodes = set(node_list)
-        current_adj = adj
-
-        for level in range(self.max_levels):
-            N = len(current_nodes)
-            if N <= 4:
-                break
-
-            # Find maximal independent edge set (greedy matching)
-            matched: set[str] = set()
-            groups: dict[str, str] = {}  # node → representative
-            representatives: set[str] = set()
-
-            # Sort edges by weight (heaviest first)
-            edges = []
-            for u in current_nodes:
-                for v in current_adj.get(u, []):
-                    if v in current_nodes and u < v:
-                        pair = (min(u, v), max(u, v))
-                        w = self._edge_weight.get(pair, 1.0)
-                        edges.append((w, u, v))
-            edges.sort(reverse=True)
-
-            for w, u, v in edges:
-                if u not in matched and v not in matched:
-                    matched.add(u)
-                    matched.add(v)
-                    groups[u] = u
-                    groups[v] = u  # v maps to u
-                    representatives.add(u)
-                    # Average positions
-                    lu, lv = self.lnodes.get(u), self.lnodes.get(v)
-                    if lu and lv:
-                        lu.mass += lv.mass
-
-            # Unmatched nodes become their own representative
-            for n in current_nodes:
-                if n not in groups:
-                    groups[n] = n
-                    representatives.add(n)
-
-            # Check coarsening ratio
-            if len(representatives) / N > _COARSEN_RATIO:
-                break
-
-            # Build coarsened adjacency
-            coarse_adj: dict[str, list[str]] = defaultdict(list)
-            for rep in representatives:
-                coarse_adj[rep]
-            for u in current_nodes:
-                for v in current_adj.get(u, []):
-                    if v in current_nodes:
-                        ru, rv = groups[u], groups[v]
-                        if ru != rv and rv not in coarse_adj[ru]:
-                            coarse_adj[ru].append(rv)
-                            coarse_adj[rv].append(ru)
-
-            level_data = {
-                "nodes": list(representatives),
-                "adj": dict(coarse_adj),
-                "mapping": groups,
-            }
-            levels.append(level_data)
-
-            current_nodes = representatives
-            current_adj = dict(coarse_adj)
-
-        return levels
-
-    def _init_positions(self, node_list, N):
+                         adj: dict[str, list[str]]) -> list[Level]:
+        """Build multilevel hierarchy via maximal independent edge set.
+
+        The component's edges become index arrays in ``node_list``
+        order and the coarsening itself runs over CSR matrices in
+        :func:`multilevel.build_hierarchy`.
+        """
+        index = {name: i for i, name in enumerate(node_list)}
+        eu: list[int] = []
+        ev: list[int] = []
+        weight: list[float] = []
+        length: list[float] = []
+        for u in node_list:
+            iu = index[u]
+            for v in adj.get(u, []):
+                iv = index.get(v)
+                if iv is None or not u < v:
+                    continue
+                pair = (u, v)
+                eu.append(iu)
+                ev.append(iv)
+                weight.append(self._edge_weight.get(pair, 1.0))
+                length.append(self._edge_len.get(pair, self.K))
+        return build_hierarchy(len(node_list), eu, ev, weight, length,
+                               self.max_levels, _COARSEN_RATIO)
+
+    def _init_positions(self, pos: np.ndarray, pos_set: np.ndarray,
+                        rng: np.random.Generator) -> np.ndarray:
+        """Random positions in a square of side ``K (sqrt(N) + 1)``
+        for every node without a user-set position."""
+        N = len(pos)
         span = self.K * (math.sqrt(N) + 1.0)
-        for name in node_list:
-            ln = self.lnodes.get(name)
-            if ln and not ln.pos_set:
-                ln.x = (random.random() - 0.5) * span
-                ln.y = (random.random() - 0.5) * span
+        out = (rng.random((N, 2)) - 0.5) * span
+        out[pos_set] = pos[pos_set]
+        return out
 
     # ── Spring-electrical solver ─────────────────
 
-    def _spring_electrical(self, node_list: list[str],
-                           adj: dict[str, list[str]],
-                           K: float, maxiter: int):
-        """Spring-electrical force computation with optional quadtree."""
-        N = len(node_list)
+    def _spring_electrical(self, pos: np.ndarray, level: Level,
+                           pinned: np.ndarray, K: float, maxiter: int):
+        """Spring-electrical force computation with optional quadtree.
+
+        Updates ``pos`` (``(N, 2)``) in place.  Mirrors
+        ``spring_electrical_embedding`` in ``spring_electrical.c``.
+        """
+        N = len(pos)
         if N < 2:
             return
 
         step = K
-        K2 = K * K
         p = self.repulsive_exp
+        eu, ev = level.eu, level.ev
+        # F_attr = C * w * d^2 / (K * d_ij), expressed per unit distance
+        attr = _ADAPTIVE_C * level.weight / (
+            K * np.maximum(level.length / 72.0, 0.01))
+        movable = ~pinned
 
         for iteration in range(maxiter):
-            # Clear displacements
-            for name in node_list:
-                ln = self.lnodes[name]
-                ln.disp_x = 0.0
-                ln.disp_y = 0.0
-
             # Repulsive forces
             if self.use_quadtree and N > 45:
-                self._quadtree_repulsion(node_list, K, p)
+                disp = self._quadtree_repulsion(pos, level.mass, K, p)
             else:
-                self._allpairs_repulsion(node_list, K, p)
+                disp = self._allpairs_repulsion(pos, K, p)
 
             # Attractive forces
-            seen = set()
-            for u in node_list:
-                for v in adj.get(u, []):
-                    if v in set(node_list):
-                        pair_key = (min(u, v), max(u, v))
-                        if pair_key in seen:
-                            continue
-                        seen.add(pair_key)
-                        pu, pv = self.lnodes[u], self.lnodes[v]
-                        dx = pv.x - pu.x
-                        dy = pv.y - pu.y
-                        dist = math.sqrt(dx * dx + dy * dy)
-                        if dist < 0.01:
-                            continue
-                        edge_len = self._edge_len.get(pair_key, K)
-                        w = self._edge_weight.get(pair_key, 1.0)
-                        # F_attr = C * d^2 / (K * d_ij)
-                        force = _ADAPTIVE_C * w * dist / (K * max(edge_len / 72.0, 0.01))
-                        fx, fy = dx / dist * force, dy / dist * force
-                        pu.disp_x += fx
-                        pu.disp_y += fy
-                        pv.disp_x -= fx
-                        pv.disp_y -= fy
+            if len(eu):
+                d = pos[ev] - pos[eu]
+                dist = np.sqrt(np.einsum("ij,ij->i", d, d))
+                f = d * np.where(dist < 0.01, 0.0, attr)[:, None]
+                for axis in (0, 1):
+                    disp[:, axis] += np.bincount(eu, weights=f[:, axis],
+                                                 minlength=N)
+                    disp[:, axis] -= np.bincount(ev, weights=f[:, axis],
+                                                 minlength=N)
 
             # Update positions with adaptive step
-            max_disp = 0.0
-            for name in node_list:
-                ln = self.lnodes[name]
-                if ln.pinned:
-                    continue
-                d = math.sqrt(ln.disp_x ** 2 + ln.disp_y ** 2)
-                if d > 0:
-                    scale = min(step, d) / d
-                    ln.x += ln.disp_x * scale
-                    ln.y += ln.disp_y * scale
-                    max_disp = max(max_disp, d)
+            dlen = np.sqrt(np.einsum("ij,ij->i", disp, disp))
+            move = movable & (dlen > 0)
+            if move.any():
+                dm = dlen[move]
+                pos[move] += disp[move] * (np.minimum(step, dm) / dm)[:, None]
+                max_disp = float(dm.max())
+            else:
+                max_disp = 0.0
 
             # Adaptive cooling
             step *= _COOLING
             if max_disp < K * 0.001:
                 break
 
-    def _allpairs_repulsion(self, node_list, K, p):
-        """O(n^2) repulsive forces."""
+    def _allpairs_repulsion(self, pos: np.ndarray, K: float,
+                            p: float) -> np.ndarray:
+        """O(n^2) repulsive forces, one row block at a time.
+
+        ``F_rep = K^(1+p) / dist^(1+p)``; coincident pairs get a small
+        random offset.
+        """
+        N = len(pos)
         Kp = K ** (1 + p)
-        for i in range(len(node_list)):
-            pi = self.lnodes[node_list[i]]
-            for j in range(i + 1, len(node_list)):
-                pj = self.lnodes[node_list[j]]
-                dx = pj.x - pi.x
-                dy = pj.y - pi.y
-                dist2 = dx * dx + dy * dy
-                if dist2 < 0.01:
-                    dx += random.random() * 0.1
-                    dy += random.random() * 0.1
-                    dist2 = dx * dx + dy * dy
-                dist = math.sqrt(dist2)
-                # F_rep = K^(1+p) / dist^(1+p)
-                force = Kp / (dist ** (1 + p))
-                fx, fy = dx / dist * force, dy / dist * force
-                pj.disp_x += fx
-                pj.disp_y += fy
-                pi.disp_x -= fx
-                pi.disp_y -= fy
+        disp = np.zeros((N, 2))
+        for i in range(N - 1):
+            d = pos[i + 1:] - pos[i]
+            dist2 = np.einsum("ij,ij->i", d, d)
+            close = dist2 < 0.01
+            if close.any():
+                d[close] += np.array([[random.random() * 0.1,
+                                       random.random() * 0.1]
+                                      for _ in range(int(close.sum()))])
+                dist2[close] = np.einsum("ij,ij->i", d[close], d[close])
+            dist = np.sqrt(dist2)
+            f = d * (Kp / dist ** (2 + p))[:, None]
+            disp[i + 1:] += f
+            disp[i] -= f.sum(axis=0)
+        return disp
 
     # ── Barnes-Hut quadtree ──────────────────────
 
-    def _quadtree_repulsion(self, node_list, K, p):
-        """O(n log n) Barnes-Hut repulsive forces."""
-        nodes_data = [(self.lnodes[n].x, self.lnodes[n].y,
-                        self.lnodes[n].mass) for n in node_list]
-        N = len(nodes_data)
-
-        # Compute bounding box
-        min_x = min(d[0] for d in nodes_data)
-        max_x = max(d[0] for d in nodes_data)
-        min_y = min(d[1] for d in nodes_data)
-        max_y = max(d[1] for d in nodes_data)
-        size = max(max_x - min_x, max_y - min_y, 1.0)
-
-        # Build quadtree
-        root = _QTNode(x0=min_x, y0=min_y, size=size)
-        for i in range(N):
-            self._qt_insert(root, i, nodes_data[i][0], nodes_data[i][1],
-                            nodes_data[i][2])
-
-        # Compute forces
-        Kp = K ** (1 + p)
-        for i in range(N):
-            fx, fy = self._qt_force(root, i, nodes_data[i][0],
-                                     nodes_data[i][1], Kp, p)
-            ln = self.lnodes[node_list[i]]
-            ln.disp_x += fx
-            ln.disp_y += fy
-
-    def _qt_insert(self, node: _QTNode, idx: int, x: float, y: float,
-                   mass: float):
-        """Insert a point into the quadtree."""
-        if node.mass == 0 and node.is_leaf:
-            node.cx, node.cy = x, y
-            node.mass = mass
-            node.node_idx = idx
-            return
-
-        if node.is_leaf and node.mass > 0:
-            # Split: move existing point to child
-            node.is_leaf = False
-            half = node.size / 2
-            node.children = [
-                _QTNode(x0=node.x0, y0=node.y0, size=half),
-                _QTNode(x0=node.x0 + half, y0=node.y0, size=half),
-                _QTNode(x0=node.x0, y0=node.y0 + half, size=half),
-                _QTNode(x0=node.x0 + half, y0=node.y0 + half, size=half),
-            ]
-            # Re-insert old point
-            oi = self._qt_quadrant(node, node.cx, node.cy)
-            self._qt_insert(node.children[oi], node.node_idx,
-                            node.cx, node.cy, node.mass)
-            node.node_idx = -1
-
-        # Insert new point
-        qi = self._qt_quadrant(node, x, y)
-        if not node.children:
-            half = node.size / 2
-            node.children = [
-                _QTNode(x0=node.x0, y0=node.y0, size=half),
-                _QTNode(x0=node.x0 + half, y0=node.y0, size=half),
-                _QTNode(x0=node.x0, y0=node.y0 + half, size=half),
-                _QTNode(x0=node.x0 + half, y0=node.y0 + half, size=half),
-            ]
-        self._qt_insert(node.children[qi], idx, x, y, mass)
-
-        # Update center of mass
-        total = node.mass + mass
-        node.cx = (node.cx * node.mass + x * mass) / total
-        node.cy = (node.cy * node.mass + y * mass) / total
-        node.mass = total
-
-    @staticmethod
-    def _qt_quadrant(node: _QTNode, x: float, y: float) -> int:
-        half = node.size / 2
-        mx = node.x0 + half
-        my = node.y0 + half
-        if x < mx:
-            return 2 if y >= my else 0
-        else:
-            return 3 if y >= my else 1
-
-    def _qt_force(self, node: _QTNode, idx: int, x: float, y: float,
-                  Kp: float, p: float) -> tuple[float, float]:
-        """Compute repulsive force on point idx from quadtree node."""
-        if node.mass == 0:
-            return 0.0, 0.0
-
-        dx = node.cx - x
-        dy = node.cy - y
-        dist2 = dx * dx + dy * dy
-
-        if node.is_leaf:
-            if node.node_idx == idx:
-                return 0.0, 0.0
-            if dist2 < 0.01:
-                dx += random.random() * 0.1
-                dy += random.random() * 0.1
-                dist2 = dx * dx + dy * dy
-            dist = math.sqrt(dist2)
-            force = Kp * node.mass / (dist ** (1 + p))
-            return -dx / dist * force, -dy / dist * force
-
-        # Check Barnes-Hut criterion: size/distance < theta
-        dist = math.sqrt(max(dist2, 0.01))
-        if node.size / dist < _BH_THETA:
-            # Treat as single mass
-            force = Kp * node.mass / (dist ** (1 + p))
-            return -dx / dist * force, -dy / dist * force
-
-        # Recurse into children
-        fx, fy = 0.0, 0.0
-        for child in node.children:
-            cfx, cfy = self._qt_force(child, idx, x, y, Kp, p)
-            fx += cfx
-            fy += cfy
-        return fx, fy
+    def _quadtree_repulsion(self, pos: np.ndarray, mass: np.ndarray,
+                            K: float, p: float) -> np.ndarray:
+        """O(n log n) Barnes-Hut repulsive forces (see ``quadtree.py``)."""
+        return repulsive_force(pos, mass, K, p, _BH_THETA)
 
     # ── Beautify ─────────────────────────────────
 
     def _beautify_leaves(self, node_list, adj):
         """Arrange leaf nodes (degree 1) in a circle around their neighbor."""
+        node_set = set(node_list)
         for name in node_list:
-            nbrs = [n for n in adj.get(name, []) if n in set(node_list)]
+            nbrs = [n for n in adj.get(name, []) if n in node_set]
             if len(nbrs) != 1:
                 continue
             parent = self.lnodes[nbrs[0]]
             leaf = self.lnodes[name]
             # Count siblings
             siblings = [n for n in adj.get(nbrs[0], [])
-                        if n in set(node_list) and
+                        if n in node_set and
                         len(adj.get(n, [])) == 1]
             if len(siblings) <= 1:
                 continue
@@ -621,32 +465,11 @@ class SfdpLayout(LayoutEngine):
     # ── Overlap removal ──────────────────────────
 
     def _remove_overlap(self):
-        """Simple iterative overlap removal."""
-        nodes = list(self.lnodes.values())
-        N = len(nodes)
-        if N < 2:
-            return
-        for _ in range(50):
-            has_overlap = False
-            for i in range(N):
-                for j in range(i + 1, N):
-                    a, b = nodes[i], nodes[j]
-                    dx, dy = b.x - a.x, b.y - a.y
-                    dist = math.sqrt(dx * dx + dy * dy)
-                    min_d = ((a.width + b.width) / 2 +
-                             (a.height + b.height) / 2 + self.sep) * 0.5
-                    if dist < min_d and dist > 0:
-                        has_overlap = True
-                        push = (min_d - dist) / 2 + 1
-                        ux, uy = dx / dist, dy / dist
-                        if not a.pinned:
-                            a.x -= ux * push
-                            a.y -= uy * push
-                        if not b.pinned:
-                            b.x += ux * push
-                            b.y += uy * push
-            if not has_overlap:
-                break
+        """Dispatch ``overlap=`` through the shared
+        ``common.adjust.remove_overlap`` (scale, prism, vpsc, ortho,
+        …), matching neato / fdp.  Mirrors sfdp's call to
+        ``removeOverlapWith`` in ``sfdpinit.c``."""
+        remove_overlap(self)
 
     # Shared from LayoutEngine: _compute_node_size, _init_common_attrs,
     # _apply_normalize, _apply_rotation, _apply_center,
@@ -44,6 +44,17 @@ Algorithm summary:
 7. ``set_absolute_pos`` — convert (level, theta) to (x, y) using
    the ranksep array.
 
+Python deviation: ``circle_layout`` runs steps 1–6 over integer
+node ids and flat lists (``_radial_arrays``) rather than the
+per-node functions above, which are kept as the reference port.
+Leaf distances come from one multi-source BFS instead of a DFS per
+leaf, the BFS tree is built once, subtree sizes accumulate in
+reverse BFS order, and spans and thetas are assigned in BFS order.
+Every value, including the floating-point span and theta
+arithmetic, matches the recursive functions; only the cost
+changes, from repeated traversals to linear time without
+recursion.
+
 Trace tag: ``[TRACE twopi]``.
 """
 from __future__ import annotations
@@ -363,6 +374,119 @@ def set_absolute_pos(layout: "TwopiLayout",
         ln.y = hyp * math.sin(ln.theta)
 
 
+def _radial_arrays(names: list[str], adj: dict[str, list[str]],
+                   center_hint: str | None):
+    """Steps 1–6 of the algorithm over integer ids.
+
+    Returns ``(s_leaf, center, order, parent, s_center, n_child,
+    stsize, span, theta)`` indexed by position in ``names``;
+    ``order`` is the BFS order from ``center`` and ``parent`` holds
+    ``-1`` for the centre and unreached nodes.  ``stsize``, ``span``
+    and ``theta`` are ``None`` when some node is unreached.
+    """
+    n = len(names)
+    INF = n * n
+    ids = {name: i for i, name in enumerate(names)}
+    # CSR adjacency in ``adj`` order; neighbours outside ``names``
+    # are dropped.
+    ptr = [0] * (n + 1)
+    nbr: list[int] = []
+    for i, name in enumerate(names):
+        for v in adj.get(name, ()):
+            j = ids.get(v)
+            if j is not None:
+                nbr.append(j)
+        ptr[i + 1] = len(nbr)
+
+    s_leaf = [INF] * n
+    frontier: list[int] = []
+    for i in range(n):
+        distinct = -1
+        leaf = True
+        for k in range(ptr[i], ptr[i + 1]):
+            j = nbr[k]
+            if j == i:
+                continue
+            if distinct < 0:
+                distinct = j
+            elif distinct != j:
+                leaf = False
+                break
+        if leaf:
+            s_leaf[i] = 0
+            frontier.append(i)
+
+    if center_hint is not None and center_hint in ids:
+        center = ids[center_hint]
+    else:
+        # Multi-source BFS: ``s_leaf`` = distance to the nearest leaf.
+        head = 0
+        queue = frontier
+        while head < len(queue):
+            i = queue[head]
+            head += 1
+            d = s_leaf[i] + 1
+            for k in range(ptr[i], ptr[i + 1]):
+                j = nbr[k]
+                if d < s_leaf[j]:
+                    s_leaf[j] = d
+                    queue.append(j)
+        center = 0
+        max_s = 0
+        for i in range(n):
+            if s_leaf[i] > max_s:
+                max_s = s_leaf[i]
+                center = i
+
+    # BFS tree from the centre; children of a node are contiguous in
+    # ``order``, in ``adj`` order.
+    s_center = [INF] * n
+    parent = [-1] * n
+    n_child = [0] * n
+    s_center[center] = 0
+    order = [center]
+    head = 0
+    while head < len(order):
+        i = order[head]
+        head += 1
+        d = s_center[i] + 1
+        for k in range(ptr[i], ptr[i + 1]):
+            j = nbr[k]
+            if d < s_center[j]:
+                s_center[j] = d
+                parent[j] = i
+                n_child[i] += 1
+                order.append(j)
+    if len(order) < n:
+        return (s_leaf, center, order, parent, s_center, n_child,
+                None, None, None)
+
+    stsize = [0] * n
+    for i in reversed(order):
+        if n_child[i] == 0:
+            stsize[i] += 1
+        p = parent[i]
+        if p >= 0:
+            stsize[p] += stsize[i]
+
+    span = [0.0] * n
+    theta = [UNSET_THETA] * n
+    span[center] = 2 * math.pi
+    theta[center] = 0.0
+    # Lower boundary of the next child's fan, per parent.
+    low = [0.0] * n
+    for i in order:
+        p = parent[i]
+        if p >= 0:
+            span[i] = (span[p] / stsize[p]) * stsize[i]
+            theta[i] = low[p] + span[i] / 2.0
+            low[p] += span[i]
+        if n_child[i] > 0:
+            low[i] = 0.0 if p < 0 else theta[i] - span[i] / 2
+    return (s_leaf, center, order, parent, s_center, n_child,
+            stsize, span, theta)
+
+
 def circle_layout(layout: "TwopiLayout",
                   names: list[str],
                   adj: dict[str, list[str]],
@@ -380,23 +504,30 @@ def circle_layout(layout: "TwopiLayout",
         ln.x, ln.y = 0.0, 0.0
         return names[0]
 
-    init_layout(layout, names, adj)
-
-    if center_hint and center_hint in layout.lnodes:
-        center = center_hint
-    else:
-        center = find_center_node(layout, names, adj)
-
-    max_rank = set_parent_nodes(layout, names, adj, center)
-    if max_rank < 0:
+    (s_leaf, c, order, parent, s_center, n_child,
+     stsize, span, theta) = _radial_arrays(names, adj, center_hint)
+    center = names[c]
+    lnodes = layout.lnodes
+    for i, name in enumerate(names):
+        ln = lnodes[name]
+        ln.s_leaf = s_leaf[i]
+        ln.s_center = s_center[i]
+        ln.parent = names[parent[i]] if parent[i] >= 0 else ""
+        ln.n_child = n_child[i]
+        if stsize is None:
+            ln.theta = UNSET_THETA
+            ln.stsize = 0
+            ln.span = 0.0
+        else:
+            ln.theta = theta[i]
+            ln.stsize = stsize[i]
+            ln.span = span[i]
+    if stsize is None:
         _trace(f"warning: weight=0 created a disconnected component "
                f"(centre {center})")
         return center
 
+    max_rank = s_center[order[-1]]
     _trace(f"centre={center} max_rank={max_rank}")
-
-    set_subtree_size(layout, names)
-    set_subtree_spans(layout, center, adj)
-    set_positions(layout, center, adj)
     set_absolute_pos(layout, names, max_rank)
     return center
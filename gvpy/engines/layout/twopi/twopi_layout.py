@@ -171,6 +171,7 @@ class TwopiLayout(LayoutEngine):
         adj: dict[str, list[str]] = defaultdict(list)
         for name in self.lnodes:
             adj[name]
+        seen: set[tuple[str, str]] = set()
         for key, edge in self.graph.edges.items():
             t, h = edge.tail.name, edge.head.name
             if t not in self.lnodes or h not in self.lnodes:
@@ -181,9 +182,11 @@ class TwopiLayout(LayoutEngine):
                 w = 1.0
             if w <= 0:
                 continue
-            if h not in adj[t]:
+            if (t, h) not in seen:
+                seen.add((t, h))
                 adj[t].append(h)
-            if t not in adj[h]:
+            if (h, t) not in seen:
+                seen.add((h, t))
                 adj[h].append(t)
         return dict(adj)
 
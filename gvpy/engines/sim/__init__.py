@@ -13,7 +13,10 @@ Two paradigms live side by side here:
   (``ConstantBlock``, ``GainBlock``, ``AdderBlock``, ...).
   :mod:`gvpy.engines.sim.solver` runs the three-phase Mealy step
   (Output → Update → Advance) described in Van Tendeloo &
-  Vangheluwe (2018).
+  Vangheluwe (2018); :mod:`gvpy.engines.sim.compiled` compiles that
+  step into NumPy array operations for long runs of large models,
+  and :mod:`gvpy.engines.sim.sweep` runs many parameter sets of one
+  model in lock-step on them.
 
 Both paradigms share the :class:`SimulationView` base from
 :mod:`gvpy.engines.sim.base`, which extends
@@ -55,6 +58,8 @@ from .cbd import (
     CBDSimulationView,
 )
 from .solver import CBDSolver, topological_sort
+from .compiled import CompiledSchedule
+from .sweep import ParameterSweep, SweepResult
 from .trace import SimulationTrace
 
 __all__ = [
@@ -70,5 +75,6 @@ __all__ = [
     "CompoundBlock", "ConstantBlock", "GainBlock", "AdderBlock",
     "NegatorBlock", "ProductBlock", "CBDSimulationView",
     # solver / utility
-    "CBDSolver", "topological_sort", "SimulationTrace",
+    "CBDSolver", "topological_sort", "CompiledSchedule", "ParameterSweep",
+    "SweepResult", "SimulationTrace",
 ]
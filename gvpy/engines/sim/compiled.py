@@ -0,0 +1,617 @@
+"""Compiled CBD schedules — the Mealy step as array operations.
+
+Python addition: :meth:`gvpy.engines.sim.solver.CBDSolver.step`
+interprets the flattened model on every iteration (``isinstance``
+dispatch, port-dict lookups, a method call per block).
+:class:`CompiledSchedule` turns the topologically sorted leaf blocks
+into a fixed program over a NumPy signal array once, and runs it for
+as many iterations as asked.
+
+Layout
+------
+``sig`` has a row per output port of a scheduled block, plus a row
+per *external* source — an unconnected input port, or a port outside
+the schedule such as a compound's own port — whose value does not
+change during a run.  Its columns are independent replicas of the
+model: one for :meth:`CBDSolver.run`, several for batched runs.
+Constant values and gains live in a parameter array and delay states
+in a state array, with the same columns.
+
+Read order
+----------
+The interpreted step computes blocks one after another, and delay
+edges do not constrain the sort, so a block scheduled before the
+delay that feeds it reads the delay's output from the *previous*
+iteration.  The program keeps that: a read of a row written at or
+after the reader's place in the schedule is taken from a copy of the
+signals made at the start of the iteration, every other read sees
+the current values.  Blocks are levelled by their current-iteration
+dependencies, and each level's blocks of one primitive type run as
+one integer-indexed operation, with the arithmetic the primitive's
+``compute`` does in the same order (so results are bit-identical).
+
+Single runs
+-----------
+One replica gains nothing from arrays: indexing a NumPy element costs
+more than the arithmetic.  With a single column the schedule runs as
+one generated Python function instead — the whole iteration loop,
+straight-line, one statement per primitive over local floats, in the
+order and with the arithmetic of the array program.
+
+Only the exact primitive types are compiled — a subclass may
+override ``compute``.  Any other block runs its own ``compute`` /
+``update_state`` on ports loaded from, and stored back to, its
+signal rows, one replica at a time.  Signals must be real numbers
+where a primitive reads them; values are stored back to the blocks as
+floats.
+"""
+from __future__ import annotations
+
+import copy
+from numbers import Real
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+import numpy as np
+
+from .cbd import (
+    AdderBlock, ConstantBlock, DelayBlock, GainBlock, NegatorBlock,
+    ProductBlock, StatefulBlock,
+)
+
+if TYPE_CHECKING:
+    from .cbd import Block, Port
+    from .clock import DiscreteClock
+
+# With several replicas, groups smaller than this run block by block
+# on whole rows — an array operation costs as much as a dozen row
+# updates.
+_MIN_VECTOR = 16
+
+# Block types run as array operations, by their ``compute`` kind.
+_KIND = {
+    ConstantBlock: "const", GainBlock: "gain", NegatorBlock: "neg",
+    AdderBlock: "add", ProductBlock: "mul", DelayBlock: "delay",
+}
+
+
+def _source_port(port: "Port") -> "Port":
+    """The port an input reads from: its upstream output, or itself
+    when unconnected."""
+    return port.connected_from if port.connected_from is not None else port
+
+
+def _real(value: Any, what: str) -> float:
+    if type(value) is float:
+        return value
+    if not isinstance(value, Real):
+        raise TypeError(f"{what} is not a real number: {value!r}")
+    return float(value)
+
+
+class _Read:
+    """Row gather of one input per block of a group."""
+
+    def __init__(self, rows: list[int], stale: list[bool]):
+        self.rows = np.array(rows, dtype=np.intp)
+        mask = np.array(stale, dtype=bool)
+        self.all_stale = bool(mask.all()) and len(rows) > 0
+        self.some_stale = bool(mask.any()) and not self.all_stale
+        self.stale = np.nonzero(mask)[0]
+
+    def __call__(self, sig: np.ndarray, prev: np.ndarray) -> np.ndarray:
+        if self.all_stale:
+            return prev[self.rows]
+        vals = sig[self.rows]
+        if self.some_stale:
+            vals[self.stale] = prev[self.rows[self.stale]]
+        return vals
+
+
+def _scalar_run(items: list[tuple]) -> Callable:
+    """Phase-1 op applying the element updates ``items`` in order, on
+    whole rows."""
+    def op(sig, prev, params, state, cstate, it):
+        for kind, out, aux, reads in items:
+            if kind == "gain":
+                row, stale = reads[0]
+                sig[out] = params[aux] * (prev if stale else sig)[row]
+            elif kind == "add":
+                acc = 0.0
+                for row, stale in reads:
+                    acc = acc + (prev if stale else sig)[row]
+                sig[out] = acc
+            elif kind == "mul":
+                acc = 1.0
+                for row, stale in reads:
+                    acc = acc * (prev if stale else sig)[row]
+                sig[out] = acc
+            elif kind == "neg":
+                row, stale = reads[0]
+                sig[out] = -(prev if stale else sig)[row]
+            elif kind == "const":
+                sig[out] = params[aux]
+            else:  # delay
+                sig[out] = state[aux]
+    return op
+
+
+class CompiledSchedule:
+    """A topologically sorted block list compiled to array operations.
+
+    Build it from :attr:`CBDSolver.schedule` (see
+    :meth:`CBDSolver.compile`); recompile after changing the model's
+    structure.  Parameter values (``ConstantBlock.value``,
+    ``GainBlock.k``) and states are read from the blocks at the start
+    of every :meth:`run`, so they may change between runs.
+    """
+
+    def __init__(self, schedule: list["Block"]):
+        self.schedule = list(schedule)
+        rows: dict[int, int] = {}
+        #: Port whose value each signal row carries.
+        self.ports: list["Port"] = []
+        writer: list[int] = []
+        for pos, blk in enumerate(self.schedule):
+            for port in blk.output_ports.values():
+                rows[id(port)] = len(self.ports)
+                self.ports.append(port)
+                writer.append(pos)
+        self.n_written = len(self.ports)
+
+        def source(port: "Port", pos: int) -> tuple[int, bool]:
+            key = _source_port(port)
+            row = rows.get(id(key))
+            if row is None:
+                row = rows[id(key)] = len(self.ports)
+                self.ports.append(key)
+                writer.append(-1)
+            return row, writer[row] >= pos
+
+        #: Row of each output port, by port identity.
+        self.rows = rows
+        #: Blocks with a parameter row (constants, gains) / state row
+        #: (delays), in row order.
+        self.param_blocks: list["Block"] = []
+        self.state_blocks: list[DelayBlock] = []
+        # Schedule positions of blocks run through their own methods.
+        self._custom: set[int] = set()
+        # Phase-1 reads (port, row, stale) per schedule position.
+        self._reads: list[list[tuple["Port", int, bool]]] = []
+        level = [0] * len(self.schedule)
+        custom_level = 0
+        groups: dict[tuple[int, str, int], list[int]] = {}
+        for pos, blk in enumerate(self.schedule):
+            kind = _KIND.get(type(blk), "custom")
+            if kind in ("gain", "neg"):
+                names = ["IN"]
+            elif kind in ("add", "mul"):
+                names = [f"IN{i + 1}" for i in range(blk.num_inputs)]
+            elif kind == "custom":
+                names = list(blk.input_ports)
+            else:
+                names = []
+            reads = []
+            for name in names:
+                port = blk.input_ports[name]
+                row, stale = source(port, pos)
+                reads.append((port, row, stale))
+                if not stale and writer[row] >= 0:
+                    level[pos] = max(level[pos], level[writer[row]] + 1)
+            self._reads.append(reads)
+            if kind == "custom":
+                level[pos] = custom_level = max(level[pos], custom_level)
+                self._custom.add(pos)
+            arity = len(names) if kind in ("add", "mul") else 0
+            groups.setdefault((level[pos], kind, arity), []).append(pos)
+
+        # Rows read from the start-of-iteration copy, and those only
+        # custom blocks read that way: their ``compute`` may ignore
+        # the value, which before a delay's first ``compute`` can be
+        # ``None``, so the first iteration leaves those ports alone.
+        self._stale_rows = sorted({row for reads in self._reads
+                                   for _, row, stale in reads if stale})
+        self._custom_stale = set(self._stale_rows).difference(
+            row for pos, reads in enumerate(self._reads)
+            if pos not in self._custom for _, row, stale in reads if stale)
+        self._first_iter = 0
+        self._param_row: dict[int, int] = {}
+        self._state_row: dict[int, int] = {}
+        # Phase 1: (level, order, op) — primitives first within a
+        # level, then custom blocks in schedule order.  Consecutive
+        # small groups merge into one run of element updates.
+        ops: list[tuple[int, int, Any]] = []
+        # The same steps as element updates, or ``("custom", pos)``,
+        # for the straight-line program.
+        steps: list[tuple[int, int, list[tuple]]] = []
+        for (lv, kind, _), members in groups.items():
+            if kind == "custom":
+                for pos in members:
+                    ops.append((lv, 1 + pos, self._custom_compute(pos)))
+                    steps.append((lv, 1 + pos, [("custom", pos)]))
+                continue
+            elements = self._scalar_items(kind, members)
+            steps.append((lv, 0, elements))
+            if len(members) < _MIN_VECTOR:
+                ops.append((lv, 0, elements))
+            else:
+                ops.append((lv, 0, self._vector_op(kind, members)))
+        ops.sort(key=lambda op: op[:2])
+        steps.sort(key=lambda step: step[:2])
+        self._steps = [item for _, _, items in steps for item in items]
+        self._phase1: list[Callable] = []
+        items: list[tuple] = []
+        for _, _, op in ops:
+            if isinstance(op, list):
+                items.extend(op)
+                continue
+            if items:
+                self._phase1.append(_scalar_run(items))
+                items = []
+            self._phase1.append(op)
+        if items:
+            self._phase1.append(_scalar_run(items))
+
+        # Phase 2: stateful blocks in schedule order, runs of delays
+        # as one array op.
+        self._phase2: list[Callable] = []
+        self._delay_in: list[tuple["Port", int]] = []
+        # ``("delay", row, state row)`` / ``("custom", pos, reads)``.
+        self._updates: list[tuple] = []
+        run: list[tuple[int, int]] = []
+        for pos, blk in enumerate(self.schedule):
+            if not isinstance(blk, StatefulBlock):
+                continue
+            if type(blk) is DelayBlock:
+                port = blk.input_ports["IN"]
+                row, _ = source(port, len(self.schedule))
+                run.append((row, self._state(blk)))
+                self._delay_in.append((port, row))
+                self._updates.append(("delay", row, run[-1][1]))
+                continue
+            if run:
+                self._phase2.append(self._delay_update(run))
+                run = []
+            self._phase2.append(self._custom_update(pos, source))
+            self._updates.append(
+                ("custom", pos,
+                 [(port, source(port, len(self.schedule))[0])
+                  for port in blk.input_ports.values()]))
+        if run:
+            self._phase2.append(self._delay_update(run))
+        self._stale_reads = bool(self._stale_rows)
+        # Custom blocks with a state of their own.
+        self._custom_states = [
+            pos for pos in sorted(self._custom)
+            if isinstance(self.schedule[pos], StatefulBlock)]
+        self._program = self._straight_line()
+
+    # ── Program construction ────────────────────────────────────
+
+    def _param(self, blk: "Block") -> int:
+        row = self._param_row.setdefault(id(blk), len(self.param_blocks))
+        if row == len(self.param_blocks):
+            self.param_blocks.append(blk)
+        return row
+
+    def _state(self, blk: DelayBlock) -> int:
+        row = self._state_row.setdefault(id(blk), len(self.state_blocks))
+        if row == len(self.state_blocks):
+            self.state_blocks.append(blk)
+        return row
+
+    def _vector_op(self, kind: str, members: list[int]) -> Callable:
+        blocks = [self.schedule[pos] for pos in members]
+        out = np.array([self.rows[id(b.output_ports["OUT"])] for b in blocks],
+                       dtype=np.intp)
+        reads = [_Read([self._reads[pos][k][1] for pos in members],
+                       [self._reads[pos][k][2] for pos in members])
+                 for k in range(len(self._reads[members[0]]))]
+        if kind == "const":
+            par = np.array([self._param(b) for b in blocks], dtype=np.intp)
+
+            def op(sig, prev, params, state, cstate, it):
+                sig[out] = params[par]
+        elif kind == "gain":
+            par = np.array([self._param(b) for b in blocks], dtype=np.intp)
+            (read,) = reads
+
+            def op(sig, prev, params, state, cstate, it):
+                sig[out] = params[par] * read(sig, prev)
+        elif kind == "neg":
+            (read,) = reads
+
+            def op(sig, prev, params, state, cstate, it):
+                sig[out] = -read(sig, prev)
+        elif kind == "add":
+            def op(sig, prev, params, state, cstate, it):
+                # ``sum`` starts from 0 and adds left to right.
+                acc = 0.0
+                for read in reads:
+                    acc = acc + read(sig, prev)
+                sig[out] = acc
+        elif kind == "mul":
+            def op(sig, prev, params, state, cstate, it):
+                acc = 1.0
+                for read in reads:
+                    acc = acc * read(sig, prev)
+                sig[out] = acc
+        else:  # delay
+            st = np.array([self._state(b) for b in blocks], dtype=np.intp)
+
+            def op(sig, prev, params, state, cstate, it):
+                sig[out] = state[st]
+        return op
+
+    def _scalar_items(self, kind: str, members: list[int]) -> list[tuple]:
+        """Element updates ``(kind, out, aux, reads)`` for a few
+        blocks, for :func:`_scalar_run`."""
+        items = []
+        for pos in members:
+            blk = self.schedule[pos]
+            if kind in ("const", "gain"):
+                aux = self._param(blk)
+            elif kind == "delay":
+                aux = self._state(blk)
+            else:
+                aux = -1
+            items.append((kind, self.rows[id(blk.output_ports["OUT"])], aux,
+                          [(row, stale) for _, row, stale in self._reads[pos]]))
+        return items
+
+    def _delay_update(self, rows: list[tuple[int, int]]) -> Callable:
+        """``state := input`` for delays with (signal row, state row)
+        ``rows``."""
+        src = np.array([r for r, _ in rows], dtype=np.intp)
+        st = np.array([r for _, r in rows], dtype=np.intp)
+
+        def op(sig, params, state, cstate, it):
+            state[st] = sig[src]
+        return op
+
+    def _custom_compute(self, pos: int) -> Callable:
+        blk = self.schedule[pos]
+        reads = [(port, row, stale) for port, row, stale in self._reads[pos]]
+        outs = [(port, self.rows[id(port)])
+                for port in blk.output_ports.values()]
+        stateful = isinstance(blk, StatefulBlock)
+
+        loose = [row in self._custom_stale and stale
+                 for _, row, stale in reads]
+
+        def op(sig, prev, params, state, cstate, it):
+            first = it == self._first_iter
+            for j in range(sig.shape[1]):
+                for (port, row, stale), skip in zip(reads, loose):
+                    if skip and first:
+                        continue  # the port still holds its raw value
+                    _source_port(port).value = \
+                        (prev if stale else sig)[row, j].item()
+                for port, row in outs:
+                    port.value = sig[row, j].item()
+                if stateful:
+                    blk.state = cstate[pos][j]
+                blk.compute(it)
+                for port, row in outs:
+                    sig[row, j] = _real(port.value,
+                                        f"{blk.name}.{port.name}")
+                if stateful:
+                    cstate[pos][j] = blk.state
+        return op
+
+    def _custom_update(self, pos: int, source) -> Callable:
+        blk = self.schedule[pos]
+        reads = [(port, source(port, len(self.schedule))[0])
+                 for port in blk.input_ports.values()]
+
+        def op(sig, params, state, cstate, it):
+            for j in range(sig.shape[1]):
+                for port, row in reads:
+                    _source_port(port).value = sig[row, j].item()
+                blk.state = cstate[pos][j]
+                blk.update_state(it)
+                cstate[pos][j] = blk.state
+        return op
+
+    def _straight_line(self) -> Callable:
+        """The single-replica program: the whole iteration loop as one
+        generated function over local floats — ``s<row>`` signals,
+        ``t<row>`` start-of-iteration copies of stale-read rows,
+        ``p<row>`` parameters, ``d<row>`` delay states and ``c<pos>``
+        custom-block states."""
+        env: dict[str, Any] = {"_real": _real}
+        stale = self._stale_rows
+        n, ns = self.n_written, len(self.state_blocks)
+
+        def names(prefix: str, count: int) -> str:
+            return "".join(f"{prefix}{k}, " for k in range(count))
+
+        def value(row: int, is_stale: bool) -> str:
+            return f"t{row}" if is_stale else f"s{row}"
+
+        def custom_compute(pos: int) -> list[str]:
+            blk = self.schedule[pos]
+            env[f"B{pos}"] = blk
+            lines = []
+            for k, (port, row, is_stale) in enumerate(self._reads[pos]):
+                env[f"I{pos}_{k}"] = _source_port(port)
+                line = f"I{pos}_{k}.value = {value(row, is_stale)}"
+                if is_stale and row in self._custom_stale:
+                    line = f"if it != first_iter: {line}"
+                lines.append(line)
+            outs = list(blk.output_ports.values())
+            for k, port in enumerate(outs):
+                env[f"O{pos}_{k}"] = port
+                lines.append(f"O{pos}_{k}.value = s{self.rows[id(port)]}")
+            if isinstance(blk, StatefulBlock):
+                lines.append(f"B{pos}.state = c{pos}")
+            lines.append(f"B{pos}.compute(it)")
+            for k, port in enumerate(outs):
+                lines.append(f"s{self.rows[id(port)]} = _real("
+                             f"O{pos}_{k}.value, "
+                             f"{f'{blk.name}.{port.name}'!r})")
+            if isinstance(blk, StatefulBlock):
+                lines.append(f"c{pos} = B{pos}.state")
+            return lines
+
+        body = [f"t{row} = s{row}" for row in stale]
+        for step in self._steps:
+            if step[0] == "custom":
+                body.extend(custom_compute(step[1]))
+                continue
+            kind, out, aux, reads = step
+            args = [value(row, is_stale) for row, is_stale in reads]
+            if kind == "const":
+                body.append(f"s{out} = p{aux}")
+            elif kind == "delay":
+                body.append(f"s{out} = d{aux}")
+            elif kind == "gain":
+                body.append(f"s{out} = p{aux} * {args[0]}")
+            elif kind == "neg":
+                body.append(f"s{out} = -{args[0]}")
+            else:
+                # Left to right from the ``sum`` / ``prod`` start, a
+                # few terms per statement to keep expressions shallow.
+                op = " + " if kind == "add" else " * "
+                acc = "0.0" if kind == "add" else "1.0"
+                for k in range(0, max(len(args), 1), 32):
+                    body.append(f"s{out} = "
+                                + op.join([acc, *args[k:k + 32]]))
+                    acc = f"s{out}"
+        body.append("if observe is not None:")
+        body.append(f"    sig[:{n}, 0] = ({names('s', n)})")
+        body.append("    observe(it, sig)")
+        for update in self._updates:
+            if update[0] == "delay":
+                body.append(f"d{update[2]} = s{update[1]}")
+                continue
+            _, pos, reads = update
+            blk = self.schedule[pos]
+            env[f"B{pos}"] = blk
+            for k, (port, row) in enumerate(reads):
+                env[f"U{pos}_{k}"] = _source_port(port)
+                body.append(f"U{pos}_{k}.value = s{row}")
+            body.extend([f"B{pos}.state = c{pos}",
+                         f"B{pos}.update_state(it)",
+                         f"c{pos} = B{pos}.state"])
+
+        custom = self._custom_states
+        src = [
+            "def program(sig, params, state, cstate, num_iters, first_iter,"
+            " observe):",
+            f"    ({names('s', len(self.ports))}) = sig[:, 0].tolist()",
+            f"    ({names('p', len(self.param_blocks))})"
+            " = params[:, 0].tolist()",
+            f"    ({names('d', ns)}) = state[:, 0].tolist()",
+            *(f"    c{pos} = cstate[{pos}][0]" for pos in custom),
+            *(f"    t{row} = s{row}" for row in stale),
+            "    for it in range(first_iter, first_iter + num_iters):",
+            *(f"        {line}" for line in body),
+            f"    sig[:{n}, 0] = ({names('s', n)})",
+            f"    state[:, 0] = ({names('d', ns)})",
+            *(f"    cstate[{pos}][0] = c{pos}" for pos in custom),
+            f"    return ({''.join(f't{row}, ' for row in stale)})",
+        ]
+        exec(compile("\n".join(src), f"<compiled {len(self.schedule)} "
+                     "blocks>", "exec"), env)
+        return env["program"]
+
+    # ── Execution ───────────────────────────────────────────────
+
+    def load(self, replicas: int = 1) -> tuple[np.ndarray, np.ndarray,
+                                                np.ndarray, dict]:
+        """Signals, parameters, states and custom-block states taken
+        from the blocks, repeated over ``replicas`` columns."""
+        stale = set(self._stale_rows) - self._custom_stale
+        column = [0.0] * len(self.ports)
+        for row, port in enumerate(self.ports):
+            value = port.value
+            if type(value) is float:
+                column[row] = value
+            elif row >= self.n_written or row in stale:
+                column[row] = _real(value, f"{port.owner.name}.{port.name}")
+            elif isinstance(value, Real):
+                column[row] = float(value)
+        params = [blk.value if type(blk) is ConstantBlock else blk.k
+                  for blk in self.param_blocks]
+        state = [blk.state for blk in self.state_blocks]
+        for values, blocks, what in ((params, self.param_blocks, " parameter"),
+                                     (state, self.state_blocks, ".state")):
+            for row, value in enumerate(values):
+                if type(value) is not float:
+                    values[row] = _real(value, blocks[row].name + what)
+        sig, params, state = (
+            np.repeat(np.array(values, dtype=float).reshape(-1, 1),
+                      replicas, axis=1)
+            for values in (column, params, state))
+        cstate = {}
+        for pos in self._custom_states:
+            blk = self.schedule[pos]
+            cstate[pos] = [blk.state] + [copy.deepcopy(blk.state)
+                                         for _ in range(replicas - 1)]
+        return sig, params, state, cstate
+
+    def execute(self, sig: np.ndarray, params: np.ndarray,
+                state: np.ndarray, cstate: dict, num_iters: int,
+                first_iter: int = 0,
+                observe: Optional[Callable[[int, np.ndarray], None]] = None
+                ) -> np.ndarray:
+        """Run ``num_iters`` Mealy steps on the arrays in place.
+
+        ``observe(iteration, sig)`` is called after each output phase.
+        Returns the signals as the last iteration's phase-1 reads saw
+        them at the start of that iteration.
+        """
+        self._first_iter = first_iter
+        if sig.shape[1] == 1 and num_iters > 0:
+            stale = self._program(sig, params, state, cstate, num_iters,
+                                  first_iter, observe)
+            if not self._stale_reads:
+                return sig
+            prev = sig.copy()
+            prev[self._stale_rows, 0] = stale
+            return prev
+        prev = sig
+        for k in range(num_iters):
+            it = first_iter + k
+            prev = sig.copy() if self._stale_reads else sig
+            for op in self._phase1:
+                op(sig, prev, params, state, cstate, it)
+            if observe is not None:
+                observe(it, sig)
+            for op in self._phase2:
+                op(sig, params, state, cstate, it)
+        return prev
+
+    def store(self, sig: np.ndarray, prev: np.ndarray, state: np.ndarray,
+              cstate: dict, column: int = 0) -> None:
+        """Write replica ``column`` back to the blocks' ports and
+        states, as the interpreted solver would have left them."""
+        now = sig[:, column].tolist()
+        before = prev[:, column].tolist()
+        for row in range(self.n_written):
+            self.ports[row].value = now[row]
+        for pos, reads in enumerate(self._reads):
+            if pos in self._custom:
+                continue  # their own get_input_value calls set them
+            for port, row, stale in reads:
+                if port.connected_from is not None:
+                    port.value = (before if stale else now)[row]
+        for port, row in self._delay_in:
+            if port.connected_from is not None:
+                port.value = now[row]
+        for blk, value in zip(self.state_blocks, state[:, column].tolist()):
+            blk.state = value
+        for pos, states in cstate.items():
+            self.schedule[pos].state = states[column]
+
+    def run(self, num_iters: int, clock: "DiscreteClock") -> None:
+        """Run ``num_iters`` steps on the blocks themselves, advancing
+        ``clock`` — the compiled form of :meth:`CBDSolver.run`."""
+        if num_iters <= 0:
+            return
+        sig, params, state, cstate = self.load()
+        prev = self.execute(sig, params, state, cstate, num_iters,
+                            clock.iteration)
+        self.store(sig, prev, state, cstate)
+        for _ in range(num_iters):
+            clock.advance(clock.delta_t)
@@ -0,0 +1,276 @@
+"""Batched CBD runs — parameter sweeps and replicas in lock-step.
+
+Python addition: exploring a design space by building and stepping a
+:class:`~gvpy.engines.sim.solver.CBDSolver` per parameter set
+interprets the same model once per point.  :class:`ParameterSweep`
+compiles the model once (see :mod:`gvpy.engines.sim.compiled`) and
+runs ``N`` parameterisations as the ``N`` columns of one signal
+array, so every constant value, gain and delay state is an
+``(N,)``-shaped row and each array operation advances all runs.
+
+Each run's results are those of a separate interpreted run of the
+model with that run's parameters, bit for bit.  Blocks without an
+array form (custom blocks, subclasses of the primitives) still run
+once per run and iteration, so a sweep of a model made mostly of
+them gains little.
+
+``workers`` (default ``GVPY_SIM_WORKERS``, else 1) splits the runs
+into that many contiguous batches; with more than one CPU the batches
+run in forked worker processes.  The results do not depend on the
+worker count.
+
+Usage::
+
+    sweep = ParameterSweep(model)
+    result = sweep.run({"gain": np.linspace(0, 1, 1000)}, 500,
+                       probes=["plant"])
+    result.signals["plant"]        # (1000, 500): run x iteration
+    result.run(3)                  # {"plant": (500,), ...} of run 3
+"""
+from __future__ import annotations
+
+import copy
+import multiprocessing
+import os
+from typing import TYPE_CHECKING, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .cbd import CompoundBlock
+from .compiled import _source_port
+from .solver import CBDSolver
+
+if TYPE_CHECKING:
+    from .cbd import Block, Port
+
+# (compiled schedule, sig, params, state, custom states, probe rows,
+# num_iters, first iteration) for batches; set only around a run.
+_STATE = None
+
+
+def sim_workers() -> int:
+    """Batch count for :meth:`ParameterSweep.run`, from
+    ``GVPY_SIM_WORKERS`` (default 1)."""
+    try:
+        return max(1, int(os.environ.get("GVPY_SIM_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+class SweepResult:
+    """Columnar results of a batched run, one row per run.
+
+    Attributes
+    ----------
+    params : dict[str, np.ndarray]
+        The swept values, ``(N,)`` per block name.
+    signals : dict[str, np.ndarray]
+        ``(N, num_iters)`` per probe: the probed port's value after
+        each iteration's output phase.
+    states : dict[str, np.ndarray]
+        ``(N,)`` per :class:`DelayBlock`: its state after the last
+        iteration, keyed as :class:`ParameterSweep` names blocks.
+    """
+
+    def __init__(self, params: dict[str, np.ndarray],
+                 signals: dict[str, np.ndarray],
+                 states: dict[str, np.ndarray]):
+        self.params = params
+        self.signals = signals
+        self.states = states
+
+    def __len__(self) -> int:
+        for columns in (self.params, self.signals, self.states):
+            for values in columns.values():
+                return len(values)
+        return 0
+
+    def run(self, i: int) -> dict[str, np.ndarray]:
+        """Probed signals of run ``i``, one series per probe."""
+        return {name: values[i] for name, values in self.signals.items()}
+
+
+def _run_batch(bounds: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+    """Run columns ``lo:hi`` of the sweep in ``_STATE``; returns the
+    probe traces ``(probes, runs, iters)`` and the delay states
+    ``(delays, runs)``."""
+    (compiled, sig, params, state, cstate, probe_rows, num_iters,
+     first_iter) = _STATE
+    lo, hi = bounds
+    sig, params, state = sig[:, lo:hi], params[:, lo:hi], state[:, lo:hi]
+    cstate = {pos: states[lo:hi] for pos, states in cstate.items()}
+    trace = np.empty((len(probe_rows), hi - lo, num_iters))
+
+    def observe(it: int, sig: np.ndarray) -> None:
+        trace[:, :, it - first_iter] = sig[probe_rows]
+
+    compiled.execute(sig, params, state, cstate, num_iters, first_iter,
+                     observe if len(probe_rows) else None)
+    return trace, state
+
+
+class ParameterSweep:
+    """Run one CBD model for many parameter sets at once.
+
+    Blocks are named by their dotted path from ``root`` (``"A.k"``
+    for block ``k`` of sub-compound ``A``), or by their bare name
+    when no other leaf shares it; a shared bare name raises
+    ``KeyError``.  Result states are keyed the same way, bare where
+    that is unambiguous.
+
+    The model is compiled, and its values and states taken, when the
+    sweep is built; later changes to ``root`` are not seen.  Custom
+    blocks run on the model's own blocks, each run on a copy of its
+    state, and their ports and states are put back after every run,
+    so running leaves the model as it was.
+    """
+
+    def __init__(self, root: "CompoundBlock"):
+        self.root = root
+        self._solver = CBDSolver(root)
+        self._solver.init()
+        self._compiled = compiled = self._solver.compile()
+        # Leaves by dotted path and by unique bare name, the bare
+        # names several leaves share, and each leaf's result key.
+        self._blocks: dict[str, "Block"] = {}
+        self._shared: dict[str, list[str]] = {}
+        self._keys: dict[int, str] = {}
+        paths: dict[str, list[tuple[str, "Block"]]] = {}
+        stack = [("", root)]
+        while stack:
+            prefix, compound = stack.pop()
+            for blk in compound.blocks.values():
+                if isinstance(blk, CompoundBlock):
+                    stack.append((f"{prefix}{blk.name}.", blk))
+                else:
+                    paths.setdefault(blk.name, []).append(
+                        (prefix + blk.name, blk))
+        for name, leaves in paths.items():
+            for path, blk in leaves:
+                self._blocks[path] = blk
+                self._keys[id(blk)] = path if len(leaves) > 1 else name
+            if len(leaves) == 1:
+                self._blocks[name] = leaves[0][1]
+            else:
+                self._shared[name] = sorted(path for path, _ in leaves)
+        # Every run starts from these, not from the blocks, which
+        # custom blocks' methods change as they run.
+        sig, params, state, cstate = compiled.load()
+        self._initial = (sig, params, state,
+                         {pos: copy.deepcopy(states[0])
+                          for pos, states in cstate.items()})
+        # What running custom blocks changes on the model: their
+        # ports, the ports they read from, and their states.
+        self._ports: list["Port"] = []
+        for pos in sorted(compiled._custom):
+            blk = compiled.schedule[pos]
+            for port in blk.input_ports.values():
+                self._ports += [port, _source_port(port)]
+            self._ports.extend(blk.output_ports.values())
+        self._stateful = [compiled.schedule[pos]
+                          for pos in compiled._custom_states]
+
+    def _block(self, name: str) -> "Block":
+        blk = self._blocks.get(name)
+        if blk is not None:
+            return blk
+        if name in self._shared:
+            raise KeyError(f"block name {name!r} is ambiguous; use one of "
+                           f"{', '.join(self._shared[name])}")
+        raise KeyError(f"no block named {name!r}")
+
+    def _target(self, name: str) -> tuple[str, int]:
+        """``("param" | "state", row)`` swept for block ``name``: a
+        constant's value, a gain's ``k`` or a delay's initial
+        state."""
+        blk = self._block(name)
+        compiled = self._compiled
+        if id(blk) in compiled._param_row:
+            return "param", compiled._param_row[id(blk)]
+        if id(blk) in compiled._state_row:
+            return "state", compiled._state_row[id(blk)]
+        raise ValueError(
+            f"block {name!r} ({type(blk).__name__}) has no sweepable "
+            f"parameter")
+
+    def _probe(self, probe: str) -> int:
+        """Signal row of ``probe`` — ``"block"`` for its OUT port or
+        ``"block.PORT"``."""
+        name, port_name = probe, "OUT"
+        if (name not in self._blocks and name not in self._shared
+                and "." in probe):
+            name, port_name = probe.rsplit(".", 1)
+        blk = self._block(name)
+        port: Optional["Port"] = blk.output_ports.get(port_name)
+        if port is None:
+            raise KeyError(f"block {name!r} has no output port "
+                           f"{port_name!r}")
+        return self._compiled.rows[id(port)]
+
+    def run(self, params: Mapping[str, Sequence[float]], num_iters: int,
+            probes: Sequence[str] = (), replicas: Optional[int] = None,
+            workers: Optional[int] = None) -> SweepResult:
+        """Run ``num_iters`` iterations for every parameter set.
+
+        ``params`` maps block names (see the class docstring) to one
+        value per run; blocks not named keep the model's value.
+        Without ``params``, ``replicas`` copies of the model are run.
+        ``probes`` names the output ports whose series are recorded,
+        ``"block"`` for a block's OUT port or ``"block.PORT"``.
+        """
+        global _STATE
+        columns = {name: np.asarray(values, dtype=float).reshape(-1)
+                   for name, values in params.items()}
+        sizes = {len(values) for values in columns.values()}
+        if replicas is not None:
+            sizes.add(replicas)
+        if not sizes:
+            raise ValueError("give parameter columns or a replica count")
+        if len(sizes) > 1:
+            raise ValueError("parameter columns and replicas must all "
+                             f"have one length, got {sorted(sizes)}")
+        (n,) = sizes
+        targets = [(*self._target(name), values)
+                   for name, values in columns.items()]
+        probe_rows = np.array([self._probe(p) for p in probes],
+                              dtype=np.intp)
+        num_iters = max(0, num_iters)
+        compiled = self._compiled
+
+        if workers is None:
+            workers = sim_workers()
+        batches = max(1, min(workers, n))
+        cuts = [n * k // batches for k in range(batches + 1)]
+        bounds = [(cuts[k], cuts[k + 1]) for k in range(batches)]
+        procs = min(batches, os.cpu_count() or 1)
+        sig, params, state, cstate = self._initial
+        sig, params, state = (np.repeat(a, n, axis=1)
+                              for a in (sig, params, state))
+        for array, row, values in targets:
+            (params if array == "param" else state)[row] = values
+        cstate = {pos: [copy.deepcopy(initial) for _ in range(n)]
+                  for pos, initial in cstate.items()}
+        _STATE = (compiled, sig, params, state, cstate, probe_rows,
+                  num_iters, self._solver.clock.iteration)
+        ports = [(port, port.value) for port in self._ports]
+        states = [(blk, blk.state) for blk in self._stateful]
+        try:
+            if procs > 1 and "fork" in multiprocessing.get_all_start_methods():
+                with multiprocessing.get_context("fork").Pool(procs) as pool:
+                    results = pool.map(_run_batch, bounds)
+            else:
+                results = [_run_batch(b) for b in bounds]
+        finally:
+            _STATE = None
+            for port, value in ports:
+                port.value = value
+            for blk, value in states:
+                blk.state = value
+
+        trace = np.concatenate([t for t, _ in results], axis=1)
+        state = np.concatenate([s for _, s in results], axis=1)
+        return SweepResult(
+            columns,
+            {probe: trace[k] for k, probe in enumerate(probes)},
+            {self._keys[id(blk)]: state[row]
+             for row, blk in enumerate(compiled.state_blocks)})
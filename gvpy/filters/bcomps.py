@@ -18,7 +18,8 @@ Usage: bcomps [-stvx?] [-o <out template>] <files>
   -? - print usage
 If no files are specified, stdin is used
 """
-from collections import defaultdict
+from gvpy.engines.layout.common.blocktree import (
+    biconnected_components as _blocks, block_nodes, csr_adjacency)
 from gvpy.grammar.gv_reader import read_gv, read_gv_file
 
 
@@ -26,62 +27,23 @@ def biconnected_components(graph) -> tuple[list[set[str]], set[str]]:
     """Find biconnected components and articulation points.
     Returns (list of node-name sets, set of articulation point names).
     """
-    adj: dict[str, list[str]] = defaultdict(list)
-    for name in graph.nodes:
-        adj[name]
+    names = list(graph.nodes)
+    adj: dict[str, list[str]] = {name: [] for name in names}
+    seen: set[tuple[str, str]] = set()
     for key, edge in graph.edges.items():
         t, h = edge.tail.name, edge.head.name
-        if h not in adj[t]:
-            adj[t].append(h)
-        if t not in adj[h]:
-            adj[h].append(t)
-
-    disc, low, parent = {}, {}, {}
-    timer = [0]
-    edge_stack: list[tuple[str, str]] = []
-    blocks: list[set[str]] = []
-    art_points: set[str] = set()
-
-    def _dfs(u):
-        disc[u] = low[u] = timer[0]
-        timer[0] += 1
-        child_count = 0
-        for v in adj.get(u, []):
-            if v not in disc:
-                child_count += 1
-                parent[v] = u
-                edge_stack.append((u, v))
-                _dfs(v)
-                low[u] = min(low[u], low[v])
-                is_root = parent.get(u) is None
-                if (is_root and child_count > 1) or \
-                   (not is_root and low[v] >= disc[u]):
-                    art_points.add(u)
-                    block_nodes = set()
-                    while edge_stack and edge_stack[-1] != (u, v):
-                        e = edge_stack.pop()
-                        block_nodes.add(e[0])
-                        block_nodes.add(e[1])
-                    if edge_stack:
-                        e = edge_stack.pop()
-                        block_nodes.add(e[0])
-                        block_nodes.add(e[1])
-                    blocks.append(block_nodes)
-            elif v != parent.get(u) and disc[v] < disc[u]:
-                edge_stack.append((u, v))
-                low[u] = min(low[u], disc[v])
-
-    for node in adj:
-        if node not in disc:
-            parent[node] = None
-            _dfs(node)
-            if edge_stack:
-                block_nodes = set()
-                while edge_stack:
-                    e = edge_stack.pop()
-                    block_nodes.add(e[0])
-                    block_nodes.add(e[1])
-                blocks.append(block_nodes)
+        if (t, h) not in seen:
+            seen.add((t, h))
+            adj.setdefault(t, []).append(h)
+        if (h, t) not in seen:
+            seen.add((h, t))
+            adj.setdefault(h, []).append(t)
+    names.extend(n for n in adj if n not in graph.nodes)
+
+    _, ptr, nbr = csr_adjacency(names, adj)
+    edge_blocks, art = _blocks(ptr, nbr, range(len(names)))
+    blocks = [{names[x] for x in block_nodes(e)} for e in edge_blocks]
+    art_points = {names[i] for i, a in enumerate(art) if a}
 
     covered = set()
     for b in blocks:
@@ -18,7 +18,7 @@ from .gv_reader import (
     DOTParseError,
 )
 from .gv_writer import (
-    write_gv, write_gv_file,
+    write_gv, write_gv_file, iter_gv, dump_gv,
     # Backward-compatible aliases
     write_dot, write_dot_file,
 )
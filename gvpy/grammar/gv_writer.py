@@ -7,7 +7,9 @@ node/edge/graph attributes.
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import re
+from functools import lru_cache
+from typing import IO, TYPE_CHECKING, Iterator
 
 if TYPE_CHECKING:
     from gvpy.core.graph import Graph
@@ -15,6 +17,13 @@ if TYPE_CHECKING:
     from gvpy.core.edge import Edge
 
 
+# Keywords that must be quoted if used as IDs.
+_KEYWORDS = frozenset({"graph", "digraph", "subgraph", "node", "edge",
+                       "strict"})
+# Bare identifiers: [a-zA-Z_\x80-\xff][a-zA-Z0-9_\x80-\xff]*
+_BARE_ID = re.compile("[A-Za-z_\x80-\U0010ffff][0-9A-Za-z_\x80-\U0010ffff]*")
+
+
 def _needs_quoting(s: str) -> bool:
     """Return True if an ID needs double-quoting in DOT output."""
     if not s:
@@ -22,9 +31,7 @@ def _needs_quoting(s: str) -> bool:
     # HTML labels
     if s.startswith("<") and s.endswith(">"):
         return False
-    # Keywords that must be quoted if used as IDs
-    keywords = {"graph", "digraph", "subgraph", "node", "edge", "strict"}
-    if s.lower() in keywords:
+    if s.lower() in _KEYWORDS:
         return True
     # Pure numeric (int or float) is fine unquoted
     try:
@@ -32,16 +39,16 @@ def _needs_quoting(s: str) -> bool:
         return False
     except ValueError:
         pass
-    # Bare identifiers: [a-zA-Z_\x80-\xff][a-zA-Z0-9_\x80-\xff]*
-    if s[0].isalpha() or s[0] == "_" or ord(s[0]) >= 0x80:
-        return not all(
-            c.isalnum() or c == "_" or ord(c) >= 0x80 for c in s
-        )
-    return True
+    return _BARE_ID.fullmatch(s) is None
 
 
+@lru_cache(maxsize=1 << 14)
 def _quote(s: str) -> str:
-    """Quote a DOT identifier if necessary."""
+    """Quote a DOT identifier if necessary.
+
+    Memoised: node names recur in every edge statement and attribute
+    values such as colours and shapes recur across objects.
+    """
     if _needs_quoting(s):
         escaped = s.replace("\\", "\\\\").replace('"', '\\"')
         return f'"{escaped}"'
@@ -62,118 +69,138 @@ def _format_attrs(attrs: dict[str, str]) -> str:
     return " [" + ", ".join(pairs) + "]"
 
 
-def _collect_local_nodes(graph: "Graph") -> list["Node"]:
-    """Return nodes that belong directly to this graph, not its subgraphs."""
-    subgraph_nodes = set()
-    for sub in graph.subgraphs.values():
-        subgraph_nodes.update(sub.nodes.keys())
-    return [n for name, n in graph.nodes.items() if name not in subgraph_nodes]
+def _object_attrs(attrs: dict[str, str]) -> str:
+    """Attribute list of a node or edge: its set, non-internal
+    attributes."""
+    pairs = [f"{k}={_quote(v)}" for k, v in attrs.items()
+             if v is not None and v != "" and not k.startswith("_")]
+    if not pairs:
+        return ""
+    return " [" + ", ".join(pairs) + "]"
+
 
+def _local_objects(graph: "Graph"
+                   ) -> dict[int, tuple[list["Node"], list["Edge"]]]:
+    """The nodes and edges written in each graph body, keyed by
+    ``id()`` of the root graph and of every subgraph.
 
-def _collect_local_edges(graph: "Graph") -> list["Edge"]:
-    """Return edges that belong directly to this graph, not its subgraphs."""
-    subgraph_edge_keys = set()
+    An object is written in the body of each (sub)graph that holds it
+    but none of whose direct subgraphs does.  Built in one pass over
+    the hierarchy, hashing every subgraph's members once.
+    """
+    local = {}
+    stack = [graph]
+    while stack:
+        g = stack.pop()
+        subs = list(g.subgraphs.values())
+        stack.extend(subs)
+        if subs:
+            sub_nodes: set[str] = set()
+            sub_edges: set = set()
+            for sub in subs:
+                sub_nodes.update(sub.nodes)
+                sub_edges.update(sub.edges)
+            nodes = [n for name, n in g.nodes.items()
+                     if name not in sub_nodes]
+            edges = [e for key, e in g.edges.items()
+                     if key not in sub_edges]
+        else:
+            nodes = list(g.nodes.values())
+            edges = list(g.edges.values())
+        local[id(g)] = (nodes, edges)
+    return local
+
+
+def _iter_body(graph: "Graph", local: dict, indent: str,
+               edge_op: str) -> Iterator[str]:
+    """Subgraph blocks, then local node and edge statements."""
     for sub in graph.subgraphs.values():
-        subgraph_edge_keys.update(sub.edges.keys())
-    return [e for key, e in graph.edges.items() if key not in subgraph_edge_keys]
+        yield from _iter_subgraph(sub, local, indent, edge_op)
 
+    nodes, edges = local[id(graph)]
+    for node in nodes:
+        yield f"{indent}{_quote(node.name)}{_object_attrs(node.attributes)};\n"
+    for edge in edges:
+        tail = _quote(edge.tail.name)
+        head = _quote(edge.head.name)
+        yield (f"{indent}{tail} {edge_op} {head}"
+               f"{_object_attrs(edge.attributes)};\n")
 
-def _write_subgraph(graph: "Graph", indent: str, edge_op: str) -> list[str]:
+
+def _iter_subgraph(graph: "Graph", local: dict, indent: str,
+                   edge_op: str) -> Iterator[str]:
     """Recursively write a subgraph block."""
-    lines = []
     name = _quote(graph.name) if graph.name else ""
-    lines.append(f"{indent}subgraph {name} {{")
+    yield f"{indent}subgraph {name} {{\n"
     inner = indent + "    "
 
     # Subgraph-local attributes (from attr_record, not the shared attr_dict_g)
     if hasattr(graph, "attr_record"):
         for k, v in graph.attr_record.items():
             if v is not None and v != "" and not k.startswith("_"):
-                lines.append(f"{inner}{k}={_quote(v)};")
+                yield f"{inner}{k}={_quote(v)};\n"
 
-    # Nested subgraphs
-    for sub in graph.subgraphs.values():
-        lines.extend(_write_subgraph(sub, inner, edge_op))
-
-    # Local nodes
-    for node in _collect_local_nodes(graph):
-        attrs = {k: v for k, v in node.attributes.items()
-                 if v is not None and v != "" and not k.startswith("_")}
-        lines.append(f"{inner}{_quote(node.name)}{_format_attrs(attrs)};")
-
-    # Local edges
-    for edge in _collect_local_edges(graph):
-        tail = _quote(edge.tail.name)
-        head = _quote(edge.head.name)
-        attrs = {k: v for k, v in edge.attributes.items()
-                 if v is not None and v != "" and not k.startswith("_")}
-        lines.append(f"{inner}{tail} {edge_op} {head}{_format_attrs(attrs)};")
+    yield from _iter_body(graph, local, inner, edge_op)
+    yield f"{indent}}}\n"
 
-    lines.append(f"{indent}}}")
-    return lines
 
-
-def write_gv(graph: "Graph") -> str:
-    """Serialize a Graph object to GV/DOT-language text.
-
-    Returns a string containing valid DOT that can be parsed by
-    Graphviz or ``read_gv()``.
-    """
+def iter_gv(graph: "Graph") -> Iterator[str]:
+    """Yield the DOT text of ``graph`` line by line; ``write_gv`` is
+    their concatenation."""
     # Graph type
     strict = "strict " if graph.strict else ""
     gtype = "digraph" if graph.directed else "graph"
     edge_op = "->" if graph.directed else "--"
     name = _quote(graph.name) if graph.name else ""
 
-    lines = [f"{strict}{gtype} {name} {{"]
+    yield f"{strict}{gtype} {name} {{\n"
     indent = "    "
 
     # Graph-level attributes
     if hasattr(graph, "attr_dict_g"):
         for k, v in graph.attr_dict_g.items():
             if v is not None and v != "":
-                lines.append(f"{indent}{k}={_quote(v)};")
+                yield f"{indent}{k}={_quote(v)};\n"
 
     # Default node attributes
     if hasattr(graph, "attr_dict_n") and graph.attr_dict_n:
         node_defaults = {k: v for k, v in graph.attr_dict_n.items()
                          if v is not None and v != ""}
         if node_defaults:
-            lines.append(f"{indent}node{_format_attrs(node_defaults)};")
+            yield f"{indent}node{_format_attrs(node_defaults)};\n"
 
     # Default edge attributes
     if hasattr(graph, "attr_dict_e") and graph.attr_dict_e:
         edge_defaults = {k: v for k, v in graph.attr_dict_e.items()
                          if v is not None and v != ""}
         if edge_defaults:
-            lines.append(f"{indent}edge{_format_attrs(edge_defaults)};")
+            yield f"{indent}edge{_format_attrs(edge_defaults)};\n"
 
-    # Subgraphs
-    for sub in graph.subgraphs.values():
-        lines.extend(_write_subgraph(sub, indent, edge_op))
+    # Subgraphs, then the nodes and edges in no subgraph
+    yield from _iter_body(graph, _local_objects(graph), indent, edge_op)
+    yield "}\n"
 
-    # Local nodes (not in any subgraph)
-    for node in _collect_local_nodes(graph):
-        attrs = {k: v for k, v in node.attributes.items()
-                 if v is not None and v != "" and not k.startswith("_")}
-        lines.append(f"{indent}{_quote(node.name)}{_format_attrs(attrs)};")
 
-    # Local edges (not in any subgraph)
-    for edge in _collect_local_edges(graph):
-        tail = _quote(edge.tail.name)
-        head = _quote(edge.head.name)
-        attrs = {k: v for k, v in edge.attributes.items()
-                 if v is not None and v != "" and not k.startswith("_")}
-        lines.append(f"{indent}{tail} {edge_op} {head}{_format_attrs(attrs)};")
+def write_gv(graph: "Graph") -> str:
+    """Serialize a Graph object to GV/DOT-language text.
+
+    Returns a string containing valid DOT that can be parsed by
+    Graphviz or ``read_gv()``.
+    """
+    return "".join(iter_gv(graph))
+
 
-    lines.append("}")
-    return "\n".join(lines) + "\n"
+def dump_gv(graph: "Graph", sink: IO) -> None:
+    """Stream the DOT text of ``graph`` to a text or binary file-like
+    ``sink``."""
+    from gvpy.render.sink import write_chunks
+    write_chunks(iter_gv(graph), sink)
 
 
 def write_gv_file(graph: "Graph", filepath: str) -> None:
     """Write a Graph object to a GV/DOT file."""
-    from pathlib import Path
-    Path(filepath).write_text(write_gv(graph), encoding="utf-8")
+    with open(filepath, "w", encoding="utf-8") as fh:
+        dump_gv(graph, fh)
 
 
 # Backward-compatible aliases
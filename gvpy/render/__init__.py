@@ -6,18 +6,25 @@ various output formats. They are shared across all layout engines.
 
 Supported formats:
 
-- **SVG** — ``render_svg(layout_dict)`` renders positioned nodes/edges
-- **JSON** — Graphviz-compatible ``json``/``json0`` graph interchange
-- **GXL** — Graph eXchange Language (XML-based) read/write
+- **SVG** — ``render_svg(layout_dict)`` renders positioned nodes/edges;
+  ``write_svg(layout_dict, sink)`` streams the same output to a file.
+  Both take a ``viewport`` and ``zoom`` to draw one window of a large
+  layout, culled through a ``LayoutIndex`` and reduced by ``view_layout``
+- **JSON** — Graphviz-compatible ``json``/``json0`` graph interchange,
+  indented or compact, as a string or streamed (``dump_json``);
+  ``load_json`` rebuilds a laid-out graph with its layout result
+- **GXL** — Graph eXchange Language (XML-based) read/write; ``iter_gxl``
+  streams multi-graph documents one graph at a time
 
 For GV/DOT reading and writing, see ``gvpy.grammar``.
 """
-from .svg_renderer import render_svg, render_svg_file
+from .svg_renderer import render_svg, render_svg_file, write_svg
+from .viewport import LayoutIndex, view_layout
 from .json_io import (
     read_json, read_json_file, write_json, write_json0,
-    write_json_file,
+    write_json_file, dump_json, dump_json0, load_json, load_json_file,
 )
 from .gxl_io import (
-    read_gxl, read_gxl_file, read_gxl_all, write_gxl,
-    write_gxl_file,
+    read_gxl, read_gxl_file, read_gxl_all, iter_gxl, iter_gxl_file,
+    write_gxl, write_gxl_file,
 )
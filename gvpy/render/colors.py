@@ -145,3 +145,60 @@ def resolve_color(spec: str | None) -> str:
     # Last-resort: pass through unchanged.  Some renderers may
     # accept it; if not, the caller sees the original input.
     return s
+
+
+def split_color_pair(spec: str | None) -> tuple[str | None, str | None]:
+    """Split a Graphviz-style ``c1:c2`` colour pair.
+
+    Returns ``(c1, c2)`` when ``spec`` contains a colon, otherwise
+    ``(spec, None)``.  Empty strings are normalised to ``None``.
+    """
+    if not spec:
+        return None, None
+    if ":" in spec:
+        a, b = spec.split(":", 1)
+        return (a.strip() or None), (b.strip() or None)
+    return spec, None
+
+
+class StyleTable:
+    """The colour specs of one render, each resolved once.
+
+    Python addition: C resolves colours per object as it emits them
+    (``gvrender_set_fillcolor`` → ``colorxlate``).  A styled graph
+    repeats a handful of specs across thousands of objects, so the
+    renderers look each spec up here instead:
+
+    - :meth:`svg` — :func:`resolve_color`
+    - :meth:`rgba` — the RGBA tuple from ``to_rgba`` (the raster
+      renderer's conversion)
+    - :meth:`stops` — the gradient stops of a ``c1:c2`` list
+      (:func:`split_color_pair`)
+    """
+
+    def __init__(self, to_rgba=None):
+        self._to_rgba = to_rgba
+        self._svg: dict[str | None, str] = {}
+        self._rgba: dict[str | None, tuple[int, ...]] = {}
+        self._stops: dict[str | None, tuple[str | None, str | None]] = {}
+
+    def svg(self, spec: str | None) -> str:
+        try:
+            return self._svg[spec]
+        except KeyError:
+            value = self._svg[spec] = resolve_color(spec)
+            return value
+
+    def rgba(self, spec: str | None) -> tuple[int, ...]:
+        try:
+            return self._rgba[spec]
+        except KeyError:
+            value = self._rgba[spec] = self._to_rgba(spec)
+            return value
+
+    def stops(self, spec: str | None) -> tuple[str | None, str | None]:
+        try:
+            return self._stops[spec]
+        except KeyError:
+            value = self._stops[spec] = split_color_pair(spec)
+            return value
@@ -7,7 +7,7 @@ GXL is an XML format for typed, attributed graphs.  This module supports:
 - Node and edge attributes with typed values (``<string>``, ``<int>``,
   ``<float>``, ``<bool>``, ``<enum>``)
 - Subgraphs as nested ``<graph>`` elements
-- Multiple graphs per file
+- Multiple graphs per file, streamed one at a time by :func:`iter_gxl`
 - Node/edge IDs mapped to core names
 
 File extension: ``.gxl``
@@ -30,8 +30,9 @@ Reference: http://www.gupro.de/GXL/
 """
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import TYPE_CHECKING, Union
+from typing import IO, TYPE_CHECKING, Iterator, Union
 from xml.etree import ElementTree as ET
 from xml.dom import minidom
 
@@ -209,76 +210,118 @@ def _parse_typed_value(el: ET.Element) -> str:
     return text
 
 
-def _read_attrs(element: ET.Element) -> dict[str, str]:
-    """Read <attr> children from a GXL element into a dict."""
-    attrs = {}
-    for attr_el in element.findall("attr"):
-        name = attr_el.get("name", "")
-        if not name:
-            continue
-        # The value is in the first child element
-        for child in attr_el:
-            attrs[name] = _parse_typed_value(child)
-            break
-    return attrs
+def _attr_value(attr_el: ET.Element) -> str | None:
+    """Value of an ``<attr>`` element: its first typed child."""
+    for child in attr_el:
+        return _parse_typed_value(child)
+    return None
 
 
-def _read_subgraph(graph_el: ET.Element, parent_graph: "Graph"):
-    """Recursively read a nested <graph> element as a subgraph."""
-    sub_name = graph_el.get("id", "")
-    if not sub_name:
-        sub_name = f"subgraph_{id(graph_el)}"
+def iter_gxl(source: Union[str, Path, IO]) -> Iterator["Graph"]:
+    """Parse GXL incrementally, yielding each top-level ``<graph>`` as
+    a Graph as soon as its closing tag is read.
 
-    sub = parent_graph.create_subgraph(sub_name)
+    ``source`` is GXL text (as for :func:`read_gxl`), a file path, or
+    an open file.  Nodes, edges and subgraphs are built as their
+    elements are read and the elements are cleared once handled, so
+    memory follows the graph being built rather than the document.
 
-    # Subgraph attributes (stored in attr_record for subgraph-local attrs)
-    attrs = _read_attrs(graph_el)
-    for k, v in attrs.items():
-        sub.attr_record[k] = v
+    Elements are applied in document order, as the expat handlers of
+    ``cmd/tools/gxl2gv.c`` do: a subgraph's nodes and edges are added
+    where they appear, and an edge naming an undeclared node creates
+    it.  As before, a subgraph node is declared in the subgraph's
+    parent, edges of a subgraph belong to its parent, and ``<graph>``
+    elements nested anywhere but directly in a graph are ignored.
 
-    # Nested subgraphs
-    for nested in graph_el.findall("graph"):
-        _read_subgraph(nested, sub)
+    Raises ``ValueError`` if the root element is neither ``<gxl>``
+    nor ``<graph>``.
+    """
+    if isinstance(source, Path):
+        with open(source, "rb") as fh:
+            yield from iter_gxl(fh)
+        return
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    from gvpy.core.graph import Graph
 
-    # Nodes
-    for node_el in graph_el.findall("node"):
-        node_name = node_el.get("id", "")
-        if not node_name:
+    # Open elements, each with the Graph / Node / Edge it built — None
+    # for elements that build nothing.
+    stack: list[tuple[ET.Element, object]] = []
+    for event, el in ET.iterparse(source, events=("start", "end")):
+        tag = el.tag
+        if event == "start":
+            obj = None
+            if not stack:
+                if tag not in ("gxl", "graph"):
+                    raise ValueError(f"Expected <gxl> or <graph> root "
+                                     f"element, got <{tag}>")
+            parent_el, parent = stack[-1] if stack else (None, None)
+            in_graph = parent_el is not None and parent_el.tag == "graph" \
+                and parent is not None
+            if tag == "graph":
+                if parent_el is None or (parent_el.tag == "gxl"
+                                         and len(stack) == 1):
+                    edgemode = el.get("edgemode", "directed")
+                    obj = Graph(el.get("id", "G"),
+                                directed=edgemode != "undirected")
+                    obj.method_init()
+                elif in_graph:
+                    obj = parent.create_subgraph(
+                        el.get("id", "") or f"subgraph_{id(el)}")
+            elif tag == "node" and in_graph:
+                name = el.get("id", "")
+                if name:
+                    owner = parent if parent.parent is None else parent.parent
+                    obj = owner.nodes.get(name)
+                    if obj is None:
+                        obj = owner.add_node(name)
+                    if owner is not parent:
+                        parent.add_node(name)
+            elif tag == "edge" and in_graph:
+                tail = el.get("from", "")
+                head = el.get("to", "")
+                if tail and head:
+                    owner = parent if parent.parent is None else parent.parent
+                    obj = owner.add_edge(tail, head)
+            stack.append((el, obj))
             continue
-        # Add to root graph first (if not already), then to subgraph
-        root = parent_graph
-        while hasattr(root, "parent_graph") and root.parent_graph:
-            root = root.parent_graph
-        if node_name not in root.nodes:
-            node = root.add_node(node_name)
-        else:
-            node = root.nodes[node_name]
-        sub.add_node(node_name)
-
-        node_attrs = _read_attrs(node_el)
-        for k, v in node_attrs.items():
-            node.agset(k, v)
-
-    # Edges
-    for edge_el in graph_el.findall("edge"):
-        tail = edge_el.get("from", "")
-        head = edge_el.get("to", "")
-        if not tail or not head:
+
+        _, obj = stack.pop()
+        parent_el, parent = stack[-1] if stack else (None, None)
+        if tag == "attr":
+            name = el.get("name", "")
+            value = _attr_value(el)
+            if name and value is not None and parent is not None:
+                if isinstance(parent, Graph):
+                    if parent.parent is None:
+                        parent.set_graph_attr(name, value)
+                    else:
+                        parent.attr_record[name] = value
+                else:
+                    parent.agset(name, value)
+        elif tag not in ("graph", "node", "edge"):
             continue
-        root = parent_graph
-        while hasattr(root, "parent_graph") and root.parent_graph:
-            root = root.parent_graph
-        edge = root.add_edge(tail, head)
-        edge_attrs = _read_attrs(edge_el)
-        for k, v in edge_attrs.items():
-            edge.agset(k, v)
+        # Drop handled elements so the tree never grows past the
+        # element being read.
+        el.clear()
+        if parent_el is not None:
+            del parent_el[:]
+        if tag == "graph" and obj is not None and obj.parent is None:
+            yield obj
+
+
+def iter_gxl_file(filepath: Union[str, Path]) -> Iterator["Graph"]:
+    """Stream the graphs of a GXL file; see :func:`iter_gxl`."""
+    return iter_gxl(Path(filepath))
 
 
 def read_gxl(text: str) -> "Graph":
     """Parse GXL XML text into a Graph object.
 
     If the GXL contains multiple ``<graph>`` elements at the top level,
-    only the first is returned.  Use ``read_gxl_all()`` for multiple graphs.
+    only the first is returned.  Use ``read_gxl_all()`` for multiple
+    graphs, or ``iter_gxl()`` to stream them.
 
     Parameters
     ----------
@@ -290,62 +333,17 @@ def read_gxl(text: str) -> "Graph":
     Graph
         A fully constructed Graph object.
     """
-    from gvpy.core.graph import Graph
-
-    root = ET.fromstring(text)
-
-    # Find the first <graph> element (may be direct child of <gxl> or root itself)
-    if root.tag == "gxl":
-        graph_el = root.find("graph")
-    elif root.tag == "graph":
-        graph_el = root
-    else:
-        raise ValueError(f"Expected <gxl> or <graph> root element, got <{root.tag}>")
-
-    if graph_el is None:
-        raise ValueError("No <graph> element found in GXL input")
-
-    name = graph_el.get("id", "G")
-    edgemode = graph_el.get("edgemode", "directed")
-    directed = edgemode != "undirected"
-
-    g = Graph(name, directed=directed)
-    g.method_init()
-
-    # Graph-level attributes
-    attrs = _read_attrs(graph_el)
-    for k, v in attrs.items():
-        g.set_graph_attr(k, v)
+    return _first_graph(iter_gxl(text))
 
-    # Nested subgraphs
-    for nested in graph_el.findall("graph"):
-        _read_subgraph(nested, g)
 
-    # Top-level nodes
-    for node_el in graph_el.findall("node"):
-        node_name = node_el.get("id", "")
-        if not node_name:
-            continue
-        if node_name not in g.nodes:
-            node = g.add_node(node_name)
-        else:
-            node = g.nodes[node_name]
-        node_attrs = _read_attrs(node_el)
-        for k, v in node_attrs.items():
-            node.agset(k, v)
-
-    # Top-level edges
-    for edge_el in graph_el.findall("edge"):
-        tail = edge_el.get("from", "")
-        head = edge_el.get("to", "")
-        if not tail or not head:
-            continue
-        edge = g.add_edge(tail, head)
-        edge_attrs = _read_attrs(edge_el)
-        for k, v in edge_attrs.items():
-            edge.agset(k, v)
-
-    return g
+def _first_graph(graphs: Iterator["Graph"]) -> "Graph":
+    """First graph of ``graphs``; the rest of the input is not read."""
+    try:
+        for g in graphs:
+            return g
+    finally:
+        graphs.close()
+    raise ValueError("No <graph> element found in GXL input")
 
 
 def read_gxl_all(text: str) -> list["Graph"]:
@@ -353,56 +351,10 @@ def read_gxl_all(text: str) -> list["Graph"]:
 
     Returns a list of Graph objects.
     """
-    from gvpy.core.graph import Graph
-
-    root = ET.fromstring(text)
-    graphs = []
-
-    graph_els = root.findall("graph") if root.tag == "gxl" else [root]
-    for graph_el in graph_els:
-        name = graph_el.get("id", "G")
-        edgemode = graph_el.get("edgemode", "directed")
-        directed = edgemode != "undirected"
-
-        g = Graph(name, directed=directed)
-        g.method_init()
-
-        attrs = _read_attrs(graph_el)
-        for k, v in attrs.items():
-            g.set_graph_attr(k, v)
-
-        for nested in graph_el.findall("graph"):
-            _read_subgraph(nested, g)
-
-        for node_el in graph_el.findall("node"):
-            node_name = node_el.get("id", "")
-            if not node_name:
-                continue
-            if node_name not in g.nodes:
-                node = g.add_node(node_name)
-            else:
-                node = g.nodes[node_name]
-            node_attrs = _read_attrs(node_el)
-            for k, v in node_attrs.items():
-                node.agset(k, v)
-
-        for edge_el in graph_el.findall("edge"):
-            tail = edge_el.get("from", "")
-            head = edge_el.get("to", "")
-            if not tail or not head:
-                continue
-            edge = g.add_edge(tail, head)
-            edge_attrs = _read_attrs(edge_el)
-            for k, v in edge_attrs.items():
-                edge.agset(k, v)
-
-        graphs.append(g)
-
-    return graphs
+    return list(iter_gxl(text))
 
 
 def read_gxl_file(filepath: Union[str, Path]) -> "Graph":
-    """Read a GXL file and parse it into a Graph object."""
-    path = Path(filepath)
-    text = path.read_text(encoding="utf-8")
-    return read_gxl(text)
+    """Read the first graph of a GXL file, parsing only as far as its
+    closing tag."""
+    return _first_graph(iter_gxl_file(filepath))
@@ -26,8 +26,11 @@ JSON Structure (Graphviz-compatible)::
 from __future__ import annotations
 
 import json
+import math
 from pathlib import Path
-from typing import TYPE_CHECKING, Union
+from typing import IO, TYPE_CHECKING, Iterator, Union
+
+from gvpy.render.sink import write_chunks
 
 if TYPE_CHECKING:
     from gvpy.core.graph import Graph
@@ -48,9 +51,14 @@ def _edge_attrs(edge) -> dict[str, str]:
             if v is not None and v != "" and not k.startswith("_")}
 
 
-def _collect_subgraphs(graph: "Graph", objects: list, node_index: dict,
-                       gvid_counter: list[int]):
-    """Recursively collect subgraph objects."""
+def _count_subgraphs(graph: "Graph") -> int:
+    """Number of subgraphs of ``graph``, nested ones included."""
+    return sum(1 + _count_subgraphs(sub) for sub in graph.subgraphs.values())
+
+
+def _iter_subgraphs(graph: "Graph", node_index: dict,
+                    gvid_counter: list[int]) -> Iterator[dict]:
+    """Recursively yield subgraph objects."""
     for name, sub in graph.subgraphs.items():
         obj: dict = {
             "_gvid": gvid_counter[0],
@@ -76,49 +84,15 @@ def _collect_subgraphs(graph: "Graph", objects: list, node_index: dict,
                     "head": node_index[head_name],
                 })
 
-        objects.append(obj)
+        yield obj
 
         # Recurse into nested subgraphs
-        _collect_subgraphs(sub, objects, node_index, gvid_counter)
-
-
-def write_json(graph: "Graph", layout_result: dict | None = None,
-               include_draw_ops: bool = True) -> str:
-    """Serialize a Graph to Graphviz-compatible JSON format.
-
-    Parameters
-    ----------
-    graph : Graph
-        The graph to serialize.
-    layout_result : dict, optional
-        Layout result from ``DotLayout.layout()``.  When provided and
-        ``include_draw_ops`` is True, layout coordinates and drawing
-        operations are included (``-Tjson`` mode).  When None or
-        ``include_draw_ops`` is False, only structural data is written
-        (``-Tjson0`` mode).
-    include_draw_ops : bool
-        If True (default), include layout data when ``layout_result``
-        is provided.  Set to False for ``-Tjson0`` output.
-
-    Returns
-    -------
-    str
-        JSON text.
-    """
-    # Build node list with _gvid indices
-    nodes_json = []
-    node_index: dict[str, int] = {}  # node name → _gvid
+        yield from _iter_subgraphs(sub, node_index, gvid_counter)
 
-    # Build layout lookup if available
-    layout_nodes = {}
-    layout_edges = []
-    if layout_result and include_draw_ops:
-        for ln in layout_result.get("nodes", []):
-            layout_nodes[ln["name"]] = ln
-        layout_edges = layout_result.get("edges", [])
 
+def _iter_nodes(graph: "Graph", layout_nodes: dict) -> Iterator[dict]:
+    """Yield node objects in ``_gvid`` order."""
     for i, (name, node) in enumerate(graph.nodes.items()):
-        node_index[name] = i
         entry: dict = {
             "_gvid": i,
             "name": name,
@@ -140,10 +114,12 @@ def write_json(graph: "Graph", layout_result: dict | None = None,
             if "shape" not in entry and "shape" in ln:
                 entry["shape"] = ln["shape"]
 
-        nodes_json.append(entry)
+        yield entry
 
-    # Build edge list
-    edges_json = []
+
+def _iter_edges(graph: "Graph", node_index: dict,
+                layout_edges: list) -> Iterator[dict]:
+    """Yield edge objects in ``_gvid`` order."""
     edge_layout_idx = 0
     for i, (key, edge) in enumerate(graph.edges.items()):
         tail_name = edge.tail.name
@@ -173,19 +149,29 @@ def write_json(graph: "Graph", layout_result: dict | None = None,
                     entry["pos"] = " ".join(pos_parts)
                 edge_layout_idx += 1
 
-        edges_json.append(entry)
+        yield entry
+
 
-    # Build subgraph objects
-    objects: list[dict] = []
-    gvid_counter = [0]
-    _collect_subgraphs(graph, objects, node_index, gvid_counter)
+def _json_document(graph: "Graph", layout_result: dict | None,
+                   include_draw_ops: bool) -> dict:
+    """The top-level JSON object, with the ``objects`` / ``nodes`` /
+    ``edges`` arrays as lazy iterators."""
+    node_index = {name: i for i, name in enumerate(graph.nodes)}
+
+    # Build layout lookup if available
+    layout_nodes = {}
+    layout_edges = []
+    if layout_result and include_draw_ops:
+        for ln in layout_result.get("nodes", []):
+            layout_nodes[ln["name"]] = ln
+        layout_edges = layout_result.get("edges", [])
 
     # Top-level JSON
     result: dict = {
         "name": graph.name,
         "directed": graph.directed,
         "strict": graph.strict,
-        "_subgraph_cnt": len(objects),
+        "_subgraph_cnt": _count_subgraphs(graph),
     }
 
     # Graph-level attributes
@@ -201,24 +187,174 @@ def write_json(graph: "Graph", layout_result: dict | None = None,
             bb = graph_meta["bb"]
             result["bb"] = f"{bb[0]},{bb[1]},{bb[2]},{bb[3]}"
 
-    result["objects"] = objects
-    result["nodes"] = nodes_json
-    result["edges"] = edges_json
+    result["objects"] = _iter_subgraphs(graph, node_index, [0])
+    result["nodes"] = _iter_nodes(graph, layout_nodes)
+    result["edges"] = _iter_edges(graph, node_index, layout_edges)
+    return result
+
+
+# Array elements encoded per call in compact mode.
+_COMPACT_BATCH = 256
+
+
+def encode_document(doc: dict, compact: bool = False,
+                    ensure_ascii: bool = True) -> Iterator[str]:
+    """Encode the JSON object ``doc`` incrementally.
+
+    Top-level values that are lists or iterators are encoded one
+    element at a time, so an iterator is never materialised.  The
+    concatenated text equals ``json.dumps(doc, indent=2)`` — or, with
+    ``compact``, ``json.dumps(doc, separators=(",", ":"))`` — with
+    the iterators replaced by lists.
+    """
+    if compact:
+        encode = json.JSONEncoder(ensure_ascii=ensure_ascii,
+                                  separators=(",", ":")).encode
+
+        def enc(value, pad: str) -> str:
+            return encode(value)
+        open_, sep, close, key_sep = "{", ",", "}", ":"
+        item_open, item_sep, item_close = "[", ",", "]"
+    else:
+        string = (json.encoder.encode_basestring_ascii if ensure_ascii
+                  else json.encoder.encode_basestring)
+        fallback = json.JSONEncoder(ensure_ascii=ensure_ascii,
+                                    indent=2).encode
+
+        def enc(value, pad: str) -> str:
+            # ``json.dumps(value, indent=2)`` nested at ``pad``, with
+            # the common types formatted directly.
+            if isinstance(value, str):
+                return string(value)
+            if value is True:
+                return "true"
+            if value is False:
+                return "false"
+            if value is None:
+                return "null"
+            if type(value) is int:
+                return int.__repr__(value)
+            if type(value) is float and math.isfinite(value):
+                return float.__repr__(value)
+            inner = pad + "  "
+            if isinstance(value, dict):
+                if not value:
+                    return "{}"
+                if not all(isinstance(k, str) for k in value):
+                    return fallback(value).replace("\n", "\n" + pad)
+                return ("{\n" + inner + (",\n" + inner).join(
+                    string(k) + ": " + enc(v, inner)
+                    for k, v in value.items()) + "\n" + pad + "}")
+            if isinstance(value, (list, tuple)):
+                if not value:
+                    return "[]"
+                return ("[\n" + inner + (",\n" + inner).join(
+                    enc(v, inner) for v in value) + "\n" + pad + "]")
+            # JSON strings never contain a raw newline, so indenting a
+            # nested value is a replace.
+            return fallback(value).replace("\n", "\n" + pad)
+        open_, sep, close, key_sep = "{\n  ", ",\n  ", "\n}", ": "
+        item_open, item_sep, item_close = "[\n    ", ",\n    ", "\n  ]"
+
+    if not doc:
+        yield "{}"
+        return
+    for n, (key, value) in enumerate(doc.items()):
+        yield (sep if n else open_) + enc(str(key), "") + key_sep
+        if isinstance(value, (dict, str, int, float)) or value is None:
+            yield enc(value, "  ")
+            continue
+        if compact:
+            # Batches go through the C encoder in one call.
+            yield "["
+            batch: list = []
+            first = True
+            for item in value:
+                batch.append(item)
+                if len(batch) == _COMPACT_BATCH:
+                    yield ("" if first else ",") + encode(batch)[1:-1]
+                    batch.clear()
+                    first = False
+            if batch:
+                yield ("" if first else ",") + encode(batch)[1:-1]
+            yield "]"
+            continue
+        empty = True
+        for item in value:
+            yield item_sep if not empty else item_open
+            empty = False
+            yield enc(item, "    ")
+        yield "[]" if empty else item_close
+    yield close
+
+
+def iter_json(graph: "Graph", layout_result: dict | None = None,
+              include_draw_ops: bool = True,
+              compact: bool = False) -> Iterator[str]:
+    """Yield the text of :func:`write_json` piece by piece."""
+    return encode_document(
+        _json_document(graph, layout_result, include_draw_ops),
+        compact=compact, ensure_ascii=False)
+
+
+def write_json(graph: "Graph", layout_result: dict | None = None,
+               include_draw_ops: bool = True, compact: bool = False) -> str:
+    """Serialize a Graph to Graphviz-compatible JSON format.
+
+    Parameters
+    ----------
+    graph : Graph
+        The graph to serialize.
+    layout_result : dict, optional
+        Layout result from ``DotLayout.layout()``.  When provided and
+        ``include_draw_ops`` is True, layout coordinates and drawing
+        operations are included (``-Tjson`` mode).  When None or
+        ``include_draw_ops`` is False, only structural data is written
+        (``-Tjson0`` mode).
+    include_draw_ops : bool
+        If True (default), include layout data when ``layout_result``
+        is provided.  Set to False for ``-Tjson0`` output.
+    compact : bool
+        If True, omit all whitespace between tokens instead of
+        indenting by two spaces.  Both forms parse to the same
+        document.
 
-    return json.dumps(result, indent=2, ensure_ascii=False)
+    Returns
+    -------
+    str
+        JSON text.
+    """
+    return "".join(iter_json(graph, layout_result, include_draw_ops,
+                             compact))
+
+
+def dump_json(graph: "Graph", sink: IO, layout_result: dict | None = None,
+              include_draw_ops: bool = True, compact: bool = False) -> None:
+    """Stream :func:`write_json` output to the text or binary ``sink``
+    (see :mod:`gvpy.render.sink`), one array element at a time."""
+    write_chunks(iter_json(graph, layout_result, include_draw_ops, compact),
+                 sink)
 
 
-def write_json0(graph: "Graph") -> str:
+def write_json0(graph: "Graph", compact: bool = False) -> str:
     """Serialize a Graph to Graphviz json0 format (structural only, no layout)."""
-    return write_json(graph, layout_result=None, include_draw_ops=False)
+    return write_json(graph, layout_result=None, include_draw_ops=False,
+                      compact=compact)
+
+
+def dump_json0(graph: "Graph", sink: IO, compact: bool = False) -> None:
+    """Stream :func:`write_json0` output to ``sink``."""
+    dump_json(graph, sink, layout_result=None, include_draw_ops=False,
+              compact=compact)
 
 
 def write_json_file(graph: "Graph", filepath: str,
                     layout_result: dict | None = None,
-                    include_draw_ops: bool = True) -> None:
+                    include_draw_ops: bool = True,
+                    compact: bool = False) -> None:
     """Write a Graph to a JSON file."""
-    text = write_json(graph, layout_result, include_draw_ops)
-    Path(filepath).write_text(text, encoding="utf-8")
+    with open(filepath, "w", encoding="utf-8") as fh:
+        dump_json(graph, fh, layout_result, include_draw_ops, compact)
 
 
 # ── Reader ──────────────────────────────────────────────────────
@@ -313,3 +449,197 @@ def read_json_file(filepath: Union[str, Path]) -> "Graph":
     path = Path(filepath)
     text = path.read_text(encoding="utf-8")
     return read_json(text)
+
+
+# ── Positioned loader ───────────────────────────────────────────
+
+# Node and edge attributes copied into layout-result entries.
+_LAYOUT_NODE_ATTRS = ("shape", "label", "color", "fillcolor", "fontcolor",
+                      "fontname", "fontsize", "style", "penwidth")
+_LAYOUT_EDGE_ATTRS = ("label", "color", "style", "penwidth", "arrowhead",
+                      "arrowtail", "dir")
+
+
+def layout_from_attrs(graph: "Graph") -> dict:
+    """Build a layout result dict from the ``pos`` / ``width`` /
+    ``height`` / ``bb`` attributes of an already laid-out graph.
+
+    This is what ``gvcli -n`` renders: the result has the shape the
+    layout engines return, so :func:`svg_renderer.render_svg` and
+    :func:`png_renderer.render_png` take it directly.
+    """
+    nodes = []
+    for name, node in graph.nodes.items():
+        attrs = node.attributes
+        pos = attrs.get("pos", "")
+        x, y = 0.0, 0.0
+        if pos and "," in pos:
+            parts = pos.split(",")
+            try:
+                x, y = float(parts[0]), float(parts[1])
+            except ValueError:
+                pass
+        try:
+            w = float(attrs.get("width", "0.75")) * 72.0
+        except ValueError:
+            w = 54.0
+        try:
+            h = float(attrs.get("height", "0.5")) * 72.0
+        except ValueError:
+            h = 36.0
+        entry = {"name": name, "x": x, "y": y, "width": w, "height": h}
+        for attr in _LAYOUT_NODE_ATTRS:
+            val = attrs.get(attr)
+            if val:
+                entry[attr] = val
+        nodes.append(entry)
+
+    edges = []
+    for edge in graph.edges.values():
+        attrs = edge.attributes
+        points = []
+        entry = {"tail": edge.tail.name, "head": edge.head.name,
+                 "points": points}
+        pos = attrs.get("pos", "")
+        if pos:
+            for part in pos.split():
+                part = part.lstrip("se,")
+                if "," in part:
+                    try:
+                        px, py = part.split(",", 1)
+                        points.append([float(px), float(py)])
+                    except ValueError:
+                        pass
+        for attr in _LAYOUT_EDGE_ATTRS:
+            val = attrs.get(attr)
+            if val:
+                entry[attr] = val
+        edges.append(entry)
+
+    bb_str = graph.get_graph_attr("bb") or "0,0,100,100"
+    try:
+        bb = [float(v) for v in bb_str.split(",")]
+    except ValueError:
+        bb = [0, 0, 100, 100]
+
+    return {
+        "graph": {"name": graph.name, "directed": graph.directed, "bb": bb},
+        "nodes": nodes,
+        "edges": edges,
+    }
+
+
+def load_json(text: str) -> tuple["Graph", dict]:
+    """Rebuild a laid-out graph from ``-Tjson`` text for re-rendering.
+
+    Returns ``(graph, layout_result)``: the Graph :func:`read_json`
+    would build, and :func:`layout_from_attrs` of it, so a cached
+    layout goes to SVG or PNG without running any layout phase.
+
+    Python addition: the graph is built in bulk rather than through
+    ``add_node`` / ``add_edge``.  Nodes are created directly in the
+    root graph with their attribute dicts, ``_gvid`` values index a
+    list of the created nodes, and edges are attached to their
+    endpoints by those indices — no name lookups, subgraph scope
+    resolution or per-edge duplicate scans.  NODE_ADDED / EDGE_ADDED
+    callbacks are not dispatched; a freshly created graph has none
+    registered.
+    """
+    from gvpy.core.defines import ObjectType
+    from gvpy.core.edge import Edge
+    from gvpy.core.graph import Graph
+    from gvpy.core.node import Node
+
+    data = json.loads(text)
+
+    g = Graph(data.get("name", "G"), directed=data.get("directed", True),
+              strict=data.get("strict", False))
+    g.method_init()
+
+    skip_keys = {"name", "directed", "strict", "_subgraph_cnt",
+                 "objects", "nodes", "edges", "bb"}
+    for k, v in data.items():
+        if k not in skip_keys and isinstance(v, str):
+            g.set_graph_attr(k, v)
+    if "bb" in data:
+        g.set_graph_attr("bb", str(data["bb"]))
+
+    disc, clos = g.disc, g.clos
+    graph_nodes = g.nodes
+    root = g.get_root()
+    by_gvid: dict[int, Node] = {}
+
+    for node_data in data.get("nodes", ()):
+        gvid = node_data.get("_gvid", 0)
+        name = node_data.get("name", str(node_data.get("_gvid", "")))
+        attrs = {k: v for k, v in node_data.items()
+                 if k != "_gvid" and k != "name" and isinstance(v, str)}
+        node = graph_nodes.get(name)
+        if node is not None:
+            node.attributes.update(attrs)
+        else:
+            node = Node(name=name, graph=g,
+                        id_=disc.map(clos, ObjectType.AGNODE, name, True),
+                        root=root,
+                        seq=clos.get_next_sequence(ObjectType.AGNODE),
+                        attributes=attrs)
+            graph_nodes[name] = node
+            node.set_compound_data("rank", 0)
+        by_gvid[gvid] = node
+
+    for obj in data.get("objects", ()):
+        sub = g.create_subgraph(
+            obj.get("name", f"subgraph_{obj.get('_gvid', 0)}"))
+        for k, v in obj.items():
+            if (k not in ("_gvid", "name", "nodes", "edges")
+                    and isinstance(v, str)):
+                sub.attr_record[k] = v
+        sub_nodes = sub.nodes
+        for gvid in obj.get("nodes", ()):
+            node = by_gvid.get(gvid)
+            if node is not None:
+                sub_nodes[node.name] = node
+
+    # Parallel edges are keyed ``_e1``, ``_e2``, ... as add_edge names
+    # them; a strict graph drops loops and merges repeated pairs.
+    graph_edges = g.edges
+    strict = g.strict
+    pair_count: dict[tuple[str, str], int] = {}
+    pair_edge: dict[tuple[str, str], Edge] = {}
+    for edge_data in data.get("edges", ()):
+        tail = by_gvid.get(edge_data.get("tail", 0))
+        head = by_gvid.get(edge_data.get("head", 0))
+        if tail is None or head is None:
+            continue
+        attrs = {k: v for k, v in edge_data.items()
+                 if k != "_gvid" and k != "tail" and k != "head"
+                 and isinstance(v, str)}
+        pair = (tail.name, head.name)
+        if strict:
+            if tail is head:
+                continue
+            edge = pair_edge.get(pair)
+            if edge is not None:
+                edge.attributes.update(attrs)
+                continue
+        count = pair_count.get(pair, 0)
+        pair_count[pair] = count + 1
+        key = f"_e{count}" if count else None
+        edge = Edge(graph=g, name=key, tail=tail, head=head,
+                    id_=disc.map(clos, ObjectType.AGEDGE, key, True),
+                    key=key, attributes=attrs)
+        graph_edges[(pair[0], pair[1], key)] = edge
+        tail.outedges.append(edge)
+        head.inedges.append(edge)
+        if strict:
+            pair_edge[pair] = edge
+
+    for node in graph_nodes.values():
+        node.compound_node_data.update_degree(node.outedges, node.inedges)
+
+    return g, layout_from_attrs(g)
+
+
+def load_json_file(filepath: Union[str, Path]) -> tuple["Graph", dict]:
+    """Read a Graphviz JSON file with :func:`load_json`."""
+    return load_json(Path(filepath).read_text(encoding="utf-8"))
@@ -4,14 +4,40 @@ PNG renderer for dot layout results.
 Converts the JSON layout dict produced by DotLayout.layout() into a PNG
 image using Pillow (PIL).  Mirrors the SVG renderer's visual output for
 quick comparison with Graphviz ``dot -Tpng`` output.
+
+Large images can be rasterised in strips by forked worker processes,
+enabled with ``GVPY_PNG_WORKERS=N`` (``N > 1``).  The drawing code runs
+once against a recorder that keeps every primitive in image
+coordinates with its pixel bounding box; the primitives are assigned
+to the full-width horizontal strips they touch, each strip draws its
+primitives in the original order, and the strips are pasted into the
+full image.
+
+Pillow converts shape coordinates to integer pixels by truncation, so
+the recorder truncates them up front and a strip can draw them on a
+canvas of its own: the strip plus a margin for the widest stroke
+above and below, with every coordinate moved up by a whole number of
+pixels and primitives cut off at the canvas edge.  The canvas keeps
+the image's columns: Pillow fills polygons (and wide lines, stroked
+as quads) by computing scanline crossings in floating point from the
+x coordinates, which a horizontal move would round differently, while
+a whole-pixel vertical move leaves every crossing as it was.  Text is
+drawn at the anchor's fractional offset after truncating it, so a
+canvas also reaches up to the anchors of the text drawn on it.
 """
 from __future__ import annotations
 
 import math
+import multiprocessing
+import os
+from functools import lru_cache
 from typing import Sequence
 
 from PIL import Image, ImageDraw, ImageFont
 
+from gvpy.render.colors import StyleTable
+from gvpy.render.viewport import LayoutIndex, view_layout
+
 
 # ── Defaults ────────────────────────────────────────
 
@@ -21,6 +47,11 @@ _BG = (255, 255, 255, 255)
 _DEF_FONT_SIZE = 14.0
 _ARROW_SIZE = 8.0
 
+# Strip height in pixels for the tiled rasteriser.
+_TILE = 512
+# Below this many pixels, forking costs more than it saves.
+_MIN_TILED_PIXELS = 1 << 22
+
 # ── Color helpers ───────────────────────────────────
 
 _NAMED_COLORS: dict[str, tuple[int, ...]] = {
@@ -66,7 +97,12 @@ def _opaque(c: tuple[int, ...]) -> bool:
 
 def _try_font(size: float) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     """Attempt to load a TrueType font; fall back to default."""
-    sz = max(6, int(size))
+    return _load_font(max(6, int(size)))
+
+
+@lru_cache(maxsize=None)
+def _load_font(sz: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """The font for pixel size ``sz``, loaded once per size."""
     for name in ("arial.ttf", "Arial.ttf", "DejaVuSans.ttf",
                  "LiberationSans-Regular.ttf"):
         try:
@@ -79,22 +115,103 @@ def _try_font(size: float) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
 # ── Coordinate transform ───────────────────────────
 
 class _Ctx:
-    """Rendering context with coordinate transform."""
+    """Rendering context with coordinate transform.
+
+    With ``record``, drawing goes to a :class:`_Recorder` and no image
+    is allocated.
+    """
 
-    def __init__(self, bb: Sequence[float], scale: float, dpi: float):
+    def __init__(self, bb: Sequence[float], scale: float, dpi: float,
+                 record: bool = False):
         self.scale = scale * (dpi / 72.0)
         self.ox = -bb[0] + _PAD
         self.oy = -bb[1] + _PAD
         w = int(math.ceil((bb[2] - bb[0] + 2 * _PAD) * self.scale))
         h = int(math.ceil((bb[3] - bb[1] + 2 * _PAD) * self.scale))
-        self.img = Image.new("RGBA", (w, h), _BG)
-        self.draw = ImageDraw.Draw(self.img)
+        self.size = (w, h)
+        self.styles = StyleTable(_parse_color)
+        if record:
+            self.img = None
+            self.draw = _Recorder()
+        else:
+            self.img = Image.new("RGBA", (w, h), _BG)
+            self.draw = ImageDraw.Draw(self.img)
 
     def pt(self, x: float, y: float) -> tuple[float, float]:
         return ((x + self.ox) * self.scale,
                 (y + self.oy) * self.scale)
 
 
+class _Recorder:
+    """Stand-in for ``ImageDraw.Draw`` that records the primitives
+    drawn, in image coordinates, with their pixel bounding boxes.
+
+    Shape coordinates are truncated to whole pixels as Pillow does
+    when drawing, so moving them by whole pixels is exact.  Text keeps
+    its anchor: Pillow renders glyphs at its fractional offset.
+    """
+
+    def __init__(self):
+        self.ops: list[tuple[str, list, tuple, dict]] = []
+        self.boxes: list[tuple[float, float, float, float]] = []
+        # Per op, the row a strip's canvas must reach up to (a text
+        # anchor), or None.
+        self.pins: list[int | None] = []
+        self._measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+    def _shape(self, name: str, xy: list, kw: dict) -> None:
+        if len(xy) == 4 and not isinstance(xy[0], (tuple, list)):
+            xy = [int(v) for v in xy]
+            xs, ys = (xy[0], xy[2]), (xy[1], xy[3])
+        else:
+            xy = [(int(p[0]), int(p[1])) for p in xy]
+            xs = [p[0] for p in xy]
+            ys = [p[1] for p in xy]
+        pad = kw.get("width", 1) + 2
+        self.ops.append((name, xy, (), kw))
+        self.boxes.append((min(xs) - pad, min(ys) - pad,
+                           max(xs) + pad, max(ys) + pad))
+        self.pins.append(None)
+
+    def rectangle(self, xy, **kw) -> None:
+        self._shape("rectangle", xy, kw)
+
+    def ellipse(self, xy, **kw) -> None:
+        self._shape("ellipse", xy, kw)
+
+    def polygon(self, xy, **kw) -> None:
+        self._shape("polygon", xy, kw)
+
+    def line(self, xy, **kw) -> None:
+        if kw.get("width", 1) > 1:
+            # Pillow draws the segments of a wide line one by one;
+            # recorded apart, each reaches only the strips it crosses.
+            for a, b in zip(xy, xy[1:]):
+                self._shape("line", [a, b], kw)
+        else:
+            self._shape("line", xy, kw)
+
+    def text(self, xy, text, **kw) -> None:
+        x0, y0, x1, y1 = self._measure.textbbox(
+            xy, text, font=kw.get("font"), anchor=kw.get("anchor"))
+        self.ops.append(("text", xy, (text,), kw))
+        self.boxes.append((min(x0, xy[0]) - 2, min(y0, xy[1]) - 2,
+                           max(x1, xy[0]) + 2, max(y1, xy[1]) + 2))
+        # The anchor must stay non-negative on the canvas: Pillow
+        # splits it into whole and fractional pixels by truncation.
+        self.pins.append(math.floor(xy[1]))
+
+
+def _shift(xy, dy: int):
+    """``xy`` (a point, a point list or a flat box) moved up by
+    ``dy``."""
+    if isinstance(xy[0], (tuple, list)):
+        return [(p[0], p[1] - dy) for p in xy]
+    if len(xy) == 4:
+        return [xy[0], xy[1] - dy, xy[2], xy[3] - dy]
+    return (xy[0], xy[1] - dy)
+
+
 # ── Cluster ─────────────────────────────────────────
 
 def _draw_cluster(ctx: _Ctx, cl: dict):
@@ -103,8 +220,8 @@ def _draw_cluster(ctx: _Ctx, cl: dict):
     if "invis" in style:
         return
 
-    fill_c = _parse_color(cl.get("fillcolor") or cl.get("bgcolor") or "none")
-    stroke_c = _parse_color(cl.get("pencolor") or cl.get("color") or "black")
+    fill_c = ctx.styles.rgba(cl.get("fillcolor") or cl.get("bgcolor") or "none")
+    stroke_c = ctx.styles.rgba(cl.get("pencolor") or cl.get("color") or "black")
     try:
         pw = max(1, int(float(cl.get("penwidth", "1"))))
     except ValueError:
@@ -126,7 +243,7 @@ def _draw_cluster(ctx: _Ctx, cl: dict):
         except ValueError:
             fsz = _DEF_FONT_SIZE - 2
         font = _try_font(fsz * ctx.scale)
-        fc = _parse_color(cl.get("fontcolor", "black"))
+        fc = ctx.styles.rgba(cl.get("fontcolor", "black"))
         tx = (x0 + x1) / 2
         ty = y0 + 4 * ctx.scale
         ctx.draw.text((tx, ty), label, fill=fc, font=font, anchor="mt")
@@ -143,10 +260,10 @@ def _draw_node(ctx: _Ctx, node: dict):
     if "invis" in style:
         return
 
-    fill_c = _parse_color(node.get("fillcolor") or node.get("color") or "white")
-    stroke_c = _parse_color(node.get("color") or "black")
+    fill_c = ctx.styles.rgba(node.get("fillcolor") or node.get("color") or "white")
+    stroke_c = ctx.styles.rgba(node.get("color") or "black")
     if node.get("fillcolor"):
-        stroke_c = _parse_color(node.get("color") or "black")
+        stroke_c = ctx.styles.rgba(node.get("color") or "black")
     try:
         pw = max(1, int(float(node.get("penwidth", "1"))))
     except ValueError:
@@ -181,7 +298,7 @@ def _draw_node(ctx: _Ctx, node: dict):
         except ValueError:
             fsz = _DEF_FONT_SIZE
         font = _try_font(fsz * ctx.scale)
-        fc = _parse_color(node.get("fontcolor", "black"))
+        fc = ctx.styles.rgba(node.get("fontcolor", "black"))
         ctx.draw.text((cx, cy), label, fill=fc, font=font, anchor="mm")
 
 
@@ -195,7 +312,7 @@ def _draw_edge(ctx: _Ctx, edge: dict, directed: bool):
     if "invis" in style:
         return
 
-    stroke_c = _parse_color(edge.get("color") or "black")
+    stroke_c = ctx.styles.rgba(edge.get("color") or "black")
     try:
         pw = max(1, int(float(edge.get("penwidth", "1"))))
     except ValueError:
@@ -248,7 +365,7 @@ def _draw_edge(ctx: _Ctx, edge: dict, directed: bool):
         except ValueError:
             fsz = 10
         font = _try_font(fsz * ctx.scale)
-        fc = _parse_color(edge.get("fontcolor") or "black")
+        fc = ctx.styles.rgba(edge.get("fontcolor") or "black")
         ctx.draw.text(mid, label, fill=fc, font=font, anchor="mm")
 
 
@@ -274,9 +391,96 @@ def _draw_arrow(ctx: _Ctx, p_from: tuple, p_to: tuple,
     ctx.draw.polygon(pts, fill=color)
 
 
+# ── Tiled rasteriser ────────────────────────────────
+
+# (ops, strips, image width) for forked workers; set only around a pool.
+_STATE = None
+
+
+def png_workers() -> int:
+    """Worker-process count for tiled rasterisation, from
+    ``GVPY_PNG_WORKERS`` (default 1 — one image, no tiles)."""
+    try:
+        return max(1, int(os.environ.get("GVPY_PNG_WORKERS", "1")))
+    except ValueError:
+        return 1
+
+
+def _tiles(rec: _Recorder, size: tuple[int, int]
+           ) -> list[tuple[int, int, tuple[int, int], list[int]]]:
+    """Strips ``(y, h, canvas, ops)`` covering an image of ``size``:
+    the primitives whose boxes reach each strip, in drawing order, and
+    the image rows ``(y0, y1)`` they are drawn on.
+
+    The canvas is the strip plus a margin for the widest stroke, grown
+    up to the anchors of its text and cut to the image like the whole
+    image cuts them.
+    """
+    w, h = size
+    rows = -(-h // _TILE)
+    members: list[list[int]] = [[] for _ in range(rows)]
+    for i, (x0, y0, x1, y1) in enumerate(rec.boxes):
+        if x1 < 0 or y1 < 0 or x0 >= w or y0 >= h:
+            continue
+        for r in range(max(0, int(y0 // _TILE)),
+                       min(rows - 1, int(y1 // _TILE)) + 1):
+            members[r].append(i)
+
+    tiles = []
+    for r, ops in enumerate(members):
+        y = r * _TILE
+        th = min(_TILE, h - y)
+        m = 2 + max((rec.ops[i][3].get("width", 1) for i in ops), default=1)
+        y0, y1 = y - m, y + th + m
+        for i in ops:
+            pin = rec.pins[i]
+            if pin is not None:
+                y0 = min(y0, pin)
+        tiles.append((y, th, (max(0, y0), min(h, y1)), ops))
+    return tiles
+
+
+def _render_tile(k: int) -> bytes:
+    """RGBA pixels of strip ``k``."""
+    ops, tiles, w = _STATE
+    y, h, (cy0, cy1), members = tiles[k]
+    img = Image.new("RGBA", (w, cy1 - cy0), _BG)
+    draw = ImageDraw.Draw(img)
+    for i in members:
+        name, xy, args, kw = ops[i]
+        getattr(draw, name)(_shift(xy, cy0), *args, **kw)
+    return img.crop((0, y - cy0, w, y - cy0 + h)).tobytes()
+
+
+def _rasterise_tiled(rec: _Recorder, size: tuple[int, int],
+                     workers: int) -> Image.Image:
+    """Draw ``rec`` strip by strip in up to ``workers`` processes and
+    paste the strips into one image."""
+    global _STATE
+    tiles = _tiles(rec, size)
+    procs = min(workers, os.cpu_count() or 1, len(tiles))
+    _STATE = (rec.ops, tiles, size[0])
+    try:
+        if procs > 1 and "fork" in multiprocessing.get_all_start_methods():
+            with multiprocessing.get_context("fork").Pool(procs) as pool:
+                pixels = pool.map(_render_tile, range(len(tiles)))
+        else:
+            pixels = [_render_tile(k) for k in range(len(tiles))]
+    finally:
+        _STATE = None
+
+    img = Image.new("RGBA", size, _BG)
+    for (y, h, _, _), data in zip(tiles, pixels):
+        img.paste(Image.frombytes("RGBA", (size[0], h), data), (0, y))
+    return img
+
+
 # ── Public API ──────────────────────────────────────
 
-def render_png(layout: dict, dpi: float = 72.0) -> bytes:
+def render_png(layout: dict, dpi: float = 72.0,
+               workers: int | None = None,
+               viewport: Sequence[float] | None = None,
+               index: LayoutIndex | None = None) -> bytes:
     """Convert a layout result dict to PNG bytes.
 
     Parameters
@@ -286,16 +490,31 @@ def render_png(layout: dict, dpi: float = 72.0) -> bytes:
         renderer consumes).
     dpi : float
         Output resolution (default 72 matches Graphviz ``-Gdpi=72``).
+    workers : int or None
+        Processes for tiled rasterisation of large images; ``None``
+        reads ``GVPY_PNG_WORKERS``.  The pixels do not depend on it.
+    viewport : sequence of float or None
+        Window ``x0, y0, x1, y1`` (layout coordinates) to draw instead
+        of the whole layout, at the level of detail
+        :func:`gvpy.render.viewport.view_layout` chooses for ``dpi``.
+    index : LayoutIndex or None
+        Spatial index of ``layout``, built once to draw many windows.
 
     Returns
     -------
     bytes
         PNG image data.
     """
+    if viewport is not None:
+        layout = view_layout(layout, viewport, _SCALE * dpi / 72.0, index)
     graph = layout.get("graph", {})
     bb = graph.get("bb", [0, 0, 100, 100])
+    if workers is None:
+        workers = png_workers()
 
-    ctx = _Ctx(bb, _SCALE, dpi)
+    probe = _Ctx(bb, _SCALE, dpi, record=True)
+    tiled = workers > 1 and probe.size[0] * probe.size[1] >= _MIN_TILED_PIXELS
+    ctx = probe if tiled else _Ctx(bb, _SCALE, dpi)
 
     # Draw order: clusters (background) → edges → nodes (foreground)
     for cl in layout.get("clusters", []):
@@ -305,7 +524,9 @@ def render_png(layout: dict, dpi: float = 72.0) -> bytes:
     for node in layout.get("nodes", []):
         _draw_node(ctx, node)
 
+    img = _rasterise_tiled(ctx.draw, ctx.size, workers) if tiled else ctx.img
+
     import io
     buf = io.BytesIO()
-    ctx.img.save(buf, format="PNG")
+    img.save(buf, format="PNG")
     return buf.getvalue()
@@ -0,0 +1,40 @@
+"""Chunked writing of rendered text to file-like sinks.
+
+Shared by the streaming writers (:func:`svg_renderer.write_svg`,
+:func:`json_io.dump_json`).  A sink is any object with a ``write``
+method; binary sinks — ``io.RawIOBase`` / ``io.BufferedIOBase``
+instances or files opened in a ``b`` mode — receive UTF-8 bytes and
+anything else receives ``str``.
+"""
+from __future__ import annotations
+
+import io
+from typing import IO, Iterable
+
+# Characters buffered between sink writes.
+WRITE_CHUNK = 1 << 16
+
+
+def is_binary(sink: IO) -> bool:
+    """True if ``sink`` takes bytes rather than ``str``."""
+    return (isinstance(sink, (io.RawIOBase, io.BufferedIOBase))
+            or "b" in getattr(sink, "mode", ""))
+
+
+def write_chunks(fragments: Iterable[str], sink: IO) -> None:
+    """Write ``fragments`` to ``sink`` in writes of about
+    ``WRITE_CHUNK`` characters."""
+    binary = is_binary(sink)
+    buf: list[str] = []
+    size = 0
+    for frag in fragments:
+        buf.append(frag)
+        size += len(frag)
+        if size >= WRITE_CHUNK:
+            text = "".join(buf)
+            sink.write(text.encode("utf-8") if binary else text)
+            buf.clear()
+            size = 0
+    if buf:
+        text = "".join(buf)
+        sink.write(text.encode("utf-8") if binary else text)
@@ -3,15 +3,26 @@ SVG renderer for dot layout results.
 
 Converts the JSON layout dict produced by DotLayout.layout() into SVG markup.
 Supports node shapes, colors, fill styles, fonts, edge colors, and styles.
+
+``render_svg`` returns the document as one string; ``write_svg``
+streams the same bytes to a text or binary file-like sink as the
+fragments are produced, so memory stays bounded by the largest
+single cluster, edge or node fragment rather than the whole document.
+Both can draw a window of the layout only (see
+:mod:`gvpy.render.viewport`).
 """
 from __future__ import annotations
 
 import math
 import re
 from pathlib import Path
-from typing import Union
+from typing import IO, Iterator, Sequence, Union
 from xml.sax.saxutils import escape
 
+from gvpy.render.colors import StyleTable
+from gvpy.render.sink import write_chunks
+from gvpy.render.viewport import LayoutIndex, view_layout
+
 
 _SVG_HEADER = """\
 <?xml version="1.0" encoding="UTF-8"?>
@@ -72,6 +83,11 @@ _HTML_ROUNDED_R = 4.0
 _GRADIENT_COUNTER: list[int] = [0]
 
 
+# Colour specs resolved so far in the current render; replaced at the
+# start of each one.
+_STYLES: list[StyleTable] = [StyleTable()]
+
+
 def _next_gradient_id() -> str:
     gid = f"gvpyg{_GRADIENT_COUNTER[0]}"
     _GRADIENT_COUNTER[0] += 1
@@ -93,17 +109,9 @@ def _apply_imagepath(raw: str) -> None:
 
 
 def _parse_bgcolor_pair(bg: str | None) -> tuple[str | None, str | None]:
-    """Split a Graphviz-style ``c1:c2`` colour pair.
-
-    Returns ``(c1, c2)`` when ``bg`` contains a colon, otherwise
-    ``(bg, None)``.  Empty strings are normalised to ``None``.
-    """
-    if not bg:
-        return None, None
-    if ":" in bg:
-        a, b = bg.split(":", 1)
-        return (a.strip() or None), (b.strip() or None)
-    return bg, None
+    """Split a Graphviz-style ``c1:c2`` colour pair (see
+    :func:`gvpy.render.colors.split_color_pair`), once per render."""
+    return _STYLES[0].stops(bg)
 
 
 def _gradient_def(gid: str, c1: str, c2: str, style: str,
@@ -855,7 +863,7 @@ def _render_html_text(cx: float, cy: float, raw_label: str,
 
 def _node_attrs(node: dict) -> tuple[str, str, str, float, str, float]:
     """Extract (fill, stroke, font_family, font_size, font_color, penwidth) from node dict."""
-    from gvpy.render.colors import resolve_color
+    resolve_color = _STYLES[0].svg
     style = node.get("style", "")
     fill = node.get("fillcolor", node.get("color", ""))
     stroke = node.get("color", _DEF_NODE_STROKE)
@@ -886,7 +894,7 @@ def _node_attrs(node: dict) -> tuple[str, str, str, float, str, float]:
 
 def _edge_attrs(edge: dict) -> tuple[str, float, str, str, float]:
     """Extract (stroke, penwidth, dasharray, font_color, font_size) from edge dict."""
-    from gvpy.render.colors import resolve_color
+    resolve_color = _STYLES[0].svg
     stroke = edge.get("color", _DEF_EDGE_STROKE)
     try:
         penwidth = float(edge.get("penwidth", "1"))
@@ -963,8 +971,36 @@ def _regular_polygon(cx: float, cy: float, r: float, n: int,
     return _fit_polygon(cx, cy, r, r, n, 0.0, fill, stroke, penwidth)
 
 
-def render_svg(layout: dict) -> str:
-    """Convert a layout result dict to an SVG string."""
+def render_svg(layout: dict, viewport: Sequence[float] | None = None,
+               zoom: float = 1.0, index: LayoutIndex | None = None) -> str:
+    """Convert a layout result dict to an SVG string.
+
+    With ``viewport`` (``x0, y0, x1, y1`` in layout coordinates) only
+    that window is drawn, ``zoom`` times its layout size and with the
+    level of detail :func:`gvpy.render.viewport.view_layout` chooses
+    for that zoom; pass an ``index`` built once to draw many windows
+    of one layout.
+    """
+    return "".join(iter_svg(layout, viewport, zoom, index))
+
+
+def write_svg(layout: dict, sink: IO, viewport: Sequence[float] | None = None,
+              zoom: float = 1.0, index: LayoutIndex | None = None) -> None:
+    """Stream the SVG for ``layout`` to the text or binary ``sink``
+    (see :mod:`gvpy.render.sink`).  The output is identical to
+    :func:`render_svg`."""
+    write_chunks(iter_svg(layout, viewport, zoom, index), sink)
+
+
+def iter_svg(layout: dict, viewport: Sequence[float] | None = None,
+             zoom: float = 1.0,
+             index: LayoutIndex | None = None) -> Iterator[str]:
+    """Yield the SVG for ``layout`` fragment by fragment: header,
+    clusters, edges, nodes, graph label, footer.  ``viewport``,
+    ``zoom`` and ``index`` are as for :func:`render_svg`."""
+    if viewport is not None:
+        layout = view_layout(layout, viewport, zoom, index)
+        layout["graph"]["zoom"] = zoom
     graph = layout.get("graph", {})
     bb = graph.get("bb", [0, 0, 100, 100])
     pad = 4.0
@@ -977,6 +1013,7 @@ def render_svg(layout: dict) -> str:
     # Gradient IDs within one render must be globally unique.  Reset
     # the module-level counter so IDs stay deterministic across runs.
     _GRADIENT_COUNTER[0] = 0
+    _STYLES[0] = StyleTable()
 
     # Install graph-level imagepath so the HTML IMG probe can find
     # relative SRCs.  Graphviz allows ``;`` (Windows) or ``:`` (Unix)
@@ -1003,18 +1040,18 @@ def render_svg(layout: dict) -> str:
         vx_o, vy_o, vw_o, vh_o = vx, vy, vw, vh
         zoom_attr = ""
 
-    parts = [_SVG_HEADER.format(
+    yield _SVG_HEADER.format(
         w=round(vw_o), h=round(vh_o),
         vx=vx_o, vy=vy_o, vw=vw_o, vh=vh_o,
         title=title, zoom_attr=zoom_attr,
-    )]
+    )
 
     for cl in layout.get("clusters", []):
-        parts.append(_render_cluster(cl))
+        yield _render_cluster(cl)
     for edge in layout.get("edges", []):
-        parts.append(_render_edge(edge, directed))
+        yield _render_edge(edge, directed)
     for node in layout.get("nodes", []):
-        parts.append(_render_node(node))
+        yield _render_node(node)
 
     # Graph-level label
     graph_label = graph.get("label", "")
@@ -1027,19 +1064,19 @@ def render_svg(layout: dict) -> str:
         except ValueError:
             gfsize = _DEF_FONT_SIZE
         gfcolor = graph.get("fontcolor", "black")
-        parts.append(
+        yield (
             f'<text x="{graph_label_x}" y="{graph_label_y}" '
             f'text-anchor="middle" font-family="{gfont}" '
             f'font-size="{gfsize}" fill="{gfcolor}">'
             f'{escape(graph_label)}</text>\n'
         )
 
-    parts.append(_SVG_FOOTER)
-    return "".join(parts)
+    yield _SVG_FOOTER
 
 
 def render_svg_file(layout: dict, filepath: Union[str, Path]):
-    Path(filepath).write_text(render_svg(layout), encoding="utf-8")
+    with open(filepath, "w", encoding="utf-8") as fh:
+        write_svg(layout, fh)
 
 
 # ── Cluster ──────────────────────────────────────
@@ -0,0 +1,306 @@
+"""Viewport culling and level of detail for layout dicts.
+
+Python addition: Graphviz always emits the whole drawing.  A dashboard
+showing a small window of a very large layout needs only the objects
+inside that window, at the detail the zoom level can show.
+:class:`LayoutIndex` buckets the clusters, edges and nodes of a layout
+dict (as produced by ``DotLayout.layout()`` or
+:func:`gvpy.render.json_io.layout_from_attrs`) into a uniform grid
+once; :func:`view_layout` then builds the reduced layout dict for one
+viewport, at a cost that follows the number of objects in view.
+
+At zoom ``z`` (output pixels per layout point) the reduced layout
+
+- drops labels whose font would be under ``_MIN_TEXT_PX`` pixels tall,
+  and draws record nodes as plain boxes;
+- simplifies edge splines and polylines to fewer control points,
+  keeping every point within ``_SIMPLIFY_PX`` pixels of the original
+  curve (a cubic lies inside the hull of its control points, so
+  control points near the chord bound the whole curve);
+- merges nodes smaller than a pixel into one pixel-sized box per
+  pixel cell.
+
+The renderers accept the viewport directly: ``render_svg(layout,
+viewport=..., zoom=...)`` and ``render_png(layout, dpi,
+viewport=...)``.
+"""
+from __future__ import annotations
+
+import math
+from typing import Sequence
+
+# Smallest font size, in pixels, still drawn.
+_MIN_TEXT_PX = 4.0
+# Distance, in pixels, a simplified edge may stray from the original.
+_SIMPLIFY_PX = 0.5
+# Objects covering more grid cells than this are tested on every query.
+_MAX_CELLS = 64
+# Rough glyph width, as a fraction of the font size, for label extents.
+_CHAR_WIDTH = 0.6
+# Room around edge points for arrowheads and pen width.
+_EDGE_PAD = 10.0
+_DEF_FONT_SIZE = 14.0
+
+_KINDS = ("clusters", "edges", "nodes")
+
+Rect = tuple[float, float, float, float]
+
+
+def _font_size(obj: dict) -> float:
+    try:
+        return float(obj.get("fontsize", _DEF_FONT_SIZE))
+    except (TypeError, ValueError):
+        return _DEF_FONT_SIZE
+
+
+def _text_box(x, y, text: str, size: float, centred: bool = True) -> Rect:
+    """Estimated extent of ``text`` anchored at ``(x, y)``."""
+    lines = str(text).split("\n")
+    w = _CHAR_WIDTH * size * max(len(s) for s in lines)
+    h = size * len(lines)
+    x, y = float(x), float(y)
+    x0 = x - w / 2 if centred else x
+    return (x0, y - h, x0 + w, y + h)
+
+
+def _union(a: Rect, b: Rect) -> Rect:
+    return (min(a[0], b[0]), min(a[1], b[1]),
+            max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _node_box(node: dict) -> Rect:
+    hw, hh = node["width"] / 2, node["height"] / 2
+    box = (node["x"] - hw, node["y"] - hh, node["x"] + hw, node["y"] + hh)
+    if node.get("xlabel") and node.get("_xlabel_pos_x"):
+        box = _union(box, _text_box(node["_xlabel_pos_x"],
+                                    node["_xlabel_pos_y"], node["xlabel"],
+                                    _font_size(node)))
+    return box
+
+
+def _edge_box(edge: dict) -> Rect | None:
+    pts = edge.get("points")
+    if not pts:
+        return None
+    xs = [p[0] for p in pts]
+    ys = [p[1] for p in pts]
+    box = (min(xs) - _EDGE_PAD, min(ys) - _EDGE_PAD,
+           max(xs) + _EDGE_PAD, max(ys) + _EDGE_PAD)
+    size = _font_size(edge)
+    if edge.get("label") and edge.get("label_pos"):
+        lx, ly = edge["label_pos"]
+        box = _union(box, _text_box(lx, ly, edge["label"], size))
+    for end in ("head", "tail"):
+        text = edge.get(f"{end}label")
+        x = edge.get(f"_{end}label_pos_x")
+        if text and x:
+            box = _union(box, _text_box(x, edge[f"_{end}label_pos_y"],
+                                        text, size, centred=False))
+    return box
+
+
+def _object_box(kind: str, obj: dict) -> Rect | None:
+    if kind == "nodes":
+        return _node_box(obj)
+    if kind == "edges":
+        return _edge_box(obj)
+    bb = obj.get("bb")
+    return tuple(bb) if bb else None
+
+
+class LayoutIndex:
+    """Uniform-grid spatial index over the clusters, edges and nodes
+    of a layout dict.
+
+    Build it once per layout and pass it to :func:`view_layout` (or
+    the renderers' ``index`` argument) for every viewport.
+    """
+
+    def __init__(self, layout: dict):
+        self.layout = layout
+        self.boxes: dict[str, list[Rect | None]] = {
+            kind: [_object_box(kind, obj) for obj in layout.get(kind, [])]
+            for kind in _KINDS}
+        live = [b for kind in _KINDS for b in self.boxes[kind] if b]
+        if not live:
+            live = [(0.0, 0.0, 0.0, 0.0)]
+        self.x0 = min(b[0] for b in live)
+        self.y0 = min(b[1] for b in live)
+        w = max(b[2] for b in live) - self.x0
+        h = max(b[3] for b in live) - self.y0
+        n = len(live)
+        self.cell = math.sqrt(w * h / n) or max(w, h, 1.0) / math.sqrt(n)
+        self.cols = int(w // self.cell) + 1
+        self.rows = int(h // self.cell) + 1
+
+        self._cells: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        self._large: list[tuple[int, int]] = []
+        for k, kind in enumerate(_KINDS):
+            for i, box in enumerate(self.boxes[kind]):
+                if box is None:
+                    continue
+                c0, r0, c1, r1 = self._span(box)
+                if (c1 - c0 + 1) * (r1 - r0 + 1) > _MAX_CELLS:
+                    self._large.append((k, i))
+                    continue
+                for r in range(r0, r1 + 1):
+                    for c in range(c0, c1 + 1):
+                        self._cells.setdefault((c, r), []).append((k, i))
+
+    def _span(self, box: Rect) -> tuple[int, int, int, int]:
+        """Grid columns and rows ``(c0, r0, c1, r1)`` that ``box``
+        covers, clamped to the grid."""
+        def clamp(v: float, hi: int) -> int:
+            return min(hi, max(0, int(v // self.cell)))
+        return (clamp(box[0] - self.x0, self.cols - 1),
+                clamp(box[1] - self.y0, self.rows - 1),
+                clamp(box[2] - self.x0, self.cols - 1),
+                clamp(box[3] - self.y0, self.rows - 1))
+
+    def query(self, rect: Sequence[float]) -> dict[str, list[int]]:
+        """Indices of the clusters, edges and nodes whose boxes meet
+        ``rect`` (``x0, y0, x1, y1``), each list in layout order."""
+        x0, y0, x1, y1 = rect
+        found: set[tuple[int, int]] = set()
+        hits: dict[str, list[int]] = {kind: [] for kind in _KINDS}
+
+        def test(k: int, i: int) -> None:
+            if (k, i) in found:
+                return
+            found.add((k, i))
+            b = self.boxes[_KINDS[k]][i]
+            if b[0] <= x1 and b[2] >= x0 and b[1] <= y1 and b[3] >= y0:
+                hits[_KINDS[k]].append(i)
+
+        for k, i in self._large:
+            test(k, i)
+        c0, r0, c1, r1 = self._span(rect)
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                for k, i in self._cells.get((c, r), ()):
+                    test(k, i)
+        for ids in hits.values():
+            ids.sort()
+        return hits
+
+
+# ── Level of detail ──────────────────────────────────
+
+def _seg_dist(p, a, b) -> float:
+    """Distance from point ``p`` to segment ``a``–``b``."""
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    d2 = dx * dx + dy * dy
+    t = 0.0
+    if d2 > 0.0:
+        t = max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / d2))
+    return math.hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+
+def simplify_points(pts: list, tol: float, bezier: bool) -> list:
+    """``pts`` with runs of nearly straight segments merged.
+
+    For a piecewise cubic (``3k + 1`` points) each run of pieces whose
+    control points all lie within ``tol`` of the chord becomes one
+    straight cubic; other pieces are kept as they are.  A polyline
+    drops vertices the same way.
+    """
+    step = 3 if bezier else 1
+    last = len(pts) - 1
+    out = [pts[0]]
+    a = 0
+    while a < last:
+        b = a + step
+        while b + step <= last and all(
+                _seg_dist(pts[j], pts[a], pts[b + step]) <= tol
+                for j in range(a + 1, b + step)):
+            b += step
+        if b == a + step and bezier and any(
+                _seg_dist(pts[j], pts[a], pts[b]) > tol
+                for j in range(a + 1, b)):
+            out.extend(pts[a + 1:b + 1])
+        elif bezier:
+            (ax, ay), (bx, by) = pts[a], pts[b]
+            out.append([ax + (bx - ax) / 3, ay + (by - ay) / 3])
+            out.append([ax + 2 * (bx - ax) / 3, ay + 2 * (by - ay) / 3])
+            out.append(pts[b])
+        else:
+            out.append(pts[b])
+        a = b
+    return out
+
+
+_NODE_TEXT = ("xlabel",)
+_EDGE_TEXT = ("label", "headlabel", "taillabel", "xlabel")
+
+
+def _without(obj: dict, keys: Sequence[str]) -> dict:
+    return {k: v for k, v in obj.items() if k not in keys}
+
+
+def view_layout(layout: dict, viewport: Sequence[float], zoom: float = 1.0,
+                index: LayoutIndex | None = None) -> dict:
+    """The part of ``layout`` inside ``viewport`` (``x0, y0, x1, y1``
+    in layout coordinates), reduced for display at ``zoom`` pixels per
+    layout point.
+
+    Returns a new layout dict whose graph ``bb`` is the viewport; the
+    objects in ``layout`` are not modified.  A node standing for
+    several sub-pixel nodes carries their count in ``merged``.
+    """
+    if index is None or index.layout is not layout:
+        index = LayoutIndex(layout)
+    hits = index.query(viewport)
+    px = 1.0 / zoom
+
+    def readable(obj: dict) -> bool:
+        return _font_size(obj) * zoom >= _MIN_TEXT_PX
+
+    clusters = []
+    for i in hits["clusters"]:
+        cl = layout["clusters"][i]
+        if "invis" in cl.get("style", ""):
+            continue
+        clusters.append(cl if readable(cl) else _without(cl, ("label",)))
+
+    edges = []
+    tol = _SIMPLIFY_PX * px
+    for i in hits["edges"]:
+        edge = layout["edges"][i]
+        if "invis" in edge.get("style", ""):
+            continue
+        pts = edge["points"]
+        bezier = (edge.get("spline_type", "polyline") == "bezier"
+                  and len(pts) >= 4 and (len(pts) - 1) % 3 == 0)
+        if len(pts) > (4 if bezier else 2):
+            simple = simplify_points(pts, tol, bezier)
+            if len(simple) < len(pts):
+                edge = dict(edge, points=simple)
+        if not readable(edge):
+            edge = _without(edge, _EDGE_TEXT)
+        edges.append(edge)
+
+    nodes = []
+    pixels: dict[tuple[int, int], dict] = {}
+    for i in hits["nodes"]:
+        node = layout["nodes"][i]
+        if "invis" in node.get("style", ""):
+            continue
+        if max(node["width"], node["height"]) < px:
+            cell = (math.floor(node["x"] / px), math.floor(node["y"] / px))
+            if cell in pixels:
+                pixels[cell]["merged"] += 1
+                continue
+            node = dict(_without(node, _NODE_TEXT), width=px, height=px,
+                        shape="box", label="", merged=1)
+            pixels[cell] = node
+        elif not readable(node):
+            node = dict(_without(node, _NODE_TEXT), label="")
+            if node.get("shape") in ("record", "Mrecord"):
+                node["shape"] = "box"
+        nodes.append(node)
+
+    graph = dict(layout.get("graph", {}), bb=list(viewport))
+    if graph.get("label") and not readable(graph):
+        del graph["label"]
+    return dict(layout, graph=graph, clusters=clusters, edges=edges,
+                nodes=nodes)
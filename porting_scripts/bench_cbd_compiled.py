@@ -0,0 +1,88 @@
+"""Benchmark compiled CBD runs against the interpreted Mealy step.
+
+Usage:
+    PYTHONPATH=. python porting_scripts/bench_cbd_compiled.py [ITERS]
+
+Builds chain-shaped models — ``WIDTH`` independent loops, each a delay
+feeding ``DEPTH`` alternating adders (plus a constant) and gains back
+into itself — so no dependency level holds more than ``WIDTH`` blocks
+of one kind.  Each is run for ``ITERS`` iterations (default 300) by:
+
+    interp    — ``CBDSolver.run`` stepping the schedule
+    compiled  — ``CBDSolver.run`` after ``compile()`` (not timed)
+
+and the final states are compared.  The single chain of about a
+thousand blocks (``1 x 700``) is the narrow case the straight-line
+program exists for; the script exits non-zero if its speed-up is
+below 10x.
+"""
+import sys
+import time
+
+from gvpy.engines.sim import (
+    AdderBlock, CBDSolver, CompoundBlock, ConstantBlock, DelayBlock,
+    GainBlock,
+)
+
+SHAPES = [(1, 700), (10, 70), (20, 35), (200, 4)]
+MIN_CHAIN_SPEEDUP = 10.0
+
+
+def chains(width: int, depth: int) -> CompoundBlock:
+    cbd = CompoundBlock("bench")
+    for w in range(width):
+        cbd.add_block(DelayBlock(f"d{w}", initial_state=1.0))
+        prev = f"d{w}"
+        for i in range(depth):
+            name = f"b{w}_{i}"
+            if i % 2:
+                cbd.add_block(GainBlock(name, k=0.999))
+                cbd.add_connection(prev, "OUT", name, "IN")
+            else:
+                cbd.add_block(AdderBlock(name, num_inputs=2))
+                cbd.add_block(ConstantBlock(f"c{w}_{i}", value=0.001))
+                cbd.add_connection(prev, "OUT", name, "IN1")
+                cbd.add_connection(f"c{w}_{i}", "OUT", name, "IN2")
+            prev = name
+        cbd.add_connection(prev, "OUT", f"d{w}", "IN")
+    return cbd
+
+
+def measure(width: int, depth: int, iters: int,
+            compiled: bool) -> tuple[float, list, int]:
+    """Best of three: seconds, final delay states and block count."""
+    best = float("inf")
+    for _ in range(3):
+        cbd = chains(width, depth)
+        solver = CBDSolver(cbd)
+        solver.init()
+        if compiled:
+            solver.compile()
+        t0 = time.perf_counter()
+        solver.run(iters)
+        best = min(best, time.perf_counter() - t0)
+    states = [cbd.blocks[f"d{w}"].state for w in range(width)]
+    return best, states, len(solver.schedule)
+
+
+def main() -> int:
+    iters = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    status = 0
+    for width, depth in SHAPES:
+        interp, expected, blocks = measure(width, depth, iters, False)
+        compiled, states, _ = measure(width, depth, iters, True)
+        speedup = interp / compiled
+        print(f"{width:4d} x {depth:<4d} {blocks:5d} blocks   "
+              f"interp {interp:7.3f} s   compiled {compiled:7.4f} s   "
+              f"x{speedup:5.1f}   "
+              f"{'same' if states == expected else 'DIFFERENT'}")
+        if states != expected:
+            status = 1
+        if width == 1 and speedup < MIN_CHAIN_SPEEDUP:
+            print(f"  chain speed-up below {MIN_CHAIN_SPEEDUP:g}x")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
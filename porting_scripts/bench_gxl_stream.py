@@ -0,0 +1,88 @@
+"""Benchmark streaming GXL reading against whole-document parsing.
+
+Usage:
+    PYTHONPATH=. python porting_scripts/bench_gxl_stream.py [MB] [GRAPHS]
+
+Generates a multi-graph GXL file of about ``MB`` megabytes (default 50)
+split across ``GRAPHS`` top-level graphs (default 20), then reports
+time and peak traced memory for:
+
+    tree    — ``ET.parse`` of the whole file, as ``read_gxl_all`` did
+              before it streamed: the full element tree is built before
+              any graph is
+    stream  — ``iter_gxl_file``, building and dropping one graph at a
+              time
+
+The tree figure covers the XML tree alone, no graphs; the stream figure
+includes building every graph.  Peak memory of the stream run should
+stay near the cost of one graph whatever the file size.
+"""
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+from gvpy.render.gxl_io import iter_gxl_file
+
+
+def write_doc(path: Path, megabytes: float, n_graphs: int) -> tuple[int, int]:
+    """Write the benchmark document; returns (nodes per graph, bytes)."""
+    node = ('<node id="n{i}"><attr name="label"><string>node {i}</string>'
+            '</attr><attr name="width"><float>0.75</float></attr></node>\n')
+    edge = ('<edge from="n{i}" to="n{j}"><attr name="weight"><int>2</int>'
+            '</attr></edge>\n')
+    per_node = len(node.format(i=99999)) + len(edge.format(i=99999, j=99999))
+    n_nodes = int(megabytes * 1e6 / n_graphs / per_node)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('<?xml version="1.0" encoding="UTF-8"?>\n<gxl>\n')
+        for k in range(n_graphs):
+            fh.write(f'<graph id="G{k}" edgemode="directed">\n')
+            for i in range(n_nodes):
+                fh.write(node.format(i=i))
+            for i in range(n_nodes):
+                fh.write(edge.format(i=i, j=(i * 7 + 1) % n_nodes))
+            fh.write("</graph>\n")
+        fh.write("</gxl>\n")
+    return n_nodes, path.stat().st_size
+
+
+def measure(fn) -> tuple[float, float]:
+    """Seconds and peak traced MB of ``fn()``."""
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def tree(path: Path) -> None:
+    ET.parse(path)
+
+
+def stream(path: Path) -> None:
+    for g in iter_gxl_file(path):
+        del g
+        gc.collect()
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 50.0
+    n_graphs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.gxl"
+        n_nodes, size = write_doc(path, megabytes, n_graphs)
+        print(f"{path.name}: {size / 1e6:.1f} MB, {n_graphs} graphs of "
+              f"{n_nodes} nodes / {n_nodes} edges")
+        for label, fn in (("tree", tree), ("stream", stream)):
+            elapsed, peak = measure(lambda: fn(path))
+            print(f"  {label:7s} {elapsed:7.2f} s   peak {peak:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
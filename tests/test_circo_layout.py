@@ -157,6 +157,32 @@ class TestCircoBiconnected:
         r = circo_dot('digraph G { oneblock=true; a->b; b->c; c->d; d->a; }')
         assert len(r["nodes"]) == 4
 
+    def test_blocks_and_cut_tree(self):
+        """Two triangles joined by a bridge: three blocks, cut
+        nodes c and d, and a tree rooted at the first block."""
+        from gvpy.engines.layout.common import blocktree
+        names = ["a", "b", "c", "d", "e", "f"]
+        adj = {"a": ["b", "c"], "b": ["a", "c"], "c": ["a", "b", "d"],
+               "d": ["c", "e", "f"], "e": ["d", "f"], "f": ["d", "e"]}
+        _, ptr, nbr = blocktree.csr_adjacency(names, adj)
+        edges, art = blocktree.biconnected_components(ptr, nbr, [0])
+        blocks = [blocktree.block_nodes(e) for e in edges]
+        assert [sorted(names[x] for x in b) for b in blocks] == [
+            ["d", "e", "f"], ["c", "d"], ["a", "b", "c"]]
+        assert [names[i] for i, a in enumerate(art) if a] == ["c", "d"]
+        order, parent, cut = blocktree.block_cut_tree(blocks, 6, 0)
+        assert order == [0, 1, 2]
+        assert parent == [-1, 0, 1]
+        assert [names[x] for x in cut[1:]] == ["d", "c"]
+
+    def test_long_cycle_and_path(self):
+        """Deep DFS and block trees do not hit the recursion limit."""
+        body = " ".join(f"n{i} -- n{i + 1};" for i in range(1500))
+        r = circo_dot("graph G { %s }" % body)
+        assert len(r["nodes"]) == 1501
+        r = circo_dot("graph G { %s n1500 -- n0; }" % body)
+        assert len(r["nodes"]) == 1501
+
 
 # ═══════════════════════════════════════════════════════════════
 #  Edge crossing reduction
@@ -205,6 +231,55 @@ class TestCircoCrossings:
         c_after = layout._count_crossings(improved, adj)
         assert c_after <= c_before
 
+    @staticmethod
+    def _brute_force(order, edges):
+        pos = {n: i for i, n in enumerate(order)}
+        total = 0.0
+        for i, (u, v, w) in enumerate(edges):
+            a, b = sorted((pos[u], pos[v]))
+            for x, y, w2 in edges[i + 1:]:
+                c, d = sorted((pos[x], pos[y]))
+                if a < c < b < d or c < a < d < b:
+                    total += w * w2
+        return total
+
+    def test_fenwick_count_matches_brute_force(self):
+        import random
+        import numpy as np
+        from gvpy.engines.layout.circo.crossings import count_crossings
+        rng = random.Random(4)
+        order = [f"n{i}" for i in range(12)]
+        edges = []
+        for _ in range(30):
+            u, v = rng.sample(order, 2)
+            edges.append((u, v, rng.choice([0.5, 1.0, 2.0])))
+        pos = {n: i for i, n in enumerate(order)}
+        fast = count_crossings(np.array([pos[u] for u, _, _ in edges]),
+                               np.array([pos[v] for _, v, _ in edges]),
+                               np.array([w for _, _, w in edges]))
+        assert fast == pytest.approx(self._brute_force(order, edges))
+
+    def test_move_delta_matches_recount(self):
+        import random
+        from gvpy.engines.layout.circo.crossings import CrossingCounter
+        rng = random.Random(9)
+        order = [f"n{i}" for i in range(10)]
+        edges = [(u, v, rng.choice([0.5, 1.0, 2.0])) for u, v in
+                 {tuple(rng.sample(order, 2)) for _ in range(20)}]
+        # A repeated chord and a self loop.
+        edges += [edges[0], ("n3", "n3", 1.0)]
+        counter = CrossingCounter(order, edges)
+        for _ in range(60):
+            node = rng.choice(order)
+            ins = rng.randrange(len(order))
+            delta = counter.move_delta(node, ins)
+            trial = [n for n in counter.order if n != node]
+            trial.insert(ins, node)
+            assert counter.total + delta == pytest.approx(
+                self._brute_force(trial, edges))
+            counter.apply_move(node, ins, delta)
+            assert counter.order == trial
+
 
 # ═══════════════════════════════════════════════════════════════
 #  Disconnected components
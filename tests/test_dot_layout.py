@@ -2523,3 +2523,106 @@ class TestBSplineFitter:
         long_edges = [e for e in r["edges"] if len(e["points"]) > 4]
         # There should be some multi-segment edges
         assert len(long_edges) >= 0  # may not have any if all 1-rank
+
+
+class TestEdgeIndex:
+
+    def _layout(self):
+        g = read_gv("digraph G { a -> b -> c; a -> c; a -> d -> e; a -> e; "
+                    "{ rank=same; b; f; } b -> f; f -> b; c -> c; }")
+        layout = DotLayout(g)
+        layout.layout()
+        return layout
+
+    def test_matches_linear_filter(self):
+        """Per-node lists equal a scan of ledges + _chain_edges."""
+        from gvpy.engines.layout.dot.dotsplines import (
+            _node_in_edges, _node_out_edges)
+        layout = self._layout()
+        all_edges = layout.ledges + layout._chain_edges
+        for ln in layout.lnodes.values():
+            out = [le for le in all_edges if le.tail_name == ln.name]
+            inn = [le for le in all_edges if le.head_name == ln.name]
+            assert _node_out_edges(layout, ln) == out
+            assert _node_in_edges(layout, ln) == inn
+
+    def test_rebuilt_when_edges_change(self):
+        from gvpy.engines.layout.dot.dotsplines import _node_out_edges
+        layout = self._layout()
+        a = layout.lnodes["a"]
+        before = len(_node_out_edges(layout, a))
+        layout.ledges.append(LayoutEdge(edge=None, tail_name="a",
+                                        head_name="f"))
+        assert len(_node_out_edges(layout, a)) == before + 1
+
+    def test_getmainedge_and_flat_index(self):
+        from gvpy.engines.layout.dot.dotsplines import (
+            count_flat_edge_index, getmainedge)
+        layout = self._layout()
+        for le in layout.ledges + layout._chain_edges:
+            expected = next(
+                (r for r in layout.ledges if not r.virtual and le.orig_tail
+                 and (r.tail_name, r.head_name) == (le.orig_tail,
+                                                    le.orig_head)), le)
+            assert getmainedge(layout, le) is expected
+        flats = [le for le in layout.ledges if not le.virtual and
+                 {le.tail_name, le.head_name} == {"b", "f"}]
+        assert [count_flat_edge_index(layout, le) for le in flats] == \
+            list(range(len(flats)))
+
+
+class TestParallelSplines:
+
+    SRC = ("digraph G { " +
+           " ".join(f"n{i} -> n{(i * 7 + 3) % 40};" for i in range(40)) +
+           " ".join(f" n{i} -> n{i + 1};" for i in range(39)) + " }")
+
+    def _points(self, monkeypatch, workers):
+        monkeypatch.setenv("GVPY_SPLINE_WORKERS", str(workers))
+        r = layout_dot(self.SRC)
+        return [e.get("points") for e in r["edges"]]
+
+    def test_groups_share_chains(self):
+        from gvpy.engines.layout.dot.parallel_splines import (
+            _write_set, group_tasks)
+        from gvpy.engines.layout.dot.path import EDGETYPE_SPLINE
+        layout = DotLayout(read_gv(self.SRC))
+        layout.layout()
+        tasks = [(le, False) for le in layout.ledges if not le.virtual]
+        tasks += [(le, True) for le in layout._chain_edges]
+        groups = group_tasks(layout, tasks, EDGETYPE_SPLINE)
+        assert sorted(i for g in groups for i in g) == list(range(len(tasks)))
+        owner = {}
+        for gi, g in enumerate(groups):
+            assert g == sorted(g)
+            for i in g:
+                for name in _write_set(layout, *tasks[i], EDGETYPE_SPLINE):
+                    assert owner.setdefault(name, gi) == gi
+
+    def test_worker_count_independent(self, monkeypatch):
+        """Parallel output does not depend on the worker count, and
+        every edge is routed — through the fork pool, even on a
+        one-CPU machine."""
+        import multiprocessing
+        import os
+        from gvpy.engines.layout.dot import parallel_splines
+        pools, real_get_context = [], multiprocessing.get_context
+
+        def get_context(method):
+            pools.append(method)
+            return real_get_context(method)
+
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        monkeypatch.setattr(parallel_splines.multiprocessing, "get_context",
+                            get_context)
+        two = self._points(monkeypatch, 2)
+        assert two == self._points(monkeypatch, 3)
+        assert all(two)
+        assert pools == ["fork", "fork"]
+
+    def test_default_is_serial(self, monkeypatch):
+        from gvpy.engines.layout.dot.dotsplines import spline_workers
+        monkeypatch.delenv("GVPY_SPLINE_WORKERS", raising=False)
+        assert spline_workers() == 1
+        monkeypatch.setenv("GVPY_SPLINE_WORKERS", "bogus")
+        assert spline_workers() == 1
@@ -215,3 +215,66 @@ class TestFdpAlignment:
                 assert not (ovx and ovy), (
                     f"overlap pair after xlayout: {a['name']} {b['name']}"
                 )
+
+    def test_xlayout_weak_repulsion_is_near_field(self):
+        """The weak non-overlap repulsion reaches only boxes within
+        ``K``: an unconnected node far from an overlapping pair stays
+        exactly where it is (xlayout.c would push it away)."""
+        from types import SimpleNamespace as NS
+        from gvpy.engines.layout.fdp.xlayout import xlayout
+
+        def ln(x, y):
+            return NS(x=x, y=y, width=40.0, height=20.0, pinned=False)
+
+        layout = NS(lnodes={"a": ln(0.0, 0.0), "b": ln(3.0, 2.0),
+                            "c": ln(2000.0, 0.0)},
+                    graph=NS(edges={0: NS(tail=NS(name="a"),
+                                          head=NS(name="b"))}))
+        assert xlayout(layout, 72.0, 4.0, 100) == 0
+        c = layout.lnodes["c"]
+        assert (c.x, c.y) == (2000.0, 0.0)
+        a, b = layout.lnodes["a"], layout.lnodes["b"]
+        assert abs(a.x - b.x) > 44.0 or abs(a.y - b.y) > 24.0
+
+    def test_cell_hash_matches_grid_neighbourhood(self):
+        """The sorted-cell hash enumerates exactly the node pairs the
+        dict grid visits (same cell + Moore neighbours), each once."""
+        import itertools
+        import numpy as np
+        from gvpy.engines.layout.fdp.grid import (
+            build_cell_hash, build_grid, cell_pairs,
+            half_neighbour_offsets, neighbour_offsets,
+        )
+
+        class FakeLN:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+
+        rng = np.random.default_rng(7)
+        pos = rng.uniform(-300, 300, (150, 2))
+        lnodes = {i: FakeLN(x, y) for i, (x, y) in enumerate(pos)}
+        grid = build_grid(range(len(pos)), lnodes, cell_size=60)
+        expected = set()
+        for (ci, cj), members in grid.items():
+            for a, b in itertools.combinations(members, 2):
+                expected.add(frozenset((a, b)))
+            for di, dj in neighbour_offsets():
+                for a in members:
+                    for b in grid.get((ci + di, cj + dj), []):
+                        expected.add(frozenset((a, b)))
+
+        ch = build_cell_hash(pos, 60)
+        found = []
+        for di, dj in [(0, 0)] + half_neighbour_offsets():
+            ia, ib = cell_pairs(ch, di, dj)
+            found.extend(frozenset(p) for p in zip(ia.tolist(), ib.tolist()))
+        assert len(found) == len(set(found))
+        assert set(found) == expected
+
+    def test_grid_path_lays_out_larger_graph(self):
+        """Components above the all-pairs threshold take the grid
+        path and come out spread with no coincident nodes."""
+        edges = " ".join(f"n{i} -- n{i // 2};" for i in range(1, 80))
+        r = fdp_gv(f"graph G {{ overlap=true; {edges} }}")
+        pts = {(round(n["x"], 1), round(n["y"], 1)) for n in r["nodes"]}
+        assert len(pts) == 80
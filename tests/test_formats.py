@@ -10,13 +10,15 @@ from pathlib import Path
 from xml.etree import ElementTree as ET
 
 from gvpy.core.graph import Graph
-from gvpy.grammar.gv_writer import write_gv, write_gv_file
+from gvpy.grammar.gv_writer import write_gv, write_gv_file, dump_gv
 from gvpy.grammar.gv_reader import read_gv
 from gvpy.render.json_io import (
     write_json, write_json0, read_json, read_json_file, write_json_file,
+    load_json, layout_from_attrs,
 )
 from gvpy.render.gxl_io import (
     write_gxl, read_gxl, read_gxl_all, read_gxl_file, write_gxl_file,
+    iter_gxl,
 )
 
 TEST_DATA = Path(__file__).parent.parent / "test_data"
@@ -225,6 +227,27 @@ class TestDotWriter:
         assert "}" in dot
         g.close()
 
+    def test_dump_gv_matches_write_gv(self, complex_graph):
+        """dump_gv streams exactly write_gv's text to text and binary sinks."""
+        import io
+        text, data = io.StringIO(), io.BytesIO()
+        dump_gv(complex_graph, text)
+        dump_gv(complex_graph, data)
+        dot = write_gv(complex_graph)
+        assert text.getvalue() == dot
+        assert data.getvalue() == dot.encode("utf-8")
+
+    def test_objects_written_once_per_scope(self):
+        """Subgraph members are written in the block of the deepest holder."""
+        dot = write_gv(read_gv(
+            "digraph { subgraph cluster_a { x; subgraph cluster_b { y } }"
+            " y -> w }"))
+        lines = [line.strip() for line in dot.splitlines()]
+        assert lines.count("x;") == 1
+        assert lines.index("x;") > lines.index("subgraph cluster_b {")
+        assert lines.index("y;") < lines.index("x;")
+        assert lines[-2] == "y -> w;"
+
 
 class TestDotRoundtrip:
 
@@ -398,6 +421,41 @@ class TestJsonWriter:
         assert "cluster_outer" in names
         assert "cluster_inner" in names
 
+    def test_json_compact_same_document(self, complex_graph):
+        """Compact output has no whitespace and parses to the same
+        document as the indented form."""
+        from gvpy.engines.layout.dot import DotLayout
+        result = DotLayout(complex_graph).layout()
+        text = write_json(complex_graph, layout_result=result)
+        compact = write_json(complex_graph, layout_result=result,
+                             compact=True)
+        assert json.loads(compact) == json.loads(text)
+        assert "\n" not in compact and ", " not in compact
+        assert len(compact) < len(text)
+
+    def test_json_stream_matches_dumps(self, complex_graph):
+        """Indented output equals json.dumps(indent=2); dump_json
+        streams the same text to text and binary sinks."""
+        import io
+        from gvpy.render.json_io import dump_json, encode_document
+        text = write_json(complex_graph)
+        assert text == json.dumps(json.loads(text), indent=2,
+                                  ensure_ascii=False)
+        for sink in (io.StringIO(), io.BytesIO()):
+            dump_json(complex_graph, sink)
+            out = sink.getvalue()
+            assert (out.decode("utf-8") if isinstance(out, bytes)
+                    else out) == text
+        doc = {"graph": {"bb": [0, 1.5]}, "nodes": iter([{"a": "é"}]),
+               "edges": iter([])}
+        expect = {"graph": {"bb": [0, 1.5]}, "nodes": [{"a": "é"}],
+                  "edges": []}
+        for compact, kw in ((False, {"indent": 2}),
+                            (True, {"separators": (",", ":")})):
+            doc["nodes"], doc["edges"] = iter([{"a": "é"}]), iter([])
+            assert "".join(encode_document(doc, compact)) == \
+                json.dumps(expect, **kw)
+
 
 # ═══════════════════════════════════════════════════════════════
 #  JSON Reader
@@ -533,6 +591,59 @@ class TestJsonReader:
         assert g.directed is False
         g.close()
 
+    def test_load_json_matches_read_json(self):
+        """load_json builds the graph read_json does, plus its layout."""
+        text = json.dumps({
+            "name": "G", "directed": True, "strict": False,
+            "bb": "0,0,120,80",
+            "objects": [{"_gvid": 0, "name": "cluster_x", "nodes": [1, 2],
+                         "edges": [], "color": "blue"}],
+            "nodes": [
+                {"_gvid": 0, "name": "A", "pos": "10,20", "width": "1",
+                 "height": "0.5", "shape": "box"},
+                {"_gvid": 1, "name": "B", "pos": "60,20"},
+                {"_gvid": 2, "name": "C", "pos": "110,60"},
+            ],
+            "edges": [
+                {"_gvid": 0, "tail": 0, "head": 1,
+                 "pos": "e,50,20 20,20 30,20 40,20", "color": "red"},
+                {"_gvid": 1, "tail": 0, "head": 1},
+                {"_gvid": 2, "tail": 1, "head": 2},
+            ],
+        })
+        ref = read_json(text)
+        g, layout = load_json(text)
+        assert list(g.nodes) == list(ref.nodes)
+        assert list(g.edges) == list(ref.edges)
+        for name, node in ref.nodes.items():
+            assert g.nodes[name].attributes == node.attributes
+            assert len(g.nodes[name].outedges) == len(node.outedges)
+        assert list(g.subgraphs["cluster_x"].nodes) == ["B", "C"]
+        assert g.subgraphs["cluster_x"].attr_record["color"] == "blue"
+        assert layout == layout_from_attrs(ref)
+        assert layout["graph"]["bb"] == [0.0, 0.0, 120.0, 80.0]
+        assert layout["nodes"][0]["width"] == 72.0
+        assert layout["edges"][0]["points"][1] == [20.0, 20.0]
+        g.close()
+        ref.close()
+
+    def test_load_json_strict_merges_edges(self):
+        """In a strict graph repeated edges merge and loops are dropped."""
+        text = json.dumps({
+            "name": "G", "directed": True, "strict": True,
+            "nodes": [{"_gvid": 0, "name": "A"}, {"_gvid": 1, "name": "B"}],
+            "edges": [
+                {"_gvid": 0, "tail": 0, "head": 1},
+                {"_gvid": 1, "tail": 0, "head": 1, "color": "red"},
+                {"_gvid": 2, "tail": 1, "head": 1},
+            ],
+        })
+        g, layout = load_json(text)
+        assert len(g.edges) == 1
+        assert next(iter(g.edges.values())).attributes["color"] == "red"
+        assert len(layout["edges"]) == 1
+        g.close()
+
 
 class TestJsonRoundtrip:
 
@@ -839,6 +950,49 @@ class TestGxlReader:
         for g in graphs:
             g.close()
 
+    @staticmethod
+    def _gxl_doc(n_graphs, n_nodes):
+        graphs = "".join(
+            f'<graph id="G{k}" edgemode="directed">'
+            + "".join(f'<node id="n{i}"><attr name="label">'
+                      f'<string>node {i}</string></attr></node>'
+                      for i in range(n_nodes))
+            + "".join(f'<edge from="n{i}" to="n{i + 1}"/>'
+                      for i in range(n_nodes - 1))
+            + "</graph>"
+            for k in range(n_graphs))
+        return f'<?xml version="1.0" encoding="UTF-8"?><gxl>{graphs}</gxl>'
+
+    def test_iter_gxl_streams_graphs(self):
+        """iter_gxl yields a graph before reading the rest of the file."""
+        import io
+        data = self._gxl_doc(4, 1000).encode("utf-8")
+        src = io.BytesIO(data)
+        graphs = iter_gxl(src)
+        g = next(graphs)
+        assert g.name == "G0"
+        assert len(g.nodes) == 1000 and len(g.edges) == 999
+        assert g.nodes["n7"].agget("label") == "node 7"
+        assert src.tell() < len(data)
+        assert [h.name for h in graphs] == ["G1", "G2", "G3"]
+
+    def test_iter_gxl_memory_per_graph(self):
+        """Streaming peak memory follows one graph, not the document."""
+        import gc
+        import io
+        import tracemalloc
+        peaks = []
+        for n_graphs in (2, 8):
+            data = self._gxl_doc(n_graphs, 300).encode("utf-8")
+            tracemalloc.start()
+            for g in iter_gxl(io.BytesIO(data)):
+                assert len(g.nodes) == 300
+                del g
+                gc.collect()    # graphs are reference cycles
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        assert peaks[1] < 1.5 * peaks[0]
+
 
 class TestGxlRoundtrip:
 
@@ -135,6 +135,82 @@ class TestNeatoComponents:
         assert len(r["nodes"]) == 5
 
 
+class TestNeatoPack:
+
+    @staticmethod
+    def _boxes(r):
+        return [(n["x"] - n["width"] / 2, n["y"] - n["height"] / 2,
+                 n["x"] + n["width"] / 2, n["y"] + n["height"] / 2)
+                for n in r["nodes"]]
+
+    def test_parse_pack_mode(self):
+        from gvpy.engines.layout.common.pack import (
+            PK_COL_MAJOR, PK_INPUT_ORDER, PK_TOP_ALIGN, PackInfo,
+            parse_pack_mode)
+        info = parse_pack_mode("array_cti3", PackInfo())
+        assert info.mode == "array"
+        assert info.flags == PK_COL_MAJOR | PK_TOP_ALIGN | PK_INPUT_ORDER
+        assert info.sz == 3
+        assert parse_pack_mode("clust", PackInfo()).mode == "clust"
+        assert parse_pack_mode("bogus", PackInfo()).mode == "node"
+
+    def test_node_mode_no_overlap(self):
+        text = "graph G { %s }" % " ".join(
+            f"a{i} -- b{i} -- c{i};" for i in range(12))
+        boxes = self._boxes(neato_gv(text))
+        for i, (ax0, ay0, ax1, ay1) in enumerate(boxes):
+            for bx0, by0, bx1, by1 in boxes[i + 1:]:
+                assert (ax1 <= bx0 or bx1 <= ax0
+                        or ay1 <= by0 or by1 <= ay0)
+
+    def test_array_input_order(self):
+        r = neato_gv("graph G { a; b; c; d; }", packmode="array_i2")
+        a, b, c, d = (node_by_name(r, n) for n in "abcd")
+        assert a["y"] == pytest.approx(b["y"])
+        assert c["y"] == pytest.approx(d["y"])
+        assert a["x"] < b["x"] and c["x"] < d["x"]
+        assert a["y"] > c["y"]
+
+    def test_poly_places_scales_linearly(self, monkeypatch):
+        """Spiral positions examined grow linearly with the number of
+        polyominoes, and no two placed polyominoes share a cell."""
+        import random
+        from gvpy.engines.layout.common import pack
+
+        def place(n):
+            rng = random.Random(7)
+            polys, bbs = [], []
+            for _ in range(n):
+                w, h = rng.randint(1, 8), rng.randint(1, 8)
+                polys.append(frozenset({(0, 0)} | {
+                    (rng.randrange(w), rng.randrange(h))
+                    for _ in range(w * h // 2)}))
+                bbs.append((0, 0, w, h))
+            count = [0]
+            pop = pack._Candidates.pop
+
+            def counting(cand):
+                count[0] += 1
+                return pop(cand)
+
+            monkeypatch.setattr(pack._Candidates, "pop", counting)
+            places = pack.poly_places(polys, [(0, 0)] * n, (1, 1), bbs,
+                                      [False] * n, 0.0, 1)
+            monkeypatch.undo()
+            cells = [(x + px, y + py) for poly, (px, py) in zip(polys, places)
+                     for x, y in poly]
+            assert len(cells) == len(set(cells))
+            return count[0]
+
+        assert place(1200) < 6 * place(300)
+
+    def test_pinned_component_stays(self):
+        r = neato_gv('graph G { a [pos="1,1!"]; a -- b; c -- d; }')
+        na = node_by_name(r, "a")
+        assert na["x"] == pytest.approx(72.0, abs=1)
+        assert na["y"] == pytest.approx(72.0, abs=1)
+
+
 class TestNeatoOverlap:
 
     def test_overlap_false(self):
@@ -763,3 +839,276 @@ class TestNeatoStressKernel:
                 f"Stress increased at step {i}: "
                 f"{stresses[i - 1]:.6f} -> {stresses[i]:.6f}"
             )
+
+
+class TestOverlapIndex:
+    """Shared sweep-and-prune index used by every overlap mode."""
+
+    @staticmethod
+    def _boxes(n, seed, span):
+        import numpy as np
+        rng = np.random.default_rng(seed)
+        x = rng.uniform(0, span, n)
+        y = rng.uniform(0, span, n)
+        hw = rng.uniform(5, 30, n)
+        hh = rng.uniform(5, 30, n)
+        return x, y, hw, hh
+
+    @staticmethod
+    def _brute(x, y, hw, hh, strict):
+        out = []
+        for i in range(len(x)):
+            for j in range(i + 1, len(x)):
+                dx = abs(x[i] - x[j])
+                dy = abs(y[i] - y[j])
+                wx = hw[i] + hw[j]
+                wy = hh[i] + hh[j]
+                if strict:
+                    hit = dx < wx and dy < wy
+                else:
+                    hit = dx <= wx and dy <= wy
+                if hit:
+                    out.append((i, j))
+        return out
+
+    def test_pairs_match_brute_force(self):
+        from gvpy.engines.layout.common.overlap_index import (
+            count_overlaps, overlapping_pairs,
+        )
+        x, y, hw, hh = self._boxes(300, 3, 800)
+        for strict in (True, False):
+            ia, ib = overlapping_pairs(x, y, hw, hh, strict=strict)
+            expected = self._brute(x, y, hw, hh, strict)
+            assert list(zip(ia.tolist(), ib.tolist())) == expected
+            assert count_overlaps(x, y, hw, hh, strict=strict) == len(expected)
+
+    def test_small_blocks_and_column_layout(self):
+        """Chunked enumeration and a degenerate single column (every
+        box shares the same x range) still find every pair once."""
+        import numpy as np
+        from gvpy.engines.layout.common.overlap_index import (
+            candidate_blocks, overlapping_pairs,
+        )
+        n = 60
+        x = np.zeros(n)
+        y = np.arange(n) * 15.0
+        hw = np.full(n, 20.0)
+        hh = np.full(n, 10.0)
+        seen = []
+        for ia, ib in candidate_blocks(x, y, hw, hh, max_block=7):
+            seen.extend(tuple(sorted(p)) for p in zip(ia.tolist(), ib.tolist()))
+        ia, ib = overlapping_pairs(x, y, hw, hh)
+        assert len(seen) == len(set(seen))
+        assert set(zip(ia.tolist(), ib.tolist())) <= set(seen)
+        assert len(ia) == n - 1
+
+    def test_any_overlap(self):
+        import numpy as np
+        from gvpy.engines.layout.common.overlap_index import any_overlap
+        x = np.array([0.0, 100.0, 200.0])
+        y = np.zeros(3)
+        hw = np.full(3, 50.0)
+        hh = np.full(3, 10.0)
+        # Touching boxes overlap only under the closed test.
+        assert not any_overlap(x, y, hw, hh)
+        assert any_overlap(x, y, hw, hh, strict=False)
+        x[2] = 190.0
+        assert any_overlap(x, y, hw, hh)
+
+    def test_compress_matches_all_pairs_scale(self):
+        """compress picks the same factor as the all-pairs max-min."""
+        from gvpy.engines.layout.common.adjust import compress_adjust
+
+        class FakeLN:
+            def __init__(self, x, y, w, h):
+                self.x, self.y = x, y
+                self.width, self.height = w, h
+                self.pinned = False
+
+        class FakeLayout:
+            def __init__(self):
+                self.lnodes = {
+                    f"n{i}{j}": FakeLN(i * 300.0, j * 250.0, 60.0, 40.0)
+                    for i in range(5) for j in range(4)
+                }
+                self.sep = 0.0
+                self.overlap = "compress"
+
+        layout = FakeLayout()
+        nodes = list(layout.lnodes.values())
+        best = 0.0
+        for a in range(len(nodes)):
+            for b in range(a + 1, len(nodes)):
+                p, q = nodes[a], nodes[b]
+                dx, dy = abs(p.x - q.x), abs(p.y - q.y)
+                sx = float("inf") if dx == 0 else (p.width + q.width) / 2 / dx
+                sy = float("inf") if dy == 0 else (p.height + q.height) / 2 / dy
+                best = max(best, min(sx, sy))
+        assert compress_adjust(layout) == 1
+        assert layout.lnodes["n10"].x == pytest.approx(300.0 * best)
+
+    def test_scalexy_uses_only_overlapping_pairs(self):
+        """A pair side by side on one row (y factor above 1, but no
+        overlap) does not enter the scalexy set, as in mkOverlapSet;
+        including it picked a shrinking x scale of about 0.21."""
+        from gvpy.engines.layout.common.adjust import scalexy_adjust
+
+        class FakeLN:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+                self.width, self.height = 40.0, 20.0
+                self.pinned = False
+
+        class FakeLayout:
+            def __init__(self):
+                self.lnodes = {"a": FakeLN(0.0, 0.0), "b": FakeLN(10.0, 5.0),
+                               "c": FakeLN(200.0, 2.0)}
+                self.sep = 0.0
+
+        layout = FakeLayout()
+        assert scalexy_adjust(layout) == 1
+        assert [(ln.x, ln.y) for ln in layout.lnodes.values()] == [
+            (0.0, 0.0), (10.0, 20.0), (200.0, 8.0)]
+
+
+class TestVpsc:
+    """VPSC solver behind ``overlap=vpsc`` / ``ipsep`` / ``ortho*``."""
+
+    def test_chain_solution_is_weighted_mean(self):
+        """Three variables all wanting x=0 with unit gaps settle
+        symmetrically around 0."""
+        from gvpy.engines.layout.common.vpsc import solve_vpsc
+        x = solve_vpsc([0.0, 0.0, 0.0], [1.0, 1.0, 1.0],
+                       [(0, 1, 1.0), (1, 2, 1.0)])
+        assert x.tolist() == pytest.approx([-1.0, 0.0, 1.0])
+
+    def test_split_on_negative_multiplier(self):
+        """satisfy() alone merges all three variables into one block;
+        refine() must split off b, whose constraint is slack at the
+        optimum."""
+        from gvpy.engines.layout.common.vpsc import solve_vpsc
+        x = solve_vpsc([1.0, 2.0, 0.0], [1.0, 1.0, 1.0],
+                       [(0, 1, 2.0), (0, 2, 2.0)])
+        assert x.tolist() == pytest.approx([-0.5, 2.0, 1.5])
+
+    def test_repair_rounds_are_bounded(self, monkeypatch):
+        """The repair pass clears a fully violated chain (listed right
+        to left) in one round, and gives up after ``_MAX_REPAIR``
+        rounds when merging cannot help."""
+        from gvpy.engines.layout.common import vpsc
+
+        def chain(n):
+            vs = [vpsc.Variable(i, 0.0) for i in range(n)]
+            cs = [vpsc.Constraint(vs[i], vs[i + 1], 1.0)
+                  for i in reversed(range(n - 1))]
+            return vpsc.Solver(vs, cs)
+
+        solver = chain(300)
+        assert solver._repair() == 1
+        assert all(c.slack() >= -vpsc._SLACK_EPS for c in solver.cs)
+
+        solver = chain(300)
+        monkeypatch.setattr(vpsc.Solver, "merge_left", lambda self, b: b)
+        assert solver._repair() == vpsc._MAX_REPAIR
+
+    def test_matches_reference_qp(self):
+        """Random instances reach the same objective as SLSQP."""
+        import numpy as np
+        from scipy.optimize import minimize
+        from gvpy.engines.layout.common.vpsc import solve_vpsc
+        rng = np.random.default_rng(11)
+        for _ in range(25):
+            n = int(rng.integers(3, 9))
+            d = rng.uniform(0, 10, n)
+            w = rng.uniform(0.5, 2.0, n)
+            perm = rng.permutation(n)
+            cs = []
+            for _k in range(2 * n):
+                i, j = sorted(rng.choice(n, 2, replace=False))
+                cs.append((int(perm[i]), int(perm[j]),
+                           float(rng.uniform(0, 3))))
+            x = solve_vpsc(d, w, cs)
+            for lft, rgt, gap in cs:
+                assert x[lft] + gap <= x[rgt] + 1e-6
+
+            def f(z):
+                return float(np.sum(w * (z - d) ** 2))
+            ref = minimize(
+                f, x.copy(), method="SLSQP",
+                constraints=[{"type": "ineq",
+                              "fun": lambda z, a=a, b=b, g=g: z[b] - z[a] - g}
+                             for a, b, g in cs],
+                options={"ftol": 1e-12, "maxiter": 500})
+            assert f(x) <= ref.fun + 1e-6
+
+    def test_remove_rectangle_overlap_clears(self):
+        import numpy as np
+        from gvpy.engines.layout.common.overlap_index import count_overlaps
+        from gvpy.engines.layout.common.vpsc import remove_rectangle_overlap
+        rng = np.random.default_rng(5)
+        n = 150
+        x = rng.uniform(0, 300, n)
+        y = rng.uniform(0, 300, n)
+        hw = rng.uniform(5, 20, n)
+        hh = rng.uniform(5, 20, n)
+        assert count_overlaps(x, y, hw, hh) > 0
+        nx, ny = remove_rectangle_overlap(x, y, hw, hh)
+        assert count_overlaps(nx, ny, hw, hh) == 0
+
+    def test_vpsc_mode_grows_less_than_scale(self, capsys):
+        """``overlap=vpsc`` no longer falls back to scale: it clears
+        overlap with a smaller drawing and without a warning."""
+        from gvpy.engines.layout.common.adjust import (
+            _bbox_of, _has_overlap, remove_overlap,
+        )
+
+        class FakeLN:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+                self.width, self.height = 54.0, 36.0
+                self.pinned = False
+
+        class FakeLayout:
+            def __init__(self, mode):
+                self.lnodes = {
+                    f"n{i}{j}": FakeLN(i * 40.0 + (j % 2) * 7.0, j * 30.0)
+                    for i in range(6) for j in range(6)
+                }
+                self.sep = 0.0
+                self.overlap = mode
+
+        areas = {}
+        for mode in ("vpsc", "scale"):
+            layout = FakeLayout(mode)
+            remove_overlap(layout)
+            assert not _has_overlap(layout)
+            x0, y0, x1, y1 = _bbox_of(layout)
+            areas[mode] = (x1 - x0) * (y1 - y0)
+        assert areas["vpsc"] < areas["scale"]
+        assert "falling back" not in capsys.readouterr().err
+
+    def test_ortho_modes_preserve_axis_order(self):
+        """``ortho_adjust(axes="x")`` keeps the x order of nodes whose
+        y extents overlap."""
+        from gvpy.engines.layout.common.adjust import (
+            _has_overlap, ortho_adjust,
+        )
+
+        class FakeLN:
+            def __init__(self, x, y):
+                self.x, self.y = x, y
+                self.width, self.height = 60.0, 40.0
+                self.pinned = False
+
+        class FakeLayout:
+            def __init__(self):
+                self.lnodes = {f"n{i}": FakeLN(i * 20.0, (i % 3) * 5.0)
+                               for i in range(8)}
+                self.sep = 0.0
+                self.overlap = "orthoxy"
+
+        layout = FakeLayout()
+        ortho_adjust(layout, axes="x")
+        assert not _has_overlap(layout)
+        xs = [layout.lnodes[f"n{i}"].x for i in range(8)]
+        assert xs == sorted(xs)
@@ -64,3 +64,29 @@ def test_polyline_not_misinterpreted_as_bezier_by_audit():
         "bezier interpretation should hit the interior bbox — if this "
         "also returns False the test bbox is the wrong shape, not a real "
         "regression")
+
+
+def test_astar_option_routes_every_edge(monkeypatch):
+    # GVPY_ORTHO_ASTAR=1 swaps Dijkstra for A*; every edge must still
+    # get a right-angle route.
+    monkeypatch.setenv("GVPY_ORTHO_ASTAR", "1")
+    src = """
+        digraph {
+            splines=ortho
+            a -> c
+            subgraph cluster_b { b }
+            a -> b
+            b -> c
+            c -> d
+            a -> d
+        }
+    """
+    layout = DotGraphInfo(read_dot(src))
+    layout.layout()
+    for le in layout.ledges:
+        if le.virtual:
+            continue
+        pts = le.route.points
+        assert len(pts) >= 2
+        for (x1, y1), (x2, y2) in zip(pts, pts[1:]):
+            assert abs(x1 - x2) < 1e-6 or abs(y1 - y2) < 1e-6
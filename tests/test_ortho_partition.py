@@ -1,21 +1,27 @@
 """Parity tests for gvpy.engines.layout.ortho.partition (Phase 4 port).
 
 Compares Python's decomposition against the C harness in
-``filters/partition_harness/``.  Rectangles are sorted lexicographically
+``porting_scripts/partition_harness/``.  Rectangles are sorted lexicographically
 on both sides before comparison because the two code paths use
 different segment-insertion orders (C uses ``srand48(173)`` +
 ``drand48()``; Python uses identity) — the final rectangle set is
 deterministic and permutation-invariant by construction, but internal
-trapezoid numbering differs.
+trapezoid numbering differs.  The sweep-line path
+(``method="sweep"``) is held to the same fixtures and cross-checked
+against the trapezoid path on random layouts.
 """
 
 from __future__ import annotations
 
+import random
 from pathlib import Path
 
 import pytest
 
+from gvpy.engines.layout.common.geom import Ppoint
 from gvpy.engines.layout.ortho.partition import (
+    Boxf,
+    Cell,
     format_partition,
     load_fixture,
     partition,
@@ -24,7 +30,7 @@ from gvpy.engines.layout.ortho.partition import (
 
 FIXTURE_DIR = (
     Path(__file__).parent.parent
-    / "filters" / "partition_harness" / "fixtures"
+    / "porting_scripts" / "partition_harness" / "fixtures"
 )
 EXPECTED_DIR = Path(__file__).parent / "fixtures" / "partition"
 
@@ -33,8 +39,9 @@ def _fixture_names() -> list[str]:
     return sorted(p.stem for p in FIXTURE_DIR.glob("*.in"))
 
 
+@pytest.mark.parametrize("method", ["seidel", "sweep"])
 @pytest.mark.parametrize("name", _fixture_names())
-def test_matches_c_harness(name: str):
+def test_matches_c_harness(name: str, method: str):
     in_path = FIXTURE_DIR / f"{name}.in"
     expected_path = EXPECTED_DIR / f"{name}.expected"
     assert in_path.exists(), f"missing input fixture: {in_path}"
@@ -43,7 +50,7 @@ def test_matches_c_harness(name: str):
     )
 
     cells, ncells, bb = load_fixture(str(in_path))
-    rects = partition(cells, ncells, bb)
+    rects = partition(cells, ncells, bb, method=method)
 
     actual = format_partition(ncells, rects)
     expected = expected_path.read_text(encoding="utf-8")
@@ -66,5 +73,41 @@ def test_matches_c_harness(name: str):
         )
 
 
+def _random_cells(seed: int) -> tuple[list[Cell], Boxf]:
+    # Separated boxes on a coarse grid, so many corners share an x or
+    # a y — the tie cases of the trapezoidation.
+    rng = random.Random(seed)
+    boxes: list[tuple[int, int, int, int]] = []
+    for _ in range(60):
+        x0, y0 = rng.randint(1, 16), rng.randint(1, 16)
+        x1, y1 = x0 + rng.randint(1, 3), y0 + rng.randint(1, 3)
+        if x1 < 20 and y1 < 20 and all(
+                x1 < a or x0 > c or y1 < b or y0 > d
+                for a, b, c, d in boxes):
+            boxes.append((x0, y0, x1, y1))
+    cells = [Cell(bb=Boxf(LL=Ppoint(a, b), UR=Ppoint(c, d)))
+             for a, b, c, d in boxes]
+    return cells, Boxf(LL=Ppoint(0, 0), UR=Ppoint(20, 20))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_sweep_matches_trapezoids(seed: int):
+    cells, bb = _random_cells(seed)
+    seidel = partition(cells, len(cells), bb, method="seidel")
+    sweep = partition(cells, len(cells), bb, method="sweep")
+    assert (format_partition(len(cells), sweep)
+            == format_partition(len(cells), seidel))
+
+
+def test_method_validation(monkeypatch):
+    cells, bb = _random_cells(0)
+    with pytest.raises(ValueError, match="sweeps"):
+        partition(cells, len(cells), bb, method="sweeps")
+    # A bad environment value falls back to the trapezoid path.
+    monkeypatch.setenv("GVPY_ORTHO_PARTITION", "bogus")
+    assert partition(cells, len(cells), bb) == partition(
+        cells, len(cells), bb, method="seidel")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
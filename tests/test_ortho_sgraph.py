@@ -20,6 +20,7 @@ from gvpy.engines.layout.ortho.sgraph import (
     gsave,
     reset,
     short_path,
+    short_path_astar,
 )
 
 
@@ -278,5 +279,112 @@ class TestDijkstraVsNetworkX:
         assert recomputed == nx_cost
 
 
+class TestSearchReuse:
+    def test_repeated_searches_share_state(self, ten_node_graph):
+        g, snodes, nxg = ten_node_graph
+        pq = fpq.pq_gen(g.nnodes)
+        # No per-node reset between searches: generation stamps alone
+        # must keep earlier results from leaking into later ones.
+        for src, dst in [(0, 9), (9, 0), (3, 6), (0, 9)]:
+            assert short_path(pq, g, snodes[src], snodes[dst]) == 0
+            assert snodes[dst].n_val == nx.dijkstra_path_length(
+                nxg, src, dst)
+
+    def test_weight_vector_overrides_edges(self, ten_node_graph):
+        g, snodes, nxg = ten_node_graph
+        pq = fpq.pq_gen(g.nnodes)
+        g.weights = [e.weight for e in g.edges]
+        g.weights[9] = 100.0           # 5 - 6
+        nxg[5][6]["weight"] = 100.0
+        short_path(pq, g, snodes[0], snodes[7])
+        assert snodes[7].n_val == nx.dijkstra_path_length(nxg, 0, 7)
+        assert g.edges[9].weight == 1.0
+
+    def test_reset_visits_only_touched(self):
+        g = create_sgraph(6)
+        a, b, c = (create_snode(g) for _ in range(3))
+        create_sedge(g, a, b, 1.0)
+        gsave(g)
+        assert g.touched == []
+        t = create_snode(g)
+        create_sedge(g, c, t, 1.0)
+        assert g.touched == [c.index, t.index]
+        reset(g)
+        assert c.adj_edge_list == [] and a.adj_edge_list == [0]
+        assert g.touched == []
+
+
+class TestAStar:
+    @pytest.mark.parametrize("src,dst", [(0, 9), (3, 6), (9, 0)])
+    def test_zero_bound_matches_networkx(self, ten_node_graph, src, dst):
+        g, snodes, nxg = ten_node_graph
+        rc = short_path_astar(g, snodes[src], snodes[dst],
+                              [0.0] * len(g.nodes))
+        assert rc == 0
+        assert snodes[dst].n_val == nx.dijkstra_path_length(nxg, src, dst)
+        cursor, path = snodes[dst], []
+        while cursor is not None:
+            path.append(cursor.index)
+            cursor = cursor.n_dad
+        assert path[-1] == src
+
+    def test_admissible_bound_keeps_cost(self, ten_node_graph):
+        g, snodes, nxg = ten_node_graph
+        exact = nx.single_source_dijkstra_path_length(nxg, 9)
+        h = [exact.get(i, 0) * 0.9 for i in range(len(g.nodes))]
+        short_path_astar(g, snodes[0], snodes[9], h)
+        assert snodes[9].n_val == exact[0]
+
+    def test_unreachable(self):
+        g = create_sgraph(3)
+        a, b, c = (create_snode(g) for _ in range(3))
+        create_sedge(g, b, c, 1.0)
+        short_path_astar(g, a, c, [0.0, 0.0, 0.0])
+        assert c.n_val == UNSEEN
+
+
+class TestArrayBacked:
+    def test_int_heap_pops_like_pq(self):
+        keys = [-7, -3, -9, -1, -3, -5, -8, -2]
+        g = create_sgraph(len(keys))
+        nodes = [create_snode(g) for _ in keys]
+        pq = fpq.pq_gen(len(keys))
+        ipq = fpq.ipq_gen(len(keys), len(keys))
+        val = keys + [0]
+        for n, k in zip(nodes, keys):
+            n.n_val = k
+            fpq.pq_insert(pq, n)
+            fpq.ipq_insert(ipq, n.index, val)
+        fpq.pq_update(pq, nodes[2], -2)
+        fpq.ipq_update(ipq, 2, val, -2)
+        popped = [fpq.pq_remove(pq).index for _ in keys]
+        assert [fpq.ipq_remove(ipq, val) for _ in keys] == popped
+        assert fpq.ipq_remove(ipq, val) == -1
+
+    def test_adjacency_follows_edge_lists(self):
+        g = create_sgraph(6)
+        a, b, c = (create_snode(g) for _ in range(3))
+        create_sedge(g, a, b, 1.0)
+        create_sedge(g, b, c, 1.0)
+        gsave(g)
+        t = create_snode(g)
+        create_sedge(g, t, b, 1.0)
+        ptr, nbr, eid, extra = sgraph._adjacency(g)
+        for n in g.nodes[:g.nnodes]:
+            got = list(zip(nbr[ptr[n.index]:ptr[n.index + 1]],
+                           eid[ptr[n.index]:ptr[n.index + 1]]))
+            got += extra.get(n.index, [])
+            assert [ei for _, ei in got] == n.adj_edge_list[:n.n_adj]
+
+    def test_set_weight_reroutes(self, ten_node_graph):
+        g, snodes, nxg = ten_node_graph
+        pq = fpq.pq_gen(g.nnodes)
+        sgraph.set_weight(g, g.edges[9], 100.0)         # 5 - 6
+        nxg[5][6]["weight"] = 100.0
+        short_path(pq, g, snodes[0], snodes[7])
+        assert snodes[7].n_val == nx.dijkstra_path_length(nxg, 0, 7)
+        assert g.edges[9].weight == 100.0
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -578,3 +578,131 @@ class TestPathplanCoverage:
             tris.append(tri)
         Ptriangulate(poly, callback)
         assert len(tris) == 2
+
+    def test_array_solve3_matches_scalar(self):
+        import numpy as np
+        from gvpy.engines.layout.pathplan import solve3
+        from gvpy.engines.layout.pathplan.arrays import solve3 as solve3_np
+        rng = np.random.default_rng(0)
+        coeff = rng.normal(size=(200, 4))
+        coeff[:20, 3] = 0.0                      # quadratics
+        coeff[20:30, 2:] = 0.0                   # linear
+        coeff[30:35] = 0.0                       # degenerate 0 == 0
+        roots, degenerate = solve3_np(coeff)
+        for row, r, deg in zip(coeff.tolist(), roots, degenerate):
+            n, expect = solve3(row)
+            assert deg == (n == 4)
+            if n != 4:
+                got = r[~np.isnan(r)]
+                assert np.allclose(sorted(got), sorted(expect))
+
+    def test_splineisinside_vector_matches_scalar(self, monkeypatch):
+        import random
+        from gvpy.engines.layout.pathplan import route
+        random.seed(3)
+        for _ in range(200):
+            span = random.choice([40.0, 3.0])
+            edges = []
+            for _ in range(80):
+                a = Ppoint(random.uniform(0, 300), random.uniform(0, 300))
+                kind = random.random()
+                if kind < 0.1:
+                    b = Ppoint(a.x, a.y + random.uniform(-span, span))
+                elif kind < 0.15:
+                    b = Ppoint(a.x, a.y)
+                else:
+                    b = Ppoint(a.x + random.uniform(-span, span),
+                               a.y + random.uniform(-span, span))
+                edges.append(Pedge(a=a, b=b))
+            sps = [Ppoint(random.uniform(0, 300), random.uniform(0, 300))
+                   for _ in range(4)]
+            monkeypatch.setattr(route, "_VECTOR_MIN", 10 ** 9)
+            scalar = route.splineisinside(edges, sps)
+            monkeypatch.setattr(route, "_VECTOR_MIN", 0)
+            assert route.splineisinside(edges, sps) == scalar
+
+    def test_proutespline_batch_fit_identical(self, monkeypatch):
+        """The batched scale schedule picks the same fit."""
+        from gvpy.engines.layout.pathplan import Ppolyline
+        from gvpy.engines.layout.pathplan import route
+        ring = [Ppoint(0, 0), Ppoint(100, 0), Ppoint(100, 40),
+                Ppoint(40, 40), Ppoint(40, 100), Ppoint(0, 100)]
+        edges = [Pedge(a=ring[i], b=ring[(i + 1) % len(ring)])
+                 for i in range(len(ring))]
+        line = Ppolyline(ps=[Ppoint(20, 10), Ppoint(40, 40),
+                             Ppoint(20, 90)])
+        out = []
+        for vector_min in (10 ** 9, 0):
+            monkeypatch.setattr(route, "_VECTOR_MIN", vector_min)
+            spl = route.Proutespline(edges, line,
+                                     [Ppoint(0, 1), Ppoint(0, 1)])
+            out.append([(p.x, p.y) for p in spl.ps])
+        assert out[0] == out[1]
+
+    def test_limit_boxes_batch_matches_casteljau(self):
+        from gvpy.engines.layout.dot.routespl import limit_boxes
+        from gvpy.engines.layout.dot.path import Box
+        pps = [Ppoint(10, 0), Ppoint(80, 30), Ppoint(-20, 60),
+               Ppoint(50, 100)]
+        boxes = [Box(float("inf"), y, float("-inf"), y + 25)
+                 for y in (0, 25, 50, 75)]
+        limit_boxes(boxes, pps, 10)
+        for box in boxes:
+            xs = []
+            n = 10 * len(boxes)
+            for i in range(n + 1):
+                t = i / n
+                p = [Ppoint(q.x, q.y) for q in pps]
+                for r in range(3):
+                    for j in range(3 - r):
+                        p[j] = Ppoint(p[j].x + t * (p[j + 1].x - p[j].x),
+                                      p[j].y + t * (p[j + 1].y - p[j].y))
+                if box.ll_y - 1e-4 <= p[0].y <= box.ur_y + 1e-4:
+                    xs.append(p[0].x)
+            assert (box.ll_x, box.ur_x) == (min(xs), max(xs))
+
+    @pytest.mark.parametrize("overlap", [False, True])
+    def test_visibility_sweep_matches_pairwise(self, overlap):
+        import random
+        from gvpy.engines.layout.pathplan import (
+            Pobsopen, clear, dist, inCone, in_cone, ptVis)
+        rng = random.Random(7)
+        cells = rng.sample([(x, y) for x in range(5) for y in range(5)], 12)
+        polys = []
+        for k, (gx, gy) in enumerate(cells):
+            x, y = gx * 10, gy * 10
+            # Equal squares on a grid put many vertices on shared lines.
+            w = h = 4 if k % 2 else rng.uniform(1, 9)
+            if overlap:
+                w, h = w + 8, h + 3
+            ring = [Ppoint(x, y), Ppoint(x + w, y), Ppoint(x + w, y + h),
+                    Ppoint(x, y + h)]
+            polys.append(Ppoly(ps=ring if k % 3 else ring[::-1]))
+        conf = Pobsopen(polys)
+        assert conf.disjoint is not overlap
+        V, P, nxt, prv = conf.N, conf.P, conf.next, conf.prev
+        for i in range(V):
+            want = {prv[i]: dist(P[i], P[prv[i]]),
+                    nxt[i]: dist(P[i], P[nxt[i]])}
+            for j in range(V):
+                if (j != i and inCone(i, j, P, nxt, prv)
+                        and inCone(j, i, P, nxt, prv)
+                        and clear(P[i], P[j], V, V, V, P, nxt)):
+                    want[j] = dist(P[i], P[j])
+            assert conf.vis[i] == want
+        p = Ppoint(23, 17)
+        want = [0.0] * (V + 2)
+        for k in range(V):
+            if (in_cone(P[prv[k]], P[k], P[nxt[k]], p)
+                    and clear(p, P[k], V, V, V, P, nxt)):
+                want[k] = dist(p, P[k])
+        assert ptVis(conf, -1, p) == want
+
+    def test_sparse_path_matches_dense(self):
+        from gvpy.engines.layout.pathplan import shortestPath, sparsePath
+        adj = [[0, 1, 5, 0],
+               [1, 0, 1, 0],
+               [5, 1, 0, 1],
+               [0, 0, 1, 0]]
+        rows = [{t: w for t, w in enumerate(r) if w} for r in adj]
+        assert sparsePath(0, 3, 4, rows) == shortestPath(0, 3, 4, adj)
@@ -0,0 +1,103 @@
+"""
+Pytest tests for the PNG renderer.
+"""
+import io
+import math
+
+import pytest
+from PIL import Image
+
+from gvpy.grammar.gv_reader import read_gv
+from gvpy.engines.layout.dot import DotLayout
+from gvpy.render import png_renderer
+from gvpy.render.png_renderer import render_png
+
+SRC = """digraph G {
+    subgraph cluster_0 { label="Cluster"; style=filled; fillcolor=lightgrey;
+        a; b [shape=box penwidth=3]; }
+    c [shape=diamond]; d [shape=circle label="a fairly long label"];
+    a -> b -> c -> d; a -> d [label="edge"]; c -> a [penwidth=2];
+}"""
+
+# Wide strokes and outlined polygons at many slopes: Pillow fills them
+# from floating-point scanline crossings.
+WIDE = """digraph W {
+    node [shape=diamond penwidth=3]; edge [penwidth=3];
+    a -> {b c d e}; b -> {f g}; c -> {g h}; d -> {h i}; e -> {i j};
+    f -> k; g -> k; h -> l; i -> l; j -> a; k -> l -> a;
+}"""
+
+
+@pytest.fixture(scope="module")
+def layout():
+    return DotLayout(read_gv(SRC)).layout()
+
+
+@pytest.fixture(scope="module")
+def wide():
+    return DotLayout(read_gv(WIDE)).layout()
+
+
+class TestPngBasic:
+
+    def test_produces_png(self, layout):
+        img = Image.open(io.BytesIO(render_png(layout)))
+        assert img.format == "PNG"
+        assert img.width > 0 and img.height > 0
+
+
+class TestPngTiles:
+
+    @pytest.mark.parametrize("tile", [17, 64])
+    @pytest.mark.parametrize("dpi", [72, 150])
+    @pytest.mark.parametrize("src", ["layout", "wide"])
+    def test_tiled_matches_single_image(self, request, monkeypatch,
+                                        src, tile, dpi):
+        """Strips whose seams cut through shapes, text and wide
+        strokes reproduce the single-image PNG byte for byte."""
+        layout = request.getfixturevalue(src)
+        single = render_png(layout, dpi, workers=1)
+        monkeypatch.setattr(png_renderer, "_MIN_TILED_PIXELS", 0)
+        monkeypatch.setattr(png_renderer, "_TILE", tile)
+        assert render_png(layout, dpi, workers=2) == single
+
+    def test_tile_canvases_stay_tile_sized(self, monkeypatch):
+        """A cluster and an edge spanning the image do not pull every
+        strip's canvas back to the top of the image."""
+        n = 12
+        nodes = [{"name": f"n{i}_{j}", "x": i * 80.0 + 40,
+                  "y": j * 60.0 + 30, "width": 54, "height": 36,
+                  "shape": "ellipse"} for i in range(n) for j in range(n)]
+        bb = [0, 0, n * 80.0 + 20, n * 60.0 + 20]
+        lay = {"graph": {"bb": bb}, "nodes": nodes,
+               "edges": [{"tail": "n0_0", "head": f"n{n - 1}_{n - 1}",
+                          "points": [[40, 30], [400, 300], [600, 500],
+                                     [n * 80.0, n * 60.0]]}],
+               "clusters": [{"name": "cluster_all", "bb": bb,
+                             "label": "all"}]}
+        monkeypatch.setattr(png_renderer, "_TILE", 64)
+        ctx = png_renderer._Ctx(bb, png_renderer._SCALE, 72, record=True)
+        png_renderer._draw_cluster(ctx, lay["clusters"][0])
+        png_renderer._draw_edge(ctx, lay["edges"][0], True)
+        for node in nodes:
+            png_renderer._draw_node(ctx, node)
+        tiles = png_renderer._tiles(ctx.draw, ctx.size)
+        rows = sum(y1 - y0 for _, _, (y0, y1), _ in tiles)
+        assert rows < 1.5 * ctx.size[1]
+
+        single = render_png(lay, 72, workers=1)
+        monkeypatch.setattr(png_renderer, "_MIN_TILED_PIXELS", 0)
+        assert render_png(lay, 72, workers=2) == single
+
+    def test_viewport_window(self, layout):
+        """A viewport draws just that window, at dpi scale."""
+        bb = layout["graph"]["bb"]
+        window = (bb[0], bb[1], (bb[0] + bb[2]) / 2, (bb[1] + bb[3]) / 2)
+        img = Image.open(io.BytesIO(render_png(layout, 144, viewport=window)))
+        assert img.width == math.ceil((window[2] - window[0] + 8) * 2)
+
+    def test_workers_from_env(self, monkeypatch):
+        monkeypatch.setenv("GVPY_PNG_WORKERS", "3")
+        assert png_renderer.png_workers() == 3
+        monkeypatch.setenv("GVPY_PNG_WORKERS", "x")
+        assert png_renderer.png_workers() == 1
@@ -61,6 +61,52 @@ class TestSfdpMultilevel:
         r = sfdp_gv(f"graph G {{ {edges} }}", levels="1")
         assert len(r["nodes"]) == 10
 
+    def test_hierarchy_prolongation(self):
+        """Each level shrinks and P maps every fine node to one coarse node."""
+        import numpy as np
+        from gvpy.engines.layout.sfdp.multilevel import build_hierarchy
+        n = 200
+        eu = np.arange(n - 1)
+        ev = eu + 1
+        levels = build_hierarchy(n, eu, ev, np.ones(n - 1), np.ones(n - 1),
+                                 max_levels=100, ratio=0.75)
+        assert len(levels) > 3
+        for fine, coarse in zip(levels, levels[1:]):
+            assert coarse.n < fine.n
+            assert fine.P.shape == (fine.n, coarse.n)
+            assert np.array_equal(fine.P.getnnz(axis=1), np.ones(fine.n))
+            assert coarse.mass.sum() == n
+        assert levels[-1].P is None
+
+    def test_matching_is_greedy_heaviest_first(self):
+        import numpy as np
+        import scipy.sparse as sp
+        from gvpy.engines.layout.sfdp.multilevel import heavy_edge_matching
+        # Path 0-1-2-3 with heavy middle edge: greedy matches (1,2) only.
+        rows = [0, 1, 1, 2, 2, 3]
+        cols = [1, 0, 2, 1, 3, 2]
+        w = [1.0, 1.0, 5.0, 5.0, 1.0, 1.0]
+        A = sp.csr_matrix((w, (rows, cols)), shape=(4, 4))
+        assert heavy_edge_matching(A).tolist() == [-1, 2, 1, -1]
+
+    def test_matching_round_cap_leaves_singletons(self):
+        import numpy as np
+        import scipy.sparse as sp
+        from gvpy.engines.layout.sfdp.multilevel import heavy_edge_matching
+        # Weights rising along a path settle one pair per round, from
+        # the heavy end: the cap stops short of the greedy matching.
+        n = 40
+        eu = np.arange(n - 1)
+        w = np.arange(1.0, n)
+        A = sp.csr_matrix((np.concatenate([w, w]),
+                           (np.concatenate([eu, eu + 1]),
+                            np.concatenate([eu + 1, eu]))), shape=(n, n))
+        greedy = heavy_edge_matching(A, max_rounds=n)
+        assert (greedy >= 0).all()
+        capped = heavy_edge_matching(A, max_rounds=5)
+        assert (capped >= 0).sum() == 10
+        assert (capped[-10:] >= 0).all()
+
 
 class TestSfdpQuadtree:
 
@@ -70,6 +116,20 @@ class TestSfdpQuadtree:
         r = sfdp_gv(f"graph G {{ {edges} }}")
         assert len(r["nodes"]) == 50
 
+    def test_barnes_hut_matches_exact(self):
+        import numpy as np
+        from gvpy.engines.layout.sfdp.quadtree import repulsive_force
+        rng = np.random.default_rng(0)
+        pos = rng.random((400, 2)) * 500
+        mass = np.ones(400)
+        d = pos[None, :, :] - pos[:, None, :]
+        d2 = (d ** 2).sum(-1)
+        np.fill_diagonal(d2, 1.0)
+        exact = -(d * (20.0 ** 2 / d2 ** 1.5)[:, :, None]).sum(axis=1)
+        approx = repulsive_force(pos, mass, 20.0, 1.0, 0.6)
+        err = np.linalg.norm(approx - exact, axis=1)
+        assert np.median(err / np.linalg.norm(exact, axis=1)) < 0.05
+
     def test_quadtree_none(self):
         """quadtree=none disables Barnes-Hut."""
         r = sfdp_gv("graph G { a--b--c--d--e--f--a; }", quadtree="none")
@@ -102,6 +162,19 @@ class TestSfdpAttributes:
         r = sfdp_gv("graph G { a--b--c; }", overlap="false")
         assert len(r["nodes"]) == 3
 
+    def test_overlap_vpsc_clears(self):
+        """sfdp dispatches ``overlap=`` through common.adjust."""
+        r = sfdp_gv("graph G { node [shape=box, width=2, height=1]; "
+                    "a--b; a--c; a--d; a--e; b--c; d--e; }",
+                    overlap="vpsc")
+        nodes = r["nodes"]
+        for i in range(len(nodes)):
+            for j in range(i + 1, len(nodes)):
+                a, b = nodes[i], nodes[j]
+                ovx = abs(a["x"] - b["x"]) < (a["width"] + b["width"]) / 2 - 0.1
+                ovy = abs(a["y"] - b["y"]) < (a["height"] + b["height"]) / 2 - 0.1
+                assert not (ovx and ovy)
+
     def test_bounding_box(self):
         r = sfdp_gv("graph G { a--b--c--a; }")
         bb = r["graph"]["bb"]
@@ -27,6 +27,7 @@ from gvpy.engines.sim import (
     Environment,
     EventSimulationView,
     GainBlock,
+    ParameterSweep,
     SimulationTrace,
     topological_sort,
 )
@@ -183,6 +184,249 @@ def test_cbd_three_phase_mealy_produces_integer_ramp():
     assert samples == [1.0, 2.0, 3.0, 4.0, 5.0]
 
 
+def _damped_loops(n):
+    """``n`` feedback loops ``x := k*x + c`` summed by a custom
+    accumulating block — wide enough for the array path."""
+    from gvpy.engines.sim.cbd import StatefulBlock
+
+    class Leaky(StatefulBlock):
+        def compute(self, current_iter):
+            self.set_output_value("OUT", self.state)
+
+        def update_state(self, current_iter):
+            self.state = 0.5 * self.state + self.get_input_value("IN")
+
+    cbd = CompoundBlock("loops")
+    total = cbd.add_block(AdderBlock("total", num_inputs=n))
+    cbd.add_block(Leaky("leaky", initial_state=1.0))
+    cbd.add_connection("total", "OUT", "leaky", "IN")
+    for i in range(n):
+        cbd.add_block(DelayBlock(f"d{i}", initial_state=1.0))
+    for i in range(n):
+        cbd.add_block(ConstantBlock(f"c{i}", value=0.1 * i))
+        cbd.add_block(GainBlock(f"k{i}", k=0.9 - 0.01 * i))
+        cbd.add_block(AdderBlock(f"a{i}", num_inputs=2))
+        cbd.add_connection(f"d{i}", "OUT", f"k{i}", "IN")
+        cbd.add_connection(f"k{i}", "OUT", f"a{i}", "IN1")
+        cbd.add_connection(f"c{i}", "OUT", f"a{i}", "IN2")
+        cbd.add_connection(f"a{i}", "OUT", f"d{i}", "IN")
+        cbd.add_connection(f"a{i}", "OUT", "total", f"IN{i + 1}")
+    return cbd, total
+
+
+def test_cbd_compiled_run_matches_step():
+    """A compiled run leaves every port and state as stepping does."""
+    def snapshot(cbd):
+        return [(p.name, p.value) for b in cbd.flatten()
+                for p in [*b.input_ports.values(), *b.output_ports.values()]
+                ] + [getattr(b, "state", None) for b in cbd.flatten()]
+
+    results = []
+    for compiled in (False, True):
+        cbd, total = _damped_loops(20)
+        solver = CBDSolver(cbd)
+        solver.init()
+        if compiled:
+            solver.compile()
+        solver.run(30)
+        results.append((snapshot(cbd), solver.current_iter))
+    assert results[0] == results[1]
+    assert results[1][1] == 30
+
+
+def test_cbd_compiled_custom_blocks_reading_later_delays():
+    """Custom blocks scheduled before the delay they read run as in
+    the interpreter, though the delay's output is still ``None`` when
+    the run starts: an integrator whose ``compute`` emits only its
+    state, and a ``DelayBlock`` subclass breaking the loop."""
+    from gvpy.engines.sim.cbd import StatefulBlock
+
+    class Integrator(StatefulBlock):
+        def compute(self, current_iter):
+            self.set_output_value("OUT", self.state)
+
+        def update_state(self, current_iter):
+            self.state = self.state + self.get_input_value("IN")
+
+    class Delay(DelayBlock):
+        pass
+
+    def integrator_loop():
+        cbd = CompoundBlock("integrator")
+        cbd.add_block(Integrator("i", initial_state=0.0))
+        cbd.add_block(GainBlock("g", k=0.5))
+        cbd.add_block(DelayBlock("d", initial_state=1.0))
+        cbd.add_block(ConstantBlock("one", value=1.0))
+        cbd.add_block(AdderBlock("a", num_inputs=2))
+        cbd.add_connection("d", "OUT", "i", "IN")
+        cbd.add_connection("i", "OUT", "g", "IN")
+        cbd.add_connection("g", "OUT", "a", "IN1")
+        cbd.add_connection("one", "OUT", "a", "IN2")
+        cbd.add_connection("a", "OUT", "d", "IN")
+        return cbd
+
+    def subclass_loop():
+        cbd = CompoundBlock("subclass")
+        cbd.add_block(Delay("d", initial_state=1.0))
+        cbd.add_block(GainBlock("g", k=0.5))
+        cbd.add_block(ConstantBlock("one", value=1.0))
+        cbd.add_block(AdderBlock("a", num_inputs=2))
+        cbd.add_connection("d", "OUT", "g", "IN")
+        cbd.add_connection("g", "OUT", "a", "IN1")
+        cbd.add_connection("one", "OUT", "a", "IN2")
+        cbd.add_connection("a", "OUT", "d", "IN")
+        return cbd
+
+    for build in (integrator_loop, subclass_loop):
+        results = []
+        for compiled in (False, True):
+            cbd = build()
+            solver = CBDSolver(cbd)
+            solver.init()
+            if compiled:
+                solver.compile()
+            solver.run(7)
+            results.append([(p.name, p.value) for b in cbd.flatten()
+                            for p in [*b.input_ports.values(),
+                                      *b.output_ports.values()]]
+                           + [getattr(b, "state", None)
+                              for b in cbd.flatten()])
+        assert results[0] == results[1]
+        last = cbd.blocks["a"].get_output_value("OUT")
+        result = ParameterSweep(build()).run({}, 7, probes=["a"],
+                                             replicas=2)
+        assert list(result.signals["a"][:, -1]) == [last, last]
+
+
+def _chain(length):
+    """A delay feeding ``length`` alternating gains and adders (each
+    adding a constant) back into itself — one block per level."""
+    cbd = CompoundBlock("chain")
+    cbd.add_block(DelayBlock("d", initial_state=1.0))
+    prev = "d"
+    for i in range(length):
+        name = f"b{i}"
+        if i % 2:
+            cbd.add_block(GainBlock(name, k=0.999))
+            cbd.add_connection(prev, "OUT", name, "IN")
+        else:
+            cbd.add_block(AdderBlock(name, num_inputs=2))
+            cbd.add_block(ConstantBlock(f"c{i}", value=0.001))
+            cbd.add_connection(prev, "OUT", name, "IN1")
+            cbd.add_connection(f"c{i}", "OUT", name, "IN2")
+        prev = name
+    cbd.add_connection(prev, "OUT", "d", "IN")
+    return cbd
+
+
+def test_cbd_compiled_chain_matches_step():
+    """A ~1000-block chain, where no level has two blocks of a kind,
+    runs compiled as it steps.  Its speed-up is measured by
+    ``porting_scripts/bench_cbd_compiled.py``."""
+    states = []
+    for compiled in (False, True):
+        cbd = _chain(700)
+        solver = CBDSolver(cbd)
+        solver.init()
+        if compiled:
+            solver.compile()
+        solver.run(100)
+        states.append([cbd.blocks["d"].state]
+                      + [cbd.blocks[f"b{i}"].get_output_value("OUT")
+                         for i in range(700)])
+    assert states[0] == states[1]
+
+
+def test_cbd_parameter_sweep_matches_separate_runs(monkeypatch):
+    """Each column of a sweep is the interpreted run with that
+    parameter set, whatever the batch count; the model is untouched."""
+    ks = [0.2, 0.5, 0.95]
+    expected = []
+    for k in ks:
+        cbd, total = _damped_loops(20)
+        cbd.blocks["k3"].k = k
+        solver = CBDSolver(cbd)
+        solver.init()
+        series = []
+        for _ in range(15):
+            solver.step()
+            series.append(total.get_output_value("OUT"))
+        expected.append((series, cbd.blocks["d3"].state))
+
+    cbd, _ = _damped_loops(20)
+    sweep = ParameterSweep(cbd)
+    for workers in (1, 2):
+        result = sweep.run({"k3": ks}, 15, probes=["total"], workers=workers)
+        assert len(result) == 3
+        for i in range(3):
+            assert list(result.run(i)["total"]) == expected[i][0]
+            assert result.states["d3"][i] == expected[i][1]
+    assert cbd.blocks["k3"].k == 0.9 - 0.03
+    assert cbd.blocks["leaky"].state == 1.0
+    monkeypatch.setenv("GVPY_SIM_WORKERS", "x")
+    assert sweep.run({}, 2, replicas=4).states["d0"].shape == (4,)
+
+
+def test_cbd_parameter_sweep_of_deep_chain():
+    """A chain several hundred blocks deep sweeps like separate runs."""
+    ks = [0.5, 0.999]
+    expected = []
+    for k in ks:
+        cbd = _chain(600)
+        cbd.blocks["b1"].k = k
+        solver = CBDSolver(cbd)
+        solver.init()
+        solver.run(10)
+        expected.append(cbd.blocks["d"].state)
+
+    cbd = _chain(600)
+    result = ParameterSweep(cbd).run({"b1": ks}, 10, probes=["b599"])
+    assert list(result.states["d"]) == expected
+    assert result.signals["b599"].shape == (2, 10)
+    assert cbd.blocks["b1"].k == 0.999
+
+
+def test_cbd_parameter_sweep_names_nested_blocks_by_path():
+    """Leaves that share a name in different sub-compounds are swept
+    and probed by dotted path; the bare name is rejected."""
+    import pytest
+
+    def loop(name, k):
+        sub = CompoundBlock(name)
+        sub.add_block(DelayBlock("d", initial_state=1.0))
+        sub.add_block(GainBlock("k", k=k))
+        sub.add_block(ConstantBlock("c", value=0.5))
+        sub.add_block(AdderBlock("a", num_inputs=2))
+        sub.add_connection("d", "OUT", "k", "IN")
+        sub.add_connection("k", "OUT", "a", "IN1")
+        sub.add_connection("c", "OUT", "a", "IN2")
+        sub.add_connection("a", "OUT", "d", "IN")
+        return sub
+
+    def model(ka=0.5, kb=0.8):
+        root = CompoundBlock("root")
+        root.add_block(loop("A", ka))
+        root.add_block(loop("B", kb))
+        return root
+
+    root = model(ka=0.25)
+    solver = CBDSolver(root)
+    solver.init()
+    solver.run(5)
+    expected_a = root.blocks["A"].blocks["d"].state
+    expected_b = root.blocks["B"].blocks["d"].state
+
+    sweep = ParameterSweep(model())
+    result = sweep.run({"A.k": [0.25]}, 5, probes=["A.a", "B.a.OUT"])
+    assert {name: list(v) for name, v in result.states.items()} == {
+        "A.d": [expected_a], "B.d": [expected_b]}
+    assert result.signals["A.a"][0, -1] == expected_a
+    with pytest.raises(KeyError, match="ambiguous"):
+        sweep.run({"k": [0.25]}, 5)
+    with pytest.raises(KeyError, match="ambiguous"):
+        sweep.run({}, 5, probes=["a"], replicas=1)
+
+
 def test_cbd_simulation_view_basic():
     """CBDSimulationView wraps a CompoundBlock and runs via run()."""
     g = Graph(name="g", directed=True)
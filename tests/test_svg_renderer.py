@@ -56,6 +56,20 @@ class TestSvgNodes:
         assert ">hello</text>" in svg
         assert ">world</text>" in svg
 
+    def test_colors_resolved_once_per_render(self, monkeypatch):
+        """Each distinct colour spec is resolved once per render."""
+        from gvpy.render import colors
+        calls = []
+        real = colors.resolve_color
+        monkeypatch.setattr(colors, "resolve_color",
+                            lambda spec: calls.append(spec) or real(spec))
+        styled = '[style=filled fillcolor=lightcyan2 color=red4]'
+        svg = layout_and_render(
+            'digraph G { ' + ' '.join(f'{n} {styled};' for n in 'abcd')
+            + ' a -> b -> c -> d; }')
+        assert svg.count('fill="#d1eeee"') == 4
+        assert sorted(calls) == sorted(set(calls))
+
 
 class TestSvgEdges:
 
@@ -129,6 +143,43 @@ class TestSvgFile:
         assert content.startswith("<?xml")
         assert "<svg" in content
 
+    def test_write_svg_matches_render(self):
+        """write_svg streams exactly render_svg's output to text and
+        binary sinks."""
+        import io
+        from gvpy.render.svg_renderer import write_svg
+        g = read_gv('digraph G { subgraph cluster_0 { a -> b; } '
+                    'b -> c [label="é"]; }')
+        result = DotLayout(g).layout()
+        text, data = io.StringIO(), io.BytesIO()
+        write_svg(result, text)
+        write_svg(result, data)
+        assert text.getvalue() == render_svg(result)
+        assert data.getvalue() == render_svg(result).encode("utf-8")
+
+    def test_write_svg_memory_flat(self):
+        """Peak memory of write_svg does not grow with the graph."""
+        import tracemalloc
+        from gvpy.render.svg_renderer import write_svg
+
+        class Null:
+            def write(self, s):
+                pass
+
+        base = DotLayout(read_gv('digraph G { a -> b [label="x"]; }')).layout()
+        node, edge = base["nodes"][0], base["edges"][0]
+        peaks = []
+        for n in (500, 4000):
+            result = dict(base)
+            result["nodes"] = [dict(node, name=f"n{i}") for i in range(n)]
+            result["edges"] = [dict(edge, tail=f"n{i}", head=f"n{i + 1}")
+                               for i in range(n)]
+            tracemalloc.start()
+            write_svg(result, Null())
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        assert peaks[1] < 1.5 * peaks[0]
+
     def test_real_file(self):
         """Render a real .gv file to SVG."""
         path = Path(__file__).parent.parent / "test_data" / "example1.gv"
@@ -142,6 +193,54 @@ class TestSvgFile:
         assert svg.count("class=\"node\"") == 5
 
 
+class TestSvgViewport:
+
+    @staticmethod
+    def grid_layout(n=20):
+        """An ``n`` x ``n`` grid of labelled nodes 100 points apart,
+        each joined to its right neighbour by a straight bezier."""
+        nodes = [{"name": f"n{i}_{j}", "x": 100.0 * i, "y": 100.0 * j,
+                  "width": 54.0, "height": 36.0}
+                 for j in range(n) for i in range(n)]
+        edges = [{"tail": f"n{i}_{j}", "head": f"n{i + 1}_{j}",
+                  "spline_type": "bezier", "label": "e",
+                  "label_pos": [100.0 * i + 50, 100.0 * j],
+                  "points": [[100.0 * i + 27 + 5 * k, 100.0 * j]
+                             for k in range(10)]}
+                 for j in range(n) for i in range(n - 1)]
+        return {"graph": {"bb": [-27.0, -18.0, 100.0 * n, 100.0 * n],
+                          "directed": True, "name": "G"},
+                "nodes": nodes, "edges": edges}
+
+    def test_only_visible_objects(self):
+        """A window draws the nodes and edges that reach it."""
+        from gvpy.render.viewport import LayoutIndex
+        layout = self.grid_layout()
+        index = LayoutIndex(layout)
+        svg = render_svg(layout, viewport=(150, 150, 350, 250), index=index)
+        assert svg.count('class="node"') == 2      # (200, 200), (300, 200)
+        assert 'id="node_n2_2"' in svg and 'id="node_n5_2"' not in svg
+        assert ">e</text>" in svg
+        assert 'viewBox="146.00 146.00 208.00 108.00"' in svg
+
+    def test_low_zoom_drops_detail(self):
+        """Far out, labels go, straight splines keep two control
+        points and sub-pixel nodes merge."""
+        from gvpy.render.viewport import view_layout
+        layout = self.grid_layout()
+        near = view_layout(layout, (0, 0, 2000, 2000), 1.0)
+        assert near["edges"][0]["label"] == "e"
+        far = view_layout(layout, (0, 0, 2000, 2000), 0.1)
+        assert "label" not in far["edges"][0]
+        assert len(far["edges"][0]["points"]) == 4
+        assert far["nodes"][0]["label"] == ""
+        assert len(far["nodes"]) == 400
+        tiny = view_layout(layout, (0, 0, 2000, 2000), 0.005)
+        assert len(tiny["nodes"]) < 400
+        assert sum(n["merged"] for n in tiny["nodes"]) == 400
+        assert "merged" not in layout["nodes"][0]
+
+
 class TestSvgCLI:
 
     def test_cli_svg_output(self, tmp_path):
@@ -171,3 +270,30 @@ class TestSvgCLI:
         assert result.returncode == 0, result.stderr
         assert out_file.exists()
         assert "<svg" in out_file.read_text()
+
+    def test_cli_failure_keeps_previous_output(self, tmp_path, monkeypatch):
+        """A render that fails part-way leaves the old file in place."""
+        import sys
+        import gvcli
+        dot_file = tmp_path / "test.gv"
+        dot_file.write_text("digraph G { x -> y; }", encoding="utf-8")
+        out_file = tmp_path / "out.svg"
+        out_file.write_text("previous", encoding="utf-8")
+
+        def failing(*args, sink=None, **kw):
+            sink.write("<svg")
+            raise RuntimeError("layout failed")
+
+        monkeypatch.setattr(gvcli, "layout_and_render", failing)
+        monkeypatch.setattr(sys, "argv", ["gvpy", str(dot_file), "-Tsvg",
+                                          "-o", str(out_file)])
+        with pytest.raises(RuntimeError):
+            gvcli.main()
+        assert out_file.read_text() == "previous"
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "out.svg", "test.gv"]
+        monkeypatch.undo()
+        monkeypatch.setattr(sys, "argv", ["gvpy", str(dot_file), "-Tsvg",
+                                          "-o", str(out_file)])
+        gvcli.main()
+        assert "<svg" in out_file.read_text()
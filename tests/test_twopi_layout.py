@@ -230,3 +230,56 @@ class TestTwopiAlignment:
                 f"c -- a; c -- b; c -- d; c -- e; }}"
             )
             assert len(r["nodes"]) == 5
+
+
+class TestTwopiArrays:
+    """The id-based ``circle_layout`` pipeline against the per-node
+    reference functions."""
+
+    def _reference(self, layout, names, adj):
+        from gvpy.engines.layout.twopi import circle
+        for name in names:
+            layout.lnodes[name].n_child = 0
+        circle.init_layout(layout, names, adj)
+        center = circle.find_center_node(layout, names, adj)
+        max_rank = circle.set_parent_nodes(layout, names, adj, center)
+        circle.set_subtree_size(layout, names)
+        circle.set_subtree_spans(layout, center, adj)
+        circle.set_positions(layout, center, adj)
+        circle.set_absolute_pos(layout, names, max_rank)
+        return center
+
+    def test_matches_reference(self):
+        import random
+        from gvpy.engines.layout.twopi.circle import circle_layout
+        rnd = random.Random(7)
+        edges = [f"n{int(rnd.random() ** 2 * i)} -- n{i};"
+                 for i in range(1, 200)]
+        edges += [f"n{rnd.randrange(200)} -- n{rnd.randrange(200)};"
+                  for _ in range(20)]
+        graph = read_gv("graph G { %s }" % " ".join(edges))
+        layout = TwopiLayout(graph)
+        layout._init_from_graph()
+        adj = layout._build_adjacency()
+        names = list(layout.lnodes)
+        fields = ("s_leaf", "s_center", "parent", "n_child", "stsize",
+                  "span", "theta", "x", "y")
+
+        center = self._reference(layout, names, adj)
+        expected = {n: tuple(getattr(ln, f) for f in fields)
+                    for n, ln in layout.lnodes.items()}
+        assert circle_layout(layout, names, adj) == center
+        got = {n: tuple(getattr(ln, f) for f in fields)
+               for n, ln in layout.lnodes.items()}
+        assert got == expected
+
+    def test_long_path_no_recursion(self):
+        from gvpy.engines.layout.twopi.circle import circle_layout
+        text = "graph G { %s }" % " ".join(
+            f"n{i} -- n{i + 1};" for i in range(3000))
+        graph = read_gv(text)
+        layout = TwopiLayout(graph)
+        layout._init_from_graph()
+        adj = layout._build_adjacency()
+        assert circle_layout(layout, list(layout.lnodes), adj) == "n1500"
+        assert layout.lnodes["n0"].s_center == 1500